@@ -0,0 +1,604 @@
+"""
+Macro Dashboard API Client
+
+One client for the Streamlit UI, notebooks and scripts:
+- pooled HTTP connections (one requests.Session per client)
+- batch endpoints (many series per request)
+- pandas DataFrame outputs
+- pluggable response caching (MemoryCache, NoCache, or anything with get/set/clear)
+
+Usage:
+    from api_client import MacroAPIClient
+    client = MacroAPIClient()
+    cpi = client.timeseries("CPIAUCSL", start=datetime(2015, 1, 1))
+    prices = client.timeseries_many(["SPY", "QQQ"], start=datetime(2020, 1, 1))
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import parse_qsl
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from tracing import CLIENT, TRACEPARENT_HEADER, span
+
+# Request header naming the dashboard page a request came from (counted on /metrics)
+PAGE_HEADER = "X-Dashboard-Page"
+
+# Per-series value columns of /api/analytics/inflation
+INFLATION_MEASURES = ["level", "yoy", "mom_annualized", "annualized_3m", "annualized_6m", "contribution"]
+
+
+def default_api_base() -> str:
+    """API base URL from the API_BASE environment variable (defaults to localhost)"""
+    api_base = os.environ.get("API_BASE", "http://localhost:8000")
+    if api_base and not api_base.startswith("http"):
+        api_base = f"https://{api_base}"
+    return api_base.rstrip("/")
+
+
+class MacroAPIError(Exception):
+    """Raised when the API can't be reached or returns an error status"""
+
+
+# ============================================================================
+# CACHES
+# ============================================================================
+
+class NoCache:
+    """Cache backend that never stores anything"""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache:
+    """
+    Thread-safe in-process TTL cache with LRU eviction.
+    Cached responses are shared - treat them as read-only.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+def _points_to_frame(points: List[dict]) -> pd.DataFrame:
+    """[{timestamp, value}, ...] -> DataFrame [timestamp, value] sorted by time"""
+    df = pd.DataFrame(points, columns=["timestamp", "value"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df["value"] = df["value"].astype(float)
+    return df.sort_values("timestamp").reset_index(drop=True)
+
+
+def _columns_to_frame(data: Dict[str, Any], exclude: Iterable[str] = ()) -> pd.DataFrame:
+    """{timestamps: [...], col: [...], ...} -> DataFrame indexed by timestamp"""
+    columns = {k: v for k, v in data.items() if k != "timestamps" and k not in exclude}
+    frame = pd.DataFrame(columns, index=pd.to_datetime(data.get("timestamps", [])), dtype=float)
+    frame.index.name = "timestamp"
+    return frame
+
+
+def _day_param(moment: Union[date, str], round_up: bool = False) -> str:
+    """
+    ISO start/end parameter snapped to a whole day, so rolling windows such
+    as datetime.now() - timedelta(days=365) build the same URL (and cache
+    key) on every rerun. Ends round up to the next midnight so none of
+    their day's points are cut off. Unparseable strings pass through.
+    """
+    if isinstance(moment, str):
+        try:
+            moment = datetime.fromisoformat(moment)
+        except ValueError:
+            return moment
+    if not isinstance(moment, datetime):
+        moment = datetime(moment.year, moment.month, moment.day)
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if round_up and day != moment:
+        day += timedelta(days=1)
+    return day.isoformat()
+
+
+class MacroAPIClient:
+    """Typed client for the Macro Dashboard API"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = 30,
+        cache: Optional[Any] = None,
+        pool_size: int = 16
+    ):
+        self.base_url = (base_url or default_api_base()).rstrip("/")
+        self.timeout = timeout
+        self.cache = cache if cache is not None else NoCache()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Dashboard page per thread - Streamlit runs each browser session in its own thread
+        self._context = threading.local()
+
+    def set_page(self, page: Optional[str]) -> None:
+        """Tag this thread's requests with the dashboard page issuing them (None stops tagging)"""
+        self._context.page = page
+
+    def _headers(self, traceparent: Optional[str] = None) -> Optional[Dict[str, str]]:
+        headers = {}
+        page = getattr(self._context, "page", None)
+        if page:
+            headers[PAGE_HEADER] = page
+        if traceparent:
+            headers[TRACEPARENT_HEADER] = traceparent
+        return headers or None
+
+    # ------------------------------------------------------------------
+    # Raw access
+    # ------------------------------------------------------------------
+
+    def get_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None, use_cache: bool = True) -> Any:
+        """
+        GET an endpoint (e.g. "/api/indicators") and return the decoded JSON.
+        start/end - in params or in the endpoint's query string - are
+        snapped to whole days (see _day_param) before the URL is built.
+        """
+        endpoint, _, query = endpoint.partition("?")
+        params = {**dict(parse_qsl(query, keep_blank_values=True)),
+                  **{k: v for k, v in (params or {}).items() if v is not None}}
+        for name, round_up in (("start", False), ("end", True)):
+            if name in params:
+                params[name] = _day_param(params[name], round_up)
+        request = requests.Request("GET", f"{self.base_url}{endpoint}", params=params).prepare()
+        key = request.url
+
+        with span(f"GET {endpoint}", CLIENT, {"http.url": key}) as current:
+            if use_cache:
+                cached = self.cache.get(key)
+                current.set_attribute("cache.hit", cached is not None)
+                if cached is not None:
+                    return cached
+
+            try:
+                response = self.session.get(request.url, headers=self._headers(current.traceparent),
+                                            timeout=self.timeout)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                raise MacroAPIError(str(e)) from e
+
+            with span("decode json"):
+                data = response.json()
+            current.set_attribute("http.response.body.size", len(response.content))
+            if use_cache:
+                self.cache.set(key, data)
+            return data
+
+    def post_json(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        body: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """POST to an endpoint, optionally with a JSON body (never cached)"""
+        with span(f"POST {endpoint}", CLIENT) as current:
+            try:
+                response = self.session.post(
+                    f"{self.base_url}{endpoint}", params=params, json=body,
+                    headers=self._headers(current.traceparent), timeout=timeout or self.timeout
+                )
+                response.raise_for_status()
+            except requests.RequestException as e:
+                raise MacroAPIError(str(e)) from e
+            return response.json()
+
+    # ------------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------------
+
+    def indicators(self, category: Optional[str] = None, source: Optional[str] = None) -> pd.DataFrame:
+        """All active indicators as a DataFrame"""
+        return pd.DataFrame(self.get_json("/api/indicators", {"category": category, "source": source}))
+
+    def status(self) -> Dict[str, Any]:
+        """Row counts, freshness and last ingest results (never cached)"""
+        return self.get_json("/api/status", use_cache=False)
+
+    def staleness(self) -> pd.DataFrame:
+        """Per-series freshness from /api/status, stalest first"""
+        indicators = self.status().get("indicators", {})
+        frame = pd.DataFrame.from_dict(indicators, orient="index")
+        if frame.empty:
+            return frame
+        frame.index.name = "indicator_id"
+        for column in ("first_timestamp", "latest_timestamp"):
+            frame[column] = pd.to_datetime(frame[column])
+        return frame.sort_values("age_days", ascending=False)
+
+    # ------------------------------------------------------------------
+    # Latest values
+    # ------------------------------------------------------------------
+
+    def latest(self, indicator_id: str) -> Dict[str, Any]:
+        """Latest value, timestamp, unit and deltas for one indicator"""
+        return self.get_json(f"/api/indicators/{indicator_id}/latest")
+
+    def latest_many(self, indicator_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Latest values for many indicators in one request (indicators without data are omitted)"""
+        ids = list(indicator_ids)
+        if not ids:
+            return {}
+        return self.get_json("/api/batch/latest", {"ids": ",".join(ids)})["indicators"]
+
+    def latest_value(self, *indicator_ids: str) -> Optional[float]:
+        """Latest value of the first indicator (in order) that has data"""
+        latest = self.latest_many(indicator_ids)
+        for indicator_id in indicator_ids:
+            value = latest.get(indicator_id, {}).get("latest_value")
+            if value is not None:
+                return value
+        return None
+
+    # ------------------------------------------------------------------
+    # Time series
+    # ------------------------------------------------------------------
+
+    def timeseries(
+        self,
+        indicator_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 20000
+    ) -> pd.DataFrame:
+        """One series as a DataFrame [timestamp, value]"""
+        data = self.get_json(f"/api/indicators/{indicator_id}/timeseries", {
+            "start": start,
+            "end": end,
+            "limit": limit,
+        })
+        return _points_to_frame(data.get("data", []))
+
+    def timeseries_many(
+        self,
+        indicator_ids: Iterable[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 20000
+    ) -> pd.DataFrame:
+        """
+        Many series in one request as a wide DataFrame
+        (index = timestamp, one column per indicator, NaN where a series has no point).
+        """
+        ids = list(indicator_ids)
+        if not ids:
+            return pd.DataFrame()
+
+        data = self.get_json("/api/batch/timeseries", {
+            "ids": ",".join(ids),
+            "start": start,
+            "end": end,
+            "limit": limit,
+        })
+
+        columns = {
+            indicator_id: pd.Series(
+                series["values"], index=pd.to_datetime(series["timestamps"]), dtype=float
+            )
+            for indicator_id, series in data.get("series", {}).items()
+        }
+        if not columns:
+            return pd.DataFrame(columns=ids, dtype=float)
+        wide = pd.DataFrame(columns).sort_index()
+        wide.index.name = "timestamp"
+        return wide
+
+    # ------------------------------------------------------------------
+    # Dashboards, signals and analytics
+    # ------------------------------------------------------------------
+
+    def dashboard(self, name: str) -> Dict[str, Any]:
+        """Pre-built dashboard payload (e.g. "recession-watch")"""
+        return self.get_json(f"/api/dashboards/{name}")
+
+    def signals(self, include_inactive: bool = False) -> List[Dict[str, Any]]:
+        """Current alert signals"""
+        return self.get_json("/api/signals", {"include_inactive": str(include_inactive).lower()})["signals"]
+
+    def regimes(self) -> List[Dict[str, Any]]:
+        """Current state of every market regime, with start, duration and previous state"""
+        return self.get_json("/api/regimes")["regimes"]
+
+    def regime_history(self, regime_id: str, start: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Regime timeline: {"periods": DataFrame [state, start, end, duration_days,
+        observations], "statistics": {state: {...}}}
+        """
+        data = self.get_json(f"/api/regimes/{regime_id}/history", {"start": start})
+        periods = pd.DataFrame(data["periods"], columns=["state", "start", "end", "duration_days", "observations"])
+        periods["start"] = pd.to_datetime(periods["start"])
+        periods["end"] = pd.to_datetime(periods["end"])
+        return {"title": data["title"], "periods": periods, "statistics": data["statistics"]}
+
+    def rrg(self, benchmark: str = "SPY", tail: int = 10, freq: str = "D") -> Dict[str, Any]:
+        """Relative rotation graph tails (RS-Ratio / RS-Momentum) of every sector vs a benchmark"""
+        return self.get_json("/api/rrg", {"benchmark": benchmark, "tail": tail, "freq": freq})
+
+    def heatmap(self, category: Optional[str] = None) -> pd.DataFrame:
+        """
+        Historical rank of every indicator's latest value (index = indicator id,
+        columns = name, category, unit, timestamp, value, then
+        percentile_<lookback> and z_score_<lookback> for full/10y/5y)
+        """
+        data = self.get_json("/api/rankings/heatmap", {"category": category})
+        rows = {}
+        for indicator_id, entry in data["indicators"].items():
+            row = {key: entry[key] for key in ("name", "category", "unit", "timestamp", "value")}
+            for lookback in data["lookbacks"]:
+                ranking = entry["rankings"].get(lookback, {})
+                row[f"percentile_{lookback}"] = ranking.get("percentile")
+                row[f"z_score_{lookback}"] = ranking.get("z_score")
+            rows[indicator_id] = row
+        columns = ["name", "category", "unit", "timestamp", "value"] + [
+            f"{stat}_{lookback}" for lookback in data["lookbacks"] for stat in ("percentile", "z_score")
+        ]
+        frame = pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"])
+        return frame
+
+    def ranking(self, indicator_id: str, value: Optional[float] = None) -> Dict[str, Any]:
+        """Percentile, z-score and distribution of one indicator per lookback (optionally placing `value` too)"""
+        return self.get_json(f"/api/rankings/{indicator_id}", {"value": value})
+
+    def technicals(self, ids: Optional[Iterable[str]] = None, category: Optional[str] = None) -> pd.DataFrame:
+        """Latest technical snapshot per ticker (index = ticker, columns = timestamp + technical fields)"""
+        data = self.get_json("/api/technicals", {
+            "ids": ",".join(ids) if ids else None,
+            "category": category,
+        })
+        snapshot = pd.DataFrame.from_dict(data["indicators"], orient="index", columns=["timestamp"] + data["fields"])
+        snapshot["timestamp"] = pd.to_datetime(snapshot["timestamp"])
+        return snapshot
+
+    def technical_history(
+        self,
+        indicator_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Technical fields for one ticker over time as a DataFrame indexed by timestamp"""
+        data = self.get_json(f"/api/technicals/{indicator_id}", {
+            "start": start,
+            "end": end,
+        })
+        return _columns_to_frame(data, exclude=("indicator_id", "version"))
+
+    def breadth(self, start: Optional[datetime] = None) -> Dict[str, Any]:
+        """Market breadth: {"latest": {...} or None, "history": DataFrame indexed by timestamp}"""
+        data = self.get_json("/api/technicals/breadth", {"start": start})
+        return {"latest": data["latest"], "history": _columns_to_frame(data["history"])}
+
+    def risk(
+        self,
+        indicator_ids: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        risk_free: float = 0.0
+    ) -> Dict[str, Dict[str, Any]]:
+        """Risk statistics per series over the window (all active indicators when ids is None)"""
+        return self.get_json("/api/analytics/risk", {
+            "ids": ",".join(indicator_ids) if indicator_ids else None,
+            "start": start,
+            "end": end,
+            "risk_free": risk_free,
+        })["statistics"]
+
+    def rolling_risk(
+        self,
+        indicator_ids: Iterable[str],
+        window: int = 90,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """Rolling volatility and drawdown per series: {id: DataFrame [volatility, drawdown] by timestamp}"""
+        data = self.get_json("/api/analytics/risk/rolling", {
+            "ids": ",".join(indicator_ids),
+            "window": window,
+            "start": start,
+            "end": end,
+        })
+        return {
+            series_id: _columns_to_frame(series, exclude=("basis",))
+            for series_id, series in data.get("series", {}).items()
+        }
+
+    def correlation(
+        self,
+        indicator_ids: Iterable[str],
+        frequency: str = "week",
+        method: str = "pearson",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """All-pairs correlation of period returns/changes as a square DataFrame"""
+        data = self.get_json("/api/analytics/correlation", {
+            "ids": ",".join(indicator_ids),
+            "frequency": frequency,
+            "method": method,
+            "start": start,
+            "end": end,
+        })
+        return pd.DataFrame(data["correlation"], index=data["ids"], columns=data["ids"], dtype=float)
+
+    def backtest_presets(self) -> Dict[str, Dict[str, Any]]:
+        """Example strategy specs by name"""
+        return self.get_json("/api/backtest/presets")["presets"]
+
+    def backtest(
+        self,
+        preset: Optional[str] = None,
+        strategy: Optional[Dict[str, Any]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        cost_bps: float = 5.0,
+        risk_free: float = 0.0,
+        benchmark: Optional[str] = "SPY",
+        sweep: Optional[Dict[str, list]] = None,
+        top: int = 10,
+        timeout: float = 120
+    ) -> Dict[str, Any]:
+        """
+        Run a backtest. Single run: {"statistics": {"strategy"|"benchmark": {...}},
+        "equity": DataFrame, "weights": DataFrame, "turnover": DataFrame}.
+        With `sweep`: {"runs": DataFrame (one row per run, params + statistics,
+        best Sharpe first), "equity": DataFrame of the best `top` runs}.
+        """
+        data = self.post_json("/api/backtest", timeout=timeout, body={
+            "preset": preset,
+            "strategy": strategy or {},
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+            "cost_bps": cost_bps,
+            "risk_free": risk_free,
+            "benchmark": benchmark,
+            "sweep": sweep,
+            "top": top,
+        })
+        if sweep:
+            runs = pd.DataFrame([{**run.pop("params"), **run} for run in data["runs"]]).set_index("run")
+            return {"strategy": data["strategy"], "runs": runs, "equity": _columns_to_frame(data["equity"])}
+        return {
+            "strategy": data["strategy"],
+            "statistics": data["statistics"],
+            "equity": _columns_to_frame(data["equity"]),
+            "weights": _columns_to_frame(data["weights"]),
+            "turnover": _columns_to_frame(data["turnover"]),
+        }
+
+    def calendar_returns(
+        self,
+        indicator_ids: Iterable[str],
+        period: str = "year",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Calendar-period returns, YTD and statistics for many series"""
+        return self.get_json("/api/analytics/calendar-returns", {
+            "ids": ",".join(indicator_ids),
+            "period": period,
+            "start": start,
+            "end": end,
+        })
+
+    def inflation(self, start: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Inflation decomposition as a long DataFrame with columns
+        [timestamp, series_id, category, headline, weight, level, yoy,
+        mom_annualized, annualized_3m, annualized_6m, contribution].
+        """
+        data = self.get_json("/api/analytics/inflation", {"start": start})
+
+        frames = []
+        for series_id, series in data.get("series", {}).items():
+            frame = pd.DataFrame({key: series[key] for key in INFLATION_MEASURES}, dtype=float)
+            frame.insert(0, "timestamp", pd.to_datetime(series["timestamps"]))
+            frame.insert(1, "series_id", series_id)
+            frame.insert(2, "category", series["category"])
+            frame.insert(3, "headline", series["headline"])
+            frame.insert(4, "weight", float("nan") if series["weight"] is None else series["weight"])
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=["timestamp", "series_id", "category", "headline", "weight"] + INFLATION_MEASURES)
+        return pd.concat(frames, ignore_index=True)
+
+    # ------------------------------------------------------------------
+    # Yield curve
+    # ------------------------------------------------------------------
+
+    def yield_curves(
+        self,
+        dates: Optional[Iterable[datetime]] = None,
+        freq: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        model: str = "ns"
+    ) -> Dict[str, Any]:
+        """Observed + fitted curves for given dates, one per period (freq), or the latest curve"""
+        return self.get_json("/api/yield-curve/snapshots", {
+            "dates": ",".join(d.strftime("%Y-%m-%d") for d in dates) if dates else None,
+            "freq": freq,
+            "start": start,
+            "end": end,
+            "model": model,
+        })
+
+    def yield_spreads(
+        self,
+        pairs: Iterable[str] = ("10Y-2Y", "10Y-3M"),
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Spread histories (percentage points) as a wide DataFrame, one column per pair"""
+        data = self.get_json("/api/yield-curve/spreads", {
+            "pairs": ",".join(pairs),
+            "start": start,
+            "end": end,
+        })
+        return _columns_to_frame(data, exclude=("model",))
+
+    def yield_factors(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """Level / slope / curvature history as a DataFrame indexed by timestamp"""
+        data = self.get_json("/api/yield-curve/factors", {
+            "start": start,
+            "end": end,
+        })
+        return _columns_to_frame(data, exclude=("model",))
+
+    def refresh(self, source: Optional[str] = None, timeout: float = 300) -> Dict[str, Any]:
+        """Trigger a data refresh and drop cached responses"""
+        result = self.post_json("/api/refresh", {"source": source} if source else None, timeout=timeout)
+        self.cache.clear()
+        return result
@@ -0,0 +1,440 @@
+"""
+Backtesting Engine
+
+Allocation strategies simulated over stored price series with vectorized
+return matrices, plus parameter sweeps spread over a process pool.
+
+Every strategy reduces to a target-weight table: one row per rebalance date
+(index = timestamp, columns = assets, rows summing to 1). simulate() then
+runs the whole backtest without a Python loop over days: between two
+rebalances the portfolio drifts with its assets, so its value on any day is
+the target-weighted sum of each asset's growth since the last rebalance,
+gathered for all days at once from the price matrix.
+
+Strategy types (spec["type"]):
+- "static":   fixed `weights`, rebalanced every `rebalance` period
+- "signal":   `weights_on` while indicator `signal` is above `threshold`
+              (below, with `direction` = "below"), else `weights_off`
+- "regime":   `weights` per state of a stored regime timeline (`regime`),
+              `default` weights for states not listed
+- "momentum": the `top_n` assets of `universe` by trailing `lookback`-day
+              return, equally weighted; `direction` = -1 holds the worst
+              performers instead (mean reversion)
+
+Rebalance periods: "none" (buy and hold), "M", "Q", "Y" - at the close of
+each period's last trading day. Signal and regime strategies also trade
+whenever their target changes, acting on the close after the observation,
+and hold `weights_off` / `default` until their input has data.
+"CASH" can be used as an asset (constant price). A backtest starts on the
+first date every asset it holds has a price.
+"""
+
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from risk import risk_statistics
+
+CASH = "CASH"
+
+REBALANCE_FREQUENCIES = ["none", "M", "Q", "Y"]
+
+BACKTEST_STATISTICS = [
+    "start", "end", "total_return", "annual_return", "volatility", "sharpe", "sortino",
+    "max_drawdown", "max_drawdown_days", "calmar", "annual_turnover", "rebalances",
+]
+
+# Sweeps smaller than this run in-process (pool start-up costs more than it saves)
+SWEEP_PARALLEL_MIN = 32
+
+# Example strategies (also the UI presets)
+BACKTEST_PRESETS = {
+    "60_40": {
+        "title": "60/40 Stocks/Bonds",
+        "type": "static",
+        "weights": {"SPY": 0.6, "TLT": 0.4},
+        "rebalance": "Q",
+    },
+    "curve_inversion_defensive": {
+        "title": "Defensive When the Curve Inverts",
+        "type": "signal",
+        "signal": "T10Y2Y",
+        "threshold": 0.0,
+        "direction": "above",
+        "weights_on": {"SPY": 0.8, "TLT": 0.2},
+        "weights_off": {"SPY": 0.3, "TLT": 0.5, "CASH": 0.2},
+        "rebalance": "Q",
+    },
+    "risk_appetite_tilt": {
+        "title": "Risk-On / Risk-Off Regime Tilt",
+        "type": "regime",
+        "regime": "risk_appetite",
+        "weights": {
+            "Risk-On": {"SPY": 0.8, "TLT": 0.2},
+            "Risk-Off": {"SPY": 0.3, "TLT": 0.7},
+        },
+        "default": {"SPY": 0.6, "TLT": 0.4},
+        "rebalance": "M",
+    },
+    "sector_momentum": {
+        "title": "Sector Momentum (Top 3)",
+        "type": "momentum",
+        "universe": ["XLK", "XLF", "XLE", "XLV", "XLY", "XLP", "XLI", "XLB", "XLU"],
+        "lookback": 126,
+        "top_n": 3,
+        "direction": 1,
+        "rebalance": "M",
+    },
+}
+
+
+def _normalize(weights: Dict[str, float]) -> Dict[str, float]:
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Strategy weights must sum to a positive number")
+    return {asset: weight / total for asset, weight in weights.items()}
+
+
+def strategy_assets(spec: dict) -> List[str]:
+    """Assets a strategy can hold (price series it needs, plus CASH)"""
+    strategy_type = spec["type"]
+    if strategy_type == "static":
+        groups = [spec["weights"]]
+    elif strategy_type == "signal":
+        groups = [spec["weights_on"], spec["weights_off"]]
+    elif strategy_type == "regime":
+        groups = list(spec["weights"].values()) + [spec["default"]]
+    elif strategy_type == "momentum":
+        groups = [spec["universe"]]
+    else:
+        raise ValueError(f"Unknown strategy type '{strategy_type}'")
+    return list(dict.fromkeys(asset for group in groups for asset in group))
+
+
+# Keys each strategy type must set
+REQUIRED_KEYS = {
+    "static": ["weights"],
+    "signal": ["signal", "threshold", "weights_on", "weights_off"],
+    "regime": ["regime", "weights", "default"],
+    "momentum": ["universe", "lookback", "top_n"],
+}
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_weights(name: str, weights) -> None:
+    if not isinstance(weights, dict) or not weights:
+        raise ValueError(f"'{name}' must be a non-empty mapping of asset -> weight")
+    for asset, weight in weights.items():
+        if not _is_number(weight):
+            raise ValueError(f"'{name}' weight of {asset} must be a number")
+
+
+def validate_spec(spec: dict) -> None:
+    """
+    Check a strategy spec's keys and value types before any data is loaded
+    (request specs and every sweep combination). Raises ValueError naming
+    the first problem.
+    """
+    strategy_type = spec.get("type")
+    if strategy_type not in REQUIRED_KEYS:
+        raise ValueError(f"Unknown strategy type '{strategy_type}'")
+    missing = [key for key in REQUIRED_KEYS[strategy_type] if key not in spec]
+    if missing:
+        raise ValueError(f"A {strategy_type} strategy needs {missing}")
+    if spec.get("rebalance", "M") not in REBALANCE_FREQUENCIES:
+        raise ValueError(f"rebalance must be one of {REBALANCE_FREQUENCIES}")
+
+    if strategy_type == "static":
+        _check_weights("weights", spec["weights"])
+    elif strategy_type == "signal":
+        if not isinstance(spec["signal"], str):
+            raise ValueError("'signal' must be an indicator id")
+        if not _is_number(spec["threshold"]):
+            raise ValueError("'threshold' must be a number")
+        if spec.get("direction", "above") not in ("above", "below"):
+            raise ValueError("'direction' must be 'above' or 'below'")
+        _check_weights("weights_on", spec["weights_on"])
+        _check_weights("weights_off", spec["weights_off"])
+    elif strategy_type == "regime":
+        if not isinstance(spec["regime"], str):
+            raise ValueError("'regime' must be a regime id")
+        if not isinstance(spec["weights"], dict) or not spec["weights"]:
+            raise ValueError("'weights' must map regime states to weights")
+        for state, weights in spec["weights"].items():
+            _check_weights(f"weights.{state}", weights)
+        _check_weights("default", spec["default"])
+    else:
+        universe = spec["universe"]
+        if not isinstance(universe, list) or not universe or not all(isinstance(a, str) for a in universe):
+            raise ValueError("'universe' must be a non-empty list of tickers")
+        for key in ("lookback", "top_n"):
+            if not _is_number(spec[key]) or spec[key] < 1 or spec[key] != int(spec[key]):
+                raise ValueError(f"'{key}' must be a positive integer")
+        if not _is_number(spec.get("direction", 1)):
+            raise ValueError("'direction' must be 1 (momentum) or -1 (mean reversion)")
+
+
+def prepare_prices(
+    prices: pd.DataFrame,
+    assets: List[str],
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None
+) -> pd.DataFrame:
+    """
+    Price matrix of a strategy's assets on every date any of them trades,
+    carried forward over holidays and cut to the dates all of them have a price.
+    """
+    frame = prices.reindex(columns=[a for a in assets if a != CASH]).sort_index()
+    frame = frame.dropna(how="all").ffill()
+    if CASH in assets:
+        frame[CASH] = 1.0
+    frame = frame.dropna()
+    if start is not None:
+        frame = frame[frame.index >= pd.Timestamp(start)]
+    if end is not None:
+        frame = frame[frame.index <= pd.Timestamp(end)]
+    return frame
+
+
+def rebalance_dates(index: pd.DatetimeIndex, rebalance: str) -> pd.DatetimeIndex:
+    """First date plus the last trading day of every period"""
+    if rebalance not in REBALANCE_FREQUENCIES:
+        raise ValueError(f"rebalance must be one of {REBALANCE_FREQUENCIES}")
+    if rebalance == "none":
+        return index[:1]
+    period_ends = index.to_series().groupby(index.to_period(rebalance)).max()
+    return index[:1].union(pd.DatetimeIndex(period_ends.to_numpy()))
+
+
+def _lagged_state(series: pd.Series, index: pd.DatetimeIndex) -> pd.Series:
+    """A signal as known on each trading date, acted on at the next close"""
+    series = series.dropna().sort_index()
+    return series.reindex(index.union(series.index)).ffill().reindex(index).shift(1)
+
+
+def target_weights(
+    spec: dict,
+    prices: pd.DataFrame,
+    signals: Optional[pd.DataFrame] = None,
+    regimes: Optional[Dict[str, pd.Series]] = None
+) -> pd.DataFrame:
+    """
+    Target-weight table of a strategy over a prepared price matrix
+    (index = rebalance dates, columns = prices.columns).
+    """
+    index, assets = prices.index, prices.columns
+    scheduled = rebalance_dates(index, spec.get("rebalance", "M"))
+
+    def row(weights: Dict[str, float]) -> np.ndarray:
+        weights = _normalize(weights)
+        return np.array([weights.get(asset, 0.0) for asset in assets])
+
+    strategy_type = spec["type"]
+    if strategy_type == "static":
+        return pd.DataFrame([row(spec["weights"])] * len(scheduled), index=scheduled, columns=assets)
+
+    if strategy_type in ("signal", "regime"):
+        if strategy_type == "signal":
+            if signals is None or spec["signal"] not in signals.columns:
+                raise ValueError(f"No data for signal '{spec['signal']}'")
+            observed = _lagged_state(signals[spec["signal"]], index)
+            if spec.get("direction", "above") == "below":
+                on = observed < spec["threshold"]
+            else:
+                on = observed > spec["threshold"]
+            state = on.where(observed.notna()).map({True: "on", False: "off"})
+            rows = {"on": row(spec["weights_on"]), "off": row(spec["weights_off"])}
+            default = rows["off"]
+        else:
+            if not regimes or spec["regime"] not in regimes:
+                raise ValueError(f"No timeline for regime '{spec['regime']}'")
+            state = _lagged_state(regimes[spec["regime"]], index)
+            rows = {name: row(weights) for name, weights in spec["weights"].items()}
+            default = row(spec["default"])
+
+        codes = state.map({name: i for i, name in enumerate(rows)}).fillna(-1).astype(int).to_numpy()
+        daily = np.vstack(list(rows.values()) + [default])[codes]
+        # Trade on schedule and whenever the target changes
+        changed = np.concatenate([[True], (daily[1:] != daily[:-1]).any(axis=1)])
+        dates = scheduled.union(index[changed])
+        return pd.DataFrame(daily[index.get_indexer(dates)], index=dates, columns=assets)
+
+    if strategy_type == "momentum":
+        lookback, top_n = int(spec["lookback"]), int(spec["top_n"])
+        trailing = (prices / prices.shift(lookback) - 1).loc[scheduled].to_numpy()
+        # Highest trailing return first (lowest for mean reversion); equal weight
+        # across the universe until a full lookback is available
+        ranks = (-np.sign(spec.get("direction", 1)) * trailing).argsort(axis=1).argsort(axis=1)
+        chosen = np.where(np.isnan(trailing).any(axis=1)[:, None], True, ranks < top_n)
+        weights = chosen / chosen.sum(axis=1, keepdims=True)
+        return pd.DataFrame(weights, index=scheduled, columns=assets)
+
+    raise ValueError(f"Unknown strategy type '{strategy_type}'")
+
+
+def simulate(prices: pd.DataFrame, targets: pd.DataFrame, cost_bps: float = 0.0) -> Tuple[pd.Series, pd.Series]:
+    """
+    Portfolio value (starting at 1) on every date of `prices`, rebalanced to
+    each row of `targets` at that date's close and drifting in between.
+    cost_bps: charged on turnover (sum of absolute weight changes) at each
+    rebalance after the first.
+    Returns (equity, turnover per rebalance).
+    """
+    growth = prices[targets.columns].to_numpy(dtype=float)
+    weights = targets.to_numpy(dtype=float)
+    rebalance_rows = prices.index.get_indexer(targets.index)
+    if rebalance_rows[0] != 0 or (rebalance_rows < 0).any():
+        raise ValueError("Rebalance dates must be dates of the price matrix, starting on the first")
+
+    # Last rebalance strictly before each day, and growth since then
+    days = np.arange(len(growth))
+    segment = np.searchsorted(rebalance_rows, days, side="left") - 1
+    anchor = np.clip(segment, 0, None)
+    since_rebalance = (weights[anchor] * growth / growth[rebalance_rows[anchor]]).sum(axis=1)
+    since_rebalance[segment < 0] = 1.0
+
+    # Weights drifted to the close of each rebalance, then the trade back to target
+    segment_growth = since_rebalance[rebalance_rows[1:]]
+    drifted = (
+        weights[:-1] * growth[rebalance_rows[1:]] / growth[rebalance_rows[:-1]]
+        / segment_growth[:, None]
+    )
+    turnover = np.abs(weights[1:] - drifted).sum(axis=1)
+    value_at_rebalance = np.concatenate([[1.0], np.cumprod(segment_growth * (1 - cost_bps / 10000 * turnover))])
+
+    equity = value_at_rebalance[anchor] * since_rebalance
+    equity[segment < 0] = 1.0
+    equity[rebalance_rows] = value_at_rebalance
+    return (
+        pd.Series(equity, index=prices.index),
+        pd.Series(np.concatenate([[0.0], turnover]), index=targets.index),
+    )
+
+
+def run_backtest(
+    spec: dict,
+    prices: pd.DataFrame,
+    signals: Optional[pd.DataFrame] = None,
+    regimes: Optional[Dict[str, pd.Series]] = None,
+    cost_bps: float = 0.0,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Run one strategy. prices/signals: wide frames (index = timestamp, one
+    column per series); regimes: regime id -> state label series.
+    Returns {"equity": Series, "turnover": Series, "targets": DataFrame}.
+    """
+    assets = strategy_assets(spec)
+    missing = [asset for asset in assets if asset != CASH and asset not in prices.columns]
+    if missing:
+        raise ValueError(f"No price data for {missing}")
+    frame = prepare_prices(prices, assets, start, end)
+    if len(frame) < 2:
+        raise ValueError("Not enough overlapping price history for this strategy")
+    targets = target_weights(spec, frame, signals, regimes)
+    equity, turnover = simulate(frame, targets, cost_bps)
+    return {"equity": equity, "turnover": turnover, "targets": targets}
+
+
+def backtest_statistics(
+    equity: pd.DataFrame,
+    turnover: Dict[str, pd.Series],
+    risk_free: float = 0.0
+) -> pd.DataFrame:
+    """BACKTEST_STATISTICS for every equity curve (one column per run)"""
+    stats = risk_statistics(equity, {column: "return" for column in equity.columns}, risk_free)
+    stats = stats.rename(columns={"total_change": "total_return"})
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stats["calmar"] = stats["annual_return"] / stats["max_drawdown"].abs()
+    years = (stats["end"] - stats["start"]).dt.days / 365.25
+    stats["annual_turnover"] = pd.Series({c: turnover[c].sum() for c in stats.index}) / years * 100
+    stats["rebalances"] = pd.Series({c: len(turnover[c]) for c in stats.index})
+    return stats[BACKTEST_STATISTICS]
+
+
+def expand_grid(spec: dict, grid: Dict[str, list]) -> List[dict]:
+    """One spec per combination of the grid's parameter values"""
+    keys = list(grid)
+    return [{**spec, **dict(zip(keys, values))} for values in itertools.product(*(grid[k] for k in keys))]
+
+
+_sweep_inputs: dict = {}
+
+
+def _init_sweep(prices, signals, regimes, cost_bps, start, end, risk_free):
+    _sweep_inputs.update(
+        prices=prices, signals=signals, regimes=regimes,
+        cost_bps=cost_bps, start=start, end=end, risk_free=risk_free,
+    )
+
+
+def _run_chunk(numbered_specs: List[Tuple[int, dict]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Backtest a slice of a sweep; returns (statistics, weekly equity) keyed by run number"""
+    inputs = _sweep_inputs
+    curves, turnover, failed = {}, {}, []
+    for number, spec in numbered_specs:
+        try:
+            result = run_backtest(
+                spec, inputs["prices"], inputs["signals"], inputs["regimes"],
+                inputs["cost_bps"], inputs["start"], inputs["end"]
+            )
+        except ValueError:
+            failed.append(number)
+            continue
+        curves[number] = result["equity"]
+        turnover[number] = result["turnover"]
+
+    if not curves:
+        return pd.DataFrame(columns=BACKTEST_STATISTICS, index=pd.Index(failed)), pd.DataFrame()
+    equity = pd.DataFrame(curves)
+    stats = backtest_statistics(equity, turnover, inputs["risk_free"])
+    return stats.reindex(list(stats.index) + failed), equity.resample("W").last().astype("float32")
+
+
+def run_sweep(
+    spec: dict,
+    grid: Dict[str, list],
+    prices: pd.DataFrame,
+    signals: Optional[pd.DataFrame] = None,
+    regimes: Optional[Dict[str, pd.Series]] = None,
+    cost_bps: float = 0.0,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    risk_free: float = 0.0,
+    workers: Optional[int] = None
+) -> Tuple[List[dict], pd.DataFrame, pd.DataFrame]:
+    """
+    Backtest every combination of `grid` over `spec`, chunked across a
+    process pool (the input frames are sent to each worker once).
+    Returns (specs, statistics indexed by run number, weekly equity curves
+    with one column per run). Combinations that cannot run get NaN statistics.
+    """
+    specs = expand_grid(spec, grid)
+    numbered = list(enumerate(specs))
+    workers = workers or min(os.cpu_count() or 1, 8)
+    inputs = (prices, signals, regimes, cost_bps, start, end, risk_free)
+
+    if workers <= 1 or len(specs) < SWEEP_PARALLEL_MIN:
+        _init_sweep(*inputs)
+        results = [_run_chunk(numbered)]
+    else:
+        chunk_size = -(-len(numbered) // (workers * 4))
+        chunks = [numbered[i:i + chunk_size] for i in range(0, len(numbered), chunk_size)]
+        # Spawned workers only import this module's pure dependencies, never the web app
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_sweep, initargs=inputs) as pool:
+            results = list(pool.map(_run_chunk, chunks))
+
+    stats = pd.concat([r[0] for r in results]).sort_index()
+    curves = [r[1] for r in results if not r[1].empty]
+    equity = pd.concat(curves, axis=1).sort_index(axis=1) if curves else pd.DataFrame()
+    return specs, stats, equity
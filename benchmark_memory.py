@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+API Memory Benchmark
+
+Measures what single requests cost in memory: peak RSS growth of the
+process while serving the request, plus the peak Python heap during the
+request and what stays allocated after it (tracemalloc). Every endpoint is
+measured in a fresh process so earlier requests' arenas and caches don't
+hide the growth; requests go through the ASGI app in-process (no server,
+no sockets).
+
+    python benchmark_memory.py --years 30 --output after.json
+    git worktree add ../baseline HEAD~1
+    python benchmark_memory.py --no-seed --app-dir ../baseline --output before.json
+    python benchmark_memory.py --no-seed --baseline before.json              # side by side
+
+--app-dir imports main.py from another checkout, so the same endpoints can
+be measured before and after a change against the same database. The
+database is wiped and reseeded (like benchmark_api.py) unless --no-seed is
+given. Peak RSS uses /proc/self/clear_refs to reset the kernel's high-water
+mark (Linux); elsewhere it falls back to ru_maxrss, which can only grow.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from benchmark_api import BENCHMARK_ENDPOINTS, DEFAULT_DATABASE_URL
+
+# The read paths whose memory matters; any BENCHMARK_ENDPOINTS name may be chosen
+MEMORY_ENDPOINTS = [
+    "timeseries_daily_1y", "timeseries_daily_full", "timeseries_weekly_full",
+    "timeseries_monthly_full", "batch_timeseries",
+]
+
+
+def _status_kb(field: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_kb() -> int:
+    peak = _status_kb("VmHWM")
+    if peak is None:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak //= 1024
+    return peak
+
+
+def measure_in_process(path: str) -> dict:
+    """Child side: serve `path` once for RSS, once more under tracemalloc"""
+    import gc
+    import time
+    import tracemalloc
+    from fastapi.testclient import TestClient
+    sys.path.insert(0, os.getcwd())  # main from --app-dir, not from this script's directory
+    import main
+
+    client = TestClient(main.app)
+    # Load every code path the request touches (imports, metadata, pools) on a one-point request first
+    if "limit=" in path:
+        warmup = re.sub(r"limit=\d+", "limit=1", path)
+    else:
+        warmup = path + ("&" if "?" in path else "?") + "limit=1"
+    client.get(warmup)
+    gc.collect()
+
+    rss_before = _status_kb("VmRSS") or 0
+    exact = _reset_peak_rss()
+    peak_before = _peak_rss_kb()
+    started = time.perf_counter()
+    response = client.get(path)
+    elapsed = time.perf_counter() - started
+    peak_after = _peak_rss_kb()
+    del response
+    gc.collect()
+
+    tracemalloc.start()
+    response = client.get(path)
+    status, size = response.status_code, len(response.content)
+    del response
+    gc.collect()
+    heap_retained, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "path": path,
+        "status": status,
+        "response_bytes": size,
+        "ms": round(elapsed * 1000, 2),
+        "rss_before_mb": round(rss_before / 1024, 1),
+        "peak_rss_growth_mb": round(max(peak_after - max(peak_before, rss_before), 0) / 1024, 2),
+        "peak_rss_exact": exact,
+        "python_heap_peak_mb": round(heap_peak / 2**20, 2),
+        "python_heap_retained_mb": round(heap_retained / 2**20, 2),
+    }
+
+
+def measure(app_dir: str, database_url: str, path: str) -> dict:
+    """Run measure_in_process for one path in a fresh interpreter importing main from app_dir"""
+    env = {**os.environ, "DATABASE_URL": database_url, "PYTHONPATH": os.path.abspath(app_dir)}
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", path],
+        cwd=app_dir, env=env, capture_output=True, text=True, timeout=600,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Measuring {path} failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict]) -> Dict[str, dict]:
+    """Before/after of the main figures per endpoint"""
+    fields = ("peak_rss_growth_mb", "python_heap_peak_mb", "ms")
+    return {
+        name: {field: {"before": baseline[name][field], "after": current[field]} for field in fields}
+        for name, current in results.items() if name in baseline
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL, help="Database to seed and read (wiped!)")
+    parser.add_argument("--years", type=float, default=30, help="History length of every synthetic series")
+    parser.add_argument("--no-seed", action="store_true", help="Measure against the database as it is")
+    parser.add_argument("--app-dir", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="Checkout whose main.py serves the requests (default: this one)")
+    parser.add_argument("--endpoints", nargs="+", choices=list(BENCHMARK_ENDPOINTS), default=MEMORY_ENDPOINTS)
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="Earlier JSON report to show before/after against")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    # Children run in --app-dir, so relative SQLite paths must not move with them
+    if args.database_url.startswith("sqlite:///") and not args.database_url.startswith("sqlite:////"):
+        args.database_url = "sqlite:///" + os.path.abspath(args.database_url[len("sqlite:///"):])
+
+    if args.child:
+        print(json.dumps(measure_in_process(args.child)))
+        return 0
+
+    report = {
+        "config": {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "database": args.database_url.split("://")[0],
+            "years": None if args.no_seed else args.years,
+            "app_dir": os.path.abspath(args.app_dir),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+    }
+
+    if not args.no_seed:
+        # The app reads DATABASE_URL at import time
+        os.environ["DATABASE_URL"] = args.database_url
+        from main import engine
+        from synthetic_data import seed_database
+        print(f"Seeding {args.database_url} with {args.years:g} years...", file=sys.stderr)
+        report["seed"] = seed_database(engine, args.years, 1)
+        engine.dispose()
+
+    results = {}
+    for name in args.endpoints:
+        results[name] = r = measure(args.app_dir, args.database_url, BENCHMARK_ENDPOINTS[name])
+        print(f"{name:28s} RSS +{r['peak_rss_growth_mb']:7.2f} MB  heap peak {r['python_heap_peak_mb']:7.2f} MB  "
+              f"{r['ms']:8.2f} ms  {r['response_bytes']:9d} bytes", file=sys.stderr)
+    report["endpoints"] = results
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(results, json.load(f)["endpoints"])
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 1 if any(not 200 <= r["status"] < 300 for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
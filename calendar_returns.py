@@ -0,0 +1,119 @@
+"""
+Calendar Returns Engine
+
+Computes year/quarter/month/YTD returns for many series at once from a wide
+price frame (index = timestamp, one column per indicator). Everything is done
+in a single grouped, vectorized pass - no per-year boolean masks.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+# Period name -> pandas period frequency
+PERIODS = {
+    "year": "Y",
+    "quarter": "Q",
+    "month": "M",
+}
+
+
+def period_labels(index: pd.PeriodIndex, period: str) -> List[str]:
+    """Format period labels as they appear in the API ("2024", "2024Q3", "2024-07")"""
+    if period == "year":
+        return [str(p.year) for p in index]
+    if period == "quarter":
+        return [f"{p.year}Q{p.quarter}" for p in index]
+    return [p.strftime("%Y-%m") for p in index]
+
+
+def calendar_returns(prices: pd.DataFrame, period: str = "year") -> pd.DataFrame:
+    """
+    Compute period returns (%) for every column of a wide price frame.
+
+    Each period's return runs from the previous period's last close to this
+    period's last close. For the first period of a series (no prior close) the
+    first observation inside the period is used as the base, so partial first
+    years still show up.
+
+    Returns DataFrame indexed by PeriodIndex with one column per series.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period '{period}', expected one of {list(PERIODS)}")
+
+    if prices.empty:
+        return pd.DataFrame(columns=prices.columns)
+
+    prices = prices.sort_index()
+    grouped = prices.groupby(prices.index.to_period(PERIODS[period]))
+
+    # last()/first() skip NaN per column, so series with different start
+    # dates and trading calendars can share one stacked frame
+    last = grouped.last()
+    first = grouped.first()
+
+    # Previous period's close; fall back to this period's first observation
+    base = last.shift(1).where(last.shift(1).notna(), first)
+    base = base.where(base > 0)
+
+    returns = (last / base - 1) * 100
+    return returns.dropna(how="all")
+
+
+def ytd_returns(prices: pd.DataFrame, as_of: Optional[pd.Timestamp] = None) -> pd.Series:
+    """YTD return (%) per series - the current year's row of the annual table"""
+    if prices.empty:
+        return pd.Series(dtype=float)
+
+    annual = calendar_returns(prices, "year")
+    year = (as_of or prices.index.max()).year
+    matches = annual.index[annual.index.year == year]
+    if len(matches) == 0:
+        return pd.Series(np.nan, index=prices.columns)
+    return annual.loc[matches[0]]
+
+
+def return_statistics(returns: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summary statistics per series over a period-returns table.
+
+    Returns DataFrame indexed by series with columns:
+    [simple_avg, cagr, best, worst, periods]
+    CAGR is the geometric mean of the period growth factors.
+    """
+    if returns.empty:
+        return pd.DataFrame(columns=["simple_avg", "cagr", "best", "worst", "periods"])
+
+    counts = returns.count()
+    log_growth = np.log1p(returns / 100)
+    cagr = (np.exp(log_growth.mean()) - 1) * 100
+
+    stats = pd.DataFrame({
+        "simple_avg": returns.mean(),
+        "cagr": cagr,
+        "best": returns.max(),
+        "worst": returns.min(),
+        "periods": counts,
+    })
+    return stats[stats["periods"] > 0]
+
+
+def returns_to_dict(returns: pd.DataFrame, period: str, decimals: int = 2) -> Dict[str, Dict[str, Optional[float]]]:
+    """Convert a period-returns frame to {series_id: {label: value}} for JSON"""
+    labels = period_labels(returns.index, period)
+    rounded = returns.round(decimals)
+    output = {}
+    for column in rounded.columns:
+        values = rounded[column].to_numpy()
+        output[column] = {
+            label: (None if np.isnan(v) else float(v))
+            for label, v in zip(labels, values)
+        }
+    return output
+
+
+def stats_to_dict(stats: pd.DataFrame, decimals: int = 2) -> Dict[str, Dict[str, float]]:
+    """Convert a statistics frame to {series_id: {stat: value}} for JSON"""
+    rounded = stats.round(decimals)
+    rounded["periods"] = rounded["periods"].astype(int)
+    return rounded.to_dict(orient="index")
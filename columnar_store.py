@@ -0,0 +1,109 @@
+"""
+Columnar Analytics Store
+
+Optional read-only copy of `indicators` as one zstd Parquet file per series
+(indicator_id, timestamp, value) plus a manifest of the series version each
+file holds (the "count:latest:sum" tokens of main.series_versions, so
+tails rewritten in place are re-exported too). Enable with
+COLUMNAR_STORE_DIR; ingestion keeps it in sync after every run (see
+refresh_columnar_store), and `python columnar_store.py` rebuilds it.
+
+The database stays the system of record. Analytics endpoints read a wide
+frame from the store only when the manifest matches the database for every
+requested series, otherwise they fall back to SQL - a stale store is never
+served. Reads are vectorized Arrow scans with the time range pushed down,
+so wide, long-history loads (35-year sector heatmaps, all-pairs
+correlations) skip building Python row tuples entirely. The files are
+plain Parquet, so DuckDB or any Arrow tool can query the directory too:
+
+    SELECT indicator_id, max(value) FROM 'store/*.parquet' GROUP BY 1
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from series_files import SeriesFiles
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = pa.schema([
+    ("indicator_id", pa.string()),
+    ("timestamp", pa.timestamp("us")),
+    ("value", pa.float64()),
+])
+
+
+class ColumnarStore(SeriesFiles):
+    """Per-series Parquet files read as vectorized Arrow scans"""
+
+    SUFFIX = ".parquet"
+
+    def write_series(self, indicator_id: str, frame: pd.DataFrame):
+        table = pa.Table.from_pandas(
+            frame.assign(indicator_id=indicator_id)[SCHEMA.names], schema=SCHEMA, preserve_index=False
+        )
+        self._replace(self.path(indicator_id), lambda path: pq.write_table(table, path, compression="zstd"))
+
+    def read_long(
+        self,
+        indicator_ids: List[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Long frame [indicator_id, timestamp, value] sorted by indicator and time"""
+        paths = [self.path(i) for i in indicator_ids if os.path.exists(self.path(i))]
+        if not paths:
+            return pd.DataFrame(columns=SCHEMA.names)
+        condition = None
+        if start is not None:
+            condition = ds.field("timestamp") >= pa.scalar(pd.Timestamp(start), pa.timestamp("us"))
+        if end is not None:
+            upper = ds.field("timestamp") <= pa.scalar(pd.Timestamp(end), pa.timestamp("us"))
+            condition = upper if condition is None else condition & upper
+        table = ds.dataset(paths, schema=SCHEMA, format="parquet").to_table(filter=condition)
+        # Nanosecond timestamps like frames built from SQL rows
+        return table.sort_by([("indicator_id", "ascending"), ("timestamp", "ascending")]).to_pandas(
+            coerce_temporal_nanoseconds=True
+        )
+
+    def read_frame(
+        self,
+        indicator_ids: List[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Wide frame (index = timestamp, one float column per indicator), like main.load_series_frame"""
+        long_df = self.read_long(indicator_ids, start, end)
+        if long_df.empty:
+            return pd.DataFrame(columns=indicator_ids, dtype=float)
+        return long_df.pivot(index="timestamp", columns="indicator_id", values="value").sort_index()
+
+
+def refresh_columnar_store():
+    """Bring the store up to date in its own session (called after ingestion); no-op when disabled"""
+    from main import columnar_store, get_db_context
+
+    if columnar_store is None:
+        return
+    try:
+        with get_db_context() as db:
+            written = columnar_store.sync(db)
+        logger.info(f"Columnar store: {written} series rewritten")
+    except Exception as e:
+        logger.error(f"Columnar store sync failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    import sys
+    from main import settings
+    logging.basicConfig(level=logging.INFO)
+    if not settings.columnar_store_dir:
+        sys.exit("Set COLUMNAR_STORE_DIR to enable the columnar store")
+    refresh_columnar_store()
@@ -4,18 +4,17 @@ Interactive frontend for economic and market indicators
 """
 
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import numpy as np
-import os
 
-# Configuration - use environment variable for deployed version
-API_BASE = os.environ.get("API_BASE", "http://localhost:8000")
-if API_BASE and not API_BASE.startswith("http"):
-    API_BASE = f"https://{API_BASE}"
+# API access goes through the shared client (API_BASE env var, pooled
+# connections, batch endpoints and response caching)
+from data_loaders import fetch_api, get_client, get_inflation_decomposition
+import render_profiler
+
 st.set_page_config(
     page_title="Macro Dashboard",
     page_icon="📊",
@@ -791,18 +790,6 @@ def auto_refresh_component(interval_seconds: int, key: str = "auto_refresh"):
     )
 
 
-def fetch_api(endpoint, silent=False):
-    """Fetch data from API. Set silent=True to suppress error messages."""
-    try:
-        response = requests.get(f"{API_BASE}{endpoint}", timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        if not silent:
-            st.error(f"Error fetching data: {str(e)}")
-        return None
-
-
 # Common Plotly layout config - Design System v2.0
 # Colors from DESIGN_SYSTEM.md
 CHART_COLORS = [
@@ -858,59 +845,65 @@ PLOTLY_LAYOUT_DEFAULTS = dict(
 )
 
 
-def create_line_chart(data, title, y_label):
-    """Create a line chart with Design System v2.0 styling"""
-    df = pd.DataFrame(data['data'])
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df['timestamp'],
-        y=df['value'],
-        mode='lines',
-        name=data['name'],
-        line=dict(color=CHART_COLORS[0], width=2),  # Teal primary
-        fill='tozeroy',
-        fillcolor='rgba(20, 184, 166, 0.1)'  # Teal with 10% opacity
-    ))
-
-    fig.update_layout(
-        title=title,
-        xaxis_title="Date",
-        yaxis_title=y_label,
-        height=400,
-        **PLOTLY_LAYOUT_DEFAULTS
-    )
+# Long series rendering - WebGL above this many points, and never send more
+# points than a chart is wide (min/max pairs keep peaks and troughs visible)
+WEBGL_POINT_THRESHOLD = 5000
+MAX_CHART_POINTS = 2000
 
-    return fig
 
+def decimate_series(x, y, max_points=MAX_CHART_POINTS):
+    """
+    Min/max decimation to roughly the viewport resolution.
+    Splits the series into max_points // 2 buckets and keeps each bucket's
+    lowest and highest point, plus the first and last points.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return x, y
 
-def get_indicator_delta(indicator_id, days=30):
-    """Fetch historical data and calculate percentage change.
-    Uses 90-day window to ensure we have data for monthly indicators."""
-    try:
-        end = datetime.now()
-        # Use 90-day window to ensure we get data for monthly indicators
-        start = end - timedelta(days=90)
-        data = fetch_api(f"/api/indicators/{indicator_id}/timeseries?start={start.isoformat()}&limit=200", silent=True)
-        if data and data.get('data') and len(data['data']) >= 2:
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            # Sort by timestamp to ensure correct order
-            df = df.sort_values('timestamp')
-            if len(df) >= 2:
-                old_value = df.iloc[0]['value']
-                new_value = df.iloc[-1]['value']
-                if old_value != 0:
-                    pct_change = ((new_value - old_value) / abs(old_value)) * 100
-                    return round(pct_change, 2)
-    except:
-        pass
-    return None
-
-
-def create_metric_cards(indicators_data, show_delta=True):
-    """Create metric cards for indicators with optional delta values"""
+    n_buckets = max(1, max_points // 2)
+    bucket_size = int(np.ceil(n / n_buckets))
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+
+    offsets = np.arange(n_buckets) * bucket_size
+    lows = np.where(np.isnan(buckets), np.inf, buckets).argmin(axis=1) + offsets
+    highs = np.where(np.isnan(buckets), -np.inf, buckets).argmax(axis=1) + offsets
+
+    keep = np.unique(np.concatenate(([0, n - 1], lows, highs)))
+    keep = keep[keep < n]
+    return x[keep], y[keep]
+
+
+def line_trace(x=None, y=None, decimate=True, **kwargs):
+    """
+    Drop-in replacement for go.Scatter for time series traces.
+    Long line traces are decimated and rendered with WebGL (Scattergl),
+    including tozeroy/toself fills; short traces and traces with per-point
+    text/markers are not decimated. Stacked and tonext-filled traces stay
+    plain go.Scatter at full resolution: Scattergl has no stackgroup, and
+    they are drawn against the previous trace, whose x points decimating
+    each trace on its own would misalign.
+    """
+    n_points = len(x) if x is not None else 0
+    stacked = "stackgroup" in kwargs or str(kwargs.get("fill") or "").startswith("tonext")
+    if n_points <= WEBGL_POINT_THRESHOLD or stacked:
+        return go.Scatter(x=x, y=y, **kwargs)
+
+    per_point = any(k in kwargs for k in ("text", "customdata", "hovertext"))
+    if decimate and not per_point and "markers" not in kwargs.get("mode", "lines"):
+        x, y = decimate_series(x, y)
+
+    return go.Scattergl(x=x, y=y, **kwargs)
+
+
+def create_metric_cards(indicators_data, show_delta=True, horizon="30D"):
+    """Create metric cards for indicators with optional delta values.
+    Deltas are precomputed server-side (calendar based) and shipped with
+    the dashboard/latest payload, so a card row costs no extra requests."""
     cols = st.columns(len(indicators_data))
 
     for i, (indicator_id, info) in enumerate(indicators_data.items()):
@@ -929,7 +922,7 @@ def create_metric_cards(indicators_data, show_delta=True):
             delta = None
             delta_suffix = ""
             if show_delta:
-                delta = get_indicator_delta(indicator_id)
+                delta = ((info.get('deltas') or {}).get(horizon) or {}).get('pct_change')
                 if delta is not None:
                     delta_suffix = f"{delta:+.1f}%"
 
@@ -937,64 +930,23 @@ def create_metric_cards(indicators_data, show_delta=True):
                 label=info['name'],
                 value=display_value,
                 delta=delta_suffix if delta_suffix else None,
-                help=f"Unit: {info.get('unit', 'N/A')}\nLast updated: {info['timestamp'][:10]}\n30-day change shown"
+                help=f"Unit: {info.get('unit', 'N/A')}\nLast updated: {info['timestamp'][:10]}\n{horizon} change shown"
             )
 
 
-def calculate_change(df, days=30):
-    """Calculate percentage change over period"""
-    if len(df) < 2:
-        return 0
-    
-    recent = df.tail(days)
-    if len(recent) < 2:
-        return 0
-    
-    old_value = recent.iloc[0]['value']
-    new_value = recent.iloc[-1]['value']
-    
-    if old_value == 0:
-        return 0
-    
-    return ((new_value - old_value) / old_value) * 100
-
-
+@st.cache_data(ttl=300, show_spinner=False)
 def check_recession_signals():
-    """Check for key recession warning signals (uses silent mode to avoid error spam)"""
-    warnings = []
-
-    # Helper to safely get numeric value
-    def safe_value(data, default=0):
-        if data and data.get('latest_value') is not None:
-            return data['latest_value']
-        return default
-
-    # Check yield curve
-    yield_data = fetch_api("/api/indicators/T10Y2Y/latest", silent=True)
-    if safe_value(yield_data) < 0:
-        warnings.append(("Yield Curve Inverted", "The 10Y-2Y spread is negative - historically precedes recessions by 6-18 months"))
-
-    # Check VIX (try FRED version first, then Yahoo)
-    vix_data = fetch_api("/api/indicators/VIXCLS/latest", silent=True)
-    if not vix_data:
-        vix_data = fetch_api("/api/indicators/^VIX/latest", silent=True)
-    vix_val = safe_value(vix_data)
-    if vix_val > 30:
-        warnings.append(("High Volatility", f"VIX is {vix_val:.1f} - elevated market fear"))
-
-    # Check unemployment trend
-    unemp_data = fetch_api("/api/indicators/UNRATE/latest", silent=True)
-    unemp_val = safe_value(unemp_data)
-    if unemp_val > 5:
-        warnings.append(("Elevated Unemployment", f"Unemployment at {unemp_val:.1f}% - above historical average"))
-
-    # Check high yield spread (credit stress)
-    hy_data = fetch_api("/api/indicators/BAMLH0A0HYM2/latest", silent=True)
-    hy_val = safe_value(hy_data)
-    if hy_val > 5:
-        warnings.append(("Credit Stress", f"High yield spread at {hy_val:.2f}% - elevated credit risk"))
-
-    return warnings
+    """Get active warning signals. Rules are evaluated server-side at ingest
+    time, so this is one cheap request, cached between reruns."""
+    data = fetch_api("/api/signals", silent=True)
+    if not data:
+        return []
+
+    return [
+        (signal['title'], signal['message'])
+        for signal in data.get('signals', [])
+        if signal.get('severity') == 'warning'
+    ]
 
 
 def display_warning_banners():
@@ -1017,171 +969,172 @@ page = st.sidebar.radio(
     "Select View",
     ["Overview", "Sector Performance", "Yield Curve", "Liquidity", "Market Regime",
      "Inflation Monitor", "Recession Watch", "Market Overview", "Credit Spreads",
-     "Currency Monitor", "Commodities", "Global Markets", "Sentiment", "Custom Analysis", "FAQ"]
+     "Currency Monitor", "Commodities", "Global Markets", "Sentiment", "Strategy Backtest", "Custom Analysis", "FAQ"]
 )
-
-# Refresh button in sidebar
-st.sidebar.divider()
-st.sidebar.subheader("Data Management")
-
-# Initialize session state for auto-refresh
-if 'auto_refresh_enabled' not in st.session_state:
-    st.session_state.auto_refresh_enabled = False
-if 'last_fred_refresh' not in st.session_state:
-    st.session_state.last_fred_refresh = None
-if 'last_market_refresh' not in st.session_state:
-    st.session_state.last_market_refresh = None
-
-# Manual refresh buttons
-col1, col2 = st.sidebar.columns(2)
-with col1:
-    if st.button("⟳ FRED", use_container_width=True, help="Refresh FRED economic data"):
-        with st.spinner("Refreshing FRED..."):
-            try:
-                response = requests.post(f"{API_BASE}/api/refresh?source=fred", timeout=300)
-                if response.status_code == 200:
+# Tag API requests with the page so /metrics shows which dashboards drive load
+get_client().set_page(page)
+
+# Debug mode (?profile=1): time every section of this run, shown in the sidebar at the end
+profiler = render_profiler.begin(page)
+try:
+    # Refresh button in sidebar
+    st.sidebar.divider()
+    st.sidebar.subheader("Data Management")
+
+    # Initialize session state for auto-refresh
+    if 'auto_refresh_enabled' not in st.session_state:
+        st.session_state.auto_refresh_enabled = False
+    if 'last_fred_refresh' not in st.session_state:
+        st.session_state.last_fred_refresh = None
+    if 'last_market_refresh' not in st.session_state:
+        st.session_state.last_market_refresh = None
+
+    # Manual refresh buttons
+    col1, col2 = st.sidebar.columns(2)
+    with col1:
+        if st.button("⟳ FRED", use_container_width=True, help="Refresh FRED economic data"):
+            with st.spinner("Refreshing FRED..."):
+                try:
+                    get_client().refresh("fred")
+                    check_recession_signals.clear()
                     st.session_state.last_fred_refresh = datetime.now()
                     st.sidebar.success("FRED refreshed!")
                     st.rerun()
-                else:
-                    st.sidebar.error("Refresh failed")
-            except Exception as e:
-                st.sidebar.error(f"Error: {str(e)}")
+                except Exception as e:
+                    st.sidebar.error(f"Refresh failed: {str(e)}")
 
-with col2:
-    if st.button("⟳ Market", use_container_width=True, help="Refresh market price data"):
-        with st.spinner("Refreshing Market..."):
-            try:
-                response = requests.post(f"{API_BASE}/api/refresh?source=market", timeout=300)
-                if response.status_code == 200:
+    with col2:
+        if st.button("⟳ Market", use_container_width=True, help="Refresh market price data"):
+            with st.spinner("Refreshing Market..."):
+                try:
+                    get_client().refresh("market")
+                    check_recession_signals.clear()
                     st.session_state.last_market_refresh = datetime.now()
                     st.sidebar.success("Market refreshed!")
                     st.rerun()
-                else:
-                    st.sidebar.error("Refresh failed")
-            except Exception as e:
-                st.sidebar.error(f"Error: {str(e)}")
+                except Exception as e:
+                    st.sidebar.error(f"Refresh failed: {str(e)}")
 
-# Auto-refresh settings
-st.sidebar.divider()
-st.sidebar.subheader("Auto-Refresh")
+    # Auto-refresh settings
+    st.sidebar.divider()
+    st.sidebar.subheader("Auto-Refresh")
 
-auto_refresh = st.sidebar.toggle("Enable Auto-Refresh", value=st.session_state.auto_refresh_enabled, key="auto_refresh_toggle")
-st.session_state.auto_refresh_enabled = auto_refresh
+    auto_refresh = st.sidebar.toggle("Enable Auto-Refresh", value=st.session_state.auto_refresh_enabled, key="auto_refresh_toggle")
+    st.session_state.auto_refresh_enabled = auto_refresh
 
-if auto_refresh:
-    col1, col2 = st.sidebar.columns(2)
-    with col1:
-        fred_interval = st.selectbox(
-            "FRED Interval",
-            options=[15, 30, 60, 120],
-            index=2,
-            format_func=lambda x: f"{x} min",
-            key="fred_interval",
-            help="FRED data updates infrequently (daily/weekly/monthly)"
-        )
-    with col2:
-        market_interval = st.selectbox(
-            "Market Interval",
-            options=[5, 10, 15, 30, 60],
-            index=2,
-            format_func=lambda x: f"{x} min",
-            key="market_interval",
-            help="Market data can update more frequently"
-        )
+    if auto_refresh:
+        col1, col2 = st.sidebar.columns(2)
+        with col1:
+            fred_interval = st.selectbox(
+                "FRED Interval",
+                options=[15, 30, 60, 120],
+                index=2,
+                format_func=lambda x: f"{x} min",
+                key="fred_interval",
+                help="FRED data updates infrequently (daily/weekly/monthly)"
+            )
+        with col2:
+            market_interval = st.selectbox(
+                "Market Interval",
+                options=[5, 10, 15, 30, 60],
+                index=2,
+                format_func=lambda x: f"{x} min",
+                key="market_interval",
+                help="Market data can update more frequently"
+            )
 
-    # Check if refresh is needed
-    now = datetime.now()
+        # Check if refresh is needed
+        now = datetime.now()
 
-    # FRED auto-refresh check
-    fred_needs_refresh = False
-    if st.session_state.last_fred_refresh is None:
-        fred_needs_refresh = True
-    else:
-        fred_elapsed = (now - st.session_state.last_fred_refresh).total_seconds() / 60
-        if fred_elapsed >= fred_interval:
+        # FRED auto-refresh check
+        fred_needs_refresh = False
+        if st.session_state.last_fred_refresh is None:
             fred_needs_refresh = True
+        else:
+            fred_elapsed = (now - st.session_state.last_fred_refresh).total_seconds() / 60
+            if fred_elapsed >= fred_interval:
+                fred_needs_refresh = True
 
-    # Market auto-refresh check
-    market_needs_refresh = False
-    if st.session_state.last_market_refresh is None:
-        market_needs_refresh = True
-    else:
-        market_elapsed = (now - st.session_state.last_market_refresh).total_seconds() / 60
-        if market_elapsed >= market_interval:
+        # Market auto-refresh check
+        market_needs_refresh = False
+        if st.session_state.last_market_refresh is None:
             market_needs_refresh = True
+        else:
+            market_elapsed = (now - st.session_state.last_market_refresh).total_seconds() / 60
+            if market_elapsed >= market_interval:
+                market_needs_refresh = True
 
-    # Perform auto-refresh if needed
-    if fred_needs_refresh or market_needs_refresh:
-        refresh_status = st.sidebar.empty()
+        # Perform auto-refresh if needed
+        if fred_needs_refresh or market_needs_refresh:
+            refresh_status = st.sidebar.empty()
 
-        if fred_needs_refresh:
-            refresh_status.info("Auto-refreshing FRED data...")
-            try:
-                response = requests.post(f"{API_BASE}/api/refresh?source=fred", timeout=300)
-                if response.status_code == 200:
+            if fred_needs_refresh:
+                refresh_status.info("Auto-refreshing FRED data...")
+                try:
+                    get_client().refresh("fred")
+                    check_recession_signals.clear()
                     st.session_state.last_fred_refresh = now
-            except:
-                pass
-
-        if market_needs_refresh:
-            refresh_status.info("Auto-refreshing Market data...")
-            try:
-                response = requests.post(f"{API_BASE}/api/refresh?source=market", timeout=300)
-                if response.status_code == 200:
+                except:
+                    pass
+
+            if market_needs_refresh:
+                refresh_status.info("Auto-refreshing Market data...")
+                try:
+                    get_client().refresh("market")
+                    check_recession_signals.clear()
                     st.session_state.last_market_refresh = now
-            except:
-                pass
+                except:
+                    pass
 
-        refresh_status.empty()
-        if fred_needs_refresh or market_needs_refresh:
-            st.rerun()
+            refresh_status.empty()
+            if fred_needs_refresh or market_needs_refresh:
+                st.rerun()
 
-    # Display next refresh countdown
-    st.sidebar.caption("**Next refresh:**")
-    col1, col2 = st.sidebar.columns(2)
+        # Display next refresh countdown
+        st.sidebar.caption("**Next refresh:**")
+        col1, col2 = st.sidebar.columns(2)
 
-    with col1:
-        if st.session_state.last_fred_refresh:
-            fred_next = fred_interval - int((now - st.session_state.last_fred_refresh).total_seconds() / 60)
-            fred_next = max(0, fred_next)
-            st.caption(f"FRED: {fred_next} min")
-        else:
-            st.caption("FRED: Now")
+        with col1:
+            if st.session_state.last_fred_refresh:
+                fred_next = fred_interval - int((now - st.session_state.last_fred_refresh).total_seconds() / 60)
+                fred_next = max(0, fred_next)
+                st.caption(f"FRED: {fred_next} min")
+            else:
+                st.caption("FRED: Now")
 
-    with col2:
+        with col2:
+            if st.session_state.last_market_refresh:
+                market_next = market_interval - int((now - st.session_state.last_market_refresh).total_seconds() / 60)
+                market_next = max(0, market_next)
+                st.caption(f"Market: {market_next} min")
+            else:
+                st.caption("Market: Now")
+
+        # Calculate the minimum refresh interval and trigger page refresh
+        min_interval = min(fred_interval, market_interval)
+        auto_refresh_component(min_interval * 60, key="dashboard_auto_refresh")
+        st.sidebar.caption(f"_Page refreshes every {min_interval} min_")
+
+    # Live data indicator in sidebar
+    st.sidebar.divider()
+    last_update = datetime.now().strftime("%H:%M")
+    st.sidebar.markdown(live_indicator(last_update), unsafe_allow_html=True)
+
+    # Show last refresh times if available
+    if st.session_state.last_fred_refresh or st.session_state.last_market_refresh:
+        refresh_info = []
+        if st.session_state.last_fred_refresh:
+            refresh_info.append(f"FRED: {st.session_state.last_fred_refresh.strftime('%H:%M')}")
         if st.session_state.last_market_refresh:
-            market_next = market_interval - int((now - st.session_state.last_market_refresh).total_seconds() / 60)
-            market_next = max(0, market_next)
-            st.caption(f"Market: {market_next} min")
-        else:
-            st.caption("Market: Now")
-
-    # Calculate the minimum refresh interval and trigger page refresh
-    min_interval = min(fred_interval, market_interval)
-    auto_refresh_component(min_interval * 60, key="dashboard_auto_refresh")
-    st.sidebar.caption(f"_Page refreshes every {min_interval} min_")
-
-# Live data indicator in sidebar
-st.sidebar.divider()
-last_update = datetime.now().strftime("%H:%M")
-st.sidebar.markdown(live_indicator(last_update), unsafe_allow_html=True)
-
-# Show last refresh times if available
-if st.session_state.last_fred_refresh or st.session_state.last_market_refresh:
-    refresh_info = []
-    if st.session_state.last_fred_refresh:
-        refresh_info.append(f"FRED: {st.session_state.last_fred_refresh.strftime('%H:%M')}")
-    if st.session_state.last_market_refresh:
-        refresh_info.append(f"Market: {st.session_state.last_market_refresh.strftime('%H:%M')}")
-    st.sidebar.caption(f"Last refresh: {' | '.join(refresh_info)}")
-
-# Page: Overview
-if page == "Overview":
-    st.header("Dashboard Overview")
-
-    # Comprehensive introduction
-    st.markdown("""
+            refresh_info.append(f"Market: {st.session_state.last_market_refresh.strftime('%H:%M')}")
+        st.sidebar.caption(f"Last refresh: {' | '.join(refresh_info)}")
+
+    # Page: Overview
+    if page == "Overview":
+        st.header("Dashboard Overview")
+
+        # Comprehensive introduction
+        st.markdown("""
     ### Your Command Center for Macro-Economic Analysis
 
     This dashboard aggregates the most important economic and market indicators that professional investors, portfolio managers,
@@ -1205,94 +1158,188 @@ if page == "Overview":
     detailed charts for stocks and crypto. Each dashboard includes comprehensive explanations to help you interpret the data.
     """)
 
-    # Warning banners at top
-    display_warning_banners()
+        # Warning banners at top
+        display_warning_banners()
 
-    # Health check
-    health = fetch_api("/health")
-    if health:
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Status", "✅ Healthy" if health['status'] == 'healthy' else "❌ Unhealthy")
-        with col2:
-            st.metric("Database", health.get('database', 'N/A'))
-        with col3:
-            st.metric("Total Indicators", health.get('total_indicators', 0))
+        # Health check
+        health = fetch_api("/health")
+        if health:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Status", "✅ Healthy" if health['status'] == 'healthy' else "❌ Unhealthy")
+            with col2:
+                st.metric("Database", health.get('database', 'N/A'))
+            with col3:
+                st.metric("Total Indicators", health.get('total_indicators', 0))
 
-    st.divider()
+            try:
+                status = get_client().status()
+            except Exception:
+                status = None
+            if status and status.get("stale"):
+                stale = status["stale"]
+                with st.expander(f"⚠️ {len(stale)} series look stale"):
+                    st.caption("Newest point is older than twice the series' usual spacing plus a week. "
+                               f"Snapshot from {str(status.get('stats_updated_at') or 'n/a')[:16]}.")
+                    st.dataframe(pd.DataFrame([
+                        {"Series": i, "Source": status["indicators"][i]["source"],
+                         "Latest": str(status["indicators"][i]["latest_timestamp"])[:10],
+                         "Age (days)": status["indicators"][i]["age_days"],
+                         "Stale after (days)": status["indicators"][i]["stale_after_days"]}
+                        for i in stale
+                    ]), use_container_width=True, hide_index=True)
+                for source, run in status.get("last_refresh", {}).items():
+                    if run.get("failed"):
+                        st.caption(f"Last {source} refresh: {run['failed']} of {run['series']} series failed")
 
-    # Key metrics from both dashboards
-    st.subheader("Key Economic Indicators")
-    st.caption("**Yield Spread**: Difference between 10Y and 2Y Treasury rates (negative = inverted, recession signal). "
-               "**Unemployment**: % of labor force without jobs. **Industrial Production**: Index where 100 = 2017 output levels. "
-               "**Housing Starts**: New residential construction in thousands of units/year. **Consumer Sentiment**: Survey index (100 = 1966 baseline).")
-    recession_data = fetch_api("/api/dashboards/recession-watch")
-    if recession_data:
-        create_metric_cards(recession_data['indicators'])
+        st.divider()
 
-    st.divider()
+        # Key metrics from both dashboards
+        st.subheader("Key Economic Indicators")
+        st.caption("**Yield Spread**: Difference between 10Y and 2Y Treasury rates (negative = inverted, recession signal). "
+                   "**Unemployment**: % of labor force without jobs. **Industrial Production**: Index where 100 = 2017 output levels. "
+                   "**Housing Starts**: New residential construction in thousands of units/year. **Consumer Sentiment**: Survey index (100 = 1966 baseline).")
+        recession_data = fetch_api("/api/dashboards/recession-watch")
+        if recession_data:
+            create_metric_cards(recession_data['indicators'])
 
-    st.subheader("Key Market Indicators")
-    st.caption("Current prices for major indices and assets. Delta shows 30-day percentage change.")
-    market_data = fetch_api("/api/dashboards/market-overview")
-    if market_data:
-        create_metric_cards(market_data['indicators'])
+        st.divider()
 
-    st.divider()
+        st.subheader("Key Market Indicators")
+        st.caption("Current prices for major indices and assets. Delta shows 30-day percentage change.")
+        market_data = fetch_api("/api/dashboards/market-overview")
+        if market_data:
+            create_metric_cards(market_data['indicators'])
 
-    # Trailing 1-Year Major Assets Comparison
-    st.subheader("Major Assets - Trailing 1 Year")
-    start_date = datetime.now() - timedelta(days=365)
+        st.divider()
 
-    # Fetch multiple assets
-    assets = [
-        ("^GSPC", "S&P 500", "#14b8a6"),
-        ("^IXIC", "Nasdaq", "#8b5cf6"),
-        ("^DJI", "Dow Jones", "#F6AD55"),
-        ("BTC-USD", "Bitcoin", "#B794F4")
-    ]
+        # Historical percentile of every indicator
+        st.subheader("Macro Heatmap - Where Is Each Indicator vs Its History?")
+        st.caption("Percentile of each indicator's latest value within its full history and the last 10 and 5 years "
+                   "(0 = lowest ever seen, 100 = highest). Hover for the value and z-score. Rather than fixed thresholds, "
+                   "this shows whether a reading is actually unusual for that series.")
+        try:
+            heatmap = get_client().heatmap()
+        except Exception:
+            heatmap = pd.DataFrame()
+
+        if not heatmap.empty:
+            categories = sorted(heatmap['category'].dropna().unique())
+            selected = st.multiselect("Categories", categories, default=categories, key="heatmap_categories")
+            heatmap = heatmap[heatmap['category'].isin(selected)]
+
+        if not heatmap.empty:
+            lookbacks = [("full", "Full History"), ("10y", "10 Years"), ("5y", "5 Years")]
+            percentiles = heatmap[[f"percentile_{lb}" for lb, _ in lookbacks]].to_numpy(dtype=float)
+            z_scores = heatmap[[f"z_score_{lb}" for lb, _ in lookbacks]].to_numpy(dtype=float)
+            labels = [f"{row['name']} ({indicator_id})" for indicator_id, row in heatmap.iterrows()]
+            hover = [
+                [f"{label}<br>Value: {value:,.2f}<br>Percentile: {p:.0f}<br>Z-score: {z:+.2f}"
+                 if pd.notna(p) and pd.notna(z) else label
+                 for p, z in zip(p_row, z_row)]
+                for label, value, p_row, z_row in zip(labels, heatmap['value'], percentiles, z_scores)
+            ]
+
+            fig = go.Figure(data=go.Heatmap(
+                z=percentiles,
+                x=[title for _, title in lookbacks],
+                y=labels,
+                zmin=0,
+                zmax=100,
+                colorscale=[
+                    [0, '#3b82f6'],      # Blue for historic lows
+                    [0.5, '#1A1F2E'],    # Dark for typical readings
+                    [1, '#ef4444']       # Red for historic highs
+                ],
+                text=[[f"{p:.0f}" if pd.notna(p) else "" for p in row] for row in percentiles],
+                texttemplate="%{text}",
+                textfont={"size": 10, "color": "white"},
+                customdata=hover,
+                hovertemplate="%{customdata}<extra></extra>",
+                hoverongaps=False,
+                colorbar=dict(title="Percentile")
+            ))
+            fig.update_layout(
+                template='plotly_dark',
+                height=max(400, len(labels) * 20),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                yaxis=dict(autorange='reversed'),
+                margin=dict(l=10, r=10, t=30, b=10)
+            )
+            st.plotly_chart(fig, use_container_width=True)
 
-    fig = go.Figure()
-    for symbol, name, color in assets:
-        data = fetch_api(f"/api/indicators/{symbol}/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-        if data and data.get('data') and len(data['data']) > 1:
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            # Normalize to percentage change from start
-            start_val = df.iloc[0]['value']
-            df['pct'] = ((df['value'] - start_val) / start_val) * 100
+            with st.expander("Historical extremes (10-year percentile at or beyond 10/90)"):
+                extremes = heatmap[(heatmap['percentile_10y'] >= 90) | (heatmap['percentile_10y'] <= 10)]
+                if extremes.empty:
+                    st.info("No indicator is at a 10-year extreme.")
+                else:
+                    st.dataframe(
+                        extremes[['name', 'category', 'value', 'percentile_10y', 'z_score_10y', 'percentile_full']]
+                        .sort_values('percentile_10y')
+                        .rename(columns={'name': 'Indicator', 'category': 'Category', 'value': 'Value',
+                                         'percentile_10y': '10Y Percentile', 'z_score_10y': '10Y Z-Score',
+                                         'percentile_full': 'Full Percentile'}),
+                        use_container_width=True
+                    )
+        else:
+            st.info("Ranking index not available yet - it is built after the next data refresh.")
 
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'],
-                y=df['pct'],
-                mode='lines',
-                name=name,
-                line=dict(color=color, width=2)
-            ))
+        st.divider()
 
-    fig.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Return (%)",
-        template='plotly_dark',
-        height=450,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(gridcolor='#2D3748'),
-        yaxis=dict(gridcolor='#2D3748'),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-        hovermode='x unified'
-    )
+        # Trailing 1-Year Major Assets Comparison
+        st.subheader("Major Assets - Trailing 1 Year")
+        start_date = datetime.now() - timedelta(days=365)
 
-    st.plotly_chart(fig, use_container_width=True)
-    st.caption("Chart shows normalized returns (% change from 1 year ago) to compare assets on equal footing.")
+        # Fetch multiple assets
+        assets = [
+            ("^GSPC", "S&P 500", "#14b8a6"),
+            ("^IXIC", "Nasdaq", "#8b5cf6"),
+            ("^DJI", "Dow Jones", "#F6AD55"),
+            ("BTC-USD", "Bitcoin", "#B794F4")
+        ]
 
-# Page: Sector Performance (Novel Investor style heatmap)
-elif page == "Sector Performance":
-    st.header("📊 S&P 500 Sector Performance")
+        fig = go.Figure()
+        for symbol, name, color in assets:
+            data = fetch_api(f"/api/indicators/{symbol}/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+            if data and data.get('data') and len(data['data']) > 1:
+                df = pd.DataFrame(data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                df = df.sort_values('timestamp')
+                # Normalize to percentage change from start
+                start_val = df.iloc[0]['value']
+                df['pct'] = ((df['value'] - start_val) / start_val) * 100
 
-    # Comprehensive explanation
-    st.markdown("""
+                fig.add_trace(line_trace(
+                    x=df['timestamp'],
+                    y=df['pct'],
+                    mode='lines',
+                    name=name,
+                    line=dict(color=color, width=2)
+                ))
+
+        fig.update_layout(
+            xaxis_title="Date",
+            yaxis_title="Return (%)",
+            template='plotly_dark',
+            height=450,
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            xaxis=dict(gridcolor='#2D3748'),
+            yaxis=dict(gridcolor='#2D3748'),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
+            hovermode='x unified'
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("Chart shows normalized returns (% change from 1 year ago) to compare assets on equal footing.")
+
+    # Page: Sector Performance (Novel Investor style heatmap)
+    elif page == "Sector Performance":
+        st.header("📊 S&P 500 Sector Performance")
+
+        # Comprehensive explanation
+        st.markdown("""
     ### Understanding Sector Rotation
 
     The S&P 500 is divided into 11 sectors, each representing a different segment of the economy. **Sector rotation**
@@ -1312,161 +1359,186 @@ elif page == "Sector Performance":
     as the index data is not available. Real Estate index begins in 2001 when it was split from Financials.*
     """)
 
-    # S&P 500 Sector Indices - using actual index data for longer history
-    # Format: (symbol, display_name)
-    sectors_config = [
-        ("^SP500-45", "Technology"),
-        ("^SP500-40", "Financials"),
-        ("XLE", "Energy"),  # Use ETF - index not available on Yahoo
-        ("^SP500-35", "Health Care"),
-        ("^SP500-25", "Cons. Disc."),
-        ("^SP500-30", "Cons. Staples"),
-        ("^SP500-20", "Industrials"),
-        ("^SP500-15", "Materials"),
-        ("^SP500-55", "Utilities"),
-        ("^SP500-60", "Real Estate"),
-        ("^SP500-50", "Comm. Svcs"),
-    ]
-
-    current_year = datetime.now().year
-
-    # Time range selector
-    st.subheader("Historical Returns Heatmap")
-    col1, col2 = st.columns([1, 3])
-    with col1:
-        time_range = st.selectbox(
-            "Time Range",
-            ["5 Years", "10 Years", "20 Years", "Full History"],
-            index=2,
-            key="sector_time_range"
-        )
+        # S&P 500 Sector Indices - using actual index data for longer history
+        # Format: (symbol, display_name)
+        sectors_config = [
+            ("^SP500-45", "Technology"),
+            ("^SP500-40", "Financials"),
+            ("XLE", "Energy"),  # Use ETF - index not available on Yahoo
+            ("^SP500-35", "Health Care"),
+            ("^SP500-25", "Cons. Disc."),
+            ("^SP500-30", "Cons. Staples"),
+            ("^SP500-20", "Industrials"),
+            ("^SP500-15", "Materials"),
+            ("^SP500-55", "Utilities"),
+            ("^SP500-60", "Real Estate"),
+            ("^SP500-50", "Comm. Svcs"),
+        ]
+
+        current_year = datetime.now().year
+
+        # Time range selector
+        st.subheader("Historical Returns Heatmap")
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            time_range = st.selectbox(
+                "Time Range",
+                ["5 Years", "10 Years", "20 Years", "Full History"],
+                index=2,
+                key="sector_time_range"
+            )
 
-    # Determine years to show based on selection
-    if time_range == "5 Years":
-        num_years = 5
-    elif time_range == "10 Years":
-        num_years = 10
-    elif time_range == "20 Years":
-        num_years = 20
-    else:  # Full History
-        num_years = 35  # Back to 1990
-
-    years = list(range(current_year - num_years, current_year + 1))
-    history_start = datetime(current_year - 40, 1, 1).isoformat()
-
-    # Build returns matrix
-    returns_data = []
-    for symbol, name in sectors_config:
-        row = {"Sector": name}
-
-        # Fetch data
-        data = fetch_api(f"/api/indicators/{symbol}/timeseries?start={history_start}&limit=20000", silent=True)
-        if data and data.get('data'):
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df['year'] = df['timestamp'].dt.year
-            df = df.sort_values('timestamp')
+        # Determine years to show based on selection
+        if time_range == "5 Years":
+            num_years = 5
+        elif time_range == "10 Years":
+            num_years = 10
+        elif time_range == "20 Years":
+            num_years = 20
+        else:  # Full History
+            num_years = 35  # Back to 1990
+
+        years = list(range(current_year - num_years, current_year + 1))
+        history_start = datetime(current_year - num_years, 1, 1)
+
+        # Annual returns, YTD and statistics for all sectors in a single request
+        try:
+            calendar_data = get_client().calendar_returns(
+                [symbol for symbol, _ in sectors_config], period="year", start=history_start
+            )
+        except Exception:
+            calendar_data = {}
+        sector_returns = calendar_data.get("returns", {})
 
+        # Build returns matrix
+        returns_data = []
+        for symbol, name in sectors_config:
+            row = {"Sector": name}
+            symbol_returns = sector_returns.get(symbol, {})
             for year in years:
-                year_data = df[df['year'] == year]
-                if len(year_data) >= 2:
-                    start_val = year_data.iloc[0]['value']
-                    end_val = year_data.iloc[-1]['value']
-                    if start_val > 0:
-                        pct_return = ((end_val - start_val) / start_val) * 100
-                        row[str(year)] = round(pct_return, 1)
-                    else:
-                        row[str(year)] = None
-                else:
-                    row[str(year)] = None
-        else:
-            for year in years:
-                row[str(year)] = None
-
-        returns_data.append(row)
-
-    returns_df = pd.DataFrame(returns_data)
-
-    if len(returns_df) > 0:
-        # Create heatmap
-        year_cols = [str(y) for y in years if str(y) in returns_df.columns]
-        heatmap_data = returns_df[year_cols].values.T
-
-        fig = go.Figure(data=go.Heatmap(
-            z=heatmap_data,
-            x=returns_df['Sector'].tolist(),
-            y=year_cols,
-            colorscale=[
-                [0, '#ef4444'],      # Red for negative
-                [0.5, '#1A1F2E'],    # Dark for zero
-                [1, '#10b981']       # Green for positive
-            ],
-            zmid=0,
-            text=[[f"{v:.1f}%" if pd.notna(v) else "" for v in row] for row in heatmap_data],
-            texttemplate="%{text}",
-            textfont={"size": 10, "color": "white"},
-            hoverongaps=False,
-            colorbar=dict(title="Return %")
-        ))
-
-        # Dynamic height based on years shown
-        chart_height = max(400, min(800, len(year_cols) * 22))
-        fig.update_layout(
-            title=f"Annual Sector Returns (%) - {time_range}",
-            xaxis_title="Sector",
-            yaxis_title="Year",
-            template='plotly_dark',
-            height=chart_height,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)'
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Weighted Average Returns
-        st.subheader("Average Annual Returns by Sector")
-        st.caption(f"Simple and annualized returns over the selected {time_range.lower()} period")
-
-        avg_data = []
-        for _, row in returns_df.iterrows():
-            sector_name = row['Sector']
-            returns = [row[col] for col in year_cols if pd.notna(row[col])]
-            if returns:
-                simple_avg = np.mean(returns)
-                # Calculate geometric mean (CAGR approximation)
-                # Convert percentage returns to growth factors, multiply, then annualize
-                growth_factors = [(1 + r/100) for r in returns]
-                cumulative = np.prod(growth_factors)
-                n_years = len(returns)
-                cagr = (cumulative ** (1/n_years) - 1) * 100 if n_years > 0 else 0
-                avg_data.append({
-                    "Sector": sector_name,
-                    "Simple Avg": simple_avg,
-                    "CAGR": cagr,
-                    "Years": n_years,
-                    "Best Year": max(returns),
-                    "Worst Year": min(returns)
-                })
+                value = symbol_returns.get(str(year))
+                row[str(year)] = round(value, 1) if value is not None else None
+            returns_data.append(row)
+
+        returns_df = pd.DataFrame(returns_data)
+
+        if len(returns_df) > 0:
+            # Create heatmap
+            year_cols = [str(y) for y in years if str(y) in returns_df.columns]
+            heatmap_data = returns_df[year_cols].values.T
+
+            fig = go.Figure(data=go.Heatmap(
+                z=heatmap_data,
+                x=returns_df['Sector'].tolist(),
+                y=year_cols,
+                colorscale=[
+                    [0, '#ef4444'],      # Red for negative
+                    [0.5, '#1A1F2E'],    # Dark for zero
+                    [1, '#10b981']       # Green for positive
+                ],
+                zmid=0,
+                text=[[f"{v:.1f}%" if pd.notna(v) else "" for v in row] for row in heatmap_data],
+                texttemplate="%{text}",
+                textfont={"size": 10, "color": "white"},
+                hoverongaps=False,
+                colorbar=dict(title="Return %")
+            ))
 
-        if avg_data:
-            avg_df = pd.DataFrame(avg_data).sort_values("CAGR", ascending=False)
+            # Dynamic height based on years shown
+            chart_height = max(400, min(800, len(year_cols) * 22))
+            fig.update_layout(
+                title=f"Annual Sector Returns (%) - {time_range}",
+                xaxis_title="Sector",
+                yaxis_title="Year",
+                template='plotly_dark',
+                height=chart_height,
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)'
+            )
 
-            col1, col2 = st.columns(2)
+            st.plotly_chart(fig, use_container_width=True)
 
-            with col1:
-                # CAGR bar chart
-                colors = ['#10b981' if v >= 0 else '#ef4444' for v in avg_df['CAGR']]
-                fig_cagr = go.Figure(go.Bar(
-                    x=avg_df['CAGR'],
-                    y=avg_df['Sector'],
+            # Weighted Average Returns
+            st.subheader("Average Annual Returns by Sector")
+            st.caption(f"Simple and annualized returns over the selected {time_range.lower()} period")
+
+            sector_names = dict(sectors_config)
+            avg_data = [
+                {
+                    "Sector": sector_names[symbol],
+                    "Simple Avg": stats["simple_avg"],
+                    "CAGR": stats["cagr"],
+                    "Years": stats["periods"],
+                    "Best Year": stats["best"],
+                    "Worst Year": stats["worst"],
+                }
+                for symbol, stats in calendar_data.get("statistics", {}).items()
+                if symbol in sector_names
+            ]
+
+            if avg_data:
+                avg_df = pd.DataFrame(avg_data).sort_values("CAGR", ascending=False)
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    # CAGR bar chart
+                    colors = ['#10b981' if v >= 0 else '#ef4444' for v in avg_df['CAGR']]
+                    fig_cagr = go.Figure(go.Bar(
+                        x=avg_df['CAGR'],
+                        y=avg_df['Sector'],
+                        orientation='h',
+                        marker_color=colors,
+                        text=[f"{v:.1f}%" for v in avg_df['CAGR']],
+                        textposition='outside'
+                    ))
+                    fig_cagr.update_layout(
+                        title=f"Compound Annual Growth Rate ({time_range})",
+                        xaxis_title="CAGR (%)",
+                        yaxis_title="",
+                        template='plotly_dark',
+                        height=400,
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        xaxis=dict(gridcolor='#2D3748')
+                    )
+                    st.plotly_chart(fig_cagr, use_container_width=True)
+
+                with col2:
+                    # Stats table
+                    st.markdown("**Return Statistics**")
+                    display_df = avg_df[['Sector', 'CAGR', 'Simple Avg', 'Best Year', 'Worst Year', 'Years']].copy()
+                    display_df.columns = ['Sector', 'CAGR %', 'Avg %', 'Best %', 'Worst %', 'Yrs']
+                    for col in ['CAGR %', 'Avg %', 'Best %', 'Worst %']:
+                        display_df[col] = display_df[col].apply(lambda x: f"{x:.1f}")
+                    st.dataframe(display_df, use_container_width=True, hide_index=True)
+
+            st.divider()
+
+            # YTD performance bar chart
+            st.subheader("Year-to-Date Performance")
+            ytd_data = [
+                {"Sector": name, "YTD Return": calendar_data["ytd"][symbol]}
+                for symbol, name in sectors_config
+                if calendar_data.get("ytd", {}).get(symbol) is not None
+            ]
+
+            if ytd_data:
+                ytd_df = pd.DataFrame(ytd_data).sort_values("YTD Return", ascending=True)
+                colors = ['#10b981' if v >= 0 else '#ef4444' for v in ytd_df['YTD Return']]
+
+                fig = go.Figure(go.Bar(
+                    x=ytd_df['YTD Return'],
+                    y=ytd_df['Sector'],
                     orientation='h',
                     marker_color=colors,
-                    text=[f"{v:.1f}%" for v in avg_df['CAGR']],
+                    text=[f"{v:.1f}%" for v in ytd_df['YTD Return']],
                     textposition='outside'
                 ))
-                fig_cagr.update_layout(
-                    title=f"Compound Annual Growth Rate ({time_range})",
-                    xaxis_title="CAGR (%)",
+
+                fig.update_layout(
+                    title=f"{current_year} YTD Sector Returns",
+                    xaxis_title="Return (%)",
                     yaxis_title="",
                     template='plotly_dark',
                     height=400,
@@ -1474,69 +1546,91 @@ elif page == "Sector Performance":
                     plot_bgcolor='rgba(0,0,0,0)',
                     xaxis=dict(gridcolor='#2D3748')
                 )
-                st.plotly_chart(fig_cagr, use_container_width=True)
 
-            with col2:
-                # Stats table
-                st.markdown("**Return Statistics**")
-                display_df = avg_df[['Sector', 'CAGR', 'Simple Avg', 'Best Year', 'Worst Year', 'Years']].copy()
-                display_df.columns = ['Sector', 'CAGR %', 'Avg %', 'Best %', 'Worst %', 'Yrs']
-                for col in ['CAGR %', 'Avg %', 'Best %', 'Worst %']:
-                    display_df[col] = display_df[col].apply(lambda x: f"{x:.1f}")
-                st.dataframe(display_df, use_container_width=True, hide_index=True)
+                st.plotly_chart(fig, use_container_width=True)
 
+        # Relative Rotation Graph (coordinates computed at ingest time, rrg.py)
         st.divider()
+        st.subheader("Relative Rotation Graph")
+        st.caption("RS-Ratio (x) measures each sector's relative strength vs the benchmark against its own recent trend; "
+                   "RS-Momentum (y) measures whether that relative strength is improving. Sectors typically rotate "
+                   "clockwise: Improving → Leading → Weakening → Lagging. The large marker is the latest point.")
 
-        # YTD performance bar chart
-        st.subheader("Year-to-Date Performance")
-        ytd_data = []
-        start_of_year = datetime(current_year, 1, 1)
-        for symbol, name in sectors_config:
-            data = fetch_api(f"/api/indicators/{symbol}/timeseries?start={start_of_year.isoformat()}&limit=500", silent=True)
-            if data and data.get('data') and len(data['data']) >= 2:
-                df = pd.DataFrame(data['data'])
-                start_val = df.iloc[0]['value']
-                end_val = df.iloc[-1]['value']
-                if start_val > 0:
-                    ytd_return = ((end_val - start_val) / start_val) * 100
-                    ytd_data.append({"Sector": name, "YTD Return": ytd_return})
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            rrg_benchmark = st.selectbox("Benchmark", ["SPY", "^GSPC"],
+                                         format_func=lambda b: {"SPY": "SPY (sector ETFs)", "^GSPC": "S&P 500 (sector indices)"}[b],
+                                         key="rrg_benchmark")
+        with col2:
+            rrg_freq = st.selectbox("Tail points", ["W", "D"], format_func=lambda f: {"W": "Weekly", "D": "Daily"}[f],
+                                    key="rrg_freq")
+        with col3:
+            rrg_tail = st.slider("Tail length", 2, 26, 8, key="rrg_tail")
 
-        if ytd_data:
-            ytd_df = pd.DataFrame(ytd_data).sort_values("YTD Return", ascending=True)
-            colors = ['#10b981' if v >= 0 else '#ef4444' for v in ytd_df['YTD Return']]
+        try:
+            rrg_data = get_client().rrg(rrg_benchmark, tail=rrg_tail, freq=rrg_freq)
+        except Exception:
+            rrg_data = None
 
-            fig = go.Figure(go.Bar(
-                x=ytd_df['YTD Return'],
-                y=ytd_df['Sector'],
-                orientation='h',
-                marker_color=colors,
-                text=[f"{v:.1f}%" for v in ytd_df['YTD Return']],
-                textposition='outside'
-            ))
+        if rrg_data and rrg_data.get('sectors'):
+            sector_labels = dict(sectors_config)
+            palette = px.colors.qualitative.Plotly + px.colors.qualitative.Safe
+            fig = go.Figure()
+
+            all_x = [v for sector in rrg_data['sectors'].values() for v in sector['rs_ratio']]
+            all_y = [v for sector in rrg_data['sectors'].values() for v in sector['rs_momentum']]
+            reach = max(2.0, max(abs(v - 100) for v in all_x + all_y) * 1.1)
+            quadrants = [
+                (100, 100 + reach, 100, 100 + reach, "rgba(16,185,129,0.08)", "Leading"),
+                (100, 100 + reach, 100 - reach, 100, "rgba(246,173,85,0.08)", "Weakening"),
+                (100 - reach, 100, 100 - reach, 100, "rgba(239,68,68,0.08)", "Lagging"),
+                (100 - reach, 100, 100, 100 + reach, "rgba(66,153,225,0.08)", "Improving"),
+            ]
+            for x0, x1, y0, y1, color, label in quadrants:
+                fig.add_shape(type="rect", x0=x0, x1=x1, y0=y0, y1=y1, fillcolor=color, line_width=0, layer="below")
+                fig.add_annotation(x=x1 if x0 == 100 else x0, y=y1 if y0 == 100 else y0, text=label, showarrow=False,
+                                   xanchor="right" if x0 == 100 else "left", yanchor="top" if y0 == 100 else "bottom",
+                                   font=dict(color="#A0AEC0", size=12))
+
+            for i, (symbol, sector) in enumerate(rrg_data['sectors'].items()):
+                color = palette[i % len(palette)]
+                label = sector_labels.get(symbol, sector['name'])
+                sizes = [6] * (len(sector['rs_ratio']) - 1) + [14]
+                fig.add_trace(go.Scatter(
+                    x=sector['rs_ratio'], y=sector['rs_momentum'], mode='lines+markers', name=label,
+                    line=dict(color=color, width=2), marker=dict(size=sizes, color=color),
+                    text=[str(t)[:10] for t in sector['timestamps']],
+                    hovertemplate=f"{label}<br>%{{text}}<br>RS-Ratio %{{x:.2f}}<br>RS-Momentum %{{y:.2f}}<extra></extra>",
+                ))
 
             fig.update_layout(
-                title=f"{current_year} YTD Sector Returns",
-                xaxis_title="Return (%)",
-                yaxis_title="",
-                template='plotly_dark',
-                height=400,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                xaxis=dict(gridcolor='#2D3748')
+                xaxis_title="RS-Ratio", yaxis_title="RS-Momentum", template='plotly_dark', height=600,
+                paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(gridcolor='#2D3748', range=[100 - reach, 100 + reach], zeroline=False),
+                yaxis=dict(gridcolor='#2D3748', range=[100 - reach, 100 + reach], zeroline=False),
             )
-
             st.plotly_chart(fig, use_container_width=True)
 
-    # Sector Descriptions
-    st.divider()
-    st.subheader("Sector Guide")
-    st.markdown("Understanding each sector's role in the economy and its major constituents.")
+            quadrant_table = pd.DataFrame([
+                {"Sector": sector_labels.get(symbol, sector['name']), "Quadrant": sector['quadrant'],
+                 "RS-Ratio": round(sector['rs_ratio'][-1], 2), "RS-Momentum": round(sector['rs_momentum'][-1], 2)}
+                for symbol, sector in rrg_data['sectors'].items()
+            ]).sort_values(["Quadrant", "RS-Ratio"], ascending=[True, False])
+            st.caption(f"As of {str(rrg_data['as_of'])[:10]}")
+            st.dataframe(quadrant_table, use_container_width=True, hide_index=True)
+        else:
+            st.info("Relative rotation data is computed during market data ingestion.")
 
-    col1, col2 = st.columns(2)
+        # Sector Descriptions
+        st.divider()
+        st.subheader("Sector Guide")
+        st.markdown("Understanding each sector's role in the economy and its major constituents.")
 
-    with col1:
-        with st.expander("**Technology (XLK)**", expanded=False):
-            st.markdown("""
+        col1, col2 = st.columns(2)
+
+        with col1:
+            with st.expander("**Technology (XLK)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Software, hardware, semiconductors, IT services, and electronic equipment companies.
 
             **Economic Role:** The growth engine of the modern economy. Technology drives productivity gains, digital transformation, and innovation across all other sectors. Highly sensitive to interest rates due to long-duration cash flows.
@@ -1553,8 +1647,8 @@ elif page == "Sector Performance":
             **Weight in S&P 500:** ~30% (largest sector)
             """)
 
-        with st.expander("**Financials (XLF)**", expanded=False):
-            st.markdown("""
+            with st.expander("**Financials (XLF)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Banks, insurance companies, asset managers, credit card companies, and financial exchanges.
 
             **Economic Role:** The circulatory system of the economy. Financials facilitate capital allocation, risk transfer, and payment systems. Their health reflects credit conditions and economic confidence.
@@ -1571,8 +1665,8 @@ elif page == "Sector Performance":
             **Weight in S&P 500:** ~13%
             """)
 
-        with st.expander("**Health Care (XLV)**", expanded=False):
-            st.markdown("""
+            with st.expander("**Health Care (XLV)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Pharmaceuticals, biotechnology, medical devices, health insurance, hospitals, and healthcare services.
 
             **Economic Role:** Essential services with relatively inelastic demand. Healthcare spending continues regardless of economic conditions, making this a defensive sector with growth characteristics from aging demographics.
@@ -1589,8 +1683,8 @@ elif page == "Sector Performance":
             **Weight in S&P 500:** ~12%
             """)
 
-        with st.expander("**Consumer Discretionary (XLY)**", expanded=False):
-            st.markdown("""
+            with st.expander("**Consumer Discretionary (XLY)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Retail, automobiles, hotels, restaurants, leisure, apparel, and consumer services - things people buy when they have extra money.
 
             **Economic Role:** A direct read on consumer confidence and spending power. When consumers feel wealthy and secure, discretionary spending rises. When worried, it's the first to get cut.
@@ -1607,8 +1701,8 @@ elif page == "Sector Performance":
             **Weight in S&P 500:** ~10%
             """)
 
-        with st.expander("**Industrials (XLI)**", expanded=False):
-            st.markdown("""
+            with st.expander("**Industrials (XLI)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Aerospace & defense, machinery, construction, transportation (airlines, railroads, trucking), and professional services.
 
             **Economic Role:** The backbone of physical economic activity. Industrials build infrastructure, move goods, and manufacture equipment. Closely tied to business investment and global trade.
@@ -1625,8 +1719,8 @@ elif page == "Sector Performance":
             **Weight in S&P 500:** ~9%
             """)
 
-        with st.expander("**Energy (XLE)**", expanded=False):
-            st.markdown("""
+            with st.expander("**Energy (XLE)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Oil & gas exploration/production, refining, pipelines, and energy equipment/services.
 
             **Economic Role:** Provides the fuel that powers the economy. Energy prices affect transportation costs, manufacturing inputs, and consumer spending (gasoline). Geopolitically sensitive.
@@ -1643,9 +1737,9 @@ elif page == "Sector Performance":
             **Weight in S&P 500:** ~4%
             """)
 
-    with col2:
-        with st.expander("**Consumer Staples (XLP)**", expanded=False):
-            st.markdown("""
+        with col2:
+            with st.expander("**Consumer Staples (XLP)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Food, beverages, tobacco, household products, and personal care - everyday necessities that people buy regardless of economic conditions.
 
             **Economic Role:** Provides essential goods with stable demand. People need to eat, clean, and maintain hygiene in any economy. This stability makes staples a classic defensive sector.
@@ -1662,8 +1756,8 @@ elif page == "Sector Performance":
             **Weight in S&P 500:** ~6%
             """)
 
-        with st.expander("**Utilities (XLU)**", expanded=False):
-            st.markdown("""
+            with st.expander("**Utilities (XLU)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Electric utilities, gas utilities, water utilities, and independent power producers.
 
             **Economic Role:** Provides essential services (electricity, gas, water) with regulated, predictable revenue streams. High dividend yields make utilities bond-like investments.
@@ -1680,8 +1774,8 @@ elif page == "Sector Performance":
             **Weight in S&P 500:** ~2%
             """)
 
-        with st.expander("**Materials (XLB)**", expanded=False):
-            st.markdown("""
+            with st.expander("**Materials (XLB)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Chemicals, construction materials, metals & mining, paper & packaging, and containers.
 
             **Economic Role:** Provides raw materials for manufacturing and construction. Commodity-sensitive sector tied to global industrial activity and infrastructure investment.
@@ -1698,8 +1792,8 @@ elif page == "Sector Performance":
             **Weight in S&P 500:** ~2%
             """)
 
-        with st.expander("**Real Estate (XLRE)**", expanded=False):
-            st.markdown("""
+            with st.expander("**Real Estate (XLRE)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Real Estate Investment Trusts (REITs) owning office, retail, residential, industrial, healthcare, and data center properties.
 
             **Economic Role:** Provides exposure to commercial real estate without direct property ownership. REITs must distribute 90% of taxable income as dividends, making them income-oriented investments.
@@ -1718,8 +1812,8 @@ elif page == "Sector Performance":
             *Note: Before 2015, Real Estate was part of Financials. Historical data uses VNQ (Vanguard Real Estate ETF) as proxy.*
             """)
 
-        with st.expander("**Communication Services (XLC)**", expanded=False):
-            st.markdown("""
+            with st.expander("**Communication Services (XLC)**", expanded=False):
+                st.markdown("""
             **What It Covers:** Telecom providers, media companies, entertainment, interactive media, and social networking platforms.
 
             **Economic Role:** Enables communication and content distribution. Combines stable telecom utilities with high-growth digital media. Sector was reorganized in 2018 to include internet companies previously in Technology.
@@ -1738,12 +1832,12 @@ elif page == "Sector Performance":
             *Note: Sector was reorganized in 2018. Historical data uses IYZ (iShares Telecom ETF) as proxy, which tracked the old, narrower Telecom sector.*
             """)
 
-# Page: Yield Curve
-elif page == "Yield Curve":
-    st.header("📈 Treasury Yield Curve")
+    # Page: Yield Curve
+    elif page == "Yield Curve":
+        st.header("📈 Treasury Yield Curve")
 
-    # Comprehensive explanation
-    st.markdown("""
+        # Comprehensive explanation
+        st.markdown("""
     ### What Is the Yield Curve and Why Does It Matter?
 
     The yield curve is a graph showing interest rates (yields) on U.S. Treasury bonds across different time horizons,
@@ -1774,136 +1868,220 @@ elif page == "Yield Curve":
     and corporate borrowing costs throughout the economy.
     """)
 
-    # Yield curve maturities (in order)
-    maturities = [
-        ("DGS1MO", "1M", 1/12),
-        ("DGS3MO", "3M", 0.25),
-        ("DGS6MO", "6M", 0.5),
-        ("DGS1", "1Y", 1),
-        ("DGS2", "2Y", 2),
-        ("DGS5", "5Y", 5),
-        ("DGS7", "7Y", 7),
-        ("DGS10", "10Y", 10),
-        ("DGS20", "20Y", 20),
-        ("DGS30", "30Y", 30)
-    ]
-
-    # Get latest yields
-    current_yields = []
-    for series_id, label, years in maturities:
-        data = fetch_api(f"/api/indicators/{series_id}/latest", silent=True)
-        if data and data.get('latest_value') is not None:
-            current_yields.append({
-                "label": label,
-                "years": years,
-                "yield": data['latest_value']
-            })
-
-    if current_yields:
-        # Current yield curve
-        st.subheader("Current Yield Curve")
-        yield_df = pd.DataFrame(current_yields)
+        # Yield curve cube: observed + fitted curves, spreads and factors all come
+        # from one server-side matrix fitted once per data refresh
+        client = get_client()
+        try:
+            latest = client.yield_curves()
+        except Exception:
+            latest = None
+
+        def curve_axis():
+            """Log-scaled maturity axis labelled with the published tenors"""
+            return dict(gridcolor='#2D3748', type='log', title="Maturity",
+                        tickvals=[t['years'] for t in latest['tenors']],
+                        ticktext=[t['label'] for t in latest['tenors']])
+
+        def curve_traces(curve, name, color, width=3, fitted_dash=None):
+            """Observed yields (markers) and the fitted Nelson-Siegel curve (line) for one snapshot"""
+            observed_years = [t['years'] for t in latest['tenors'] if t['label'] in curve['observed']]
+            observed = [curve['observed'][t['label']] for t in latest['tenors'] if t['label'] in curve['observed']]
+            return [
+                line_trace(x=latest['fitted_maturities'], y=curve['fitted'], mode='lines', name=f"{name} (fitted)",
+                           line=dict(color=color, width=width, dash=fitted_dash), hoverinfo='skip', showlegend=False),
+                line_trace(x=observed_years, y=observed, mode='markers', name=name,
+                           marker=dict(size=10, color=color),
+                           hovertemplate="%{y:.2f}%<extra>" + name + "</extra>"),
+            ]
+
+        if latest and latest.get('curves'):
+            # Current yield curve
+            current = latest['curves'][0]
+            st.subheader("Current Yield Curve")
+            st.caption(f"As of {str(current['date'])[:10]}. Markers are published yields; the line is a Nelson-Siegel fit "
+                       f"(RMSE {current['params'].get('rmse', 0) or 0:.3f}pp).")
+
+            # Compare against past curves in the same request
+            compare = st.multiselect(
+                "Compare with:",
+                ["1 Month Ago", "6 Months Ago", "1 Year Ago", "2 Years Ago", "5 Years Ago"],
+                default=["1 Year Ago"],
+                key="yc_compare"
+            )
+            compare_days = {"1 Month Ago": 30, "6 Months Ago": 182, "1 Year Ago": 365, "2 Years Ago": 730, "5 Years Ago": 1825}
+            as_of = pd.Timestamp(current['date'])
+            past_curves = []
+            if compare:
+                try:
+                    past = client.yield_curves(dates=[as_of - timedelta(days=compare_days[c]) for c in compare])
+                    past_curves = list(zip(compare, past['curves']))
+                except Exception:
+                    past_curves = []
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=yield_df['label'],
-            y=yield_df['yield'],
-            mode='lines+markers',
-            name='Current Curve',
-            line=dict(color='#14b8a6', width=3),
-            marker=dict(size=12),
-            text=[f"{y:.2f}%" for y in yield_df['yield']],
-            textposition='top center',
-            textfont=dict(size=11, color='#E2E8F0')
-        ))
+            fig = go.Figure()
+            compare_colors = ['#F6AD55', '#8b5cf6', '#ED64A6', '#A0AEC0', '#4A5568']
+            for (label, curve), color in zip(past_curves, compare_colors):
+                for trace in curve_traces(curve, f"{label} ({str(curve['date'])[:10]})", color, width=2, fitted_dash='dot'):
+                    fig.add_trace(trace)
+            for trace in curve_traces(current, "Current", '#14b8a6'):
+                fig.add_trace(trace)
 
-        fig.update_layout(
-            xaxis_title="Maturity",
-            yaxis_title="Yield (%)",
-            template='plotly_dark',
-            height=400,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748', categoryorder='array',
-                      categoryarray=['1M', '3M', '6M', '1Y', '2Y', '5Y', '7Y', '10Y', '20Y', '30Y']),
-            yaxis=dict(gridcolor='#2D3748')
-        )
+            fig.update_layout(
+                yaxis_title="Yield (%)",
+                template='plotly_dark',
+                height=400,
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=curve_axis(),
+                yaxis=dict(gridcolor='#2D3748'),
+                legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5)
+            )
 
-        st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True)
 
-        # Key spread metrics
-        col1, col2, col3, col4 = st.columns(4)
+            # Key spread metrics
+            col1, col2, col3, col4 = st.columns(4)
 
-        spread_10y2y = fetch_api("/api/indicators/T10Y2Y/latest", silent=True)
-        if spread_10y2y and spread_10y2y.get('latest_value') is not None:
-            val = spread_10y2y['latest_value']
-            with col1:
-                st.metric("10Y-2Y Spread", f"{val:.2f}%",
-                         delta="Inverted" if val < 0 else "Normal",
-                         delta_color="inverse" if val < 0 else "normal")
+            try:
+                recent_spreads = client.yield_spreads(["10Y-2Y", "10Y-3M", "30Y-5Y"], start=as_of - timedelta(days=30))
+            except Exception:
+                recent_spreads = pd.DataFrame()
+            spread_now = recent_spreads.ffill().iloc[-1] if not recent_spreads.empty else {}
+
+            for col, pair in zip([col1, col2], ["10Y-2Y", "10Y-3M"]):
+                val = spread_now.get(pair)
+                if val is not None and not pd.isna(val):
+                    with col:
+                        st.metric(f"{pair} Spread", f"{val:.2f}%",
+                                 delta="Inverted" if val < 0 else "Normal",
+                                 delta_color="inverse" if val < 0 else "normal")
+
+            val = spread_now.get("30Y-5Y")
+            if val is not None and not pd.isna(val):
+                with col3:
+                    st.metric("30Y-5Y Spread", f"{val:.2f}%")
+
+            if '2Y' in current['observed']:
+                with col4:
+                    st.metric("2Y Yield", f"{current['observed']['2Y']:.2f}%")
 
-        # Calculate other spreads from current yields
-        yields_dict = {row['label']: row['yield'] for _, row in yield_df.iterrows()}
+        st.divider()
 
-        if '10Y' in yields_dict and '3M' in yields_dict:
-            spread_10y3m = yields_dict['10Y'] - yields_dict['3M']
-            with col2:
-                st.metric("10Y-3M Spread", f"{spread_10y3m:.2f}%",
-                         delta="Inverted" if spread_10y3m < 0 else "Normal",
-                         delta_color="inverse" if spread_10y3m < 0 else "normal")
+        # Spread history
+        st.subheader("Spread History")
+        spread_col1, spread_col2 = st.columns([1, 2])
+        with spread_col1:
+            spread_pair = st.selectbox("Spread", ["10Y-2Y", "10Y-3M", "30Y-5Y", "5Y-2Y", "2Y-3M"], key="yc_spread")
+        with spread_col2:
+            time_range = st.selectbox("Time Range", ["1 Year", "5 Years", "10 Years", "Max"], index=1, key="yc_range")
+        days_map = {"1 Year": 365, "5 Years": 1825, "10 Years": 3650, "Max": 20000}
+        start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-        if '30Y' in yields_dict and '5Y' in yields_dict:
-            spread_30y5y = yields_dict['30Y'] - yields_dict['5Y']
-            with col3:
-                st.metric("30Y-5Y Spread", f"{spread_30y5y:.2f}%")
+        try:
+            spread_df = client.yield_spreads([spread_pair], start=start_date)[spread_pair].dropna()
+        except Exception:
+            spread_df = pd.Series(dtype=float)
 
-        if '2Y' in yields_dict:
-            with col4:
-                st.metric("2Y Yield", f"{yields_dict['2Y']:.2f}%")
+        if not spread_df.empty:
+            fig = go.Figure()
+            fig.add_trace(line_trace(
+                x=spread_df.index,
+                y=spread_df.values,
+                mode='lines',
+                fill='tozeroy',
+                fillcolor='rgba(239, 68, 68, 0.2)',
+                line=dict(color='#ef4444', width=2)
+            ))
+            fig.add_hline(y=0, line_dash="dash", line_color="#E2E8F0", annotation_text="Inversion Line")
 
-    st.divider()
+            fig.update_layout(
+                xaxis_title="Date",
+                yaxis_title="Spread (%)",
+                template='plotly_dark',
+                height=400,
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(gridcolor='#2D3748'),
+                yaxis=dict(gridcolor='#2D3748')
+            )
 
-    # Historical 10Y-2Y spread
-    st.subheader("10Y-2Y Spread History")
-    time_range = st.selectbox("Time Range", ["1 Year", "5 Years", "10 Years", "Max"], index=1, key="yc_range")
-    days_map = {"1 Year": 365, "5 Years": 1825, "10 Years": 3650, "Max": 20000}
-    start_date = datetime.now() - timedelta(days=days_map[time_range])
+            st.plotly_chart(fig, use_container_width=True)
 
-    spread_data = fetch_api(f"/api/indicators/T10Y2Y/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-    if spread_data and spread_data.get('data'):
-        df = pd.DataFrame(spread_data['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        # Level / slope / curvature
+        st.subheader("Level, Slope and Curvature")
+        st.caption("Nelson-Siegel factors: level = long-run yield, slope = long end minus short end, "
+                   "curvature = hump in the 2-5 year sector.")
+        try:
+            factors_df = client.yield_factors(start=start_date)
+        except Exception:
+            factors_df = pd.DataFrame()
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['timestamp'],
-            y=df['value'],
-            mode='lines',
-            fill='tozeroy',
-            fillcolor='rgba(239, 68, 68, 0.2)',
-            line=dict(color='#ef4444', width=2)
-        ))
-        fig.add_hline(y=0, line_dash="dash", line_color="#E2E8F0", annotation_text="Inversion Line")
+        if not factors_df.empty:
+            fig = go.Figure()
+            for column, color in [("level", '#14b8a6'), ("slope", '#F6AD55'), ("curvature", '#8b5cf6')]:
+                fig.add_trace(line_trace(x=factors_df.index, y=factors_df[column], mode='lines',
+                                         name=column.title(), line=dict(color=color, width=2)))
+            fig.add_hline(y=0, line_dash="dot", line_color="#4A5568")
+            fig.update_layout(
+                xaxis_title="Date",
+                yaxis_title="Factor (%)",
+                template='plotly_dark',
+                height=400,
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(gridcolor='#2D3748'),
+                yaxis=dict(gridcolor='#2D3748'),
+                legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5),
+                hovermode='x unified'
+            )
+            st.plotly_chart(fig, use_container_width=True)
 
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Spread (%)",
-            template='plotly_dark',
-            height=400,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748'),
-            yaxis=dict(gridcolor='#2D3748')
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        # Curve over time (animated)
+        if latest and latest.get('curves'):
+            st.subheader("Curve Over Time")
+            frame_freq = st.radio("One curve per:", ["Month", "Quarter", "Year"], index=1, horizontal=True, key="yc_anim_freq")
+            try:
+                history = client.yield_curves(freq={"Month": "M", "Quarter": "Q", "Year": "Y"}[frame_freq], start=start_date)
+                history_curves = history['curves']
+            except Exception:
+                history_curves = []
+
+            if history_curves:
+                frames = [
+                    go.Frame(data=curve_traces(curve, str(curve['date'])[:10], '#14b8a6'), name=str(curve['date'])[:10])
+                    for curve in history_curves
+                ]
+                all_yields = [v for curve in history_curves for v in curve['observed'].values()]
+                fig = go.Figure(data=frames[-1].data, frames=frames)
+                fig.update_layout(
+                    yaxis_title="Yield (%)",
+                    template='plotly_dark',
+                    height=450,
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    xaxis=curve_axis(),
+                    yaxis=dict(gridcolor='#2D3748', range=[min(all_yields) - 0.25, max(all_yields) + 0.25]),
+                    showlegend=False,
+                    updatemenus=[dict(type="buttons", showactive=False, x=0, y=1.15, xanchor="left", buttons=[
+                        dict(label="▶ Play", method="animate",
+                             args=[None, dict(frame=dict(duration=300, redraw=True), fromcurrent=True)]),
+                        dict(label="⏸ Pause", method="animate",
+                             args=[[None], dict(frame=dict(duration=0, redraw=False), mode="immediate")]),
+                    ])],
+                    sliders=[dict(active=len(frames) - 1, currentvalue=dict(prefix="Curve: "), steps=[
+                        dict(label=frame.name, method="animate",
+                             args=[[frame.name], dict(frame=dict(duration=0, redraw=True), mode="immediate")])
+                        for frame in frames
+                    ])]
+                )
+                st.plotly_chart(fig, use_container_width=True)
 
-# Page: Liquidity
-elif page == "Liquidity":
-    st.header("💧 Liquidity Dashboard")
+    # Page: Liquidity
+    elif page == "Liquidity":
+        st.header("💧 Liquidity Dashboard")
 
-    # Comprehensive explanation
-    st.markdown("""
+        # Comprehensive explanation
+        st.markdown("""
     ### Understanding Liquidity: The Lifeblood of Financial Markets
 
     Liquidity refers to the amount of money sloshing around the financial system, available to buy assets, fund loans,
@@ -1935,96 +2113,62 @@ elif page == "Liquidity":
     art - but understanding these mechanics puts you ahead of most investors who focus only on earnings and headlines.
     """)
 
-    # Key liquidity metrics
-    col1, col2, col3, col4 = st.columns(4)
-
-    fed_bs = fetch_api("/api/indicators/WALCL/latest", silent=True)
-    if fed_bs and fed_bs.get('latest_value'):
-        with col1:
-            val = fed_bs['latest_value'] / 1e6  # Convert to trillions
-            st.metric("Fed Balance Sheet", f"${val:.2f}T")
-
-    m2 = fetch_api("/api/indicators/M2SL/latest", silent=True)
-    if m2 and m2.get('latest_value'):
-        with col2:
-            val = m2['latest_value'] / 1000  # Convert to trillions
-            st.metric("M2 Money Supply", f"${val:.2f}T")
-
-    rrp = fetch_api("/api/indicators/RRPONTSYD/latest", silent=True)
-    if rrp and rrp.get('latest_value'):
-        with col3:
-            val = rrp['latest_value'] / 1000  # Convert to trillions
-            st.metric("Reverse Repo", f"${val:.2f}T")
-
-    tga = fetch_api("/api/indicators/WTREGEN/latest", silent=True)
-    if tga and tga.get('latest_value'):
-        with col4:
-            val = tga['latest_value'] / 1e6  # Convert to trillions
-            st.metric("Treasury Account", f"${val:.2f}T")
-
-    st.divider()
+        # Key liquidity metrics
+        col1, col2, col3, col4 = st.columns(4)
 
-    # Fed Balance Sheet chart
-    st.subheader("Fed Balance Sheet (Total Assets)")
-    time_range = st.selectbox("Time Range", ["1 Year", "5 Years", "10 Years", "Max"], index=2, key="liq_range")
-    days_map = {"1 Year": 365, "5 Years": 1825, "10 Years": 3650, "Max": 20000}
-    start_date = datetime.now() - timedelta(days=days_map[time_range])
+        fed_bs = fetch_api("/api/indicators/WALCL/latest", silent=True)
+        if fed_bs and fed_bs.get('latest_value'):
+            with col1:
+                val = fed_bs['latest_value'] / 1e6  # Convert to trillions
+                st.metric("Fed Balance Sheet", f"${val:.2f}T")
 
-    fed_data = fetch_api(f"/api/indicators/WALCL/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-    if fed_data and fed_data.get('data'):
-        df = pd.DataFrame(fed_data['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['value'] = df['value'] / 1e6  # Convert to trillions
+        m2 = fetch_api("/api/indicators/M2SL/latest", silent=True)
+        if m2 and m2.get('latest_value'):
+            with col2:
+                val = m2['latest_value'] / 1000  # Convert to trillions
+                st.metric("M2 Money Supply", f"${val:.2f}T")
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['timestamp'],
-            y=df['value'],
-            mode='lines',
-            fill='tozeroy',
-            fillcolor='rgba(20, 184, 166, 0.15)',
-            line=dict(color='#14b8a6', width=2)
-        ))
+        rrp = fetch_api("/api/indicators/RRPONTSYD/latest", silent=True)
+        if rrp and rrp.get('latest_value'):
+            with col3:
+                val = rrp['latest_value'] / 1000  # Convert to trillions
+                st.metric("Reverse Repo", f"${val:.2f}T")
 
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Total Assets ($T)",
-            template='plotly_dark',
-            height=400,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748'),
-            yaxis=dict(gridcolor='#2D3748')
-        )
+        tga = fetch_api("/api/indicators/WTREGEN/latest", silent=True)
+        if tga and tga.get('latest_value'):
+            with col4:
+                val = tga['latest_value'] / 1e6  # Convert to trillions
+                st.metric("Treasury Account", f"${val:.2f}T")
 
-        st.plotly_chart(fig, use_container_width=True)
+        st.divider()
 
-    # Credit conditions
-    st.subheader("Credit Conditions")
-    col1, col2 = st.columns(2)
+        # Fed Balance Sheet chart
+        st.subheader("Fed Balance Sheet (Total Assets)")
+        time_range = st.selectbox("Time Range", ["1 Year", "5 Years", "10 Years", "Max"], index=2, key="liq_range")
+        days_map = {"1 Year": 365, "5 Years": 1825, "10 Years": 3650, "Max": 20000}
+        start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-    with col1:
-        st.markdown("**High Yield Spread (Credit Stress)**")
-        hy_data = fetch_api(f"/api/indicators/BAMLH0A0HYM2/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-        if hy_data and hy_data.get('data'):
-            df = pd.DataFrame(hy_data['data'])
+        fed_data = fetch_api(f"/api/indicators/WALCL/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+        if fed_data and fed_data.get('data'):
+            df = pd.DataFrame(fed_data['data'])
             df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df['value'] = df['value'] / 1e6  # Convert to trillions
 
             fig = go.Figure()
-            fig.add_trace(go.Scatter(
+            fig.add_trace(line_trace(
                 x=df['timestamp'],
                 y=df['value'],
                 mode='lines',
                 fill='tozeroy',
-                fillcolor='rgba(246, 173, 85, 0.15)',
-                line=dict(color='#F6AD55', width=2)
+                fillcolor='rgba(20, 184, 166, 0.15)',
+                line=dict(color='#14b8a6', width=2)
             ))
 
             fig.update_layout(
                 xaxis_title="Date",
-                yaxis_title="Spread (%)",
+                yaxis_title="Total Assets ($T)",
                 template='plotly_dark',
-                height=300,
+                height=400,
                 paper_bgcolor='rgba(0,0,0,0)',
                 plot_bgcolor='rgba(0,0,0,0)',
                 xaxis=dict(gridcolor='#2D3748'),
@@ -2033,40 +2177,74 @@ elif page == "Liquidity":
 
             st.plotly_chart(fig, use_container_width=True)
 
-    with col2:
-        st.markdown("**SOFR (Overnight Rate)**")
-        sofr_data = fetch_api(f"/api/indicators/SOFR/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-        if sofr_data and sofr_data.get('data'):
-            df = pd.DataFrame(sofr_data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+        # Credit conditions
+        st.subheader("Credit Conditions")
+        col1, col2 = st.columns(2)
 
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'],
-                y=df['value'],
-                mode='lines',
-                line=dict(color='#8b5cf6', width=2)
-            ))
+        with col1:
+            st.markdown("**High Yield Spread (Credit Stress)**")
+            hy_data = fetch_api(f"/api/indicators/BAMLH0A0HYM2/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+            if hy_data and hy_data.get('data'):
+                df = pd.DataFrame(hy_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
 
-            fig.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Rate (%)",
-                template='plotly_dark',
-                height=300,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                xaxis=dict(gridcolor='#2D3748'),
-                yaxis=dict(gridcolor='#2D3748')
-            )
+                fig = go.Figure()
+                fig.add_trace(line_trace(
+                    x=df['timestamp'],
+                    y=df['value'],
+                    mode='lines',
+                    fill='tozeroy',
+                    fillcolor='rgba(246, 173, 85, 0.15)',
+                    line=dict(color='#F6AD55', width=2)
+                ))
 
-            st.plotly_chart(fig, use_container_width=True)
+                fig.update_layout(
+                    xaxis_title="Date",
+                    yaxis_title="Spread (%)",
+                    template='plotly_dark',
+                    height=300,
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    xaxis=dict(gridcolor='#2D3748'),
+                    yaxis=dict(gridcolor='#2D3748')
+                )
 
-# Page: Market Regime
-elif page == "Market Regime":
-    st.header("🔄 Market Regime Dashboard")
+                st.plotly_chart(fig, use_container_width=True)
 
-    # Comprehensive explanation
-    st.markdown("""
+        with col2:
+            st.markdown("**SOFR (Overnight Rate)**")
+            sofr_data = fetch_api(f"/api/indicators/SOFR/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+            if sofr_data and sofr_data.get('data'):
+                df = pd.DataFrame(sofr_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+                fig = go.Figure()
+                fig.add_trace(line_trace(
+                    x=df['timestamp'],
+                    y=df['value'],
+                    mode='lines',
+                    line=dict(color='#8b5cf6', width=2)
+                ))
+
+                fig.update_layout(
+                    xaxis_title="Date",
+                    yaxis_title="Rate (%)",
+                    template='plotly_dark',
+                    height=300,
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    xaxis=dict(gridcolor='#2D3748'),
+                    yaxis=dict(gridcolor='#2D3748')
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+    # Page: Market Regime
+    elif page == "Market Regime":
+        st.header("🔄 Market Regime Dashboard")
+
+        # Comprehensive explanation
+        st.markdown("""
     ### Understanding Market Regimes and Style Rotation
 
     "Market regime" refers to the prevailing environment that determines which types of investments outperform. This is
@@ -2099,138 +2277,167 @@ elif page == "Market Regime":
     capturing gains from whichever regime is working while maintaining exposure to the next rotation.
     """)
 
-    time_range = st.selectbox("Time Range", ["1 Month", "3 Months", "1 Year", "3 Years", "5 Years", "10 Years", "Max"], index=2, key="regime_range")
-    days_map = {"1 Month": 30, "3 Months": 90, "1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650, "Max": 20000}
-    start_date = datetime.now() - timedelta(days=days_map[time_range])
-
-    # Growth vs Value comparison
-    st.subheader("Growth vs Value")
-
-    growth_data = fetch_api(f"/api/indicators/IWF/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-    value_data = fetch_api(f"/api/indicators/IWD/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-
-    if growth_data and growth_data.get('data') and value_data and value_data.get('data'):
-        growth_df = pd.DataFrame(growth_data['data'])
-        growth_df['timestamp'] = pd.to_datetime(growth_df['timestamp'])
-        value_df = pd.DataFrame(value_data['data'])
-        value_df['timestamp'] = pd.to_datetime(value_df['timestamp'])
-
-        # Normalize to percentage change
-        growth_df = growth_df.sort_values('timestamp')
-        value_df = value_df.sort_values('timestamp')
-        growth_start = growth_df.iloc[0]['value']
-        value_start = value_df.iloc[0]['value']
-        growth_df['pct'] = ((growth_df['value'] - growth_start) / growth_start) * 100
-        value_df['pct'] = ((value_df['value'] - value_start) / value_start) * 100
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=growth_df['timestamp'], y=growth_df['pct'], mode='lines',
-                                 name='Growth (IWF)', line=dict(color='#14b8a6', width=2)))
-        fig.add_trace(go.Scatter(x=value_df['timestamp'], y=value_df['pct'], mode='lines',
-                                 name='Value (IWD)', line=dict(color='#F6AD55', width=2)))
-
-        fig.update_layout(
-            xaxis_title="Date", yaxis_title="Return (%)", template='plotly_dark', height=400,
-            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02)
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Show which is leading
-        growth_return = growth_df.iloc[-1]['pct']
-        value_return = value_df.iloc[-1]['pct']
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Growth Return", f"{growth_return:.1f}%")
-        with col2:
-            st.metric("Value Return", f"{value_return:.1f}%")
-        with col3:
-            leader = "Growth" if growth_return > value_return else "Value"
-            spread = abs(growth_return - value_return)
-            st.metric("Current Leader", leader, f"+{spread:.1f}%")
-
-    st.divider()
-
-    # Large Cap vs Small Cap
-    st.subheader("Large Cap vs Small Cap")
+        time_range = st.selectbox("Time Range", ["1 Month", "3 Months", "1 Year", "3 Years", "5 Years", "10 Years", "Max"], index=2, key="regime_range")
+        days_map = {"1 Month": 30, "3 Months": 90, "1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650, "Max": 20000}
+        start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-    spy_data = fetch_api(f"/api/indicators/SPY/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-    iwm_data = fetch_api(f"/api/indicators/IWM/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+        # Regimes are classified at ingest time (regimes.py); the page only reads
+        # the stored timelines
+        client = get_client()
+        try:
+            regimes = {r['regime_id']: r for r in client.regimes()}
+        except Exception:
+            regimes = {}
+
+        regime_colors = {
+            "Growth": "#14b8a6", "Value": "#F6AD55", "Large Cap": "#8b5cf6", "Small Cap": "#B794F4",
+            "US": "#14b8a6", "International": "#8b5cf6", "Risk-On": "#48BB78", "Risk-Off": "#F56565",
+            "Goldilocks": "#48BB78", "Reflation": "#F6AD55", "Stagflation": "#F56565", "Deflation": "#4299E1",
+            "Neutral": "#718096",
+        }
 
-    if spy_data and spy_data.get('data') and iwm_data and iwm_data.get('data'):
-        spy_df = pd.DataFrame(spy_data['data'])
-        spy_df['timestamp'] = pd.to_datetime(spy_df['timestamp'])
-        iwm_df = pd.DataFrame(iwm_data['data'])
-        iwm_df['timestamp'] = pd.to_datetime(iwm_df['timestamp'])
+        if regimes:
+            st.subheader("Current Regimes")
+            st.caption("Growth/value, size and geography use 3-month relative strength (±1% neutral band); "
+                       "risk appetite votes on credit spreads, the 10Y-2Y curve, SPY and TLT; the quadrant uses "
+                       "the 3-month change in industrial production and CPI year-over-year growth.")
+            cols = st.columns(len(regimes))
+            for col, regime in zip(cols, regimes.values()):
+                with col:
+                    st.metric(regime['title'], regime['state'],
+                              f"{regime['duration_days']} days since {str(regime['start'])[:10]}", delta_color="off")
+                    if regime.get('previous_state'):
+                        st.caption(f"Previously: {regime['previous_state']}")
+
+            # Timeline: one row per regime, one bar per period
+            histories = {}
+            for regime_id in regimes:
+                try:
+                    histories[regime_id] = client.regime_history(regime_id, start=start_date)
+                except Exception:
+                    continue
 
-        spy_df = spy_df.sort_values('timestamp')
-        iwm_df = iwm_df.sort_values('timestamp')
-        spy_start = spy_df.iloc[0]['value']
-        iwm_start = iwm_df.iloc[0]['value']
-        spy_df['pct'] = ((spy_df['value'] - spy_start) / spy_start) * 100
-        iwm_df['pct'] = ((iwm_df['value'] - iwm_start) / iwm_start) * 100
+            fig = go.Figure()
+            shown_states = set()
+            for regime_id, history in histories.items():
+                periods = history['periods']
+                starts = periods['start'].clip(lower=pd.Timestamp(start_date))
+                ends = periods['start'] + pd.to_timedelta(periods['duration_days'].clip(lower=1), unit='D')
+                for state, group in periods.groupby('state'):
+                    fig.add_trace(go.Bar(
+                        y=[history['title']] * len(group),
+                        x=(ends[group.index] - starts[group.index]).dt.total_seconds() * 1000,
+                        base=starts[group.index].dt.strftime('%Y-%m-%d'),
+                        orientation='h', name=state, legendgroup=state, showlegend=state not in shown_states,
+                        marker=dict(color=regime_colors.get(state, '#A0AEC0')),
+                        customdata=group[['duration_days']].assign(start=group['start'].dt.strftime('%Y-%m-%d')).to_numpy(),
+                        hovertemplate=f"{state}<br>from %{{customdata[1]}} for %{{customdata[0]}} days<extra></extra>",
+                    ))
+                    shown_states.add(state)
+
+            if histories:
+                fig.update_layout(
+                    barmode='overlay', template='plotly_dark', height=80 + 60 * len(histories),
+                    paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                    xaxis=dict(type='date', gridcolor='#2D3748'), yaxis=dict(autorange='reversed'),
+                    legend=dict(orientation="h", yanchor="bottom", y=1.02), margin=dict(l=10, r=10, t=40, b=10)
+                )
+                st.plotly_chart(fig, use_container_width=True)
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=spy_df['timestamp'], y=spy_df['pct'], mode='lines',
-                                 name='Large Cap (SPY)', line=dict(color='#8b5cf6', width=2)))
-        fig.add_trace(go.Scatter(x=iwm_df['timestamp'], y=iwm_df['pct'], mode='lines',
-                                 name='Small Cap (IWM)', line=dict(color='#B794F4', width=2)))
+                # Transitions and durations for one regime
+                selected = st.selectbox("Regime history", list(histories), format_func=lambda r: regimes[r]['title'],
+                                        key="regime_history")
+                history = histories[selected]
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown("**Recent transitions**")
+                    recent = history['periods'].iloc[::-1].head(15)
+                    st.dataframe(pd.DataFrame({
+                        "Start": recent['start'].dt.strftime('%Y-%m-%d'),
+                        "State": recent['state'],
+                        "Duration (days)": recent['duration_days'],
+                    }), hide_index=True, use_container_width=True)
+                with col2:
+                    st.markdown(f"**Duration statistics ({time_range})**")
+                    st.dataframe(pd.DataFrame([
+                        {"State": state, "Periods": stats['periods'], "Avg days": stats['avg_duration_days'],
+                         "Longest": stats['max_duration_days'], "Time in state (%)": stats['share_of_time']}
+                        for state, stats in history['statistics'].items()
+                    ]), hide_index=True, use_container_width=True)
+
+            st.divider()
+
+        # Cumulative returns for every style pair from one batch request
+        try:
+            prices = client.timeseries_many(["IWF", "IWD", "SPY", "IWM", "EFA", "EEM"], start=start_date)
+        except Exception:
+            prices = pd.DataFrame()
+
+        def cumulative_returns(symbol):
+            series = prices[symbol].dropna() if symbol in prices.columns else pd.Series(dtype=float)
+            return (series / series.iloc[0] - 1) * 100 if not series.empty else series
+
+        def returns_chart(lines):
+            fig = go.Figure()
+            for symbol, name, color in lines:
+                returns = cumulative_returns(symbol)
+                fig.add_trace(line_trace(x=returns.index, y=returns.values, mode='lines',
+                                         name=name, line=dict(color=color, width=2)))
+            fig.update_layout(
+                xaxis_title="Date", yaxis_title="Return (%)", template='plotly_dark', height=400,
+                paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'),
+                legend=dict(orientation="h", yanchor="bottom", y=1.02)
+            )
+            st.plotly_chart(fig, use_container_width=True)
 
-        fig.update_layout(
-            xaxis_title="Date", yaxis_title="Return (%)", template='plotly_dark', height=400,
-            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02)
-        )
+        def has_data(*symbols):
+            return all(symbol in prices.columns and prices[symbol].notna().any() for symbol in symbols)
 
-        st.plotly_chart(fig, use_container_width=True)
+        # Growth vs Value comparison
+        st.subheader("Growth vs Value")
 
-    st.divider()
+        if has_data("IWF", "IWD"):
+            returns_chart([("IWF", "Growth (IWF)", '#14b8a6'), ("IWD", "Value (IWD)", '#F6AD55')])
 
-    # US vs International
-    st.subheader("US vs International")
+            growth_return = cumulative_returns("IWF").iloc[-1]
+            value_return = cumulative_returns("IWD").iloc[-1]
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Growth Return", f"{growth_return:.1f}%")
+            with col2:
+                st.metric("Value Return", f"{value_return:.1f}%")
+            with col3:
+                if "growth_value" in regimes:
+                    regime = regimes["growth_value"]
+                    st.metric("Current Regime", regime['state'], f"{regime['duration_days']} days", delta_color="off")
+                else:
+                    leader = "Growth" if growth_return > value_return else "Value"
+                    st.metric("Current Leader", leader, f"+{abs(growth_return - value_return):.1f}%")
 
-    efa_data = fetch_api(f"/api/indicators/EFA/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-    eem_data = fetch_api(f"/api/indicators/EEM/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+        st.divider()
 
-    if spy_data and efa_data and efa_data.get('data') and eem_data and eem_data.get('data'):
-        efa_df = pd.DataFrame(efa_data['data'])
-        efa_df['timestamp'] = pd.to_datetime(efa_df['timestamp'])
-        eem_df = pd.DataFrame(eem_data['data'])
-        eem_df['timestamp'] = pd.to_datetime(eem_df['timestamp'])
+        # Large Cap vs Small Cap
+        st.subheader("Large Cap vs Small Cap")
 
-        efa_df = efa_df.sort_values('timestamp')
-        eem_df = eem_df.sort_values('timestamp')
-        efa_start = efa_df.iloc[0]['value']
-        eem_start = eem_df.iloc[0]['value']
-        efa_df['pct'] = ((efa_df['value'] - efa_start) / efa_start) * 100
-        eem_df['pct'] = ((eem_df['value'] - eem_start) / eem_start) * 100
+        if has_data("SPY", "IWM"):
+            returns_chart([("SPY", "Large Cap (SPY)", '#8b5cf6'), ("IWM", "Small Cap (IWM)", '#B794F4')])
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=spy_df['timestamp'], y=spy_df['pct'], mode='lines',
-                                 name='US (SPY)', line=dict(color='#14b8a6', width=2)))
-        fig.add_trace(go.Scatter(x=efa_df['timestamp'], y=efa_df['pct'], mode='lines',
-                                 name='Developed (EFA)', line=dict(color='#8b5cf6', width=2)))
-        fig.add_trace(go.Scatter(x=eem_df['timestamp'], y=eem_df['pct'], mode='lines',
-                                 name='Emerging (EEM)', line=dict(color='#F6AD55', width=2)))
+        st.divider()
 
-        fig.update_layout(
-            xaxis_title="Date", yaxis_title="Return (%)", template='plotly_dark', height=400,
-            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02)
-        )
+        # US vs International
+        st.subheader("US vs International")
 
-        st.plotly_chart(fig, use_container_width=True)
+        if has_data("SPY", "EFA", "EEM"):
+            returns_chart([("SPY", "US (SPY)", '#14b8a6'), ("EFA", "Developed (EFA)", '#8b5cf6'),
+                           ("EEM", "Emerging (EEM)", '#F6AD55')])
 
-# Page: Inflation Monitor
-elif page == "Inflation Monitor":
-    st.header("🔥 Inflation Monitor")
+    # Page: Inflation Monitor
+    elif page == "Inflation Monitor":
+        st.header("🔥 Inflation Monitor")
 
-    # Comprehensive explanation
-    st.markdown("""
+        # Comprehensive explanation
+        st.markdown("""
     ### Understanding Inflation: The Hidden Tax on Your Money
 
     Inflation measures how quickly prices rise across the economy, eroding the purchasing power of your dollars. If inflation
@@ -2261,125 +2468,111 @@ elif page == "Inflation Monitor":
     consumers actually allocate their budgets, giving context to which price changes matter most for household finances.
     """)
 
-    # Calculate YoY inflation from index
-    def get_yoy_inflation(series_id):
-        # Request 2 years of data to ensure we have enough for YoY calculation (need 13+ monthly points)
-        two_years_ago = (datetime.now() - timedelta(days=730)).isoformat()
-        data = fetch_api(f"/api/indicators/{series_id}/timeseries?start={two_years_ago}&limit=500", silent=True)
-        if data and data.get('data') and len(data['data']) > 12:
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            current = df.iloc[-1]['value']
-            year_ago = df.iloc[-13]['value'] if len(df) >= 13 else df.iloc[0]['value']
-            return ((current - year_ago) / year_ago) * 100
-        return None
+        # Levels, YoY, annualized rates and contributions for every CPI/PCE series,
+        # computed server-side - every chart on this page filters this one frame
+        inflation_df = get_inflation_decomposition()
+        latest_yoy = inflation_df.dropna(subset=['yoy']).groupby('series_id')['yoy'].last()
 
-    # Key inflation metrics
-    st.subheader("Headline Metrics")
-    col1, col2, col3, col4 = st.columns(4)
+        # Key inflation metrics
+        st.subheader("Headline Metrics")
+        col1, col2, col3, col4 = st.columns(4)
 
-    cpi_yoy = get_yoy_inflation("CPIAUCSL")
-    core_cpi_yoy = get_yoy_inflation("CPILFESL")
-    pce_yoy = get_yoy_inflation("PCEPI")
-    breakeven = fetch_api("/api/indicators/T10YIE/latest", silent=True)
+        cpi_yoy = latest_yoy.get("CPIAUCSL")
+        core_cpi_yoy = latest_yoy.get("CPILFESL")
+        pce_yoy = latest_yoy.get("PCEPI")
+        breakeven = fetch_api("/api/indicators/T10YIE/latest", silent=True)
 
-    with col1:
-        if cpi_yoy:
-            color = "normal" if cpi_yoy <= 3 else "inverse"
-            st.metric("CPI (YoY)", f"{cpi_yoy:.1f}%", delta="Above target" if cpi_yoy > 2 else "At target", delta_color=color)
-    with col2:
-        if core_cpi_yoy:
-            st.metric("Core CPI (YoY)", f"{core_cpi_yoy:.1f}%")
-    with col3:
-        if pce_yoy:
-            st.metric("PCE (YoY)", f"{pce_yoy:.1f}%")
-    with col4:
-        if breakeven and breakeven.get('latest_value'):
-            st.metric("10Y Breakeven", f"{breakeven['latest_value']:.2f}%")
-
-    st.divider()
+        with col1:
+            if cpi_yoy:
+                color = "normal" if cpi_yoy <= 3 else "inverse"
+                st.metric("CPI (YoY)", f"{cpi_yoy:.1f}%", delta="Above target" if cpi_yoy > 2 else "At target", delta_color=color)
+        with col2:
+            if core_cpi_yoy:
+                st.metric("Core CPI (YoY)", f"{core_cpi_yoy:.1f}%")
+        with col3:
+            if pce_yoy:
+                st.metric("PCE (YoY)", f"{pce_yoy:.1f}%")
+        with col4:
+            if breakeven and breakeven.get('latest_value'):
+                st.metric("10Y Breakeven", f"{breakeven['latest_value']:.2f}%")
 
-    # Time range selector
-    time_range = st.selectbox("Time Range", ["1 Year", "3 Years", "5 Years", "10 Years", "20 Years", "Max"], index=3, key="inf_range")
-    days_map = {"1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650, "20 Years": 7300, "Max": 20000}
-    start_date = datetime.now() - timedelta(days=days_map[time_range])
+        st.divider()
 
-    # CPI chart
-    st.subheader("Consumer Price Index (YoY Change)")
-    cpi_data = fetch_api(f"/api/indicators/CPIAUCSL/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-    if cpi_data and cpi_data.get('data'):
-        df = pd.DataFrame(cpi_data['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp')
-        df['yoy'] = df['value'].pct_change(periods=12) * 100
+        # Time range selector
+        time_range = st.selectbox("Time Range", ["1 Year", "3 Years", "5 Years", "10 Years", "20 Years", "Max"], index=3, key="inf_range")
+        days_map = {"1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650, "20 Years": 7300, "Max": 20000}
+        start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df['timestamp'], y=df['yoy'], mode='lines', fill='tozeroy',
-                                 fillcolor='rgba(239, 68, 68, 0.15)', line=dict(color='#ef4444', width=2)))
-        fig.add_hline(y=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
-        fig.update_layout(xaxis_title="Date", yaxis_title="YoY Change (%)", template='plotly_dark', height=400,
-                         paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
-        st.plotly_chart(fig, use_container_width=True)
+        # CPI chart
+        st.subheader("Consumer Price Index (YoY Change)")
+        df = inflation_df[(inflation_df['series_id'] == "CPIAUCSL") & (inflation_df['timestamp'] >= start_date)]
+        if not df.empty:
+            fig = go.Figure()
+            fig.add_trace(line_trace(x=df['timestamp'], y=df['yoy'], mode='lines', fill='tozeroy',
+                                     fillcolor='rgba(239, 68, 68, 0.15)', line=dict(color='#ef4444', width=2)))
+            fig.add_hline(y=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
+            fig.update_layout(xaxis_title="Date", yaxis_title="YoY Change (%)", template='plotly_dark', height=400,
+                             paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
+            st.plotly_chart(fig, use_container_width=True)
 
-    st.divider()
+        st.divider()
 
-    # Consumer Basket Breakdown
-    st.subheader("Consumer Basket Breakdown (YoY Inflation by Category)")
-    st.caption("Shows which components of the CPI are driving inflation. Click 'Refresh FRED' in sidebar if data is missing.")
-
-    # CPI component series
-    cpi_components = [
-        ("CUSR0000SAH1", "Shelter (Housing/Rent)", "#ef4444"),
-        ("CUSR0000SAF11", "Food at Home", "#F6AD55"),
-        ("CUSR0000SEFV", "Food Away from Home", "#10b981"),
-        ("CUUR0000SETB01", "Gasoline", "#8b5cf6"),
-        ("CUSR0000SEEB", "Electricity", "#B794F4"),
-        ("CUSR0000SAM2", "Medical Care", "#14b8a6"),
-        ("CUSR0000SETA02", "Used Vehicles", "#ED64A6"),
-        ("CPIAPPSL", "Apparel", "#A0AEC0"),
-    ]
+        # Consumer Basket Breakdown
+        st.subheader("Consumer Basket Breakdown (YoY Inflation by Category)")
+        st.caption("Shows which components of the CPI are driving inflation. Click 'Refresh FRED' in sidebar if data is missing.")
+
+        # CPI component series
+        cpi_components = [
+            ("CUSR0000SAH1", "Shelter (Housing/Rent)", "#ef4444"),
+            ("CUSR0000SAF11", "Food at Home", "#F6AD55"),
+            ("CUSR0000SEFV", "Food Away from Home", "#10b981"),
+            ("CUUR0000SETB01", "Gasoline", "#8b5cf6"),
+            ("CUSR0000SEEB", "Electricity", "#B794F4"),
+            ("CUSR0000SAM2", "Medical Care", "#14b8a6"),
+            ("CUSR0000SETA02", "Used Vehicles", "#ED64A6"),
+            ("CPIAPPSL", "Apparel", "#A0AEC0"),
+        ]
+
+        component_yoy = []
+        for series_id, name, color in cpi_components:
+            yoy = latest_yoy.get(series_id)
+            if yoy is not None:
+                component_yoy.append({"Category": name, "YoY %": yoy, "color": color})
+
+        if component_yoy:
+            comp_df = pd.DataFrame(component_yoy).sort_values("YoY %", ascending=True)
+            colors = ['#10b981' if v <= 2 else '#F6AD55' if v <= 5 else '#ef4444' for v in comp_df['YoY %']]
 
-    component_yoy = []
-    for series_id, name, color in cpi_components:
-        yoy = get_yoy_inflation(series_id)
-        if yoy is not None:
-            component_yoy.append({"Category": name, "YoY %": yoy, "color": color})
-
-    if component_yoy:
-        comp_df = pd.DataFrame(component_yoy).sort_values("YoY %", ascending=True)
-        colors = ['#10b981' if v <= 2 else '#F6AD55' if v <= 5 else '#ef4444' for v in comp_df['YoY %']]
-
-        fig = go.Figure(go.Bar(
-            x=comp_df['YoY %'],
-            y=comp_df['Category'],
-            orientation='h',
-            marker_color=colors,
-            text=[f"{v:.1f}%" for v in comp_df['YoY %']],
-            textposition='outside'
-        ))
-        fig.add_vline(x=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
-        fig.update_layout(title="Current YoY Inflation by Category", xaxis_title="YoY Change (%)", yaxis_title="",
-                         template='plotly_dark', height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'))
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Consumer basket data not yet loaded. Click 'Refresh FRED' in the sidebar to fetch CPI component data.")
+            fig = go.Figure(go.Bar(
+                x=comp_df['YoY %'],
+                y=comp_df['Category'],
+                orientation='h',
+                marker_color=colors,
+                text=[f"{v:.1f}%" for v in comp_df['YoY %']],
+                textposition='outside'
+            ))
+            fig.add_vline(x=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
+            fig.update_layout(title="Current YoY Inflation by Category", xaxis_title="YoY Change (%)", yaxis_title="",
+                             template='plotly_dark', height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'))
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("Consumer basket data not yet loaded. Click 'Refresh FRED' in the sidebar to fetch CPI component data.")
 
-    st.divider()
+        st.divider()
 
-    # ============================================================================
-    # WHERE DOES YOUR MONEY GO? - Consumer Spending & Inflation Module
-    # ============================================================================
-    # Import canonical categories and data loaders
-    from categories import (
-        CANONICAL_CATEGORIES, PCE_SERIES_MAP, CPI_SERIES_MAP,
-        CPI_WEIGHTS, BLS_CEX_2023, get_category_color, get_category_icon
-    )
+        # ============================================================================
+        # WHERE DOES YOUR MONEY GO? - Consumer Spending & Inflation Module
+        # ============================================================================
+        # Import canonical categories and data loaders
+        from categories import (
+            CANONICAL_CATEGORIES, PCE_SERIES_MAP, CPI_SERIES_MAP,
+            CPI_WEIGHTS, BLS_CEX_2023, get_category_color, get_category_icon
+        )
 
-    st.subheader("💰 Where Does Your Money Go?")
-    st.markdown("""
+        st.subheader("💰 Where Does Your Money Go?")
+        st.markdown("""
     This section answers: *Where does the average American's spending go, and how has inflation changed those buckets?*
 
     **Important distinction:** PCE (Personal Consumption Expenditures) includes third-party payments (employer health insurance,
@@ -2387,130 +2580,213 @@ elif page == "Inflation Monitor":
     actually pay out-of-pocket. PCE per household is ~$159k/year; out-of-pocket is ~$78k/year.
     """)
 
-    # ========== PART A: Spending Breakdown ==========
-    st.markdown("### Part A: Consumer Spending Breakdown")
+        # ========== PART A: Spending Breakdown ==========
+        st.markdown("### Part A: Consumer Spending Breakdown")
 
-    # Spending basis toggle
-    spending_basis = st.radio(
-        "Spending Measure:",
-        ["PCE (National Accounts)", "Out-of-pocket (BLS CEX)"],
-        horizontal=True,
-        key="spending_basis",
-        help="PCE includes third-party payments & imputed values. BLS CEX is actual out-of-pocket spending."
-    )
+        # Spending basis toggle
+        spending_basis = st.radio(
+            "Spending Measure:",
+            ["PCE (National Accounts)", "Out-of-pocket (BLS CEX)"],
+            horizontal=True,
+            key="spending_basis",
+            help="PCE includes third-party payments & imputed values. BLS CEX is actual out-of-pocket spending."
+        )
 
-    if spending_basis == "PCE (National Accounts)":
-        # ===== PCE-based spending =====
-        st.caption("*PCE per household includes employer-paid insurance, imputed rent for homeowners, and other non-cash items.*")
-
-        # Controls
-        ctrl_col1, ctrl_col2 = st.columns(2)
-        with ctrl_col1:
-            pce_view = st.radio("View:", ["Per Household", "Per Capita", "Total ($B)"], horizontal=True, key="pce_view")
-        with ctrl_col2:
-            show_pct = st.checkbox("Show as % of total", key="pce_pct")
-
-        # Fetch PCE data
-        total_pce_data = fetch_api("/api/indicators/PCE/latest", silent=True)
-        total_pce_billions = total_pce_data.get('latest_value', 0) if total_pce_data else 0
-        pce_timestamp = total_pce_data.get('timestamp', '') if total_pce_data else ''
-
-        hh_data = fetch_api("/api/indicators/TTLHH/latest", silent=True)
-        if not hh_data or not hh_data.get('latest_value'):
-            hh_data = fetch_api("/api/indicators/TTLHHM156N/latest", silent=True)
-        households = hh_data.get('latest_value', 0) if hh_data else 0  # thousands
-
-        pop_data = fetch_api("/api/indicators/POPTHM/latest", silent=True)
-        if not pop_data or not pop_data.get('latest_value'):
-            pop_data = fetch_api("/api/indicators/POP/latest", silent=True)
-        population = pop_data.get('latest_value', 0) if pop_data else 0  # thousands
-
-        # Fetch category data using canonical mapping
-        spending_data = []
-        for series_id, category in PCE_SERIES_MAP.items():
-            data = fetch_api(f"/api/indicators/{series_id}/latest", silent=True)
-            if data and data.get('latest_value'):
-                cat_info = CANONICAL_CATEGORIES.get(category, {})
-                spending_data.append({
-                    "category": category,
-                    "value_billions": data['latest_value'],
-                    "color": cat_info.get("color", "#718096"),
-                    "icon": cat_info.get("icon", "📦"),
-                    "description": cat_info.get("description", ""),
-                })
+        if spending_basis == "PCE (National Accounts)":
+            # ===== PCE-based spending =====
+            st.caption("*PCE per household includes employer-paid insurance, imputed rent for homeowners, and other non-cash items.*")
+
+            # Controls
+            ctrl_col1, ctrl_col2 = st.columns(2)
+            with ctrl_col1:
+                pce_view = st.radio("View:", ["Per Household", "Per Capita", "Total ($B)"], horizontal=True, key="pce_view")
+            with ctrl_col2:
+                show_pct = st.checkbox("Show as % of total", key="pce_pct")
+
+            # Fetch PCE totals, household/population counts and all categories in one request
+            try:
+                pce_latest = get_client().latest_many(
+                    ["PCE", "TTLHH", "TTLHHM156N", "POPTHM", "POP"] + list(PCE_SERIES_MAP)
+                )
+            except Exception:
+                pce_latest = {}
+
+            total_pce_data = pce_latest.get("PCE")
+            total_pce_billions = total_pce_data.get('latest_value', 0) if total_pce_data else 0
+            pce_timestamp = total_pce_data.get('timestamp', '') if total_pce_data else ''
+
+            hh_data = pce_latest.get("TTLHH")
+            if not hh_data or not hh_data.get('latest_value'):
+                hh_data = pce_latest.get("TTLHHM156N")
+            households = hh_data.get('latest_value', 0) if hh_data else 0  # thousands
+
+            pop_data = pce_latest.get("POPTHM")
+            if not pop_data or not pop_data.get('latest_value'):
+                pop_data = pce_latest.get("POP")
+            population = pop_data.get('latest_value', 0) if pop_data else 0  # thousands
+
+            # Category data using canonical mapping
+            spending_data = []
+            for series_id, category in PCE_SERIES_MAP.items():
+                data = pce_latest.get(series_id)
+                if data and data.get('latest_value'):
+                    cat_info = CANONICAL_CATEGORIES.get(category, {})
+                    spending_data.append({
+                        "category": category,
+                        "value_billions": data['latest_value'],
+                        "color": cat_info.get("color", "#718096"),
+                        "icon": cat_info.get("icon", "📦"),
+                        "description": cat_info.get("description", ""),
+                    })
+
+            if spending_data and total_pce_billions > 0:
+                spend_df = pd.DataFrame(spending_data)
+
+                # Calculate "Other" as remainder
+                detailed_total = spend_df['value_billions'].sum()
+                other_billions = total_pce_billions - detailed_total
+                if other_billions > 50:  # Only show if significant
+                    spend_df = pd.concat([spend_df, pd.DataFrame([{
+                        "category": "Other (Education, Telecom, etc.)",
+                        "value_billions": other_billions,
+                        "color": "#4A5568",
+                        "icon": "📦",
+                        "description": "Education, communication, personal care, misc services",
+                    }])], ignore_index=True)
+
+                # Calculate per-unit values
+                if households > 0:
+                    spend_df['per_household'] = (spend_df['value_billions'] * 1e9) / (households * 1e3)
+                if population > 0:
+                    spend_df['per_capita'] = (spend_df['value_billions'] * 1e9) / (population * 1e3)
+                spend_df['pct_of_total'] = (spend_df['value_billions'] / total_pce_billions) * 100
+
+                # Determine display column
+                if pce_view == "Per Household" and households > 0:
+                    value_col = 'per_household'
+                    value_label = "Annual $ per Household"
+                    divisor_count = households * 1e3
+                elif pce_view == "Per Capita" and population > 0:
+                    value_col = 'per_capita'
+                    value_label = "Annual $ per Person"
+                    divisor_count = population * 1e3
+                else:
+                    value_col = 'value_billions'
+                    value_label = "Total ($B)"
+                    divisor_count = 1
+
+                # Sort and prepare display
+                spend_df = spend_df.sort_values(value_col, ascending=True)
+                spend_df['display_label'] = spend_df.apply(lambda r: f"{r['icon']} {r['category']}", axis=1)
+
+                # Create chart
+                if show_pct:
+                    x_vals = spend_df['pct_of_total']
+                    text_vals = [f"{v:.1f}%" for v in x_vals]
+                    x_title = "% of Total PCE"
+                elif value_col == 'value_billions':
+                    x_vals = spend_df[value_col]
+                    text_vals = [f"${v:,.0f}B" for v in x_vals]
+                    x_title = "Billions of Dollars"
+                else:
+                    x_vals = spend_df[value_col]
+                    text_vals = [f"${v:,.0f}" for v in x_vals]
+                    x_title = value_label
+
+                fig = go.Figure(go.Bar(
+                    x=x_vals,
+                    y=spend_df['display_label'],
+                    orientation='h',
+                    marker_color=spend_df['color'].tolist(),
+                    text=text_vals,
+                    textposition='outside',
+                    hovertemplate="<b>%{y}</b><br>" +
+                                  f"Value: %{{x:,.0f}}<br>" +
+                                  "% of Total: %{customdata:.1f}%<extra></extra>",
+                    customdata=spend_df['pct_of_total']
+                ))
+                fig.update_layout(
+                    title=f"PCE Spending by Category ({value_label})",
+                    xaxis_title=x_title,
+                    yaxis_title="",
+                    template='plotly_dark',
+                    height=max(450, len(spend_df) * 38),
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    xaxis=dict(gridcolor='#2D3748'),
+                    margin=dict(l=10, r=80)
+                )
+                st.plotly_chart(fig, use_container_width=True)
+
+                # Summary metrics
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Total PCE", f"${total_pce_billions:,.0f}B")
+                with col2:
+                    if households > 0:
+                        pce_per_hh = (total_pce_billions * 1e9) / (households * 1e3)
+                        st.metric("PCE per Household", f"${pce_per_hh:,.0f}/yr")
+                with col3:
+                    if population > 0:
+                        pce_per_cap = (total_pce_billions * 1e9) / (population * 1e3)
+                        st.metric("PCE per Capita", f"${pce_per_cap:,.0f}/yr")
+                with col4:
+                    st.metric("US Households", f"{households/1e3:.1f}M")
+
+                # Data provenance
+                st.caption(f"*Data: BEA Personal Consumption Expenditures via FRED. PCE data as of {pce_timestamp[:10] if pce_timestamp else 'N/A'}.*")
 
-        if spending_data and total_pce_billions > 0:
-            spend_df = pd.DataFrame(spending_data)
-
-            # Calculate "Other" as remainder
-            detailed_total = spend_df['value_billions'].sum()
-            other_billions = total_pce_billions - detailed_total
-            if other_billions > 50:  # Only show if significant
-                spend_df = pd.concat([spend_df, pd.DataFrame([{
-                    "category": "Other (Education, Telecom, etc.)",
-                    "value_billions": other_billions,
-                    "color": "#4A5568",
-                    "icon": "📦",
-                    "description": "Education, communication, personal care, misc services",
-                }])], ignore_index=True)
-
-            # Calculate per-unit values
-            if households > 0:
-                spend_df['per_household'] = (spend_df['value_billions'] * 1e9) / (households * 1e3)
-            if population > 0:
-                spend_df['per_capita'] = (spend_df['value_billions'] * 1e9) / (population * 1e3)
-            spend_df['pct_of_total'] = (spend_df['value_billions'] / total_pce_billions) * 100
-
-            # Determine display column
-            if pce_view == "Per Household" and households > 0:
-                value_col = 'per_household'
-                value_label = "Annual $ per Household"
-                divisor_count = households * 1e3
-            elif pce_view == "Per Capita" and population > 0:
-                value_col = 'per_capita'
-                value_label = "Annual $ per Person"
-                divisor_count = population * 1e3
             else:
-                value_col = 'value_billions'
-                value_label = "Total ($B)"
-                divisor_count = 1
+                st.info("PCE spending data not yet loaded. Click 'Refresh FRED' in the sidebar.")
+
+        else:
+            # ===== BLS Consumer Expenditure Survey (Out-of-pocket) =====
+            st.caption("*Out-of-pocket spending per consumer unit (≈ household). Excludes employer-paid benefits and imputed values.*")
+
+            bls_data = BLS_CEX_2023
+            total_expenditure = bls_data["total"]
+            categories = bls_data["categories"]
+
+            # Build dataframe
+            bls_df = pd.DataFrame([
+                {
+                    "category": cat,
+                    "value": val,
+                    "color": CANONICAL_CATEGORIES.get(cat, {}).get("color", "#718096"),
+                    "icon": CANONICAL_CATEGORIES.get(cat, {}).get("icon", "📦"),
+                    "pct": (val / total_expenditure) * 100
+                }
+                for cat, val in categories.items()
+            ])
+            bls_df = bls_df.sort_values('value', ascending=True)
+            bls_df['display_label'] = bls_df.apply(lambda r: f"{r['icon']} {r['category']}", axis=1)
 
-            # Sort and prepare display
-            spend_df = spend_df.sort_values(value_col, ascending=True)
-            spend_df['display_label'] = spend_df.apply(lambda r: f"{r['icon']} {r['category']}", axis=1)
+            # Controls
+            show_pct_bls = st.checkbox("Show as % of total", key="bls_pct")
 
-            # Create chart
-            if show_pct:
-                x_vals = spend_df['pct_of_total']
+            if show_pct_bls:
+                x_vals = bls_df['pct']
                 text_vals = [f"{v:.1f}%" for v in x_vals]
-                x_title = "% of Total PCE"
-            elif value_col == 'value_billions':
-                x_vals = spend_df[value_col]
-                text_vals = [f"${v:,.0f}B" for v in x_vals]
-                x_title = "Billions of Dollars"
+                x_title = "% of Total Expenditure"
             else:
-                x_vals = spend_df[value_col]
+                x_vals = bls_df['value']
                 text_vals = [f"${v:,.0f}" for v in x_vals]
-                x_title = value_label
+                x_title = "Annual $ per Consumer Unit"
 
             fig = go.Figure(go.Bar(
                 x=x_vals,
-                y=spend_df['display_label'],
+                y=bls_df['display_label'],
                 orientation='h',
-                marker_color=spend_df['color'].tolist(),
+                marker_color=bls_df['color'].tolist(),
                 text=text_vals,
-                textposition='outside',
-                hovertemplate="<b>%{y}</b><br>" +
-                              f"Value: %{{x:,.0f}}<br>" +
-                              "% of Total: %{customdata:.1f}%<extra></extra>",
-                customdata=spend_df['pct_of_total']
+                textposition='outside'
             ))
             fig.update_layout(
-                title=f"PCE Spending by Category ({value_label})",
+                title="Out-of-Pocket Spending by Category (BLS Consumer Expenditure Survey 2023)",
                 xaxis_title=x_title,
                 yaxis_title="",
                 template='plotly_dark',
-                height=max(450, len(spend_df) * 38),
+                height=max(450, len(bls_df) * 38),
                 paper_bgcolor='rgba(0,0,0,0)',
                 plot_bgcolor='rgba(0,0,0,0)',
                 xaxis=dict(gridcolor='#2D3748'),
@@ -2518,450 +2794,334 @@ elif page == "Inflation Monitor":
             )
             st.plotly_chart(fig, use_container_width=True)
 
-            # Summary metrics
-            col1, col2, col3, col4 = st.columns(4)
+            # Summary
+            col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Total PCE", f"${total_pce_billions:,.0f}B")
+                st.metric("Total Annual Expenditure", f"${total_expenditure:,.0f}")
             with col2:
-                if households > 0:
-                    pce_per_hh = (total_pce_billions * 1e9) / (households * 1e3)
-                    st.metric("PCE per Household", f"${pce_per_hh:,.0f}/yr")
+                st.metric("Monthly Expenditure", f"${total_expenditure/12:,.0f}")
             with col3:
-                if population > 0:
-                    pce_per_cap = (total_pce_billions * 1e9) / (population * 1e3)
-                    st.metric("PCE per Capita", f"${pce_per_cap:,.0f}/yr")
-            with col4:
-                st.metric("US Households", f"{households/1e3:.1f}M")
+                st.metric("Survey Year", "2023")
 
-            # Data provenance
-            st.caption(f"*Data: BEA Personal Consumption Expenditures via FRED. PCE data as of {pce_timestamp[:10] if pce_timestamp else 'N/A'}.*")
+            st.caption("*Data: BLS Consumer Expenditure Survey. 'Consumer unit' ≈ household but not identical (can include single individuals).*")
 
-        else:
-            st.info("PCE spending data not yet loaded. Click 'Refresh FRED' in the sidebar.")
-
-    else:
-        # ===== BLS Consumer Expenditure Survey (Out-of-pocket) =====
-        st.caption("*Out-of-pocket spending per consumer unit (≈ household). Excludes employer-paid benefits and imputed values.*")
-
-        bls_data = BLS_CEX_2023
-        total_expenditure = bls_data["total"]
-        categories = bls_data["categories"]
-
-        # Build dataframe
-        bls_df = pd.DataFrame([
-            {
-                "category": cat,
-                "value": val,
-                "color": CANONICAL_CATEGORIES.get(cat, {}).get("color", "#718096"),
-                "icon": CANONICAL_CATEGORIES.get(cat, {}).get("icon", "📦"),
-                "pct": (val / total_expenditure) * 100
-            }
-            for cat, val in categories.items()
-        ])
-        bls_df = bls_df.sort_values('value', ascending=True)
-        bls_df['display_label'] = bls_df.apply(lambda r: f"{r['icon']} {r['category']}", axis=1)
-
-        # Controls
-        show_pct_bls = st.checkbox("Show as % of total", key="bls_pct")
-
-        if show_pct_bls:
-            x_vals = bls_df['pct']
-            text_vals = [f"{v:.1f}%" for v in x_vals]
-            x_title = "% of Total Expenditure"
-        else:
-            x_vals = bls_df['value']
-            text_vals = [f"${v:,.0f}" for v in x_vals]
-            x_title = "Annual $ per Consumer Unit"
-
-        fig = go.Figure(go.Bar(
-            x=x_vals,
-            y=bls_df['display_label'],
-            orientation='h',
-            marker_color=bls_df['color'].tolist(),
-            text=text_vals,
-            textposition='outside'
-        ))
-        fig.update_layout(
-            title="Out-of-Pocket Spending by Category (BLS Consumer Expenditure Survey 2023)",
-            xaxis_title=x_title,
-            yaxis_title="",
-            template='plotly_dark',
-            height=max(450, len(bls_df) * 38),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748'),
-            margin=dict(l=10, r=80)
-        )
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Summary
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Annual Expenditure", f"${total_expenditure:,.0f}")
-        with col2:
-            st.metric("Monthly Expenditure", f"${total_expenditure/12:,.0f}")
-        with col3:
-            st.metric("Survey Year", "2023")
-
-        st.caption("*Data: BLS Consumer Expenditure Survey. 'Consumer unit' ≈ household but not identical (can include single individuals).*")
-
-    st.divider()
-
-    # ========== PART B: Inflation Impact - Indexed Price Growth ==========
-    st.markdown("### Part B: Inflation Impact Over Time")
-
-    # Timeframe selector
-    inf_col1, inf_col2 = st.columns([1, 2])
-    with inf_col1:
-        timeframe = st.radio(
-            "Timeframe:",
-            ["5 Years", "10 Years", "20 Years", "30 Years"],
-            horizontal=False,
-            key="inflation_impact_range"
-        )
-    years_map = {"5 Years": 5, "10 Years": 10, "20 Years": 20, "30 Years": 30}
-    years_back = years_map[timeframe]
-    start_date_impact = datetime.now() - timedelta(days=years_back * 365)
-    end_date_display = datetime.now().strftime("%b %Y")
-    start_date_display = start_date_impact.strftime("%b %Y")
-
-    with inf_col2:
-        # Category multiselect - default to top categories
-        all_cpi_categories = list(CPI_SERIES_MAP.values())
-        default_categories = ["Shelter", "Food at home", "Food away from home", "Gasoline & fuel", "Medical care", "Vehicles"]
-        selected_categories = st.multiselect(
-            "Categories to display:",
-            options=all_cpi_categories,
-            default=[c for c in default_categories if c in all_cpi_categories],
-            key="inflation_categories"
-        )
+        st.divider()
 
-    if not selected_categories:
-        selected_categories = default_categories
+        # ========== PART B: Inflation Impact - Indexed Price Growth ==========
+        st.markdown("### Part B: Inflation Impact Over Time")
+
+        # Timeframe selector
+        inf_col1, inf_col2 = st.columns([1, 2])
+        with inf_col1:
+            timeframe = st.radio(
+                "Timeframe:",
+                ["5 Years", "10 Years", "20 Years", "30 Years"],
+                horizontal=False,
+                key="inflation_impact_range"
+            )
+        years_map = {"5 Years": 5, "10 Years": 10, "20 Years": 20, "30 Years": 30}
+        years_back = years_map[timeframe]
+        start_date_impact = datetime.now() - timedelta(days=years_back * 365)
+        end_date_display = datetime.now().strftime("%b %Y")
+        start_date_display = start_date_impact.strftime("%b %Y")
+
+        with inf_col2:
+            # Category multiselect - default to top categories
+            all_cpi_categories = list(CPI_SERIES_MAP.values())
+            default_categories = ["Shelter", "Food at home", "Food away from home", "Gasoline & fuel", "Medical care", "Vehicles"]
+            selected_categories = st.multiselect(
+                "Categories to display:",
+                options=all_cpi_categories,
+                default=[c for c in default_categories if c in all_cpi_categories],
+                key="inflation_categories"
+            )
 
-    # Fetch CPI time series for selected categories
-    inflation_series = []
-    for series_id, category in CPI_SERIES_MAP.items():
-        if category not in selected_categories:
-            continue
+        if not selected_categories:
+            selected_categories = default_categories
 
-        data = fetch_api(
-            f"/api/indicators/{series_id}/timeseries?start={start_date_impact.isoformat()}&limit=10000",
-            silent=True
-        )
-        if data and data.get('data') and len(data['data']) > 12:
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
+        # Selected CPI components and headline CPI levels as one wide frame
+        selected_series = [sid for sid, category in CPI_SERIES_MAP.items() if category in selected_categories]
+        impact_df = inflation_df[
+            inflation_df['series_id'].isin(selected_series + ["CPIAUCSL"])
+            & (inflation_df['timestamp'] >= start_date_impact)
+        ]
+        cpi_wide = impact_df.pivot(index='timestamp', columns='series_id', values='level')
 
+        def indexed_growth(series_id):
+            """Index a CPI series to 100 at its first point; returns (df, cumulative %, CAGR %)"""
+            df = cpi_wide[series_id].dropna().rename('value').reset_index()
             base_value = df.iloc[0]['value']
             end_value = df.iloc[-1]['value']
             df['indexed'] = (df['value'] / base_value) * 100
             cumulative = ((end_value / base_value) - 1) * 100
             actual_years = (df.iloc[-1]['timestamp'] - df.iloc[0]['timestamp']).days / 365.25
             cagr = ((end_value / base_value) ** (1 / actual_years) - 1) * 100 if actual_years > 0 else 0
+            return df, cumulative, cagr
+
+        inflation_series = []
+        for series_id in selected_series:
+            if series_id in cpi_wide.columns and cpi_wide[series_id].count() > 12:
+                category = CPI_SERIES_MAP[series_id]
+                df, cumulative, cagr = indexed_growth(series_id)
+                inflation_series.append({
+                    "category": category,
+                    "color": get_category_color(category),
+                    "df": df,
+                    "start_date": df.iloc[0]['timestamp'],
+                    "end_date": df.iloc[-1]['timestamp'],
+                    "cumulative": cumulative,
+                    "cagr": cagr,
+                    "weight": CPI_WEIGHTS.get(category, 0)
+                })
 
-            inflation_series.append({
-                "category": category,
-                "color": get_category_color(category),
-                "df": df,
-                "start_date": df.iloc[0]['timestamp'],
-                "end_date": df.iloc[-1]['timestamp'],
-                "cumulative": cumulative,
-                "cagr": cagr,
-                "weight": CPI_WEIGHTS.get(category, 0)
-            })
-
-    # Also fetch headline CPI
-    overall_cpi = fetch_api(
-        f"/api/indicators/CPIAUCSL/timeseries?start={start_date_impact.isoformat()}&limit=10000",
-        silent=True
-    )
-    headline_stats = None
-    if overall_cpi and overall_cpi.get('data'):
-        cpi_df = pd.DataFrame(overall_cpi['data'])
-        cpi_df['timestamp'] = pd.to_datetime(cpi_df['timestamp'])
-        cpi_df = cpi_df.sort_values('timestamp')
-        cpi_start = cpi_df.iloc[0]['value']
-        cpi_end = cpi_df.iloc[-1]['value']
-        cpi_df['indexed'] = (cpi_df['value'] / cpi_start) * 100
-        headline_cumulative = ((cpi_end / cpi_start) - 1) * 100
-        actual_years = (cpi_df.iloc[-1]['timestamp'] - cpi_df.iloc[0]['timestamp']).days / 365.25
-        headline_cagr = ((cpi_end / cpi_start) ** (1 / actual_years) - 1) * 100 if actual_years > 0 else 0
-        headline_stats = {"cumulative": headline_cumulative, "cagr": headline_cagr, "df": cpi_df}
-
-    if inflation_series:
-        # Sort by cumulative inflation
-        inflation_series = sorted(inflation_series, key=lambda x: x['cumulative'], reverse=True)
-
-        # Create indexed line chart
-        fig = go.Figure()
+        # Headline CPI
+        headline_stats = None
+        if "CPIAUCSL" in cpi_wide.columns and cpi_wide["CPIAUCSL"].count() > 0:
+            cpi_df, headline_cumulative, headline_cagr = indexed_growth("CPIAUCSL")
+            headline_stats = {"cumulative": headline_cumulative, "cagr": headline_cagr, "df": cpi_df}
 
-        # Add headline CPI first (dashed)
-        if headline_stats:
-            fig.add_trace(go.Scatter(
-                x=headline_stats['df']['timestamp'],
-                y=headline_stats['df']['indexed'],
-                mode='lines',
-                name=f"All Items CPI (+{headline_stats['cumulative']:.0f}%)",
-                line=dict(color='#E2E8F0', width=3, dash='dash'),
-            ))
+        if inflation_series:
+            # Sort by cumulative inflation
+            inflation_series = sorted(inflation_series, key=lambda x: x['cumulative'], reverse=True)
 
-        # Add category lines
-        for series in inflation_series:
-            fig.add_trace(go.Scatter(
-                x=series['df']['timestamp'],
-                y=series['df']['indexed'],
-                mode='lines',
-                name=f"{series['category']} (+{series['cumulative']:.0f}%)",
-                line=dict(color=series['color'], width=2),
-            ))
+            # Create indexed line chart
+            fig = go.Figure()
 
-        fig.add_hline(y=100, line_dash="dot", line_color="#4A5568", annotation_text="Baseline")
+            # Add headline CPI first (dashed)
+            if headline_stats:
+                fig.add_trace(line_trace(
+                    x=headline_stats['df']['timestamp'],
+                    y=headline_stats['df']['indexed'],
+                    mode='lines',
+                    name=f"All Items CPI (+{headline_stats['cumulative']:.0f}%)",
+                    line=dict(color='#E2E8F0', width=3, dash='dash'),
+                ))
 
-        fig.update_layout(
-            title=f"Cumulative Price Growth by Category ({start_date_display} - {end_date_display})",
-            xaxis_title="Date",
-            yaxis_title="Price Index (Start = 100)",
-            template='plotly_dark',
-            height=500,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748'),
-            yaxis=dict(gridcolor='#2D3748'),
-            legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
-            hovermode='x unified'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            # Add category lines
+            for series in inflation_series:
+                fig.add_trace(line_trace(
+                    x=series['df']['timestamp'],
+                    y=series['df']['indexed'],
+                    mode='lines',
+                    name=f"{series['category']} (+{series['cumulative']:.0f}%)",
+                    line=dict(color=series['color'], width=2),
+                ))
 
-        # Summary statistics table
-        st.markdown("**Summary Statistics**")
-        summary_data = []
-        if headline_stats:
-            summary_data.append({
-                "Category": "📊 All Items (CPI)",
-                f"Cumulative ({years_back}Y)": f"+{headline_stats['cumulative']:.1f}%",
-                "CAGR": f"+{headline_stats['cagr']:.2f}%",
-                "CPI Weight": "100%"
-            })
-        for series in inflation_series:
-            summary_data.append({
-                "Category": f"{get_category_icon(series['category'])} {series['category']}",
-                f"Cumulative ({years_back}Y)": f"+{series['cumulative']:.1f}%",
-                "CAGR": f"+{series['cagr']:.2f}%",
-                "CPI Weight": f"{series['weight']:.1f}%"
-            })
-
-        summary_df = pd.DataFrame(summary_data)
-        st.dataframe(summary_df, use_container_width=True, hide_index=True)
-
-        # Key metrics
-        col1, col2, col3 = st.columns(3)
-        with col1:
+            fig.add_hline(y=100, line_dash="dot", line_color="#4A5568", annotation_text="Baseline")
+
+            fig.update_layout(
+                title=f"Cumulative Price Growth by Category ({start_date_display} - {end_date_display})",
+                xaxis_title="Date",
+                yaxis_title="Price Index (Start = 100)",
+                template='plotly_dark',
+                height=500,
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(gridcolor='#2D3748'),
+                yaxis=dict(gridcolor='#2D3748'),
+                legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+                hovermode='x unified'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Summary statistics table
+            st.markdown("**Summary Statistics**")
+            summary_data = []
             if headline_stats:
-                st.metric(f"Overall CPI ({years_back}Y)", f"+{headline_stats['cumulative']:.1f}%", f"CAGR: +{headline_stats['cagr']:.2f}%")
-        with col2:
-            highest = inflation_series[0]
-            st.metric("Highest Category", highest['category'], f"+{highest['cumulative']:.0f}%")
-        with col3:
-            lowest = inflation_series[-1]
-            st.metric("Lowest Category", lowest['category'], f"+{lowest['cumulative']:.0f}%")
+                summary_data.append({
+                    "Category": "📊 All Items (CPI)",
+                    f"Cumulative ({years_back}Y)": f"+{headline_stats['cumulative']:.1f}%",
+                    "CAGR": f"+{headline_stats['cagr']:.2f}%",
+                    "CPI Weight": "100%"
+                })
+            for series in inflation_series:
+                summary_data.append({
+                    "Category": f"{get_category_icon(series['category'])} {series['category']}",
+                    f"Cumulative ({years_back}Y)": f"+{series['cumulative']:.1f}%",
+                    "CAGR": f"+{series['cagr']:.2f}%",
+                    "CPI Weight": f"{series['weight']:.1f}%"
+                })
 
-        st.caption(f"*Data: BLS Consumer Price Index via FRED. Period: {start_date_display} to {end_date_display}.*")
+            summary_df = pd.DataFrame(summary_data)
+            st.dataframe(summary_df, use_container_width=True, hide_index=True)
 
-    else:
-        st.info("CPI component data not yet loaded. Click 'Refresh FRED' in the sidebar.")
+            # Key metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if headline_stats:
+                    st.metric(f"Overall CPI ({years_back}Y)", f"+{headline_stats['cumulative']:.1f}%", f"CAGR: +{headline_stats['cagr']:.2f}%")
+            with col2:
+                highest = inflation_series[0]
+                st.metric("Highest Category", highest['category'], f"+{highest['cumulative']:.0f}%")
+            with col3:
+                lowest = inflation_series[-1]
+                st.metric("Lowest Category", lowest['category'], f"+{lowest['cumulative']:.0f}%")
 
-    st.divider()
+            st.caption(f"*Data: BLS Consumer Price Index via FRED. Period: {start_date_display} to {end_date_display}.*")
 
-    # ========== PART C: Current YoY Inflation by Category ==========
-    st.markdown("### Part C: Current Inflation by Category (YoY)")
+        else:
+            st.info("CPI component data not yet loaded. Click 'Refresh FRED' in the sidebar.")
 
-    # Calculate current YoY for each CPI category
-    yoy_data = []
-    for series_id, category in CPI_SERIES_MAP.items():
-        two_years_ago = datetime.now() - timedelta(days=730)
-        data = fetch_api(
-            f"/api/indicators/{series_id}/timeseries?start={two_years_ago.isoformat()}&limit=500",
-            silent=True
-        )
-        if data and data.get('data') and len(data['data']) >= 13:
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            current = df.iloc[-1]['value']
-            year_ago = df.iloc[-13]['value']
-            yoy = ((current - year_ago) / year_ago) * 100
-            yoy_data.append({
-                "category": category,
-                "yoy": yoy,
-                "color": get_category_color(category),
-                "weight": CPI_WEIGHTS.get(category, 0)
-            })
-
-    if yoy_data:
-        yoy_df = pd.DataFrame(yoy_data).sort_values('yoy', ascending=True)
-        yoy_df['display_label'] = yoy_df.apply(lambda r: f"{get_category_icon(r['category'])} {r['category']}", axis=1)
-
-        # Color bars by inflation level
-        bar_colors = ['#10b981' if v <= 2 else '#F6AD55' if v <= 5 else '#ef4444' for v in yoy_df['yoy']]
-
-        fig = go.Figure(go.Bar(
-            x=yoy_df['yoy'],
-            y=yoy_df['display_label'],
-            orientation='h',
-            marker_color=bar_colors,
-            text=[f"{v:+.1f}%" for v in yoy_df['yoy']],
-            textposition='outside'
-        ))
-        fig.add_vline(x=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
-        fig.update_layout(
-            title="Current Year-over-Year Inflation by Category",
-            xaxis_title="YoY Change (%)",
-            yaxis_title="",
-            template='plotly_dark',
-            height=max(350, len(yoy_df) * 40),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748'),
-            margin=dict(l=10, r=60)
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.divider()
 
-        st.caption("*Data: BLS Consumer Price Index via FRED. Green = at/below 2% target, Orange = 2-5%, Red = above 5%.*")
+        # ========== PART C: Current YoY Inflation by Category ==========
+        st.markdown("### Part C: Current Inflation by Category (YoY)")
 
-    st.divider()
+        # Calculate current YoY for each CPI category
+        yoy_data = []
+        for series_id, category in CPI_SERIES_MAP.items():
+            yoy = latest_yoy.get(series_id)
+            if yoy is not None:
+                yoy_data.append({
+                    "category": category,
+                    "yoy": yoy,
+                    "color": get_category_color(category),
+                    "weight": CPI_WEIGHTS.get(category, 0)
+                })
 
-    # ========== PART D: Contribution to YoY Inflation (Stacked) ==========
-    st.markdown("### Part D: Category Contributions to Headline Inflation")
-    st.caption("Shows how much each category contributes to total CPI inflation, weighted by importance in consumer spending.")
+        if yoy_data:
+            yoy_df = pd.DataFrame(yoy_data).sort_values('yoy', ascending=True)
+            yoy_df['display_label'] = yoy_df.apply(lambda r: f"{get_category_icon(r['category'])} {r['category']}", axis=1)
 
-    # Timeframe for contribution chart
-    contrib_timeframe = st.radio(
-        "Timeframe:",
-        ["3 Years", "5 Years", "10 Years"],
-        horizontal=True,
-        key="contrib_timeframe"
-    )
-    contrib_years = {"3 Years": 3, "5 Years": 5, "10 Years": 10}[contrib_timeframe]
-    contrib_start = datetime.now() - timedelta(days=contrib_years * 365)
-
-    # Fetch monthly YoY data for each CPI category
-    contrib_series = {}
-    for series_id, category in CPI_SERIES_MAP.items():
-        weight = CPI_WEIGHTS.get(category, 0)
-        if weight <= 0:
-            continue
-
-        data = fetch_api(
-            f"/api/indicators/{series_id}/timeseries?start={contrib_start.isoformat()}&limit=5000",
-            silent=True
-        )
-        if data and data.get('data') and len(data['data']) >= 13:
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            # Calculate YoY for each month
-            df['yoy'] = df['value'].pct_change(periods=12) * 100
-            df = df.dropna(subset=['yoy'])
-            # Calculate weighted contribution
-            df['contribution'] = df['yoy'] * (weight / 100)
-            df['category'] = category
-            contrib_series[category] = df[['timestamp', 'yoy', 'contribution', 'category']].copy()
-
-    if contrib_series:
-        # Combine all series
-        contrib_df = pd.concat(contrib_series.values(), ignore_index=True)
-
-        # Pivot for stacked area chart
-        pivot_df = contrib_df.pivot_table(
-            index='timestamp',
-            columns='category',
-            values='contribution',
-            aggfunc='mean'
-        ).reset_index()
-
-        # Get category order by average contribution (largest first)
-        category_order = contrib_df.groupby('category')['contribution'].mean().abs().sort_values(ascending=False).index.tolist()
-
-        # Create stacked area chart
-        fig = go.Figure()
+            # Color bars by inflation level
+            bar_colors = ['#10b981' if v <= 2 else '#F6AD55' if v <= 5 else '#ef4444' for v in yoy_df['yoy']]
 
-        for category in reversed(category_order):  # Reverse so largest is on bottom
-            if category in pivot_df.columns:
-                fig.add_trace(go.Scatter(
-                    x=pivot_df['timestamp'],
-                    y=pivot_df[category],
-                    mode='lines',
-                    name=category,
-                    stackgroup='one',
-                    line=dict(width=0.5),
-                    fillcolor=get_category_color(category),
-                ))
+            fig = go.Figure(go.Bar(
+                x=yoy_df['yoy'],
+                y=yoy_df['display_label'],
+                orientation='h',
+                marker_color=bar_colors,
+                text=[f"{v:+.1f}%" for v in yoy_df['yoy']],
+                textposition='outside'
+            ))
+            fig.add_vline(x=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
+            fig.update_layout(
+                title="Current Year-over-Year Inflation by Category",
+                xaxis_title="YoY Change (%)",
+                yaxis_title="",
+                template='plotly_dark',
+                height=max(350, len(yoy_df) * 40),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(gridcolor='#2D3748'),
+                margin=dict(l=10, r=60)
+            )
+            st.plotly_chart(fig, use_container_width=True)
 
-        fig.add_hline(y=0, line_dash="solid", line_color="#4A5568")
-        fig.add_hline(y=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
+            st.caption("*Data: BLS Consumer Price Index via FRED. Green = at/below 2% target, Orange = 2-5%, Red = above 5%.*")
 
-        fig.update_layout(
-            title=f"Contribution to Headline CPI Inflation by Category ({contrib_timeframe})",
-            xaxis_title="Date",
-            yaxis_title="Contribution to YoY Inflation (%)",
-            template='plotly_dark',
-            height=450,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(gridcolor='#2D3748'),
-            yaxis=dict(gridcolor='#2D3748'),
-            legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
-            hovermode='x unified'
+        st.divider()
+
+        # ========== PART D: Contribution to YoY Inflation (Stacked) ==========
+        st.markdown("### Part D: Category Contributions to Headline Inflation")
+        st.caption("Shows how much each category contributes to total CPI inflation, weighted by importance in consumer spending.")
+
+        # Timeframe for contribution chart
+        contrib_timeframe = st.radio(
+            "Timeframe:",
+            ["3 Years", "5 Years", "10 Years"],
+            horizontal=True,
+            key="contrib_timeframe"
         )
-        st.plotly_chart(fig, use_container_width=True)
+        contrib_years = {"3 Years": 3, "5 Years": 5, "10 Years": 10}[contrib_timeframe]
+        contrib_start = datetime.now() - timedelta(days=contrib_years * 365)
 
-        # Show contribution breakdown table for latest month
-        latest_month = contrib_df['timestamp'].max()
-        latest_contrib = contrib_df[contrib_df['timestamp'] == latest_month].copy()
-        latest_contrib = latest_contrib.sort_values('contribution', ascending=False)
-
-        with st.expander("View latest month contribution breakdown"):
-            table_data = []
-            for _, row in latest_contrib.iterrows():
-                table_data.append({
-                    "Category": f"{get_category_icon(row['category'])} {row['category']}",
-                    "YoY Inflation": f"{row['yoy']:+.1f}%",
-                    "CPI Weight": f"{CPI_WEIGHTS.get(row['category'], 0):.1f}%",
-                    "Contribution": f"{row['contribution']:+.2f}pp",
-                })
-            st.dataframe(pd.DataFrame(table_data), use_container_width=True, hide_index=True)
+        # Weighted monthly contributions (contribution is only set for weighted CPI components)
+        contrib_df = inflation_df[
+            inflation_df['contribution'].notna() & (inflation_df['timestamp'] >= contrib_start)
+        ][['timestamp', 'yoy', 'contribution', 'category']]
 
-        st.caption("*Contribution = Category YoY × CPI Weight. Weights are approximate (Dec 2024 relative importance). "
-                   "Categories shown cover ~75% of CPI; remainder grouped as 'Other'.*")
+        if not contrib_df.empty:
 
-    else:
-        st.info("Insufficient data for contribution analysis. Click 'Refresh FRED' in the sidebar.")
+            # Pivot for stacked area chart
+            pivot_df = contrib_df.pivot_table(
+                index='timestamp',
+                columns='category',
+                values='contribution',
+                aggfunc='mean'
+            ).reset_index()
 
-    st.divider()
+            # Get category order by average contribution (largest first)
+            category_order = contrib_df.groupby('category')['contribution'].mean().abs().sort_values(ascending=False).index.tolist()
 
-    # Inflation expectations
-    st.subheader("Market Inflation Expectations (10Y Breakeven)")
-    breakeven_data = fetch_api(f"/api/indicators/T10YIE/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-    if breakeven_data and breakeven_data.get('data'):
-        df = pd.DataFrame(breakeven_data['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value'], mode='lines', fill='tozeroy',
-                                 fillcolor='rgba(139, 92, 246, 0.15)', line=dict(color='#8b5cf6', width=2)))
-        fig.add_hline(y=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
-        fig.update_layout(xaxis_title="Date", yaxis_title="Breakeven Rate (%)", template='plotly_dark', height=400,
-                         paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
-        st.plotly_chart(fig, use_container_width=True)
+            # Create stacked area chart
+            fig = go.Figure()
 
-# Page: Recession Watch
-elif page == "Recession Watch":
-    st.header("🚨 Recession Watch Dashboard")
+            for category in reversed(category_order):  # Reverse so largest is on bottom
+                if category in pivot_df.columns:
+                    fig.add_trace(line_trace(
+                        x=pivot_df['timestamp'],
+                        y=pivot_df[category],
+                        mode='lines',
+                        name=category,
+                        stackgroup='one',
+                        line=dict(width=0.5),
+                        fillcolor=get_category_color(category),
+                    ))
 
-    # Comprehensive explanation
-    st.markdown("""
+            fig.add_hline(y=0, line_dash="solid", line_color="#4A5568")
+            fig.add_hline(y=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
+
+            fig.update_layout(
+                title=f"Contribution to Headline CPI Inflation by Category ({contrib_timeframe})",
+                xaxis_title="Date",
+                yaxis_title="Contribution to YoY Inflation (%)",
+                template='plotly_dark',
+                height=450,
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(gridcolor='#2D3748'),
+                yaxis=dict(gridcolor='#2D3748'),
+                legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+                hovermode='x unified'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Show contribution breakdown table for latest month
+            latest_month = contrib_df['timestamp'].max()
+            latest_contrib = contrib_df[contrib_df['timestamp'] == latest_month].copy()
+            latest_contrib = latest_contrib.sort_values('contribution', ascending=False)
+
+            with st.expander("View latest month contribution breakdown"):
+                table_data = []
+                for _, row in latest_contrib.iterrows():
+                    table_data.append({
+                        "Category": f"{get_category_icon(row['category'])} {row['category']}",
+                        "YoY Inflation": f"{row['yoy']:+.1f}%",
+                        "CPI Weight": f"{CPI_WEIGHTS.get(row['category'], 0):.1f}%",
+                        "Contribution": f"{row['contribution']:+.2f}pp",
+                    })
+                st.dataframe(pd.DataFrame(table_data), use_container_width=True, hide_index=True)
+
+            st.caption("*Contribution = Category YoY × CPI Weight. Weights are approximate (Dec 2024 relative importance). "
+                       "Categories shown cover ~75% of CPI; remainder grouped as 'Other'.*")
+
+        else:
+            st.info("Insufficient data for contribution analysis. Click 'Refresh FRED' in the sidebar.")
+
+        st.divider()
+
+        # Inflation expectations
+        st.subheader("Market Inflation Expectations (10Y Breakeven)")
+        breakeven_data = fetch_api(f"/api/indicators/T10YIE/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+        if breakeven_data and breakeven_data.get('data'):
+            df = pd.DataFrame(breakeven_data['data'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            fig = go.Figure()
+            fig.add_trace(line_trace(x=df['timestamp'], y=df['value'], mode='lines', fill='tozeroy',
+                                     fillcolor='rgba(139, 92, 246, 0.15)', line=dict(color='#8b5cf6', width=2)))
+            fig.add_hline(y=2, line_dash="dash", line_color="#10b981", annotation_text="2% Target")
+            fig.update_layout(xaxis_title="Date", yaxis_title="Breakeven Rate (%)", template='plotly_dark', height=400,
+                             paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
+            st.plotly_chart(fig, use_container_width=True)
+
+    # Page: Recession Watch
+    elif page == "Recession Watch":
+        st.header("🚨 Recession Watch Dashboard")
+
+        # Comprehensive explanation
+        st.markdown("""
     ### Reading the Economic Tea Leaves: Recession Indicators
 
     A recession is officially defined as a "significant decline in economic activity spread across the economy, lasting more
@@ -2996,157 +3156,215 @@ elif page == "Recession Watch":
     probability by seeing the real-time data that professional economists watch.
     """)
 
-    recession_data = fetch_api("/api/dashboards/recession-watch")
-    if recession_data:
-        # Display metrics
-        create_metric_cards(recession_data['indicators'])
+        recession_data = fetch_api("/api/dashboards/recession-watch")
+        if recession_data:
+            # Display metrics
+            create_metric_cards(recession_data['indicators'])
 
-    st.divider()
+        st.divider()
 
-    # Time range selector
-    time_range = st.selectbox("Time Range", ["5 Years", "10 Years", "20 Years", "30 Years", "Max"], index=2, key="recession_range")
-    days_map = {"5 Years": 1825, "10 Years": 3650, "20 Years": 7300, "30 Years": 10950, "Max": 20000}
-    start_date = datetime.now() - timedelta(days=days_map[time_range])
+        # Time range selector
+        time_range = st.selectbox("Time Range", ["5 Years", "10 Years", "20 Years", "30 Years", "Max"], index=2, key="recession_range")
+        days_map = {"5 Years": 1825, "10 Years": 3650, "20 Years": 7300, "30 Years": 10950, "Max": 20000}
+        start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-    col1, col2 = st.columns(2)
+        # Recession models (computed at ingest time and stored as regular indicators)
+        models = recession_data.get('models', {}) if recession_data else {}
+        if models:
+            st.subheader("🧮 Recession Risk Models")
+            col1, col2, col3 = st.columns(3)
 
-    with col1:
-        # Yield Curve
-        st.subheader("📉 Yield Curve (10Y-2Y Spread)")
-        yield_data = fetch_api(f"/api/indicators/T10Y2Y/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-        if yield_data and yield_data.get('data'):
-            df = pd.DataFrame(yield_data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            probability = models.get("RECPROB_TERMSPREAD")
+            if probability:
+                with col1:
+                    st.metric("Recession Probability (12M)", f"{probability['latest_value']:.0f}%",
+                             delta="Elevated" if probability['latest_value'] >= 30 else "Low",
+                             delta_color="inverse" if probability['latest_value'] >= 30 else "normal",
+                             help="Probit on the 10Y-3M Treasury spread (NY Fed method)")
+
+            sahm = models.get("SAHM_INDICATOR")
+            if sahm:
+                with col2:
+                    st.metric("Sahm Rule", f"{sahm['latest_value']:.2f}pp",
+                             delta="Triggered" if sahm['latest_value'] >= 0.5 else "Not triggered",
+                             delta_color="inverse" if sahm['latest_value'] >= 0.5 else "normal",
+                             help="3-month average unemployment minus its prior 12-month low; 0.5pp or more signals recession")
+
+            leading = models.get("LEADING_INDEX")
+            if leading:
+                with col3:
+                    st.metric("Leading Index", f"{leading['latest_value']:+.2f}",
+                             delta="Weakening" if leading['latest_value'] < 0 else "Strengthening",
+                             delta_color="inverse" if leading['latest_value'] < 0 else "normal",
+                             help="Average 10-year z-score of leading indicators (0 = typical)")
 
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'],
-                y=df['value'],
-                mode='lines',
-                fill='tozeroy',
-                fillcolor='rgba(255, 99, 99, 0.2)',
-                line=dict(color='#ef4444', width=2),
-                name='Yield Spread'
-            ))
+            try:
+                model_history = get_client().timeseries_many(list(models), start=start_date)
+            except Exception:
+                model_history = pd.DataFrame()
 
-            fig.add_hline(y=0, line_dash="dash", line_color="#E2E8F0", annotation_text="Inversion Line")
+            if not model_history.empty:
+                fig = go.Figure()
+                if "RECPROB_TERMSPREAD" in model_history.columns:
+                    series = model_history["RECPROB_TERMSPREAD"].dropna()
+                    fig.add_trace(line_trace(x=series.index, y=series.values, mode='lines', name="Recession Probability (%)",
+                                             fill='tozeroy', fillcolor='rgba(239, 68, 68, 0.15)',
+                                             line=dict(color='#ef4444', width=2)))
+                if "SAHM_INDICATOR" in model_history.columns:
+                    series = model_history["SAHM_INDICATOR"].dropna()
+                    fig.add_trace(line_trace(x=series.index, y=series.values, mode='lines', name="Sahm Indicator (pp)",
+                                             yaxis='y2', line=dict(color='#F6AD55', width=2)))
+                    fig.add_shape(type="line", xref="paper", x0=0, x1=1, yref="y2", y0=0.5, y1=0.5,
+                                  line=dict(color="#F6AD55", dash="dash", width=1))
+                fig.update_layout(template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)',
+                                  plot_bgcolor='rgba(0,0,0,0)', hovermode='x unified',
+                                  xaxis=dict(gridcolor='#2D3748'),
+                                  yaxis=dict(gridcolor='#2D3748', title="Probability (%)"),
+                                  yaxis2=dict(title="Sahm (pp)", overlaying='y', side='right', showgrid=False),
+                                  legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5))
+                st.plotly_chart(fig, use_container_width=True)
 
-            fig.update_layout(
-                xaxis_title="Date", yaxis_title="Spread (%)", hovermode='x unified',
-                template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748')
-            )
+            st.divider()
 
-            st.plotly_chart(fig, use_container_width=True)
+        col1, col2 = st.columns(2)
 
-            current_value = df.iloc[-1]['value']
-            if current_value < 0:
-                st.warning("⚠️ Yield curve is inverted - recession risk elevated")
-            else:
-                st.success("✅ Yield curve is normal")
+        with col1:
+            # Yield Curve
+            st.subheader("📉 Yield Curve (10Y-2Y Spread)")
+            yield_data = fetch_api(f"/api/indicators/T10Y2Y/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+            if yield_data and yield_data.get('data'):
+                df = pd.DataFrame(yield_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
 
-        # Housing Starts
-        st.subheader("🏠 Housing Starts")
-        housing_data = fetch_api(f"/api/indicators/HOUST/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-        if housing_data and housing_data.get('data'):
-            df = pd.DataFrame(housing_data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value'], mode='lines',
-                                     fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.1)', line=dict(color='#14b8a6', width=2)))
-            fig.update_layout(xaxis_title="Date", yaxis_title="Thousands of Units", template='plotly_dark', height=350,
-                             paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
-            st.plotly_chart(fig, use_container_width=True)
+                fig = go.Figure()
+                fig.add_trace(line_trace(
+                    x=df['timestamp'],
+                    y=df['value'],
+                    mode='lines',
+                    fill='tozeroy',
+                    fillcolor='rgba(255, 99, 99, 0.2)',
+                    line=dict(color='#ef4444', width=2),
+                    name='Yield Spread'
+                ))
 
-    with col2:
-        # Unemployment Rate
-        st.subheader("👷 Unemployment Rate")
-        unemp_data = fetch_api(f"/api/indicators/UNRATE/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-        if unemp_data and unemp_data.get('data'):
-            df = pd.DataFrame(unemp_data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value'], mode='lines',
-                                     fill='tozeroy', fillcolor='rgba(246, 173, 85, 0.15)', line=dict(color='#F6AD55', width=2)))
-            fig.update_layout(xaxis_title="Date", yaxis_title="Percent", template='plotly_dark', height=350,
-                             paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
-            st.plotly_chart(fig, use_container_width=True)
+                fig.add_hline(y=0, line_dash="dash", line_color="#E2E8F0", annotation_text="Inversion Line")
+
+                fig.update_layout(
+                    xaxis_title="Date", yaxis_title="Spread (%)", hovermode='x unified',
+                    template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                    xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748')
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+                current_value = df.iloc[-1]['value']
+                if current_value < 0:
+                    st.warning("⚠️ Yield curve is inverted - recession risk elevated")
+                else:
+                    st.success("✅ Yield curve is normal")
+
+            # Housing Starts
+            st.subheader("🏠 Housing Starts")
+            housing_data = fetch_api(f"/api/indicators/HOUST/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+            if housing_data and housing_data.get('data'):
+                df = pd.DataFrame(housing_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                fig = go.Figure()
+                fig.add_trace(line_trace(x=df['timestamp'], y=df['value'], mode='lines',
+                                         fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.1)', line=dict(color='#14b8a6', width=2)))
+                fig.update_layout(xaxis_title="Date", yaxis_title="Thousands of Units", template='plotly_dark', height=350,
+                                 paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                 xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
+                st.plotly_chart(fig, use_container_width=True)
+
+        with col2:
+            # Unemployment Rate
+            st.subheader("👷 Unemployment Rate")
+            unemp_data = fetch_api(f"/api/indicators/UNRATE/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+            if unemp_data and unemp_data.get('data'):
+                df = pd.DataFrame(unemp_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                fig = go.Figure()
+                fig.add_trace(line_trace(x=df['timestamp'], y=df['value'], mode='lines',
+                                         fill='tozeroy', fillcolor='rgba(246, 173, 85, 0.15)', line=dict(color='#F6AD55', width=2)))
+                fig.update_layout(xaxis_title="Date", yaxis_title="Percent", template='plotly_dark', height=350,
+                                 paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                 xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
+                st.plotly_chart(fig, use_container_width=True)
 
-        # Consumer Sentiment
-        st.subheader("😊 Consumer Sentiment")
-        sentiment_data = fetch_api(f"/api/indicators/UMCSENT/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-        if sentiment_data and sentiment_data.get('data'):
-            df = pd.DataFrame(sentiment_data['data'])
+            # Consumer Sentiment
+            st.subheader("😊 Consumer Sentiment")
+            sentiment_data = fetch_api(f"/api/indicators/UMCSENT/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+            if sentiment_data and sentiment_data.get('data'):
+                df = pd.DataFrame(sentiment_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                fig = go.Figure()
+                fig.add_trace(line_trace(x=df['timestamp'], y=df['value'], mode='lines',
+                                         fill='tozeroy', fillcolor='rgba(139, 92, 246, 0.15)', line=dict(color='#8b5cf6', width=2)))
+                fig.update_layout(xaxis_title="Date", yaxis_title="Index", template='plotly_dark', height=350,
+                                 paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                 xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
+                st.plotly_chart(fig, use_container_width=True)
+
+        # Industrial Production
+        st.subheader("🏭 Industrial Production")
+        indpro_data = fetch_api(f"/api/indicators/INDPRO/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+        if indpro_data and indpro_data.get('data'):
+            df = pd.DataFrame(indpro_data['data'])
             df['timestamp'] = pd.to_datetime(df['timestamp'])
             fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value'], mode='lines',
-                                     fill='tozeroy', fillcolor='rgba(139, 92, 246, 0.15)', line=dict(color='#8b5cf6', width=2)))
-            fig.update_layout(xaxis_title="Date", yaxis_title="Index", template='plotly_dark', height=350,
+            fig.add_trace(line_trace(x=df['timestamp'], y=df['value'], mode='lines',
+                                     fill='tozeroy', fillcolor='rgba(183, 148, 244, 0.15)', line=dict(color='#B794F4', width=2)))
+            fig.update_layout(xaxis_title="Date", yaxis_title="Index (2017=100)", template='plotly_dark', height=350,
                              paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
                              xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
             st.plotly_chart(fig, use_container_width=True)
 
-    # Industrial Production
-    st.subheader("🏭 Industrial Production")
-    indpro_data = fetch_api(f"/api/indicators/INDPRO/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-    if indpro_data and indpro_data.get('data'):
-        df = pd.DataFrame(indpro_data['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value'], mode='lines',
-                                 fill='tozeroy', fillcolor='rgba(183, 148, 244, 0.15)', line=dict(color='#B794F4', width=2)))
-        fig.update_layout(xaxis_title="Date", yaxis_title="Index (2017=100)", template='plotly_dark', height=350,
-                         paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
-        st.plotly_chart(fig, use_container_width=True)
-
-# Page: Market Overview
-elif page == "Market Overview":
-    st.header("📈 Comprehensive Market Overview")
+    # Page: Market Overview
+    elif page == "Market Overview":
+        st.header("📈 Comprehensive Market Overview")
 
-    st.markdown("""
+        st.markdown("""
     This page provides a thorough analysis of market conditions across multiple dimensions: breadth, style factors,
     international exposure, fixed income, volatility, valuations, positioning, commodities, correlations, and technicals.
     Use the time range selector below to adjust all charts simultaneously.
     """)
 
-    # Global time range selector
-    st.divider()
-    time_range = st.selectbox(
-        "Time Range (applies to all charts)",
-        ["1 Month", "3 Months", "6 Months", "1 Year", "2 Years", "5 Years", "10 Years", "Max"],
-        index=3,
-        key="mkt_time_range"
-    )
-    days_map = {"1 Month": 30, "3 Months": 90, "6 Months": 180, "1 Year": 365,
-                "2 Years": 730, "5 Years": 1825, "10 Years": 3650, "Max": 15000}
-    mkt_start_date = datetime.now() - timedelta(days=days_map[time_range])
-
-    # Helper function to get return
-    def get_return(series_id, days=None):
-        """Calculate return for a series over specified days or full period."""
-        data = fetch_api(f"/api/indicators/{series_id}/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
-        if data and data.get('data') and len(data['data']) > 1:
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            if days and len(df) > days:
-                start_val = df.iloc[-days-1]['value']
-            else:
-                start_val = df.iloc[0]['value']
-            end_val = df.iloc[-1]['value']
-            return ((end_val - start_val) / start_val) * 100, df
-        return None, None
+        # Global time range selector
+        st.divider()
+        time_range = st.selectbox(
+            "Time Range (applies to all charts)",
+            ["1 Month", "3 Months", "6 Months", "1 Year", "2 Years", "5 Years", "10 Years", "Max"],
+            index=3,
+            key="mkt_time_range"
+        )
+        days_map = {"1 Month": 30, "3 Months": 90, "6 Months": 180, "1 Year": 365,
+                    "2 Years": 730, "5 Years": 1825, "10 Years": 3650, "Max": 15000}
+        mkt_start_date = datetime.now() - timedelta(days=days_map[time_range])
+
+        # Helper function to get return
+        def get_return(series_id, days=None):
+            """Calculate return for a series over specified days or full period."""
+            data = fetch_api(f"/api/indicators/{series_id}/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
+            if data and data.get('data') and len(data['data']) > 1:
+                df = pd.DataFrame(data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                df = df.sort_values('timestamp')
+                if days and len(df) > days:
+                    start_val = df.iloc[-days-1]['value']
+                else:
+                    start_val = df.iloc[0]['value']
+                end_val = df.iloc[-1]['value']
+                return ((end_val - start_val) / start_val) * 100, df
+            return None, None
 
-    # ============================================================================
-    # SECTION 1: MARKET BREADTH & INTERNALS
-    # ============================================================================
-    st.divider()
-    st.subheader("1. Market Breadth & Internals")
+        # ============================================================================
+        # SECTION 1: MARKET BREADTH & INTERNALS
+        # ============================================================================
+        st.divider()
+        st.subheader("1. Market Breadth & Internals")
 
-    st.markdown("""
+        st.markdown("""
     **Market breadth measures whether gains are widespread or concentrated in a few large stocks.** When the S&P 500
     rises but most stocks within it are actually falling, that's a warning sign - the rally is narrow and potentially
     fragile. The most telling breadth indicator is the comparison between the cap-weighted S&P 500 (SPY) and the
@@ -3164,66 +3382,102 @@ elif page == "Market Overview":
     mega-cap tech, a narrow market flatters your returns but also concentrates your risk.
     """)
 
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-    with col1:
-        st.markdown("**S&P 500 vs Equal-Weight (SPY vs RSP)**")
-        spy_ret, spy_df = get_return("SPY")
-        rsp_ret, rsp_df = get_return("RSP")
+        with col1:
+            st.markdown("**S&P 500 vs Equal-Weight (SPY vs RSP)**")
+            spy_ret, spy_df = get_return("SPY")
+            rsp_ret, rsp_df = get_return("RSP")
 
-        if spy_df is not None and rsp_df is not None:
-            # Normalize both to 100
-            spy_df['normalized'] = (spy_df['value'] / spy_df.iloc[0]['value']) * 100
-            rsp_df['normalized'] = (rsp_df['value'] / rsp_df.iloc[0]['value']) * 100
+            if spy_df is not None and rsp_df is not None:
+                # Normalize both to 100
+                spy_df['normalized'] = (spy_df['value'] / spy_df.iloc[0]['value']) * 100
+                rsp_df['normalized'] = (rsp_df['value'] / rsp_df.iloc[0]['value']) * 100
 
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=spy_df['timestamp'], y=spy_df['normalized'],
-                                     name=f"SPY (Cap-Weighted) {spy_ret:+.1f}%", line=dict(color='#14b8a6', width=2)))
-            fig.add_trace(go.Scatter(x=rsp_df['timestamp'], y=rsp_df['normalized'],
-                                     name=f"RSP (Equal-Weight) {rsp_ret:+.1f}%", line=dict(color='#8b5cf6', width=2)))
-            fig.update_layout(title="Cap-Weighted vs Equal-Weight S&P 500", xaxis_title="", yaxis_title="Indexed (Start=100)",
-                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
-            st.plotly_chart(fig, use_container_width=True)
+                fig = go.Figure()
+                fig.add_trace(line_trace(x=spy_df['timestamp'], y=spy_df['normalized'],
+                                         name=f"SPY (Cap-Weighted) {spy_ret:+.1f}%", line=dict(color='#14b8a6', width=2)))
+                fig.add_trace(line_trace(x=rsp_df['timestamp'], y=rsp_df['normalized'],
+                                         name=f"RSP (Equal-Weight) {rsp_ret:+.1f}%", line=dict(color='#8b5cf6', width=2)))
+                fig.update_layout(title="Cap-Weighted vs Equal-Weight S&P 500", xaxis_title="", yaxis_title="Indexed (Start=100)",
+                                 template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                 xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+                st.plotly_chart(fig, use_container_width=True)
 
-            # Breadth indicator
-            if spy_ret and rsp_ret:
-                spread = rsp_ret - spy_ret
-                if spread > 2:
-                    st.success(f"Breadth expanding: Equal-weight outperforming by {spread:.1f}pp")
-                elif spread < -2:
-                    st.warning(f"Narrow leadership: Cap-weight outperforming by {-spread:.1f}pp")
-                else:
-                    st.info(f"Breadth neutral: Spread of {spread:+.1f}pp")
-        else:
-            st.info("Breadth data not available. Click 'Refresh Market' to load RSP data.")
+                # Breadth indicator
+                if spy_ret and rsp_ret:
+                    spread = rsp_ret - spy_ret
+                    if spread > 2:
+                        st.success(f"Breadth expanding: Equal-weight outperforming by {spread:.1f}pp")
+                    elif spread < -2:
+                        st.warning(f"Narrow leadership: Cap-weight outperforming by {-spread:.1f}pp")
+                    else:
+                        st.info(f"Breadth neutral: Spread of {spread:+.1f}pp")
+            else:
+                st.info("Breadth data not available. Click 'Refresh Market' to load RSP data.")
 
-    with col2:
-        st.markdown("**Large Cap vs Small Cap (SPY vs IWM)**")
-        iwm_ret, iwm_df = get_return("IWM")
+        with col2:
+            st.markdown("**Large Cap vs Small Cap (SPY vs IWM)**")
+            iwm_ret, iwm_df = get_return("IWM")
+
+            if spy_df is not None and iwm_df is not None:
+                iwm_df['normalized'] = (iwm_df['value'] / iwm_df.iloc[0]['value']) * 100
+
+                fig = go.Figure()
+                fig.add_trace(line_trace(x=spy_df['timestamp'], y=spy_df['normalized'],
+                                         name=f"SPY (Large Cap) {spy_ret:+.1f}%", line=dict(color='#14b8a6', width=2)))
+                fig.add_trace(line_trace(x=iwm_df['timestamp'], y=iwm_df['normalized'],
+                                         name=f"IWM (Small Cap) {iwm_ret:+.1f}%", line=dict(color='#F6AD55', width=2)))
+                fig.update_layout(title="Large Cap vs Small Cap", xaxis_title="", yaxis_title="Indexed (Start=100)",
+                                 template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                 xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("Size comparison data not available.")
+
+        # Breadth across all tracked ETFs (computed server-side from the technical table)
+        try:
+            breadth_data = get_client().breadth(start=mkt_start_date)
+        except Exception:
+            breadth_data = None
 
-        if spy_df is not None and iwm_df is not None:
-            iwm_df['normalized'] = (iwm_df['value'] / iwm_df.iloc[0]['value']) * 100
+        if breadth_data and breadth_data['latest']:
+            latest_breadth = breadth_data['latest']
+            st.markdown(f"**Breadth across {latest_breadth['tickers']} tracked ETFs**")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                above_200 = latest_breadth['pct_above_ma_200']
+                st.metric("Above 200-Day MA", f"{above_200:.0f}%",
+                          "Healthy" if above_200 > 60 else "Concerning" if above_200 < 40 else "Mixed", delta_color="off")
+            with col2:
+                st.metric("Above 50-Day MA", f"{latest_breadth['pct_above_ma_50']:.0f}%")
+            with col3:
+                st.metric("Golden Cross (50 > 200)", f"{latest_breadth['pct_golden_cross']:.0f}%")
+            with col4:
+                st.metric("52-Week Highs / Lows",
+                          f"{latest_breadth['pct_52w_high']:.0f}% / {latest_breadth['pct_52w_low']:.0f}%")
 
+            history = breadth_data['history']
             fig = go.Figure()
-            fig.add_trace(go.Scatter(x=spy_df['timestamp'], y=spy_df['normalized'],
-                                     name=f"SPY (Large Cap) {spy_ret:+.1f}%", line=dict(color='#14b8a6', width=2)))
-            fig.add_trace(go.Scatter(x=iwm_df['timestamp'], y=iwm_df['normalized'],
-                                     name=f"IWM (Small Cap) {iwm_ret:+.1f}%", line=dict(color='#F6AD55', width=2)))
-            fig.update_layout(title="Large Cap vs Small Cap", xaxis_title="", yaxis_title="Indexed (Start=100)",
-                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+            fig.add_trace(line_trace(x=history.index, y=history['pct_above_ma_200'], mode='lines',
+                                     name='% Above 200-Day MA', line=dict(color='#14b8a6', width=2)))
+            fig.add_trace(line_trace(x=history.index, y=history['pct_above_ma_50'], mode='lines',
+                                     name='% Above 50-Day MA', line=dict(color='#8b5cf6', width=1.5)))
+            fig.add_hline(y=60, line_dash="dash", line_color="#48BB78", opacity=0.5)
+            fig.add_hline(y=40, line_dash="dash", line_color="#F56565", opacity=0.5)
+            fig.update_layout(title="Share of Tracked ETFs Above Their Moving Averages", xaxis_title="", yaxis_title="%",
+                              template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                              xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748', range=[0, 100]),
+                              hovermode='x unified', legend=dict(orientation="h", yanchor="bottom", y=1.02))
             st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("Size comparison data not available.")
 
-    # ============================================================================
-    # SECTION 2: STYLE & FACTOR PERFORMANCE
-    # ============================================================================
-    st.divider()
-    st.subheader("2. Style & Factor Performance")
+        # ============================================================================
+        # SECTION 2: STYLE & FACTOR PERFORMANCE
+        # ============================================================================
+        st.divider()
+        st.subheader("2. Style & Factor Performance")
 
-    st.markdown("""
+        st.markdown("""
     **Investment "factors" are characteristics that explain stock returns beyond just market exposure.** Academic
     research (Fama-French, AQR) has identified several persistent factors that have historically delivered excess
     returns: Value (cheap stocks), Growth (high earnings growth), Momentum (recent winners), Quality (profitable,
@@ -3242,63 +3496,63 @@ elif page == "Market Overview":
     "trend following" - stocks that went up tend to keep going up, until they don't. Quality captures flight-to-safety.
     """)
 
-    # Factor performance comparison
-    factors = [
-        ("VUG", "Growth", "#14b8a6"),
-        ("VTV", "Value", "#8b5cf6"),
-        ("MTUM", "Momentum", "#F6AD55"),
-        ("QUAL", "Quality", "#B794F4"),
-        ("USMV", "Low Vol", "#ef4444"),
-        ("IWM", "Small Cap", "#10b981"),
-    ]
+        # Factor performance comparison
+        factors = [
+            ("VUG", "Growth", "#14b8a6"),
+            ("VTV", "Value", "#8b5cf6"),
+            ("MTUM", "Momentum", "#F6AD55"),
+            ("QUAL", "Quality", "#B794F4"),
+            ("USMV", "Low Vol", "#ef4444"),
+            ("IWM", "Small Cap", "#10b981"),
+        ]
+
+        factor_returns = []
+        for ticker, name, color in factors:
+            ret, _ = get_return(ticker)
+            if ret is not None:
+                factor_returns.append({"Factor": name, "Return": ret, "color": color, "ticker": ticker})
+
+        if factor_returns:
+            factor_df = pd.DataFrame(factor_returns).sort_values("Return", ascending=True)
 
-    factor_returns = []
-    for ticker, name, color in factors:
-        ret, _ = get_return(ticker)
-        if ret is not None:
-            factor_returns.append({"Factor": name, "Return": ret, "color": color, "ticker": ticker})
-
-    if factor_returns:
-        factor_df = pd.DataFrame(factor_returns).sort_values("Return", ascending=True)
-
-        fig = go.Figure(go.Bar(
-            x=factor_df['Return'],
-            y=factor_df['Factor'],
-            orientation='h',
-            marker_color=factor_df['color'].tolist(),
-            text=[f"{r:+.1f}%" for r in factor_df['Return']],
-            textposition='outside'
-        ))
-        fig.update_layout(title=f"Factor Performance ({time_range})", xaxis_title="Return (%)", yaxis_title="",
-                         template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'))
-        st.plotly_chart(fig, use_container_width=True)
+            fig = go.Figure(go.Bar(
+                x=factor_df['Return'],
+                y=factor_df['Factor'],
+                orientation='h',
+                marker_color=factor_df['color'].tolist(),
+                text=[f"{r:+.1f}%" for r in factor_df['Return']],
+                textposition='outside'
+            ))
+            fig.update_layout(title=f"Factor Performance ({time_range})", xaxis_title="Return (%)", yaxis_title="",
+                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'))
+            st.plotly_chart(fig, use_container_width=True)
 
-        # Growth vs Value spread
-        growth_ret = next((f['Return'] for f in factor_returns if f['Factor'] == 'Growth'), None)
-        value_ret = next((f['Return'] for f in factor_returns if f['Factor'] == 'Value'), None)
-        if growth_ret and value_ret:
-            gv_spread = growth_ret - value_ret
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Growth vs Value Spread", f"{gv_spread:+.1f}pp",
-                         "Growth winning" if gv_spread > 0 else "Value winning")
-            with col2:
-                best = factor_df.iloc[-1]
-                st.metric("Best Factor", best['Factor'], f"{best['Return']:+.1f}%")
-            with col3:
-                worst = factor_df.iloc[0]
-                st.metric("Worst Factor", worst['Factor'], f"{worst['Return']:+.1f}%")
-    else:
-        st.info("Factor data not available. Click 'Refresh Market' to load factor ETFs.")
-
-    # ============================================================================
-    # SECTION 3: INTERNATIONAL MARKETS
-    # ============================================================================
-    st.divider()
-    st.subheader("3. International Markets")
+            # Growth vs Value spread
+            growth_ret = next((f['Return'] for f in factor_returns if f['Factor'] == 'Growth'), None)
+            value_ret = next((f['Return'] for f in factor_returns if f['Factor'] == 'Value'), None)
+            if growth_ret and value_ret:
+                gv_spread = growth_ret - value_ret
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Growth vs Value Spread", f"{gv_spread:+.1f}pp",
+                             "Growth winning" if gv_spread > 0 else "Value winning")
+                with col2:
+                    best = factor_df.iloc[-1]
+                    st.metric("Best Factor", best['Factor'], f"{best['Return']:+.1f}%")
+                with col3:
+                    worst = factor_df.iloc[0]
+                    st.metric("Worst Factor", worst['Factor'], f"{worst['Return']:+.1f}%")
+        else:
+            st.info("Factor data not available. Click 'Refresh Market' to load factor ETFs.")
 
-    st.markdown("""
+        # ============================================================================
+        # SECTION 3: INTERNATIONAL MARKETS
+        # ============================================================================
+        st.divider()
+        st.subheader("3. International Markets")
+
+        st.markdown("""
     **International diversification remains one of the few "free lunches" in investing**, though it hasn't felt that
     way for US investors over the past decade. Since 2010, the US has dramatically outperformed international
     developed and emerging markets. This outperformance has been driven by: (1) tech sector dominance (US has more
@@ -3318,47 +3572,47 @@ elif page == "Market Overview":
     sectors (financials, industrials), Japan has finally escaped deflation and is seeing corporate governance reforms.
     """)
 
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-    with col1:
-        st.markdown("**Developed Markets Comparison**")
-        developed = [("SPY", "US", "#14b8a6"), ("VGK", "Europe", "#8b5cf6"), ("EWJ", "Japan", "#F6AD55"), ("EWU", "UK", "#B794F4")]
-        fig = go.Figure()
-        for ticker, name, color in developed:
-            ret, df = get_return(ticker)
-            if df is not None:
-                df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
-                fig.add_trace(go.Scatter(x=df['timestamp'], y=df['normalized'],
-                                        name=f"{name} {ret:+.1f}%" if ret else name,
-                                        line=dict(color=color, width=2)))
-        fig.update_layout(title="US vs Developed International", xaxis_title="", yaxis_title="Indexed (Start=100)",
-                         template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            st.markdown("**Developed Markets Comparison**")
+            developed = [("SPY", "US", "#14b8a6"), ("VGK", "Europe", "#8b5cf6"), ("EWJ", "Japan", "#F6AD55"), ("EWU", "UK", "#B794F4")]
+            fig = go.Figure()
+            for ticker, name, color in developed:
+                ret, df = get_return(ticker)
+                if df is not None:
+                    df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
+                    fig.add_trace(line_trace(x=df['timestamp'], y=df['normalized'],
+                                            name=f"{name} {ret:+.1f}%" if ret else name,
+                                            line=dict(color=color, width=2)))
+            fig.update_layout(title="US vs Developed International", xaxis_title="", yaxis_title="Indexed (Start=100)",
+                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+            st.plotly_chart(fig, use_container_width=True)
 
-    with col2:
-        st.markdown("**Emerging Markets Comparison**")
-        emerging = [("EEM", "EM Broad", "#14b8a6"), ("FXI", "China", "#ef4444"), ("INDA", "India", "#10b981"), ("EWZ", "Brazil", "#F6AD55")]
-        fig = go.Figure()
-        for ticker, name, color in emerging:
-            ret, df = get_return(ticker)
-            if df is not None:
-                df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
-                fig.add_trace(go.Scatter(x=df['timestamp'], y=df['normalized'],
-                                        name=f"{name} {ret:+.1f}%" if ret else name,
-                                        line=dict(color=color, width=2)))
-        fig.update_layout(title="Emerging Markets", xaxis_title="", yaxis_title="Indexed (Start=100)",
-                         template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            st.markdown("**Emerging Markets Comparison**")
+            emerging = [("EEM", "EM Broad", "#14b8a6"), ("FXI", "China", "#ef4444"), ("INDA", "India", "#10b981"), ("EWZ", "Brazil", "#F6AD55")]
+            fig = go.Figure()
+            for ticker, name, color in emerging:
+                ret, df = get_return(ticker)
+                if df is not None:
+                    df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
+                    fig.add_trace(line_trace(x=df['timestamp'], y=df['normalized'],
+                                            name=f"{name} {ret:+.1f}%" if ret else name,
+                                            line=dict(color=color, width=2)))
+            fig.update_layout(title="Emerging Markets", xaxis_title="", yaxis_title="Indexed (Start=100)",
+                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+            st.plotly_chart(fig, use_container_width=True)
 
-    # ============================================================================
-    # SECTION 4: FIXED INCOME & CREDIT
-    # ============================================================================
-    st.divider()
-    st.subheader("4. Fixed Income & Credit Markets")
+        # ============================================================================
+        # SECTION 4: FIXED INCOME & CREDIT
+        # ============================================================================
+        st.divider()
+        st.subheader("4. Fixed Income & Credit Markets")
 
-    st.markdown("""
+        st.markdown("""
     **Fixed income is far more than "boring bonds."** The credit markets are often smarter than equity markets at
     sniffing out trouble. Credit spreads - the extra yield investors demand to hold corporate bonds over risk-free
     Treasuries - are one of the best recession indicators. When spreads widen sharply (investors demanding more
@@ -3378,65 +3632,65 @@ elif page == "Market Overview":
     correlation broke down in 2022 when both fell together, a rare and painful scenario.
     """)
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Treasury ETFs (Duration Exposure)**")
-        treasuries = [("SHY", "1-3Y Treasury", "#10b981"), ("IEF", "7-10Y Treasury", "#8b5cf6"), ("TLT", "20+Y Treasury", "#ef4444")]
-        fig = go.Figure()
-        for ticker, name, color in treasuries:
-            ret, df = get_return(ticker)
-            if df is not None:
-                df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
-                fig.add_trace(go.Scatter(x=df['timestamp'], y=df['normalized'],
-                                        name=f"{name} {ret:+.1f}%" if ret else name,
-                                        line=dict(color=color, width=2)))
-        fig.update_layout(title="Treasury ETFs by Duration", xaxis_title="", yaxis_title="Indexed (Start=100)",
-                         template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
-
-    with col2:
-        st.markdown("**Credit Markets (Risk Appetite)**")
-        credit = [("LQD", "Investment Grade", "#14b8a6"), ("HYG", "High Yield", "#F6AD55"), ("EMB", "EM Bonds", "#B794F4")]
-        fig = go.Figure()
-        for ticker, name, color in credit:
-            ret, df = get_return(ticker)
-            if df is not None:
-                df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
-                fig.add_trace(go.Scatter(x=df['timestamp'], y=df['normalized'],
-                                        name=f"{name} {ret:+.1f}%" if ret else name,
-                                        line=dict(color=color, width=2)))
-        fig.update_layout(title="Corporate & EM Bonds", xaxis_title="", yaxis_title="Indexed (Start=100)",
-                         template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
+        col1, col2 = st.columns(2)
 
-    # Credit spread from FRED
-    hy_spread = fetch_api("/api/indicators/BAMLH0A0HYM2EY/latest", silent=True)
-    ig_spread = fetch_api("/api/indicators/BAMLC0A0CM/latest", silent=True)
-    if hy_spread or ig_spread:
-        col1, col2, col3 = st.columns(3)
         with col1:
-            if hy_spread and hy_spread.get('latest_value'):
-                val = hy_spread['latest_value']
-                st.metric("High Yield Spread", f"{val:.2f}%", "Elevated" if val > 5 else "Normal")
+            st.markdown("**Treasury ETFs (Duration Exposure)**")
+            treasuries = [("SHY", "1-3Y Treasury", "#10b981"), ("IEF", "7-10Y Treasury", "#8b5cf6"), ("TLT", "20+Y Treasury", "#ef4444")]
+            fig = go.Figure()
+            for ticker, name, color in treasuries:
+                ret, df = get_return(ticker)
+                if df is not None:
+                    df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
+                    fig.add_trace(line_trace(x=df['timestamp'], y=df['normalized'],
+                                            name=f"{name} {ret:+.1f}%" if ret else name,
+                                            line=dict(color=color, width=2)))
+            fig.update_layout(title="Treasury ETFs by Duration", xaxis_title="", yaxis_title="Indexed (Start=100)",
+                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+            st.plotly_chart(fig, use_container_width=True)
+
         with col2:
-            if ig_spread and ig_spread.get('latest_value'):
-                val = ig_spread['latest_value']
-                st.metric("Investment Grade Spread", f"{val:.2f}%")
-        with col3:
-            real_rate = fetch_api("/api/indicators/DFII10/latest", silent=True)
-            if real_rate and real_rate.get('latest_value'):
-                st.metric("10Y Real Rate", f"{real_rate['latest_value']:.2f}%")
+            st.markdown("**Credit Markets (Risk Appetite)**")
+            credit = [("LQD", "Investment Grade", "#14b8a6"), ("HYG", "High Yield", "#F6AD55"), ("EMB", "EM Bonds", "#B794F4")]
+            fig = go.Figure()
+            for ticker, name, color in credit:
+                ret, df = get_return(ticker)
+                if df is not None:
+                    df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
+                    fig.add_trace(line_trace(x=df['timestamp'], y=df['normalized'],
+                                            name=f"{name} {ret:+.1f}%" if ret else name,
+                                            line=dict(color=color, width=2)))
+            fig.update_layout(title="Corporate & EM Bonds", xaxis_title="", yaxis_title="Indexed (Start=100)",
+                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+            st.plotly_chart(fig, use_container_width=True)
 
-    # ============================================================================
-    # SECTION 5: VOLATILITY & RISK SENTIMENT
-    # ============================================================================
-    st.divider()
-    st.subheader("5. Volatility & Risk Sentiment")
+        # Credit spread from FRED
+        hy_spread = fetch_api("/api/indicators/BAMLH0A0HYM2EY/latest", silent=True)
+        ig_spread = fetch_api("/api/indicators/BAMLC0A0CM/latest", silent=True)
+        if hy_spread or ig_spread:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if hy_spread and hy_spread.get('latest_value'):
+                    val = hy_spread['latest_value']
+                    st.metric("High Yield Spread", f"{val:.2f}%", "Elevated" if val > 5 else "Normal")
+            with col2:
+                if ig_spread and ig_spread.get('latest_value'):
+                    val = ig_spread['latest_value']
+                    st.metric("Investment Grade Spread", f"{val:.2f}%")
+            with col3:
+                real_rate = fetch_api("/api/indicators/DFII10/latest", silent=True)
+                if real_rate and real_rate.get('latest_value'):
+                    st.metric("10Y Real Rate", f"{real_rate['latest_value']:.2f}%")
 
-    st.markdown("""
+        # ============================================================================
+        # SECTION 5: VOLATILITY & RISK SENTIMENT
+        # ============================================================================
+        st.divider()
+        st.subheader("5. Volatility & Risk Sentiment")
+
+        st.markdown("""
     **The VIX is the market's "fear gauge"**, derived from S&P 500 options prices. It represents expected annualized
     volatility over the next 30 days. A VIX of 20 implies the market expects the S&P 500 to move about 1.25% per day
     (20% / sqrt(252 trading days)). Below 15 indicates complacency; above 30 indicates fear; above 40 is panic.
@@ -3454,74 +3708,74 @@ elif page == "Market Overview":
     is low, puts are cheap (good time to add protection).
     """)
 
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-    with col1:
-        st.markdown("**VIX (Fear Gauge)**")
-        vix_data = fetch_api(f"/api/indicators/^VIX/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
-        if not vix_data or not vix_data.get('data'):
-            vix_data = fetch_api(f"/api/indicators/VIXCLS/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
-        if vix_data and vix_data.get('data'):
-            df = pd.DataFrame(vix_data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value'], mode='lines',
-                                    fill='tozeroy', fillcolor='rgba(246, 173, 85, 0.15)',
-                                    line=dict(color='#F6AD55', width=2), name='VIX'))
-            fig.add_hline(y=20, line_dash="dash", line_color="#10b981", annotation_text="Normal (20)")
-            fig.add_hline(y=30, line_dash="dash", line_color="#ef4444", annotation_text="Elevated (30)")
-            fig.update_layout(title="VIX Volatility Index", xaxis_title="", yaxis_title="VIX Level",
-                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
-            st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            st.markdown("**VIX (Fear Gauge)**")
+            vix_data = fetch_api(f"/api/indicators/^VIX/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
+            if not vix_data or not vix_data.get('data'):
+                vix_data = fetch_api(f"/api/indicators/VIXCLS/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
+            if vix_data and vix_data.get('data'):
+                df = pd.DataFrame(vix_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                fig = go.Figure()
+                fig.add_trace(line_trace(x=df['timestamp'], y=df['value'], mode='lines',
+                                        fill='tozeroy', fillcolor='rgba(246, 173, 85, 0.15)',
+                                        line=dict(color='#F6AD55', width=2), name='VIX'))
+                fig.add_hline(y=20, line_dash="dash", line_color="#10b981", annotation_text="Normal (20)")
+                fig.add_hline(y=30, line_dash="dash", line_color="#ef4444", annotation_text="Elevated (30)")
+                fig.update_layout(title="VIX Volatility Index", xaxis_title="", yaxis_title="VIX Level",
+                                 template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                 xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
+                st.plotly_chart(fig, use_container_width=True)
 
-            current_vix = df.iloc[-1]['value']
-            avg_vix = df['value'].mean()
-            col1a, col2a = st.columns(2)
-            with col1a:
-                color = "normal" if current_vix < 25 else "inverse"
-                st.metric("Current VIX", f"{current_vix:.1f}", f"Avg: {avg_vix:.1f}", delta_color=color)
-            with col2a:
-                if current_vix > 30:
-                    st.error("Fear elevated - potential buying opportunity")
-                elif current_vix < 15:
-                    st.warning("Complacency - consider hedges")
-                else:
-                    st.success("Normal volatility regime")
+                current_vix = df.iloc[-1]['value']
+                avg_vix = df['value'].mean()
+                col1a, col2a = st.columns(2)
+                with col1a:
+                    color = "normal" if current_vix < 25 else "inverse"
+                    st.metric("Current VIX", f"{current_vix:.1f}", f"Avg: {avg_vix:.1f}", delta_color=color)
+                with col2a:
+                    if current_vix > 30:
+                        st.error("Fear elevated - potential buying opportunity")
+                    elif current_vix < 15:
+                        st.warning("Complacency - consider hedges")
+                    else:
+                        st.success("Normal volatility regime")
 
-    with col2:
-        st.markdown("**Financial Conditions Index (NFCI)**")
-        nfci_data = fetch_api(f"/api/indicators/NFCI/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
-        if nfci_data and nfci_data.get('data'):
-            df = pd.DataFrame(nfci_data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value'], mode='lines',
-                                    fill='tozeroy', fillcolor='rgba(183, 148, 244, 0.15)',
-                                    line=dict(color='#B794F4', width=2)))
-            fig.add_hline(y=0, line_dash="dash", line_color="#E2E8F0", annotation_text="Neutral (0)")
-            fig.update_layout(title="Chicago Fed Financial Conditions Index", xaxis_title="", yaxis_title="Index (0 = avg)",
-                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
-            st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            st.markdown("**Financial Conditions Index (NFCI)**")
+            nfci_data = fetch_api(f"/api/indicators/NFCI/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
+            if nfci_data and nfci_data.get('data'):
+                df = pd.DataFrame(nfci_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                fig = go.Figure()
+                fig.add_trace(line_trace(x=df['timestamp'], y=df['value'], mode='lines',
+                                        fill='tozeroy', fillcolor='rgba(183, 148, 244, 0.15)',
+                                        line=dict(color='#B794F4', width=2)))
+                fig.add_hline(y=0, line_dash="dash", line_color="#E2E8F0", annotation_text="Neutral (0)")
+                fig.update_layout(title="Chicago Fed Financial Conditions Index", xaxis_title="", yaxis_title="Index (0 = avg)",
+                                 template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                 xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
+                st.plotly_chart(fig, use_container_width=True)
 
-            current_nfci = df.iloc[-1]['value']
-            if current_nfci > 0.5:
-                st.error("Financial conditions tightening significantly")
-            elif current_nfci > 0:
-                st.warning("Financial conditions slightly tight")
+                current_nfci = df.iloc[-1]['value']
+                if current_nfci > 0.5:
+                    st.error("Financial conditions tightening significantly")
+                elif current_nfci > 0:
+                    st.warning("Financial conditions slightly tight")
+                else:
+                    st.success("Financial conditions loose (supportive of risk)")
             else:
-                st.success("Financial conditions loose (supportive of risk)")
-        else:
-            st.info("Financial conditions data not available. Click 'Refresh FRED' to load.")
+                st.info("Financial conditions data not available. Click 'Refresh FRED' to load.")
 
-    # ============================================================================
-    # SECTION 6: VALUATIONS
-    # ============================================================================
-    st.divider()
-    st.subheader("6. Market Valuations")
+        # ============================================================================
+        # SECTION 6: VALUATIONS
+        # ============================================================================
+        st.divider()
+        st.subheader("6. Market Valuations")
 
-    st.markdown("""
+        st.markdown("""
     **Valuations don't time the market, but they predict long-term returns.** High valuations (high P/E ratios)
     historically lead to lower 10-year returns, while low valuations lead to higher 10-year returns. The
     correlation is remarkably strong over long horizons but nearly useless over short horizons - expensive
@@ -3540,77 +3794,75 @@ elif page == "Market Overview":
     present value of future earnings), complicating the picture.
     """)
 
-    # Buffett Indicator components
-    col1, col2 = st.columns(2)
+        # Buffett Indicator components
+        col1, col2 = st.columns(2)
 
-    with col1:
-        # Use SPY as a proxy for total market (Wilshire 5000 was discontinued on FRED June 2024)
-        spy_data = fetch_api(f"/api/indicators/SPY/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
-        if spy_data and spy_data.get('data'):
-            df = pd.DataFrame(spy_data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value'], mode='lines',
-                                    fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.15)',
-                                    line=dict(color='#14b8a6', width=2)))
-            fig.update_layout(title="S&P 500 (SPY) - Total Market Proxy", xaxis_title="", yaxis_title="Price ($)",
-                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("Market data not available. Click 'Refresh Market' to load.")
+        with col1:
+            # Use SPY as a proxy for total market (Wilshire 5000 was discontinued on FRED June 2024)
+            spy_data = fetch_api(f"/api/indicators/SPY/timeseries?start={mkt_start_date.isoformat()}&limit=10000", silent=True)
+            if spy_data and spy_data.get('data'):
+                df = pd.DataFrame(spy_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                fig = go.Figure()
+                fig.add_trace(line_trace(x=df['timestamp'], y=df['value'], mode='lines',
+                                        fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.15)',
+                                        line=dict(color='#14b8a6', width=2)))
+                fig.update_layout(title="S&P 500 (SPY) - Total Market Proxy", xaxis_title="", yaxis_title="Price ($)",
+                                 template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                 xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("Market data not available. Click 'Refresh Market' to load.")
 
-    with col2:
-        gdp_data = fetch_api("/api/indicators/GDP/latest", silent=True)
-        market_cap_data = fetch_api("/api/indicators/NCBEILQ027S/latest", silent=True)
-
-        if gdp_data and gdp_data.get('latest_value') and market_cap_data and market_cap_data.get('latest_value'):
-            gdp = gdp_data['latest_value']
-            market_cap = market_cap_data['latest_value']
-            buffett = (market_cap / gdp) * 100
-
-            # Gauge-style display
-            st.markdown("**Buffett Indicator (Market Cap / GDP)**")
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=buffett,
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "Market Cap / GDP (%)"},
-                gauge={
-                    'axis': {'range': [None, 250]},
-                    'bar': {'color': "#14b8a6"},
-                    'steps': [
-                        {'range': [0, 80], 'color': "#1A365D"},
-                        {'range': [80, 120], 'color': "#2A4365"},
-                        {'range': [120, 180], 'color': "#744210"},
-                        {'range': [180, 250], 'color': "#742A2A"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "white", 'width': 2},
-                        'thickness': 0.75,
-                        'value': 100
+        with col2:
+            # Derived series (NCBEILQ027S / GDP), materialized at ingest time
+            buffett_data = fetch_api("/api/indicators/BUFFETT_INDICATOR/latest", silent=True)
+
+            if buffett_data and buffett_data.get('latest_value'):
+                buffett = buffett_data['latest_value']
+
+                # Gauge-style display
+                st.markdown("**Buffett Indicator (Market Cap / GDP)**")
+                fig = go.Figure(go.Indicator(
+                    mode="gauge+number",
+                    value=buffett,
+                    domain={'x': [0, 1], 'y': [0, 1]},
+                    title={'text': "Market Cap / GDP (%)"},
+                    gauge={
+                        'axis': {'range': [None, 250]},
+                        'bar': {'color': "#14b8a6"},
+                        'steps': [
+                            {'range': [0, 80], 'color': "#1A365D"},
+                            {'range': [80, 120], 'color': "#2A4365"},
+                            {'range': [120, 180], 'color': "#744210"},
+                            {'range': [180, 250], 'color': "#742A2A"}
+                        ],
+                        'threshold': {
+                            'line': {'color': "white", 'width': 2},
+                            'thickness': 0.75,
+                            'value': 100
+                        }
                     }
-                }
-            ))
-            fig.update_layout(template='plotly_dark', height=300, paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig, use_container_width=True)
+                ))
+                fig.update_layout(template='plotly_dark', height=300, paper_bgcolor='rgba(0,0,0,0)')
+                st.plotly_chart(fig, use_container_width=True)
 
-            if buffett > 180:
-                st.error(f"Buffett Indicator at {buffett:.0f}% - historically very expensive")
-            elif buffett > 120:
-                st.warning(f"Buffett Indicator at {buffett:.0f}% - above historical average")
+                if buffett > 180:
+                    st.error(f"Buffett Indicator at {buffett:.0f}% - historically very expensive")
+                elif buffett > 120:
+                    st.warning(f"Buffett Indicator at {buffett:.0f}% - above historical average")
+                else:
+                    st.success(f"Buffett Indicator at {buffett:.0f}% - reasonable valuation")
             else:
-                st.success(f"Buffett Indicator at {buffett:.0f}% - reasonable valuation")
-        else:
-            st.info("Buffett Indicator components not available.")
+                st.info("Buffett Indicator components not available.")
 
-    # ============================================================================
-    # SECTION 7: FLOWS & POSITIONING
-    # ============================================================================
-    st.divider()
-    st.subheader("7. Flows & Market Positioning")
+        # ============================================================================
+        # SECTION 7: FLOWS & POSITIONING
+        # ============================================================================
+        st.divider()
+        st.subheader("7. Flows & Market Positioning")
 
-    st.markdown("""
+        st.markdown("""
     **"Don't fight the flows"** - tracking where money is moving provides insights into investor sentiment and
     potential market direction. Fund flows show whether investors are adding to or withdrawing from various
     asset classes. Heavy inflows into equity funds often coincide with late-stage bull markets (retail chasing
@@ -3628,32 +3880,32 @@ elif page == "Market Overview":
     timing tool.
     """)
 
-    margin_data = fetch_api(f"/api/indicators/BOGZ1FL663067003Q/timeseries?start={mkt_start_date.isoformat()}&limit=1000", silent=True)
-    if margin_data and margin_data.get('data'):
-        df = pd.DataFrame(margin_data['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value']/1000, mode='lines',
-                                fill='tozeroy', fillcolor='rgba(139, 92, 246, 0.15)',
-                                line=dict(color='#8b5cf6', width=2)))
-        fig.update_layout(title="Margin Debt at Broker-Dealers ($Billions)", xaxis_title="", yaxis_title="$ Billions",
-                         template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
-        st.plotly_chart(fig, use_container_width=True)
+        margin_data = fetch_api(f"/api/indicators/BOGZ1FL663067003Q/timeseries?start={mkt_start_date.isoformat()}&limit=1000", silent=True)
+        if margin_data and margin_data.get('data'):
+            df = pd.DataFrame(margin_data['data'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            fig = go.Figure()
+            fig.add_trace(line_trace(x=df['timestamp'], y=df['value']/1000, mode='lines',
+                                    fill='tozeroy', fillcolor='rgba(139, 92, 246, 0.15)',
+                                    line=dict(color='#8b5cf6', width=2)))
+            fig.update_layout(title="Margin Debt at Broker-Dealers ($Billions)", xaxis_title="", yaxis_title="$ Billions",
+                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'))
+            st.plotly_chart(fig, use_container_width=True)
 
-        current = df.iloc[-1]['value']/1000
-        peak = df['value'].max()/1000
-        st.metric("Current Margin Debt", f"${current:.0f}B", f"Peak: ${peak:.0f}B")
-    else:
-        st.info("Margin debt data not available. Click 'Refresh FRED' to load BOGZ1FL663067003Q.")
+            current = df.iloc[-1]['value']/1000
+            peak = df['value'].max()/1000
+            st.metric("Current Margin Debt", f"${current:.0f}B", f"Peak: ${peak:.0f}B")
+        else:
+            st.info("Margin debt data not available. Click 'Refresh FRED' to load BOGZ1FL663067003Q.")
 
-    # ============================================================================
-    # SECTION 8: COMMODITIES & ALTERNATIVES
-    # ============================================================================
-    st.divider()
-    st.subheader("8. Commodities & Alternative Assets")
+        # ============================================================================
+        # SECTION 8: COMMODITIES & ALTERNATIVES
+        # ============================================================================
+        st.divider()
+        st.subheader("8. Commodities & Alternative Assets")
 
-    st.markdown("""
+        st.markdown("""
     **Commodities provide diversification and inflation protection**, as they often move independently of stocks
     and bonds. Gold is the classic "safe haven" - it tends to rise during crises, currency debasement fears,
     and geopolitical uncertainty. It doesn't produce earnings or dividends, so it's valued based on sentiment,
@@ -3676,47 +3928,47 @@ elif page == "Market Overview":
     correlated with risk appetite - it rallies when investors are bullish on growth and falls during risk-off.
     """)
 
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-    with col1:
-        st.markdown("**Precious Metals & Commodities**")
-        commodities = [("GLD", "Gold", "#FFD700"), ("SLV", "Silver", "#C0C0C0"), ("USO", "Oil", "#8b5cf6"), ("DBC", "Commodities", "#F6AD55")]
-        fig = go.Figure()
-        for ticker, name, color in commodities:
-            ret, df = get_return(ticker)
-            if df is not None:
-                df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
-                fig.add_trace(go.Scatter(x=df['timestamp'], y=df['normalized'],
-                                        name=f"{name} {ret:+.1f}%" if ret else name,
-                                        line=dict(color=color, width=2)))
-        fig.update_layout(title="Commodities Performance", xaxis_title="", yaxis_title="Indexed (Start=100)",
-                         template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            st.markdown("**Precious Metals & Commodities**")
+            commodities = [("GLD", "Gold", "#FFD700"), ("SLV", "Silver", "#C0C0C0"), ("USO", "Oil", "#8b5cf6"), ("DBC", "Commodities", "#F6AD55")]
+            fig = go.Figure()
+            for ticker, name, color in commodities:
+                ret, df = get_return(ticker)
+                if df is not None:
+                    df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
+                    fig.add_trace(line_trace(x=df['timestamp'], y=df['normalized'],
+                                            name=f"{name} {ret:+.1f}%" if ret else name,
+                                            line=dict(color=color, width=2)))
+            fig.update_layout(title="Commodities Performance", xaxis_title="", yaxis_title="Indexed (Start=100)",
+                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+            st.plotly_chart(fig, use_container_width=True)
 
-    with col2:
-        st.markdown("**Crypto & Real Estate**")
-        alts = [("BTC-USD", "Bitcoin", "#F7931A"), ("ETH-USD", "Ethereum", "#627EEA"), ("VNQ", "REITs", "#14b8a6")]
-        fig = go.Figure()
-        for ticker, name, color in alts:
-            ret, df = get_return(ticker)
-            if df is not None:
-                df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
-                fig.add_trace(go.Scatter(x=df['timestamp'], y=df['normalized'],
-                                        name=f"{name} {ret:+.1f}%" if ret else name,
-                                        line=dict(color=color, width=2)))
-        fig.update_layout(title="Crypto & Real Assets", xaxis_title="", yaxis_title="Indexed (Start=100)",
-                         template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            st.markdown("**Crypto & Real Estate**")
+            alts = [("BTC-USD", "Bitcoin", "#F7931A"), ("ETH-USD", "Ethereum", "#627EEA"), ("VNQ", "REITs", "#14b8a6")]
+            fig = go.Figure()
+            for ticker, name, color in alts:
+                ret, df = get_return(ticker)
+                if df is not None:
+                    df['normalized'] = (df['value'] / df.iloc[0]['value']) * 100
+                    fig.add_trace(line_trace(x=df['timestamp'], y=df['normalized'],
+                                            name=f"{name} {ret:+.1f}%" if ret else name,
+                                            line=dict(color=color, width=2)))
+            fig.update_layout(title="Crypto & Real Assets", xaxis_title="", yaxis_title="Indexed (Start=100)",
+                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+            st.plotly_chart(fig, use_container_width=True)
 
-    # ============================================================================
-    # SECTION 9: CROSS-ASSET CORRELATIONS
-    # ============================================================================
-    st.divider()
-    st.subheader("9. Cross-Asset Correlations")
+        # ============================================================================
+        # SECTION 9: CROSS-ASSET CORRELATIONS
+        # ============================================================================
+        st.divider()
+        st.subheader("9. Cross-Asset Correlations")
 
-    st.markdown("""
+        st.markdown("""
     **Correlations between asset classes determine portfolio diversification benefits.** The classic 60/40
     portfolio (60% stocks, 40% bonds) relies on stocks and bonds being negatively correlated - when stocks
     fall, bonds rise, cushioning losses. This relationship held for decades but broke down in 2022 when both
@@ -3735,56 +3987,56 @@ elif page == "Market Overview":
     real rates fall, gold tends to rise.
     """)
 
-    # Calculate rolling correlations
-    spy_ret, spy_df = get_return("SPY")
-    tlt_ret, tlt_df = get_return("TLT")
+        # Calculate rolling correlations
+        spy_ret, spy_df = get_return("SPY")
+        tlt_ret, tlt_df = get_return("TLT")
 
-    if spy_df is not None and tlt_df is not None:
-        # Merge on date and calculate correlation
-        spy_df['date'] = spy_df['timestamp'].dt.date
-        tlt_df['date'] = tlt_df['timestamp'].dt.date
-        merged = pd.merge(spy_df[['date', 'value']], tlt_df[['date', 'value']], on='date', suffixes=('_spy', '_tlt'))
-        merged['spy_ret'] = merged['value_spy'].pct_change()
-        merged['tlt_ret'] = merged['value_tlt'].pct_change()
+        if spy_df is not None and tlt_df is not None:
+            # Merge on date and calculate correlation
+            spy_df['date'] = spy_df['timestamp'].dt.date
+            tlt_df['date'] = tlt_df['timestamp'].dt.date
+            merged = pd.merge(spy_df[['date', 'value']], tlt_df[['date', 'value']], on='date', suffixes=('_spy', '_tlt'))
+            merged['spy_ret'] = merged['value_spy'].pct_change()
+            merged['tlt_ret'] = merged['value_tlt'].pct_change()
 
-        # Rolling 60-day correlation
-        merged['correlation'] = merged['spy_ret'].rolling(60).corr(merged['tlt_ret'])
-        merged = merged.dropna()
+            # Rolling 60-day correlation
+            merged['correlation'] = merged['spy_ret'].rolling(60).corr(merged['tlt_ret'])
+            merged = merged.dropna()
 
-        if len(merged) > 0:
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=pd.to_datetime(merged['date']), y=merged['correlation'],
-                                    mode='lines', fill='tozeroy',
-                                    fillcolor='rgba(183, 148, 244, 0.15)',
-                                    line=dict(color='#B794F4', width=2)))
-            fig.add_hline(y=0, line_dash="dash", line_color="#E2E8F0", annotation_text="Uncorrelated")
-            fig.update_layout(title="Stock-Bond Correlation (SPY vs TLT, 60-day rolling)",
-                             xaxis_title="", yaxis_title="Correlation",
-                             template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748', range=[-1, 1]))
-            st.plotly_chart(fig, use_container_width=True)
+            if len(merged) > 0:
+                fig = go.Figure()
+                fig.add_trace(line_trace(x=pd.to_datetime(merged['date']), y=merged['correlation'],
+                                        mode='lines', fill='tozeroy',
+                                        fillcolor='rgba(183, 148, 244, 0.15)',
+                                        line=dict(color='#B794F4', width=2)))
+                fig.add_hline(y=0, line_dash="dash", line_color="#E2E8F0", annotation_text="Uncorrelated")
+                fig.update_layout(title="Stock-Bond Correlation (SPY vs TLT, 60-day rolling)",
+                                 xaxis_title="", yaxis_title="Correlation",
+                                 template='plotly_dark', height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                 xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748', range=[-1, 1]))
+                st.plotly_chart(fig, use_container_width=True)
 
-            current_corr = merged['correlation'].iloc[-1]
-            avg_corr = merged['correlation'].mean()
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Current Stock-Bond Correlation", f"{current_corr:.2f}",
-                         "Positive (diversification reduced)" if current_corr > 0.2 else "Negative (diversification working)")
-            with col2:
-                if current_corr > 0.3:
-                    st.warning("Bonds not providing diversification - consider alternatives")
-                elif current_corr < -0.3:
-                    st.success("Strong negative correlation - 60/40 portfolio benefits")
-                else:
-                    st.info("Neutral correlation regime")
+                current_corr = merged['correlation'].iloc[-1]
+                avg_corr = merged['correlation'].mean()
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Current Stock-Bond Correlation", f"{current_corr:.2f}",
+                             "Positive (diversification reduced)" if current_corr > 0.2 else "Negative (diversification working)")
+                with col2:
+                    if current_corr > 0.3:
+                        st.warning("Bonds not providing diversification - consider alternatives")
+                    elif current_corr < -0.3:
+                        st.success("Strong negative correlation - 60/40 portfolio benefits")
+                    else:
+                        st.info("Neutral correlation regime")
 
-    # ============================================================================
-    # SECTION 10: TECHNICAL INDICATORS
-    # ============================================================================
-    st.divider()
-    st.subheader("10. Technical Indicators")
+        # ============================================================================
+        # SECTION 10: TECHNICAL INDICATORS
+        # ============================================================================
+        st.divider()
+        st.subheader("10. Technical Indicators")
 
-    st.markdown("""
+        st.markdown("""
     **Technical analysis** studies price and volume patterns to forecast future price movements. While
     fundamentalists scoff at "reading tea leaves," technicals provide useful information about supply/demand
     dynamics and investor behavior. The most widely-watched technical levels become self-fulfilling as
@@ -3802,60 +4054,83 @@ elif page == "Market Overview":
     triggered and momentum traders pile in.
     """)
 
-    # S&P 500 with moving averages
-    spy_long = fetch_api(f"/api/indicators/SPY/timeseries?start={(datetime.now() - timedelta(days=500)).isoformat()}&limit=10000", silent=True)
-    if spy_long and spy_long.get('data') and len(spy_long['data']) > 200:
-        df = pd.DataFrame(spy_long['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp')
-        df['MA50'] = df['value'].rolling(50).mean()
-        df['MA200'] = df['value'].rolling(200).mean()
+        # Technical fields are computed server-side for every ticker in one pass
+        client = get_client()
+        try:
+            scan = client.technicals()
+        except Exception:
+            scan = pd.DataFrame()
+
+        tech_options = ["SPY"] + sorted(t for t in scan.index if t != "SPY")
+        tech_symbol = st.selectbox("Ticker", tech_options, key="tech_symbol")
+        try:
+            df = client.technical_history(tech_symbol, start=datetime.now() - timedelta(days=500))
+        except Exception:
+            df = pd.DataFrame()
+
+        if len(df) > 0 and df['ma_200'].notna().any():
+            fig = go.Figure()
+            fig.add_trace(line_trace(x=df.index, y=df['bb_upper'], mode='lines', name='Bollinger Bands',
+                                     line=dict(color='#4A5568', width=1), legendgroup='bb'))
+            fig.add_trace(line_trace(x=df.index, y=df['bb_lower'], mode='lines', name='Bollinger Lower',
+                                     line=dict(color='#4A5568', width=1), fill='tonexty',
+                                     fillcolor='rgba(74,85,104,0.15)', legendgroup='bb', showlegend=False))
+            fig.add_trace(line_trace(x=df.index, y=df['close'], mode='lines',
+                                    name=tech_symbol, line=dict(color='#14b8a6', width=2)))
+            fig.add_trace(line_trace(x=df.index, y=df['ma_50'], mode='lines',
+                                    name='50-Day MA', line=dict(color='#F6AD55', width=1.5, dash='dash')))
+            fig.add_trace(line_trace(x=df.index, y=df['ma_200'], mode='lines',
+                                    name='200-Day MA', line=dict(color='#ef4444', width=1.5, dash='dash')))
+            fig.update_layout(title=f"{tech_symbol} with Moving Averages", xaxis_title="", yaxis_title="Price ($)",
+                             template='plotly_dark', height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                             xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
+            st.plotly_chart(fig, use_container_width=True)
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df['timestamp'], y=df['value'], mode='lines',
-                                name='SPY', line=dict(color='#14b8a6', width=2)))
-        fig.add_trace(go.Scatter(x=df['timestamp'], y=df['MA50'], mode='lines',
-                                name='50-Day MA', line=dict(color='#F6AD55', width=1.5, dash='dash')))
-        fig.add_trace(go.Scatter(x=df['timestamp'], y=df['MA200'], mode='lines',
-                                name='200-Day MA', line=dict(color='#ef4444', width=1.5, dash='dash')))
-        fig.update_layout(title="S&P 500 (SPY) with Moving Averages", xaxis_title="", yaxis_title="Price ($)",
-                         template='plotly_dark', height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                         xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
+            # Technical signals
+            current = df.iloc[-1]
 
-        # Technical signals
-        current_price = df.iloc[-1]['value']
-        ma50 = df.iloc[-1]['MA50']
-        ma200 = df.iloc[-1]['MA200']
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                pct_above_200 = current['pct_vs_ma_200']
+                st.metric("Price vs 200-Day MA", f"{pct_above_200:+.1f}%",
+                         "Above (Bullish)" if pct_above_200 > 0 else "Below (Bearish)")
+            with col2:
+                if current['ma_50'] > current['ma_200']:
+                    st.success("Golden Cross (50 > 200) - Bullish")
+                else:
+                    st.error("Death Cross (50 < 200) - Bearish")
+            with col3:
+                current_rsi = current['rsi_14']
+                st.metric("14-Day RSI", f"{current_rsi:.0f}",
+                         "Overbought" if current_rsi > 70 else "Oversold" if current_rsi < 30 else "Neutral")
 
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            pct_above_200 = ((current_price - ma200) / ma200) * 100
-            st.metric("Price vs 200-Day MA", f"{pct_above_200:+.1f}%",
-                     "Above (Bullish)" if pct_above_200 > 0 else "Below (Bearish)")
-        with col2:
-            if ma50 > ma200:
-                st.success("Golden Cross (50 > 200) - Bullish")
-            else:
-                st.error("Death Cross (50 < 200) - Bearish")
-        with col3:
-            # RSI calculation
-            delta = df['value'].diff()
-            gain = delta.where(delta > 0, 0).rolling(14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            current_rsi = rsi.iloc[-1]
-            st.metric("14-Day RSI", f"{current_rsi:.0f}",
-                     "Overbought" if current_rsi > 70 else "Oversold" if current_rsi < 30 else "Neutral")
-    else:
-        st.info("Insufficient historical data for technical analysis.")
-
-# Page: Credit Spreads
-elif page == "Credit Spreads":
-    st.header("💳 Credit Spreads & Bond Market Stress")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("MACD Histogram", f"{current['macd_hist']:+.2f}",
+                          "Bullish momentum" if current['macd_hist'] > 0 else "Bearish momentum")
+            with col2:
+                st.metric("From 52-Week High", f"{current['pct_from_52w_high']:.1f}%",
+                          f"{current['pct_from_52w_low']:+.1f}% above 52-week low", delta_color="off")
+            with col3:
+                st.metric("Drawdown from Peak", f"{current['drawdown']:.1f}%",
+                          f"Daily range ~{current['atr_pct']:.1f}%", delta_color="off")
+
+            # Scan across all tickers
+            if len(scan) > 0:
+                with st.expander("Technical scan across all tracked tickers"):
+                    table = scan[['close', 'pct_vs_ma_50', 'pct_vs_ma_200', 'rsi_14', 'macd_hist',
+                                  'bb_percent_b', 'pct_from_52w_high', 'drawdown']].round(2)
+                    table.columns = ['Close', 'vs 50D MA %', 'vs 200D MA %', 'RSI', 'MACD Hist',
+                                     'Bollinger %B', 'From 52W High %', 'Drawdown %']
+                    st.dataframe(table.sort_values('vs 200D MA %', ascending=False), use_container_width=True)
+        else:
+            st.info("Insufficient historical data for technical analysis.")
 
-    st.markdown("""
+    # Page: Credit Spreads
+    elif page == "Credit Spreads":
+        st.header("💳 Credit Spreads & Bond Market Stress")
+
+        st.markdown("""
     ### Understanding Credit Spreads
 
     Credit spreads measure the difference in yield between corporate bonds and "risk-free" Treasury bonds of similar
@@ -3873,127 +4148,120 @@ elif page == "Credit Spreads":
     *The spread data below uses ICE BofA indices, the industry standard for tracking credit market conditions.*
     """)
 
-    # Key credit spread indicators
-    # ICE BofA US High Yield Index Option-Adjusted Spread
-    # ICE BofA US Corporate Index Option-Adjusted Spread
-    # BAA-AAA spread for corporate quality
+        # Key credit spread indicators
+        # ICE BofA US High Yield Index Option-Adjusted Spread
+        # ICE BofA US Corporate Index Option-Adjusted Spread
+        # BAA-AAA spread for corporate quality
 
-    col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3, col4 = st.columns(4)
 
-    # High Yield Spread
-    hy_spread = fetch_api("/api/indicators/BAMLH0A0HYM2/latest", silent=True)
-    if hy_spread and hy_spread.get('latest_value') is not None:
-        val = hy_spread['latest_value']
-        with col1:
-            delta_str = "Elevated" if val > 5 else "Normal" if val < 4 else "Moderate"
-            st.metric("High Yield Spread", f"{val:.2f}%", delta=delta_str,
-                     delta_color="inverse" if val > 5 else "normal")
-
-    # Investment Grade Spread
-    ig_spread = fetch_api("/api/indicators/BAMLC0A0CM/latest", silent=True)
-    if ig_spread and ig_spread.get('latest_value') is not None:
-        val = ig_spread['latest_value']
-        with col2:
-            st.metric("Investment Grade Spread", f"{val:.2f}%")
+        # High Yield Spread
+        hy_spread = fetch_api("/api/indicators/BAMLH0A0HYM2/latest", silent=True)
+        if hy_spread and hy_spread.get('latest_value') is not None:
+            val = hy_spread['latest_value']
+            with col1:
+                delta_str = "Elevated" if val > 5 else "Normal" if val < 4 else "Moderate"
+                st.metric("High Yield Spread", f"{val:.2f}%", delta=delta_str,
+                         delta_color="inverse" if val > 5 else "normal")
+
+        # Investment Grade Spread
+        ig_spread = fetch_api("/api/indicators/BAMLC0A0CM/latest", silent=True)
+        if ig_spread and ig_spread.get('latest_value') is not None:
+            val = ig_spread['latest_value']
+            with col2:
+                st.metric("Investment Grade Spread", f"{val:.2f}%")
 
-    # BAA Corporate Bond Yield
-    baa_yield = fetch_api("/api/indicators/DBAA/latest", silent=True)
-    if baa_yield and baa_yield.get('latest_value') is not None:
-        with col3:
-            st.metric("BAA Corporate Yield", f"{baa_yield['latest_value']:.2f}%")
+        # BAA Corporate Bond Yield
+        baa_yield = fetch_api("/api/indicators/DBAA/latest", silent=True)
+        if baa_yield and baa_yield.get('latest_value') is not None:
+            with col3:
+                st.metric("BAA Corporate Yield", f"{baa_yield['latest_value']:.2f}%")
 
-    # AAA Corporate Bond Yield
-    aaa_yield = fetch_api("/api/indicators/DAAA/latest", silent=True)
-    if aaa_yield and aaa_yield.get('latest_value') is not None:
-        with col4:
-            st.metric("AAA Corporate Yield", f"{aaa_yield['latest_value']:.2f}%")
+        # AAA Corporate Bond Yield
+        aaa_yield = fetch_api("/api/indicators/DAAA/latest", silent=True)
+        if aaa_yield and aaa_yield.get('latest_value') is not None:
+            with col4:
+                st.metric("AAA Corporate Yield", f"{aaa_yield['latest_value']:.2f}%")
 
-    st.divider()
+        st.divider()
 
-    # Historical High Yield Spread
-    st.subheader("High Yield Spread History")
-    time_range = st.selectbox("Time Range", ["1 Year", "5 Years", "10 Years", "20 Years", "Max"], index=2, key="credit_range")
-    days_map = {"1 Year": 365, "5 Years": 1825, "10 Years": 3650, "20 Years": 7300, "Max": 15000}
-    start_date = datetime.now() - timedelta(days=days_map[time_range])
+        # Historical High Yield Spread
+        st.subheader("High Yield Spread History")
+        time_range = st.selectbox("Time Range", ["1 Year", "5 Years", "10 Years", "20 Years", "Max"], index=2, key="credit_range")
+        days_map = {"1 Year": 365, "5 Years": 1825, "10 Years": 3650, "20 Years": 7300, "Max": 15000}
+        start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-    hy_data = fetch_api(f"/api/indicators/BAMLH0A0HYM2/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-    ig_data = fetch_api(f"/api/indicators/BAMLC0A0CM/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+        hy_data = fetch_api(f"/api/indicators/BAMLH0A0HYM2/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+        ig_data = fetch_api(f"/api/indicators/BAMLC0A0CM/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
 
-    if hy_data and hy_data.get('data'):
-        fig = go.Figure()
+        if hy_data and hy_data.get('data'):
+            fig = go.Figure()
 
-        # High Yield spread
-        hy_df = pd.DataFrame(hy_data['data'])
-        hy_df['timestamp'] = pd.to_datetime(hy_df['timestamp'])
-        fig.add_trace(go.Scatter(
-            x=hy_df['timestamp'], y=hy_df['value'],
-            name='High Yield Spread', line=dict(color='#ef4444', width=2),
-            fill='tozeroy', fillcolor='rgba(239, 68, 68, 0.1)'
-        ))
-
-        # Investment Grade spread
-        if ig_data and ig_data.get('data'):
-            ig_df = pd.DataFrame(ig_data['data'])
-            ig_df['timestamp'] = pd.to_datetime(ig_df['timestamp'])
-            fig.add_trace(go.Scatter(
-                x=ig_df['timestamp'], y=ig_df['value'],
-                name='Investment Grade Spread', line=dict(color='#14b8a6', width=2)
+            # High Yield spread
+            hy_df = pd.DataFrame(hy_data['data'])
+            hy_df['timestamp'] = pd.to_datetime(hy_df['timestamp'])
+            fig.add_trace(line_trace(
+                x=hy_df['timestamp'], y=hy_df['value'],
+                name='High Yield Spread', line=dict(color='#ef4444', width=2),
+                fill='tozeroy', fillcolor='rgba(239, 68, 68, 0.1)'
             ))
 
-        # Add stress threshold lines
-        fig.add_hline(y=5, line_dash="dash", line_color="yellow",
-                     annotation_text="Stress Level (5%)", annotation_position="right")
-        fig.add_hline(y=8, line_dash="dash", line_color="red",
-                     annotation_text="Crisis Level (8%)", annotation_position="right")
+            # Investment Grade spread
+            if ig_data and ig_data.get('data'):
+                ig_df = pd.DataFrame(ig_data['data'])
+                ig_df['timestamp'] = pd.to_datetime(ig_df['timestamp'])
+                fig.add_trace(line_trace(
+                    x=ig_df['timestamp'], y=ig_df['value'],
+                    name='Investment Grade Spread', line=dict(color='#14b8a6', width=2)
+                ))
 
-        fig.update_layout(
-            title="Credit Spreads Over Time",
-            yaxis_title="Spread (%)",
-            height=500,
-            **PLOTLY_LAYOUT_DEFAULTS
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            # Add stress threshold lines
+            fig.add_hline(y=5, line_dash="dash", line_color="yellow",
+                         annotation_text="Stress Level (5%)", annotation_position="right")
+            fig.add_hline(y=8, line_dash="dash", line_color="red",
+                         annotation_text="Crisis Level (8%)", annotation_position="right")
 
-    # BAA-AAA Spread (credit quality indicator)
-    st.subheader("BAA-AAA Spread (Credit Quality Indicator)")
-    st.markdown("""
+            fig.update_layout(
+                title="Credit Spreads Over Time",
+                yaxis_title="Spread (%)",
+                height=500,
+                **PLOTLY_LAYOUT_DEFAULTS
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+        # BAA-AAA Spread (credit quality indicator)
+        st.subheader("BAA-AAA Spread (Credit Quality Indicator)")
+        st.markdown("""
     The spread between BAA (lowest investment grade) and AAA (highest quality) corporate bonds measures
     how much extra yield investors demand for taking on additional credit risk within investment grade.
     Widening suggests flight to quality even within the corporate bond market.
     """)
 
-    baa_data = fetch_api(f"/api/indicators/DBAA/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-    aaa_data = fetch_api(f"/api/indicators/DAAA/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-
-    if baa_data and baa_data.get('data') and aaa_data and aaa_data.get('data'):
-        baa_df = pd.DataFrame(baa_data['data'])
-        aaa_df = pd.DataFrame(aaa_data['data'])
-        baa_df['timestamp'] = pd.to_datetime(baa_df['timestamp'])
-        aaa_df['timestamp'] = pd.to_datetime(aaa_df['timestamp'])
-
-        # Merge and calculate spread
-        merged = pd.merge(baa_df, aaa_df, on='timestamp', suffixes=('_baa', '_aaa'))
-        merged['spread'] = merged['value_baa'] - merged['value_aaa']
-
-        fig2 = go.Figure()
-        fig2.add_trace(go.Scatter(
-            x=merged['timestamp'], y=merged['spread'],
-            name='BAA-AAA Spread', line=dict(color='#9F7AEA', width=2),
-            fill='tozeroy', fillcolor='rgba(159, 122, 234, 0.1)'
-        ))
-        fig2.update_layout(
-            title="BAA-AAA Corporate Bond Spread",
-            yaxis_title="Spread (%)",
-            height=400,
-            **PLOTLY_LAYOUT_DEFAULTS
-        )
-        st.plotly_chart(fig2, use_container_width=True)
+        try:
+            spread_df = get_client().timeseries("BAA_AAA", start=start_date, limit=10000)
+        except Exception:
+            spread_df = pd.DataFrame()
+
+        if not spread_df.empty:
+            fig2 = go.Figure()
+            fig2.add_trace(line_trace(
+                x=spread_df['timestamp'], y=spread_df['value'],
+                name='BAA-AAA Spread', line=dict(color='#9F7AEA', width=2),
+                fill='tozeroy', fillcolor='rgba(159, 122, 234, 0.1)'
+            ))
+            fig2.update_layout(
+                title="BAA-AAA Corporate Bond Spread",
+                yaxis_title="Spread (%)",
+                height=400,
+                **PLOTLY_LAYOUT_DEFAULTS
+            )
+            st.plotly_chart(fig2, use_container_width=True)
 
-# Page: Currency Monitor
-elif page == "Currency Monitor":
-    st.header("💱 Currency & Dollar Monitor")
+    # Page: Currency Monitor
+    elif page == "Currency Monitor":
+        st.header("💱 Currency & Dollar Monitor")
 
-    st.markdown("""
+        st.markdown("""
     ### The Dollar's Role in Global Markets
 
     The U.S. Dollar is the world's reserve currency, and its strength or weakness ripples through every asset class.
@@ -4010,91 +4278,91 @@ elif page == "Currency Monitor":
     - Emerging market currencies weaken when the dollar strengthens, potentially causing EM debt stress
     """)
 
-    # Currency pairs using Yahoo Finance symbols
-    currencies = [
-        ("DX-Y.NYB", "DXY Index", "Dollar Index"),
-        ("EURUSD=X", "EUR/USD", "Euro"),
-        ("JPY=X", "USD/JPY", "Japanese Yen"),
-        ("GBPUSD=X", "GBP/USD", "British Pound"),
-        ("CNY=X", "USD/CNY", "Chinese Yuan"),
-        ("AUDUSD=X", "AUD/USD", "Australian Dollar"),
-    ]
-
-    # Display current values
-    col1, col2, col3 = st.columns(3)
-    cols = [col1, col2, col3, col1, col2, col3]
+        # Currency pairs using Yahoo Finance symbols
+        currencies = [
+            ("DX-Y.NYB", "DXY Index", "Dollar Index"),
+            ("EURUSD=X", "EUR/USD", "Euro"),
+            ("JPY=X", "USD/JPY", "Japanese Yen"),
+            ("GBPUSD=X", "GBP/USD", "British Pound"),
+            ("CNY=X", "USD/CNY", "Chinese Yuan"),
+            ("AUDUSD=X", "AUD/USD", "Australian Dollar"),
+        ]
+
+        # Display current values
+        col1, col2, col3 = st.columns(3)
+        cols = [col1, col2, col3, col1, col2, col3]
 
-    for i, (symbol, label, name) in enumerate(currencies):
-        data = fetch_api(f"/api/indicators/{symbol}/latest", silent=True)
-        if data and data.get('latest_value') is not None:
-            with cols[i]:
-                st.metric(label, f"{data['latest_value']:.4f}" if 'USD' in label else f"{data['latest_value']:.2f}")
+        for i, (symbol, label, name) in enumerate(currencies):
+            data = fetch_api(f"/api/indicators/{symbol}/latest", silent=True)
+            if data and data.get('latest_value') is not None:
+                with cols[i]:
+                    st.metric(label, f"{data['latest_value']:.4f}" if 'USD' in label else f"{data['latest_value']:.2f}")
 
-    st.divider()
+        st.divider()
 
-    # DXY Historical Chart
-    st.subheader("Dollar Index (DXY) History")
-    time_range = st.selectbox("Time Range", ["1 Year", "5 Years", "10 Years", "Max"], index=1, key="fx_range")
-    days_map = {"1 Year": 365, "5 Years": 1825, "10 Years": 3650, "Max": 10000}
-    start_date = datetime.now() - timedelta(days=days_map[time_range])
+        # DXY Historical Chart
+        st.subheader("Dollar Index (DXY) History")
+        time_range = st.selectbox("Time Range", ["1 Year", "5 Years", "10 Years", "Max"], index=1, key="fx_range")
+        days_map = {"1 Year": 365, "5 Years": 1825, "10 Years": 3650, "Max": 10000}
+        start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-    dxy_data = fetch_api(f"/api/indicators/DX-Y.NYB/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+        dxy_data = fetch_api(f"/api/indicators/DX-Y.NYB/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
 
-    if dxy_data and dxy_data.get('data'):
-        df = pd.DataFrame(dxy_data['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        if dxy_data and dxy_data.get('data'):
+            df = pd.DataFrame(dxy_data['data'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['timestamp'], y=df['value'],
-            name='DXY', line=dict(color='#14b8a6', width=2),
-            fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.1)'
-        ))
+            fig = go.Figure()
+            fig.add_trace(line_trace(
+                x=df['timestamp'], y=df['value'],
+                name='DXY', line=dict(color='#14b8a6', width=2),
+                fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.1)'
+            ))
 
-        # Add reference lines
-        fig.add_hline(y=100, line_dash="dash", line_color="gray",
-                     annotation_text="100 (Baseline)", annotation_position="right")
+            # Add reference lines
+            fig.add_hline(y=100, line_dash="dash", line_color="gray",
+                         annotation_text="100 (Baseline)", annotation_position="right")
 
-        fig.update_layout(
-            title="U.S. Dollar Index (DXY)",
-            yaxis_title="Index Value",
-            height=450,
-            **PLOTLY_LAYOUT_DEFAULTS
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            fig.update_layout(
+                title="U.S. Dollar Index (DXY)",
+                yaxis_title="Index Value",
+                height=450,
+                **PLOTLY_LAYOUT_DEFAULTS
+            )
+            st.plotly_chart(fig, use_container_width=True)
 
-    # Multi-currency comparison
-    st.subheader("Major Currency Pairs")
+        # Multi-currency comparison
+        st.subheader("Major Currency Pairs")
 
-    fig2 = go.Figure()
-    colors = ['#14b8a6', '#8b5cf6', '#ef4444', '#F6AD55', '#9F7AEA']
+        fig2 = go.Figure()
+        colors = ['#14b8a6', '#8b5cf6', '#ef4444', '#F6AD55', '#9F7AEA']
 
-    for i, (symbol, label, name) in enumerate(currencies[1:]):  # Skip DXY
-        data = fetch_api(f"/api/indicators/{symbol}/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-        if data and data.get('data'):
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            # Normalize to percentage change from start
-            df['normalized'] = (df['value'] / df['value'].iloc[0] - 1) * 100
-            fig2.add_trace(go.Scatter(
-                x=df['timestamp'], y=df['normalized'],
-                name=label, line=dict(color=colors[i % len(colors)], width=2)
-            ))
+        for i, (symbol, label, name) in enumerate(currencies[1:]):  # Skip DXY
+            data = fetch_api(f"/api/indicators/{symbol}/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+            if data and data.get('data'):
+                df = pd.DataFrame(data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                # Normalize to percentage change from start
+                df['normalized'] = (df['value'] / df['value'].iloc[0] - 1) * 100
+                fig2.add_trace(line_trace(
+                    x=df['timestamp'], y=df['normalized'],
+                    name=label, line=dict(color=colors[i % len(colors)], width=2)
+                ))
 
-    fig2.add_hline(y=0, line_dash="dash", line_color="gray")
-    fig2.update_layout(
-        title="Currency Performance (% Change from Start)",
-        yaxis_title="% Change",
-        height=450,
-        **PLOTLY_LAYOUT_DEFAULTS
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+        fig2.add_hline(y=0, line_dash="dash", line_color="gray")
+        fig2.update_layout(
+            title="Currency Performance (% Change from Start)",
+            yaxis_title="% Change",
+            height=450,
+            **PLOTLY_LAYOUT_DEFAULTS
+        )
+        st.plotly_chart(fig2, use_container_width=True)
 
-# Page: Commodities
-elif page == "Commodities":
-    st.header("🛢️ Commodities Dashboard")
+    # Page: Commodities
+    elif page == "Commodities":
+        st.header("🛢️ Commodities Dashboard")
 
-    st.markdown("""
+        st.markdown("""
     ### Commodities as Economic Indicators
 
     Commodity prices provide real-time signals about global economic activity, inflation expectations, and supply/demand
@@ -4114,118 +4382,115 @@ elif page == "Commodities":
     a falling ratio suggests risk aversion and growth concerns.
     """)
 
-    # Commodity symbols
-    commodities = [
-        ("CL=F", "Crude Oil (WTI)", "$/barrel"),
-        ("GC=F", "Gold", "$/oz"),
-        ("SI=F", "Silver", "$/oz"),
-        ("HG=F", "Copper", "$/lb"),
-        ("NG=F", "Natural Gas", "$/MMBtu"),
-        ("ZC=F", "Corn", "cents/bu"),
-    ]
-
-    # Display current prices
-    col1, col2, col3 = st.columns(3)
-    cols = [col1, col2, col3, col1, col2, col3]
-
-    commodity_values = {}
-    for i, (symbol, name, unit) in enumerate(commodities):
-        data = fetch_api(f"/api/indicators/{symbol}/latest", silent=True)
-        if data and data.get('latest_value') is not None:
-            commodity_values[symbol] = data['latest_value']
-            with cols[i]:
-                st.metric(name, f"${data['latest_value']:,.2f}", help=unit)
-
-    st.divider()
-
-    # Time range selector
-    st.subheader("Commodity Price History")
-    time_range = st.selectbox("Time Range", ["1 Year", "3 Years", "5 Years", "10 Years"], index=1, key="commodity_range")
-    days_map = {"1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650}
-    start_date = datetime.now() - timedelta(days=days_map[time_range])
+        # Commodity symbols
+        commodities = [
+            ("CL=F", "Crude Oil (WTI)", "$/barrel"),
+            ("GC=F", "Gold", "$/oz"),
+            ("SI=F", "Silver", "$/oz"),
+            ("HG=F", "Copper", "$/lb"),
+            ("NG=F", "Natural Gas", "$/MMBtu"),
+            ("ZC=F", "Corn", "cents/bu"),
+        ]
+
+        # Display current prices
+        col1, col2, col3 = st.columns(3)
+        cols = [col1, col2, col3, col1, col2, col3]
 
-    # Oil chart
-    oil_data = fetch_api(f"/api/indicators/CL=F/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-    if oil_data and oil_data.get('data'):
-        df = pd.DataFrame(oil_data['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        commodity_values = {}
+        for i, (symbol, name, unit) in enumerate(commodities):
+            data = fetch_api(f"/api/indicators/{symbol}/latest", silent=True)
+            if data and data.get('latest_value') is not None:
+                commodity_values[symbol] = data['latest_value']
+                with cols[i]:
+                    st.metric(name, f"${data['latest_value']:,.2f}", help=unit)
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['timestamp'], y=df['value'],
-            name='WTI Crude', line=dict(color='#F6AD55', width=2),
-            fill='tozeroy', fillcolor='rgba(246, 173, 85, 0.1)'
-        ))
-        fig.update_layout(
-            title="Crude Oil (WTI)",
-            yaxis_title="$/barrel",
-            height=400,
-            **PLOTLY_LAYOUT_DEFAULTS
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.divider()
 
-    # Gold and Copper comparison
-    col1, col2 = st.columns(2)
+        # Time range selector
+        st.subheader("Commodity Price History")
+        time_range = st.selectbox("Time Range", ["1 Year", "3 Years", "5 Years", "10 Years"], index=1, key="commodity_range")
+        days_map = {"1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650}
+        start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-    with col1:
-        gold_data = fetch_api(f"/api/indicators/GC=F/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-        if gold_data and gold_data.get('data'):
-            df = pd.DataFrame(gold_data['data'])
+        # Oil chart
+        oil_data = fetch_api(f"/api/indicators/CL=F/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+        if oil_data and oil_data.get('data'):
+            df = pd.DataFrame(oil_data['data'])
             df['timestamp'] = pd.to_datetime(df['timestamp'])
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'], y=df['value'],
-                name='Gold', line=dict(color='#FFD700', width=2),
-                fill='tozeroy', fillcolor='rgba(255, 215, 0, 0.1)'
-            ))
-            fig.update_layout(title="Gold", yaxis_title="$/oz", height=350, **PLOTLY_LAYOUT_DEFAULTS)
-            st.plotly_chart(fig, use_container_width=True)
 
-    with col2:
-        copper_data = fetch_api(f"/api/indicators/HG=F/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-        if copper_data and copper_data.get('data'):
-            df = pd.DataFrame(copper_data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
             fig = go.Figure()
-            fig.add_trace(go.Scatter(
+            fig.add_trace(line_trace(
                 x=df['timestamp'], y=df['value'],
-                name='Copper', line=dict(color='#B87333', width=2),
-                fill='tozeroy', fillcolor='rgba(184, 115, 51, 0.1)'
+                name='WTI Crude', line=dict(color='#F6AD55', width=2),
+                fill='tozeroy', fillcolor='rgba(246, 173, 85, 0.1)'
             ))
-            fig.update_layout(title="Copper", yaxis_title="$/lb", height=350, **PLOTLY_LAYOUT_DEFAULTS)
+            fig.update_layout(
+                title="Crude Oil (WTI)",
+                yaxis_title="$/barrel",
+                height=400,
+                **PLOTLY_LAYOUT_DEFAULTS
+            )
             st.plotly_chart(fig, use_container_width=True)
 
-    # Copper/Gold Ratio
-    st.subheader("Copper/Gold Ratio (Economic Sentiment)")
-    if gold_data and gold_data.get('data') and copper_data and copper_data.get('data'):
-        gold_df = pd.DataFrame(gold_data['data'])
-        copper_df = pd.DataFrame(copper_data['data'])
-        gold_df['timestamp'] = pd.to_datetime(gold_df['timestamp'])
-        copper_df['timestamp'] = pd.to_datetime(copper_df['timestamp'])
+        # Gold and Copper comparison
+        col1, col2 = st.columns(2)
 
-        merged = pd.merge(copper_df, gold_df, on='timestamp', suffixes=('_copper', '_gold'))
-        # Ratio: copper price * 1000 / gold price (scale for readability)
-        merged['ratio'] = (merged['value_copper'] * 1000) / merged['value_gold']
+        with col1:
+            gold_data = fetch_api(f"/api/indicators/GC=F/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+            if gold_data and gold_data.get('data'):
+                df = pd.DataFrame(gold_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                fig = go.Figure()
+                fig.add_trace(line_trace(
+                    x=df['timestamp'], y=df['value'],
+                    name='Gold', line=dict(color='#FFD700', width=2),
+                    fill='tozeroy', fillcolor='rgba(255, 215, 0, 0.1)'
+                ))
+                fig.update_layout(title="Gold", yaxis_title="$/oz", height=350, **PLOTLY_LAYOUT_DEFAULTS)
+                st.plotly_chart(fig, use_container_width=True)
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=merged['timestamp'], y=merged['ratio'],
-            name='Copper/Gold Ratio', line=dict(color='#14b8a6', width=2),
-            fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.1)'
-        ))
-        fig.update_layout(
-            title="Copper/Gold Ratio (Higher = More Optimistic)",
-            yaxis_title="Ratio",
-            height=400,
-            **PLOTLY_LAYOUT_DEFAULTS
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            copper_data = fetch_api(f"/api/indicators/HG=F/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+            if copper_data and copper_data.get('data'):
+                df = pd.DataFrame(copper_data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                fig = go.Figure()
+                fig.add_trace(line_trace(
+                    x=df['timestamp'], y=df['value'],
+                    name='Copper', line=dict(color='#B87333', width=2),
+                    fill='tozeroy', fillcolor='rgba(184, 115, 51, 0.1)'
+                ))
+                fig.update_layout(title="Copper", yaxis_title="$/lb", height=350, **PLOTLY_LAYOUT_DEFAULTS)
+                st.plotly_chart(fig, use_container_width=True)
 
-# Page: Global Markets
-elif page == "Global Markets":
-    st.header("🌍 Global Markets Comparison")
+        # Copper/Gold Ratio
+        st.subheader("Copper/Gold Ratio (Economic Sentiment)")
+        # Derived series: copper price * 1000 / gold price (scaled for readability)
+        try:
+            ratio_df = get_client().timeseries("COPPER_GOLD", start=start_date, limit=10000)
+        except Exception:
+            ratio_df = pd.DataFrame()
 
-    st.markdown("""
+        if not ratio_df.empty:
+            fig = go.Figure()
+            fig.add_trace(line_trace(
+                x=ratio_df['timestamp'], y=ratio_df['value'],
+                name='Copper/Gold Ratio', line=dict(color='#14b8a6', width=2),
+                fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.1)'
+            ))
+            fig.update_layout(
+                title="Copper/Gold Ratio (Higher = More Optimistic)",
+                yaxis_title="Ratio",
+                height=400,
+                **PLOTLY_LAYOUT_DEFAULTS
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+    # Page: Global Markets
+    elif page == "Global Markets":
+        st.header("🌍 Global Markets Comparison")
+
+        st.markdown("""
     ### Diversification Beyond U.S. Borders
 
     While U.S. markets have dominated returns over the past decade, global diversification remains important for
@@ -4241,113 +4506,113 @@ elif page == "Global Markets":
     When the dollar weakens and growth is strong, EM often outperforms significantly.
     """)
 
-    # Global market ETFs
-    markets = [
-        ("SPY", "S&P 500 (US)", "#14b8a6"),
-        ("EFA", "Developed Int'l (EAFE)", "#8b5cf6"),
-        ("EEM", "Emerging Markets", "#ef4444"),
-        ("VGK", "Europe (VGK)", "#F6AD55"),
-        ("EWJ", "Japan (EWJ)", "#9F7AEA"),
-        ("FXI", "China (FXI)", "#ED64A6"),
-    ]
-
-    # Current values
-    col1, col2, col3 = st.columns(3)
-    cols = [col1, col2, col3, col1, col2, col3]
-
-    for i, (symbol, name, color) in enumerate(markets):
-        data = fetch_api(f"/api/indicators/{symbol}/latest", silent=True)
-        if data and data.get('latest_value') is not None:
-            with cols[i]:
-                st.metric(name, f"${data['latest_value']:.2f}")
-
-    st.divider()
-
-    # Time range selector
-    st.subheader("Relative Performance")
-    time_range = st.selectbox("Time Range", ["YTD", "1 Year", "3 Years", "5 Years", "10 Years"], index=2, key="global_range")
-
-    if time_range == "YTD":
-        start_date = datetime(datetime.now().year, 1, 1)
-    else:
-        days_map = {"1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650}
-        start_date = datetime.now() - timedelta(days=days_map[time_range])
+        # Global market ETFs
+        markets = [
+            ("SPY", "S&P 500 (US)", "#14b8a6"),
+            ("EFA", "Developed Int'l (EAFE)", "#8b5cf6"),
+            ("EEM", "Emerging Markets", "#ef4444"),
+            ("VGK", "Europe (VGK)", "#F6AD55"),
+            ("EWJ", "Japan (EWJ)", "#9F7AEA"),
+            ("FXI", "China (FXI)", "#ED64A6"),
+        ]
+
+        # Current values
+        col1, col2, col3 = st.columns(3)
+        cols = [col1, col2, col3, col1, col2, col3]
 
-    # Normalized performance chart
-    fig = go.Figure()
+        for i, (symbol, name, color) in enumerate(markets):
+            data = fetch_api(f"/api/indicators/{symbol}/latest", silent=True)
+            if data and data.get('latest_value') is not None:
+                with cols[i]:
+                    st.metric(name, f"${data['latest_value']:.2f}")
 
-    for symbol, name, color in markets:
-        data = fetch_api(f"/api/indicators/{symbol}/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-        if data and data.get('data'):
-            df = pd.DataFrame(data['data'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            # Normalize to percentage change from start
-            df['normalized'] = (df['value'] / df['value'].iloc[0] - 1) * 100
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'], y=df['normalized'],
-                name=name, line=dict(color=color, width=2)
-            ))
+        st.divider()
 
-    fig.add_hline(y=0, line_dash="dash", line_color="gray")
-    fig.update_layout(
-        title=f"Global Market Performance ({time_range})",
-        yaxis_title="% Return",
-        height=500,
-        **PLOTLY_LAYOUT_DEFAULTS
-    )
-    st.plotly_chart(fig, use_container_width=True)
+        # Time range selector
+        st.subheader("Relative Performance")
+        time_range = st.selectbox("Time Range", ["YTD", "1 Year", "3 Years", "5 Years", "10 Years"], index=2, key="global_range")
 
-    # US vs International ratio
-    st.subheader("US vs. International Relative Strength")
+        if time_range == "YTD":
+            start_date = datetime(datetime.now().year, 1, 1)
+        else:
+            days_map = {"1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650}
+            start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-    spy_data = fetch_api(f"/api/indicators/SPY/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-    efa_data = fetch_api(f"/api/indicators/EFA/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
-    eem_data = fetch_api(f"/api/indicators/EEM/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+        # Normalized performance chart
+        fig = go.Figure()
 
-    if spy_data and efa_data and spy_data.get('data') and efa_data.get('data'):
-        spy_df = pd.DataFrame(spy_data['data'])
-        efa_df = pd.DataFrame(efa_data['data'])
-        spy_df['timestamp'] = pd.to_datetime(spy_df['timestamp'])
-        efa_df['timestamp'] = pd.to_datetime(efa_df['timestamp'])
+        for symbol, name, color in markets:
+            data = fetch_api(f"/api/indicators/{symbol}/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+            if data and data.get('data'):
+                df = pd.DataFrame(data['data'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                df = df.sort_values('timestamp')
+                # Normalize to percentage change from start
+                df['normalized'] = (df['value'] / df['value'].iloc[0] - 1) * 100
+                fig.add_trace(line_trace(
+                    x=df['timestamp'], y=df['normalized'],
+                    name=name, line=dict(color=color, width=2)
+                ))
 
-        merged = pd.merge(spy_df, efa_df, on='timestamp', suffixes=('_spy', '_efa'))
-        merged['us_vs_intl'] = merged['value_spy'] / merged['value_efa']
-        # Normalize
-        merged['us_vs_intl_norm'] = (merged['us_vs_intl'] / merged['us_vs_intl'].iloc[0] - 1) * 100
+        fig.add_hline(y=0, line_dash="dash", line_color="gray")
+        fig.update_layout(
+            title=f"Global Market Performance ({time_range})",
+            yaxis_title="% Return",
+            height=500,
+            **PLOTLY_LAYOUT_DEFAULTS
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-        fig2 = go.Figure()
-        fig2.add_trace(go.Scatter(
-            x=merged['timestamp'], y=merged['us_vs_intl_norm'],
-            name='US vs Developed Int\'l', line=dict(color='#14b8a6', width=2),
-            fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.1)'
-        ))
-
-        if eem_data and eem_data.get('data'):
-            eem_df = pd.DataFrame(eem_data['data'])
-            eem_df['timestamp'] = pd.to_datetime(eem_df['timestamp'])
-            merged2 = pd.merge(spy_df, eem_df, on='timestamp', suffixes=('_spy', '_eem'))
-            merged2['us_vs_em'] = merged2['value_spy'] / merged2['value_eem']
-            merged2['us_vs_em_norm'] = (merged2['us_vs_em'] / merged2['us_vs_em'].iloc[0] - 1) * 100
-            fig2.add_trace(go.Scatter(
-                x=merged2['timestamp'], y=merged2['us_vs_em_norm'],
-                name='US vs Emerging', line=dict(color='#ef4444', width=2)
+        # US vs International ratio
+        st.subheader("US vs. International Relative Strength")
+
+        spy_data = fetch_api(f"/api/indicators/SPY/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+        efa_data = fetch_api(f"/api/indicators/EFA/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+        eem_data = fetch_api(f"/api/indicators/EEM/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+
+        if spy_data and efa_data and spy_data.get('data') and efa_data.get('data'):
+            spy_df = pd.DataFrame(spy_data['data'])
+            efa_df = pd.DataFrame(efa_data['data'])
+            spy_df['timestamp'] = pd.to_datetime(spy_df['timestamp'])
+            efa_df['timestamp'] = pd.to_datetime(efa_df['timestamp'])
+
+            merged = pd.merge(spy_df, efa_df, on='timestamp', suffixes=('_spy', '_efa'))
+            merged['us_vs_intl'] = merged['value_spy'] / merged['value_efa']
+            # Normalize
+            merged['us_vs_intl_norm'] = (merged['us_vs_intl'] / merged['us_vs_intl'].iloc[0] - 1) * 100
+
+            fig2 = go.Figure()
+            fig2.add_trace(line_trace(
+                x=merged['timestamp'], y=merged['us_vs_intl_norm'],
+                name='US vs Developed Int\'l', line=dict(color='#14b8a6', width=2),
+                fill='tozeroy', fillcolor='rgba(20, 184, 166, 0.1)'
             ))
 
-        fig2.add_hline(y=0, line_dash="dash", line_color="gray")
-        fig2.update_layout(
-            title="US Outperformance vs International (Rising = US Winning)",
-            yaxis_title="Relative Performance (%)",
-            height=400,
-            **PLOTLY_LAYOUT_DEFAULTS
-        )
-        st.plotly_chart(fig2, use_container_width=True)
+            if eem_data and eem_data.get('data'):
+                eem_df = pd.DataFrame(eem_data['data'])
+                eem_df['timestamp'] = pd.to_datetime(eem_df['timestamp'])
+                merged2 = pd.merge(spy_df, eem_df, on='timestamp', suffixes=('_spy', '_eem'))
+                merged2['us_vs_em'] = merged2['value_spy'] / merged2['value_eem']
+                merged2['us_vs_em_norm'] = (merged2['us_vs_em'] / merged2['us_vs_em'].iloc[0] - 1) * 100
+                fig2.add_trace(line_trace(
+                    x=merged2['timestamp'], y=merged2['us_vs_em_norm'],
+                    name='US vs Emerging', line=dict(color='#ef4444', width=2)
+                ))
 
-# Page: Sentiment
-elif page == "Sentiment":
-    st.header("📊 Sentiment & Positioning")
+            fig2.add_hline(y=0, line_dash="dash", line_color="gray")
+            fig2.update_layout(
+                title="US Outperformance vs International (Rising = US Winning)",
+                yaxis_title="Relative Performance (%)",
+                height=400,
+                **PLOTLY_LAYOUT_DEFAULTS
+            )
+            st.plotly_chart(fig2, use_container_width=True)
 
-    st.markdown("""
+    # Page: Sentiment
+    elif page == "Sentiment":
+        st.header("📊 Sentiment & Positioning")
+
+        st.markdown("""
     ### Measuring Market Psychology
 
     Sentiment indicators gauge investor psychology and can serve as contrarian signals. When everyone is bullish,
@@ -4366,123 +4631,119 @@ elif page == "Sentiment":
     longer than you can stay solvent - don't use these alone.*
     """)
 
-    # Key sentiment indicators
-    col1, col2, col3, col4 = st.columns(4)
-
-    # VIX
-    vix_data = fetch_api("/api/indicators/^VIX/latest", silent=True)
-    if vix_data and vix_data.get('latest_value') is not None:
-        vix_val = vix_data['latest_value']
-        with col1:
-            if vix_val > 30:
-                sentiment = "Fear"
-                color = "inverse"
-            elif vix_val < 15:
-                sentiment = "Complacent"
-                color = "off"
-            else:
-                sentiment = "Normal"
-                color = "normal"
-            st.metric("VIX", f"{vix_val:.2f}", delta=sentiment, delta_color=color)
+        # Key sentiment indicators
+        col1, col2, col3, col4 = st.columns(4)
 
-    # VIX3M (3-month VIX)
-    vix3m_data = fetch_api("/api/indicators/^VIX3M/latest", silent=True)
-    if vix3m_data and vix3m_data.get('latest_value') is not None:
-        with col2:
-            st.metric("VIX 3-Month", f"{vix3m_data['latest_value']:.2f}")
+        # VIX
+        vix_data = fetch_api("/api/indicators/^VIX/latest", silent=True)
+        if vix_data and vix_data.get('latest_value') is not None:
+            vix_val = vix_data['latest_value']
+            with col1:
+                if vix_val > 30:
+                    sentiment = "Fear"
+                    color = "inverse"
+                elif vix_val < 15:
+                    sentiment = "Complacent"
+                    color = "off"
+                else:
+                    sentiment = "Normal"
+                    color = "normal"
+                st.metric("VIX", f"{vix_val:.2f}", delta=sentiment, delta_color=color)
 
-    # Term structure
-    if vix_data and vix3m_data and vix_data.get('latest_value') and vix3m_data.get('latest_value'):
-        term_spread = vix3m_data['latest_value'] - vix_data['latest_value']
-        with col3:
-            structure = "Contango" if term_spread > 0 else "Backwardation"
-            st.metric("VIX Term Spread", f"{term_spread:.2f}", delta=structure,
-                     delta_color="normal" if term_spread > 0 else "inverse")
-
-    # Put/Call ratio (CBOE equity)
-    pcr_data = fetch_api("/api/indicators/PCEQUITY/latest", silent=True)
-    if pcr_data and pcr_data.get('latest_value') is not None:
-        pcr_val = pcr_data['latest_value']
-        with col4:
-            if pcr_val > 1.0:
-                pcr_signal = "Bearish"
-            elif pcr_val < 0.7:
-                pcr_signal = "Bullish"
-            else:
-                pcr_signal = "Neutral"
-            st.metric("Put/Call Ratio", f"{pcr_val:.2f}", delta=pcr_signal)
+        # VIX3M (3-month VIX)
+        vix3m_data = fetch_api("/api/indicators/^VIX3M/latest", silent=True)
+        if vix3m_data and vix3m_data.get('latest_value') is not None:
+            with col2:
+                st.metric("VIX 3-Month", f"{vix3m_data['latest_value']:.2f}")
 
-    st.divider()
+        # Term structure (derived series: VIX3M - VIX)
+        term_spread_data = fetch_api("/api/indicators/VIX_TERM_SPREAD/latest", silent=True)
+        if term_spread_data and term_spread_data.get('latest_value') is not None:
+            term_spread = term_spread_data['latest_value']
+            with col3:
+                structure = "Contango" if term_spread > 0 else "Backwardation"
+                st.metric("VIX Term Spread", f"{term_spread:.2f}", delta=structure,
+                         delta_color="normal" if term_spread > 0 else "inverse")
+
+        # Put/Call ratio (CBOE equity)
+        pcr_data = fetch_api("/api/indicators/PCEQUITY/latest", silent=True)
+        if pcr_data and pcr_data.get('latest_value') is not None:
+            pcr_val = pcr_data['latest_value']
+            with col4:
+                if pcr_val > 1.0:
+                    pcr_signal = "Bearish"
+                elif pcr_val < 0.7:
+                    pcr_signal = "Bullish"
+                else:
+                    pcr_signal = "Neutral"
+                st.metric("Put/Call Ratio", f"{pcr_val:.2f}", delta=pcr_signal)
 
-    # VIX Historical
-    st.subheader("VIX History")
-    time_range = st.selectbox("Time Range", ["1 Year", "3 Years", "5 Years", "10 Years"], index=1, key="sentiment_range")
-    days_map = {"1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650}
-    start_date = datetime.now() - timedelta(days=days_map[time_range])
+        st.divider()
 
-    vix_history = fetch_api(f"/api/indicators/^VIX/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+        # VIX Historical
+        st.subheader("VIX History")
+        time_range = st.selectbox("Time Range", ["1 Year", "3 Years", "5 Years", "10 Years"], index=1, key="sentiment_range")
+        days_map = {"1 Year": 365, "3 Years": 1095, "5 Years": 1825, "10 Years": 3650}
+        start_date = datetime.now() - timedelta(days=days_map[time_range])
 
-    if vix_history and vix_history.get('data'):
-        df = pd.DataFrame(vix_history['data'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        vix_history = fetch_api(f"/api/indicators/^VIX/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['timestamp'], y=df['value'],
-            name='VIX', line=dict(color='#ef4444', width=2),
-            fill='tozeroy', fillcolor='rgba(239, 68, 68, 0.1)'
-        ))
-
-        # Add threshold lines
-        fig.add_hline(y=30, line_dash="dash", line_color="red",
-                     annotation_text="Fear (30)", annotation_position="right")
-        fig.add_hline(y=20, line_dash="dash", line_color="yellow",
-                     annotation_text="Elevated (20)", annotation_position="right")
-        fig.add_hline(y=15, line_dash="dash", line_color="green",
-                     annotation_text="Complacent (15)", annotation_position="right")
+        if vix_history and vix_history.get('data'):
+            df = pd.DataFrame(vix_history['data'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
 
-        fig.update_layout(
-            title="VIX - Volatility Index",
-            yaxis_title="VIX Level",
-            height=450,
-            **PLOTLY_LAYOUT_DEFAULTS
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            fig = go.Figure()
+            fig.add_trace(line_trace(
+                x=df['timestamp'], y=df['value'],
+                name='VIX', line=dict(color='#ef4444', width=2),
+                fill='tozeroy', fillcolor='rgba(239, 68, 68, 0.1)'
+            ))
 
-    # VIX Term Structure Chart
-    st.subheader("VIX Term Structure Over Time")
+            # Add threshold lines
+            fig.add_hline(y=30, line_dash="dash", line_color="red",
+                         annotation_text="Fear (30)", annotation_position="right")
+            fig.add_hline(y=20, line_dash="dash", line_color="yellow",
+                         annotation_text="Elevated (20)", annotation_position="right")
+            fig.add_hline(y=15, line_dash="dash", line_color="green",
+                         annotation_text="Complacent (15)", annotation_position="right")
 
-    vix3m_history = fetch_api(f"/api/indicators/^VIX3M/timeseries?start={start_date.isoformat()}&limit=10000", silent=True)
+            fig.update_layout(
+                title="VIX - Volatility Index",
+                yaxis_title="VIX Level",
+                height=450,
+                **PLOTLY_LAYOUT_DEFAULTS
+            )
+            st.plotly_chart(fig, use_container_width=True)
 
-    if vix_history and vix3m_history and vix_history.get('data') and vix3m_history.get('data'):
-        vix_df = pd.DataFrame(vix_history['data'])
-        vix3m_df = pd.DataFrame(vix3m_history['data'])
-        vix_df['timestamp'] = pd.to_datetime(vix_df['timestamp'])
-        vix3m_df['timestamp'] = pd.to_datetime(vix3m_df['timestamp'])
+        # VIX Term Structure Chart
+        st.subheader("VIX Term Structure Over Time")
 
-        merged = pd.merge(vix_df, vix3m_df, on='timestamp', suffixes=('_vix', '_vix3m'))
-        merged['term_spread'] = merged['value_vix3m'] - merged['value_vix']
+        try:
+            term_df = get_client().timeseries("VIX_TERM_SPREAD", start=start_date, limit=10000)
+        except Exception:
+            term_df = pd.DataFrame()
 
-        fig2 = go.Figure()
-        fig2.add_trace(go.Scatter(
-            x=merged['timestamp'], y=merged['term_spread'],
-            name='VIX Term Spread (3M - Spot)', line=dict(color='#9F7AEA', width=2),
-            fill='tozeroy', fillcolor='rgba(159, 122, 234, 0.1)'
-        ))
-        fig2.add_hline(y=0, line_dash="dash", line_color="red",
-                      annotation_text="Backwardation Below", annotation_position="right")
+        if not term_df.empty:
+            fig2 = go.Figure()
+            fig2.add_trace(line_trace(
+                x=term_df['timestamp'], y=term_df['value'],
+                name='VIX Term Spread (3M - Spot)', line=dict(color='#9F7AEA', width=2),
+                fill='tozeroy', fillcolor='rgba(159, 122, 234, 0.1)'
+            ))
+            fig2.add_hline(y=0, line_dash="dash", line_color="red",
+                          annotation_text="Backwardation Below", annotation_position="right")
 
-        fig2.update_layout(
-            title="VIX Term Structure (Positive = Contango, Negative = Backwardation)",
-            yaxis_title="Spread",
-            height=400,
-            **PLOTLY_LAYOUT_DEFAULTS
-        )
-        st.plotly_chart(fig2, use_container_width=True)
+            fig2.update_layout(
+                title="VIX Term Structure (Positive = Contango, Negative = Backwardation)",
+                yaxis_title="Spread",
+                height=400,
+                **PLOTLY_LAYOUT_DEFAULTS
+            )
+            st.plotly_chart(fig2, use_container_width=True)
 
-    # Fear & Greed conceptual section
-    st.subheader("Interpreting Sentiment Extremes")
-    st.markdown("""
+        # Fear & Greed conceptual section
+        st.subheader("Interpreting Sentiment Extremes")
+        st.markdown("""
     | Indicator | Extreme Fear | Neutral | Extreme Greed |
     |-----------|--------------|---------|---------------|
     | VIX | > 30 | 15-25 | < 15 |
@@ -4495,174 +4756,469 @@ elif page == "Sentiment":
     - Best used in combination with price action and fundamentals
     """)
 
-# Page: Custom Analysis
-elif page == "Custom Analysis":
-    st.header("🔍 Custom Analysis")
-    st.markdown("Analyze and compare multiple indicators")
+    # Page: Strategy Backtest (allocation strategies over stored prices)
+    elif page == "Strategy Backtest":
+        st.header("🧪 Strategy Backtest")
 
-    # Get all indicators
-    all_indicators = fetch_api("/api/indicators")
+        st.markdown("""
+    ### Test Allocation Ideas Against History
+
+    The regime and signal pages describe tilts - lean into equities when credit is calm, get defensive when the yield
+    curve inverts, follow sector momentum. This page checks how those rules would actually have played out on the
+    stored price history. Pick a strategy, adjust its parameters, and compare its equity curve, drawdowns and
+    risk-adjusted return against simply buying and holding the benchmark.
+
+    **Strategy types:** *Static* portfolios hold fixed weights and rebalance on a schedule. *Signal* strategies switch
+    between two allocations depending on whether an indicator (e.g. the 10Y-2Y spread) is above or below a threshold.
+    *Regime* strategies hold a different mix in each state of a stored market regime. *Momentum* strategies hold the
+    best-performing assets over a trailing window (or the worst, for mean reversion). Signals act at the next close,
+    so there is no look-ahead, and trading costs are charged on every rebalance.
+
+    **Parameter sweeps** run every combination of a small grid at once. Treat the best combination with suspicion:
+    when many variants are tried, the top one is usually the luckiest, not the most robust. Look for broad regions
+    of the grid that work, not a single peak.
+    """)
 
-    if all_indicators:
-        # Create mappings
-        indicator_options = {
-            f"{ind['name']} ({ind['indicator_id']})": ind['indicator_id']
-            for ind in all_indicators
-        }
-        indicator_metadata = {ind['indicator_id']: ind for ind in all_indicators}
-
-        # Multi-select for indicators
-        selected_names = st.multiselect(
-            "Select Indicators (up to 5)",
-            options=list(indicator_options.keys()),
-            default=[list(indicator_options.keys())[0]],
-            max_selections=5
-        )
+        try:
+            presets = get_client().backtest_presets()
+        except Exception:
+            presets = {}
 
-        if not selected_names:
-            st.warning("Please select at least one indicator")
+        if not presets:
+            st.warning("Backtest presets unavailable - is the API running?")
         else:
-            selected_ids = [indicator_options[name] for name in selected_names]
-
-            # Options row
-            col1, col2, col3 = st.columns(3)
+            preset_titles = {spec['title']: name for name, spec in presets.items()}
+            col1, col2, col3, col4 = st.columns(4)
             with col1:
-                years_back = st.slider("Years of History", 1, 30, 5)
+                preset = preset_titles[st.selectbox("Strategy", list(preset_titles), key="backtest_preset")]
             with col2:
-                normalize = st.checkbox("Normalize (% change from start)", value=len(selected_ids) > 1)
+                years_back = st.slider("Years of History", 3, 30, 20, key="backtest_years")
             with col3:
-                y_axis_zero = st.checkbox("Y-axis starts at 0", value=False)
+                cost_bps = st.number_input("Trading Cost (bps)", 0.0, 100.0, 5.0, step=1.0, key="backtest_cost")
+            with col4:
+                benchmark = st.text_input("Benchmark", "SPY", key="backtest_benchmark").strip().upper() or None
+
+            spec = presets[preset]
+            overrides = {}
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                rebalance_options = ["none", "M", "Q", "Y"]
+                overrides['rebalance'] = st.selectbox(
+                    "Rebalance", rebalance_options, index=rebalance_options.index(spec.get('rebalance', 'M')),
+                    format_func={"none": "Never (buy & hold)", "M": "Monthly", "Q": "Quarterly", "Y": "Yearly"}.get,
+                    key=f"backtest_rebalance_{preset}"
+                )
+            if spec['type'] == 'momentum':
+                with col2:
+                    overrides['lookback'] = st.slider("Lookback (trading days)", 21, 504, spec['lookback'], step=21,
+                                                      key="backtest_lookback")
+                with col3:
+                    overrides['top_n'] = st.slider("Assets Held", 1, len(spec['universe']), spec['top_n'],
+                                                   key="backtest_top_n")
+                overrides['direction'] = -1 if st.checkbox("Mean reversion (hold the laggards)", key="backtest_reversion") else 1
+            elif spec['type'] == 'signal':
+                with col2:
+                    overrides['threshold'] = st.number_input(f"{spec['signal']} threshold", value=float(spec['threshold']),
+                                                             step=0.25, key="backtest_threshold")
+
+            with st.expander("Strategy definition"):
+                st.json({**spec, **overrides})
 
             start_date = datetime.now() - timedelta(days=365 * years_back)
+            try:
+                with st.spinner("Running backtest..."):
+                    result = get_client().backtest(
+                        preset=preset, strategy=overrides, start=start_date, cost_bps=cost_bps, benchmark=benchmark
+                    )
+            except Exception as e:
+                result = None
+                st.error(f"Backtest failed: {e}")
+
+            if result:
+                stats = result['statistics']
+                strategy_stats = stats['strategy']
+                benchmark_stats = stats.get('benchmark')
+
+                def stat_delta(field, suffix):
+                    if not benchmark_stats or strategy_stats.get(field) is None or benchmark_stats.get(field) is None:
+                        return None
+                    return f"{strategy_stats[field] - benchmark_stats[field]:+.2f}{suffix} vs benchmark"
+
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Annual Return", f"{strategy_stats['annual_return']:.1f}%", stat_delta('annual_return', '%'))
+                with col2:
+                    st.metric("Volatility", f"{strategy_stats['volatility']:.1f}%", stat_delta('volatility', '%'),
+                              delta_color="inverse")
+                with col3:
+                    st.metric("Sharpe Ratio", f"{strategy_stats['sharpe']:.2f}", stat_delta('sharpe', ''))
+                with col4:
+                    st.metric("Max Drawdown", f"{strategy_stats['max_drawdown']:.1f}%", stat_delta('max_drawdown', '%'))
+
+                # Equity curves (log scale) and drawdowns
+                equity = result['equity']
+                fig = go.Figure()
+                for column, name, color in [("strategy", spec['title'], "#14b8a6"), ("benchmark", f"{benchmark} (buy & hold)", "#F6AD55")]:
+                    if column in equity.columns:
+                        fig.add_trace(line_trace(x=equity.index, y=equity[column] * 100, mode='lines', name=name,
+                                                 line=dict(color=color, width=2)))
+                fig.update_layout(
+                    title="Growth of $100", yaxis_type="log", yaxis_title="Value ($)", template='plotly_dark', height=450,
+                    paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                    xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'),
+                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
+                    hovermode='x unified'
+                )
+                st.plotly_chart(fig, use_container_width=True)
 
-            # Fetch data for all selected indicators (with high limit for long history)
-            datasets = {}
-            for sel_id in selected_ids:
-                data = fetch_api(f"/api/indicators/{sel_id}/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
-                if data and data.get('data'):
-                    df = pd.DataFrame(data['data'])
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-                    df = df.sort_values('timestamp')
-                    datasets[sel_id] = {
-                        'data': df,
-                        'name': data['name'],
-                        'metadata': indicator_metadata.get(sel_id, {})
-                    }
+                drawdown = (equity / equity.cummax() - 1) * 100
+                fig = go.Figure()
+                for column, color in [("strategy", "#14b8a6"), ("benchmark", "#F6AD55")]:
+                    if column in drawdown.columns:
+                        fig.add_trace(line_trace(x=drawdown.index, y=drawdown[column], mode='lines', name=column.title(),
+                                                 line=dict(color=color, width=1.5)))
+                fig.update_layout(
+                    title="Drawdown from Peak (%)", template='plotly_dark', height=300,
+                    paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                    xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'),
+                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
+                    hovermode='x unified'
+                )
+                st.plotly_chart(fig, use_container_width=True)
 
-            if datasets:
-                # Create comparison chart
+                # Target weights at each rebalance
+                weights = result['weights']
+                weights = weights.loc[:, (weights > 0).any()]
                 fig = go.Figure()
-                # Vibrant colors for dark theme
-                colors = ['#14b8a6', '#8b5cf6', '#F6AD55', '#ef4444', '#B794F4']
-
-                for i, (sel_id, dataset) in enumerate(datasets.items()):
-                    df = dataset['data']
-                    name = dataset['name']
-
-                    if normalize and len(df) > 0:
-                        # Normalize to percentage change from first value
-                        first_val = df.iloc[0]['value']
-                        if first_val != 0:
-                            y_values = ((df['value'] - first_val) / abs(first_val)) * 100
-                            y_label = "% Change from Start"
+                for column in weights.columns:
+                    fig.add_trace(go.Scatter(x=weights.index, y=weights[column] * 100, mode='lines', name=column,
+                                             stackgroup='weights', line=dict(width=0.5, shape='hv')))
+                fig.update_layout(
+                    title="Target Allocation at Each Rebalance (%)", template='plotly_dark', height=300,
+                    paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                    yaxis=dict(range=[0, 100], gridcolor='#2D3748'), xaxis=dict(gridcolor='#2D3748'),
+                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
+                )
+                st.plotly_chart(fig, use_container_width=True)
+
+                stats_table = pd.DataFrame(stats).rename(columns={"strategy": spec['title'], "benchmark": f"{benchmark}"})
+                st.dataframe(stats_table.astype(str), use_container_width=True)
+
+            # Parameter sweep over a small grid per strategy type
+            st.subheader("Parameter Sweep")
+            sweep_grids = {
+                "static": {"rebalance": ["none", "M", "Q", "Y"]},
+                "signal": {"threshold": [-0.5, -0.25, 0.0, 0.25, 0.5, 0.75, 1.0], "rebalance": ["M", "Q", "Y"]},
+                "regime": {"rebalance": ["none", "M", "Q", "Y"]},
+                "momentum": {"lookback": [21, 42, 63, 126, 189, 252, 378, 504], "top_n": [1, 2, 3, 4, 5],
+                             "rebalance": ["M", "Q"], "direction": [1, -1]},
+            }
+            grid = sweep_grids[spec['type']]
+            n_runs = int(np.prod([len(values) for values in grid.values()]))
+            st.caption(f"Runs every combination of {', '.join(grid)} ({n_runs} backtests) with the settings above.")
+            if st.checkbox("Run parameter sweep", key="backtest_sweep"):
+                try:
+                    with st.spinner(f"Running {n_runs} backtests..."):
+                        sweep = get_client().backtest(
+                            preset=preset, strategy=overrides, start=start_date, cost_bps=cost_bps,
+                            benchmark=benchmark, sweep=grid, top=5
+                        )
+                except Exception as e:
+                    sweep = None
+                    st.error(f"Sweep failed: {e}")
+
+                if sweep:
+                    runs = sweep['runs']
+                    params = list(grid)
+                    if len(params) >= 2:
+                        # Best Sharpe for each pair of the first two parameters
+                        surface = runs.pivot_table(index=params[0], columns=params[1], values='sharpe', aggfunc='max')
+                        fig = go.Figure(data=go.Heatmap(
+                            z=surface.values, x=[str(c) for c in surface.columns], y=[str(i) for i in surface.index],
+                            colorscale='Viridis', text=np.round(surface.values, 2), texttemplate="%{text}",
+                            colorbar=dict(title="Sharpe")
+                        ))
+                        fig.update_layout(
+                            title=f"Best Sharpe by {params[0]} and {params[1]}", xaxis_title=params[1],
+                            yaxis_title=params[0], template='plotly_dark', height=400,
+                            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+
+                    top_equity = sweep['equity']
+                    fig = go.Figure()
+                    for run in top_equity.columns:
+                        label = ", ".join(f"{p}={runs.loc[int(run), p]}" for p in params)
+                        fig.add_trace(line_trace(x=top_equity.index, y=top_equity[run] * 100, mode='lines', name=label))
+                    fig.update_layout(
+                        title="Top 5 Runs by Sharpe - Growth of $100 (weekly)", yaxis_type="log", template='plotly_dark',
+                        height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                        xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'), hovermode='x unified'
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    st.dataframe(
+                        runs[params + ['annual_return', 'volatility', 'sharpe', 'max_drawdown', 'annual_turnover']].round(2),
+                        use_container_width=True
+                    )
+
+    # Page: Custom Analysis
+    elif page == "Custom Analysis":
+        st.header("🔍 Custom Analysis")
+        st.markdown("Analyze and compare multiple indicators")
+
+        # Get all indicators
+        all_indicators = fetch_api("/api/indicators")
+
+        if all_indicators:
+            # Create mappings
+            indicator_options = {
+                f"{ind['name']} ({ind['indicator_id']})": ind['indicator_id']
+                for ind in all_indicators
+            }
+            indicator_metadata = {ind['indicator_id']: ind for ind in all_indicators}
+
+            # Multi-select for indicators
+            selected_names = st.multiselect(
+                "Select Indicators (up to 5)",
+                options=list(indicator_options.keys()),
+                default=[list(indicator_options.keys())[0]],
+                max_selections=5
+            )
+
+            if not selected_names:
+                st.warning("Please select at least one indicator")
+            else:
+                selected_ids = [indicator_options[name] for name in selected_names]
+
+                # Options row
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    years_back = st.slider("Years of History", 1, 30, 5)
+                with col2:
+                    normalize = st.checkbox("Normalize (% change from start)", value=len(selected_ids) > 1)
+                with col3:
+                    y_axis_zero = st.checkbox("Y-axis starts at 0", value=False)
+
+                start_date = datetime.now() - timedelta(days=365 * years_back)
+
+                # Fetch data for all selected indicators (with high limit for long history)
+                datasets = {}
+                for sel_id in selected_ids:
+                    data = fetch_api(f"/api/indicators/{sel_id}/timeseries?start={start_date.isoformat()}&limit=20000", silent=True)
+                    if data and data.get('data'):
+                        df = pd.DataFrame(data['data'])
+                        df['timestamp'] = pd.to_datetime(df['timestamp'])
+                        df = df.sort_values('timestamp')
+                        datasets[sel_id] = {
+                            'data': df,
+                            'name': data['name'],
+                            'metadata': indicator_metadata.get(sel_id, {})
+                        }
+
+                if datasets:
+                    # Create comparison chart
+                    fig = go.Figure()
+                    # Vibrant colors for dark theme
+                    colors = ['#14b8a6', '#8b5cf6', '#F6AD55', '#ef4444', '#B794F4']
+
+                    for i, (sel_id, dataset) in enumerate(datasets.items()):
+                        df = dataset['data']
+                        name = dataset['name']
+
+                        if normalize and len(df) > 0:
+                            # Normalize to percentage change from first value
+                            first_val = df.iloc[0]['value']
+                            if first_val != 0:
+                                y_values = ((df['value'] - first_val) / abs(first_val)) * 100
+                                y_label = "% Change from Start"
+                            else:
+                                y_values = df['value']
+                                y_label = "Value"
                         else:
                             y_values = df['value']
                             y_label = "Value"
-                    else:
-                        y_values = df['value']
-                        y_label = "Value"
 
-                    fig.add_trace(go.Scatter(
-                        x=df['timestamp'],
-                        y=y_values,
-                        mode='lines',
-                        name=name,
-                        line=dict(color=colors[i % len(colors)], width=2)
-                    ))
+                        fig.add_trace(line_trace(
+                            x=df['timestamp'],
+                            y=y_values,
+                            mode='lines',
+                            name=name,
+                            line=dict(color=colors[i % len(colors)], width=2)
+                        ))
+
+                    # Update layout with dark theme
+                    layout_opts = {
+                        'xaxis_title': "Date",
+                        'yaxis_title': "% Change" if normalize else "Value",
+                        'hovermode': 'x unified',
+                        'template': 'plotly_dark',
+                        'height': 500,
+                        'legend': dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+                        'paper_bgcolor': 'rgba(0,0,0,0)',
+                        'plot_bgcolor': 'rgba(0,0,0,0)',
+                        'xaxis': dict(gridcolor='#2D3748', zerolinecolor='#2D3748'),
+                        'yaxis': dict(gridcolor='#2D3748', zerolinecolor='#2D3748')
+                    }
 
-                # Update layout with dark theme
-                layout_opts = {
-                    'xaxis_title': "Date",
-                    'yaxis_title': "% Change" if normalize else "Value",
-                    'hovermode': 'x unified',
-                    'template': 'plotly_dark',
-                    'height': 500,
-                    'legend': dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                    'paper_bgcolor': 'rgba(0,0,0,0)',
-                    'plot_bgcolor': 'rgba(0,0,0,0)',
-                    'xaxis': dict(gridcolor='#2D3748', zerolinecolor='#2D3748'),
-                    'yaxis': dict(gridcolor='#2D3748', zerolinecolor='#2D3748')
-                }
+                    if y_axis_zero and not normalize:
+                        layout_opts['yaxis'] = dict(rangemode='tozero', gridcolor='#2D3748', zerolinecolor='#2D3748')
 
-                if y_axis_zero and not normalize:
-                    layout_opts['yaxis'] = dict(rangemode='tozero', gridcolor='#2D3748', zerolinecolor='#2D3748')
+                    fig.update_layout(**layout_opts)
+                    st.plotly_chart(fig, use_container_width=True)
 
-                fig.update_layout(**layout_opts)
-                st.plotly_chart(fig, use_container_width=True)
+                    # Statistics for each indicator; risk statistics and calendar-day
+                    # changes are computed server-side over the same window
+                    st.subheader("📊 Statistics")
+                    try:
+                        risk_stats = get_client().risk(list(datasets), start=start_date)
+                    except Exception:
+                        risk_stats = {}
 
-                # Statistics for each indicator
-                st.subheader("📊 Statistics")
-
-                for sel_id, dataset in datasets.items():
-                    df = dataset['data']
-                    meta = dataset['metadata']
-                    unit = meta.get('unit', 'N/A')
-
-                    st.markdown(f"**{dataset['name']}** (Unit: {unit})")
-                    col1, col2, col3, col4 = st.columns(4)
-
-                    with col1:
-                        st.metric("Current", f"{df.iloc[-1]['value']:,.2f}")
-                    with col2:
-                        st.metric("Average", f"{df['value'].mean():,.2f}")
-                    with col3:
-                        st.metric("Min", f"{df['value'].min():,.2f}")
-                    with col4:
-                        st.metric("Max", f"{df['value'].max():,.2f}")
-
-                    # Trends
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("30-Day", f"{calculate_change(df, 30):+.2f}%")
-                    with col2:
-                        st.metric("90-Day", f"{calculate_change(df, 90):+.2f}%")
-                    with col3:
-                        st.metric("1-Year", f"{calculate_change(df, 365):+.2f}%")
-
-                    st.divider()
-
-                # Download combined data
-                if len(datasets) > 0:
-                    # Merge all dataframes
-                    combined_df = None
                     for sel_id, dataset in datasets.items():
-                        df = dataset['data'][['timestamp', 'value']].copy()
-                        df = df.rename(columns={'value': sel_id})
-                        if combined_df is None:
-                            combined_df = df
-                        else:
-                            combined_df = pd.merge(combined_df, df, on='timestamp', how='outer')
-
-                    if combined_df is not None:
-                        combined_df = combined_df.sort_values('timestamp')
-                        csv = combined_df.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download Combined Data as CSV",
-                            data=csv,
-                            file_name=f"comparison_{datetime.now().strftime('%Y%m%d')}.csv",
-                            mime="text/csv"
-                        )
-            else:
-                st.error("No data available for selected indicators")
+                        df = dataset['data']
+                        meta = dataset['metadata']
+                        unit = meta.get('unit', 'N/A')
+                        stats = risk_stats.get(sel_id)
+
+                        st.markdown(f"**{dataset['name']}** (Unit: {unit})")
+                        col1, col2, col3, col4 = st.columns(4)
+
+                        with col1:
+                            st.metric("Current", f"{df.iloc[-1]['value']:,.2f}")
+                        with col2:
+                            st.metric("Average", f"{df['value'].mean():,.2f}")
+                        with col3:
+                            st.metric("Min", f"{df['value'].min():,.2f}")
+                        with col4:
+                            st.metric("Max", f"{df['value'].max():,.2f}")
+
+                        if stats:
+                            # Percent changes for prices/levels, absolute changes for rates and spreads
+                            pct = stats['basis'] == 'return'
+                            suffix = "%" if pct else ""
+
+                            def fmt_change(value):
+                                return "N/A" if value is None else f"{value:+.2f}{suffix}"
+
+                            # Trends (calendar-day horizons)
+                            col1, col2, col3, col4 = st.columns(4)
+                            for col, horizon, label in zip([col1, col2, col3, col4], ["30D", "90D", "1Y", "YTD"],
+                                                           ["30-Day", "90-Day", "1-Year", "YTD"]):
+                                with col:
+                                    st.metric(label, fmt_change(stats['changes'].get(horizon)))
+
+                            # Risk
+                            col1, col2, col3, col4 = st.columns(4)
+                            with col1:
+                                drawdown_days = stats['max_drawdown_days']
+                                recovery = "recovered" if stats['max_drawdown_recovery'] else "not recovered"
+                                st.metric("Max Drawdown", f"{stats['max_drawdown']:.2f}{suffix}",
+                                          f"{drawdown_days:.0f} days, {recovery}" if drawdown_days is not None else None,
+                                          delta_color="off")
+                            with col2:
+                                volatility = stats['volatility']
+                                st.metric("Volatility (ann.)", "N/A" if volatility is None else f"{volatility:.2f}{suffix}")
+                            with col3:
+                                sharpe, sortino = stats['sharpe'], stats['sortino']
+                                st.metric("Sharpe / Sortino",
+                                          "N/A" if sharpe is None or sortino is None else f"{sharpe:.2f} / {sortino:.2f}")
+                            with col4:
+                                st.metric("Percentile Rank", f"{stats['value_percentile']:.0f}",
+                                          f"skew {stats['skew']:+.2f}" if stats['skew'] is not None else None,
+                                          delta_color="off",
+                                          help="Where the current value sits within the selected window (0 = lowest, 100 = highest)")
+
+                        st.divider()
+
+                    # Rolling volatility and drawdowns
+                    with st.expander("📉 Rolling Volatility & Drawdowns"):
+                        vol_window = st.selectbox("Volatility window", [30, 90, 180, 365], index=1,
+                                                  format_func=lambda d: f"{d} days", key="risk_window")
+                        try:
+                            rolling = get_client().rolling_risk(list(datasets), window=vol_window, start=start_date)
+                        except Exception:
+                            rolling = {}
+
+                        if rolling:
+                            fig_vol = go.Figure()
+                            fig_dd = go.Figure()
+                            for i, (sel_id, frame) in enumerate(rolling.items()):
+                                color = colors[i % len(colors)]
+                                name = datasets[sel_id]['name'] if sel_id in datasets else sel_id
+                                fig_vol.add_trace(line_trace(x=frame.index, y=frame['volatility'], mode='lines',
+                                                             name=name, line=dict(color=color, width=2)))
+                                fig_dd.add_trace(line_trace(x=frame.index, y=frame['drawdown'], mode='lines',
+                                                            name=name, line=dict(color=color, width=2), fill='tozeroy'))
+                            for fig_risk, title in [(fig_vol, f"Rolling {vol_window}-Day Volatility (annualized)"),
+                                                    (fig_dd, "Drawdown from Peak")]:
+                                fig_risk.update_layout(
+                                    title=title, template='plotly_dark', height=350, hovermode='x unified',
+                                    paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                    xaxis=dict(gridcolor='#2D3748'), yaxis=dict(gridcolor='#2D3748'),
+                                    legend=dict(orientation="h", yanchor="bottom", y=1.02)
+                                )
+                                st.plotly_chart(fig_risk, use_container_width=True)
+                            st.caption("Volatility and drawdowns are in % for prices and levels, and in the series' "
+                                       "own units (e.g. percentage points) for rates and spreads.")
+
+                    # Risk screen across every indicator
+                    with st.expander("🧮 Risk Screen: All Indicators"):
+                        if st.checkbox("Load risk statistics for every indicator", key="risk_screen"):
+                            try:
+                                screen = get_client().risk(start=start_date)
+                            except Exception:
+                                screen = {}
+                            if screen:
+                                screen_df = pd.DataFrame([
+                                    {
+                                        "Indicator": indicator_metadata.get(sid, {}).get('name', sid),
+                                        "ID": sid,
+                                        "Basis": stats['basis'],
+                                        "Ann. Return/Change": stats['annual_return'],
+                                        "Volatility": stats['volatility'],
+                                        "Sharpe": stats['sharpe'],
+                                        "Max Drawdown": stats['max_drawdown'],
+                                        "Drawdown Days": stats['max_drawdown_days'],
+                                        "Current Drawdown": stats['current_drawdown'],
+                                        "Percentile": stats['value_percentile'],
+                                    }
+                                    for sid, stats in screen.items()
+                                ])
+                                st.dataframe(screen_df.round(2), hide_index=True, use_container_width=True)
+
+                    # Download combined data
+                    if len(datasets) > 0:
+                        # Merge all dataframes
+                        combined_df = None
+                        for sel_id, dataset in datasets.items():
+                            df = dataset['data'][['timestamp', 'value']].copy()
+                            df = df.rename(columns={'value': sel_id})
+                            if combined_df is None:
+                                combined_df = df
+                            else:
+                                combined_df = pd.merge(combined_df, df, on='timestamp', how='outer')
+
+                        if combined_df is not None:
+                            combined_df = combined_df.sort_values('timestamp')
+                            csv = combined_df.to_csv(index=False)
+                            st.download_button(
+                                label="📥 Download Combined Data as CSV",
+                                data=csv,
+                                file_name=f"comparison_{datetime.now().strftime('%Y%m%d')}.csv",
+                                mime="text/csv"
+                            )
+                else:
+                    st.error("No data available for selected indicators")
 
-# Page: FAQ
-elif page == "FAQ":
-    st.header("FAQ: Understanding the Metrics")
-    st.markdown("Comprehensive explanations of the key indicators and metrics used throughout this dashboard.")
+    # Page: FAQ
+    elif page == "FAQ":
+        st.header("FAQ: Understanding the Metrics")
+        st.markdown("Comprehensive explanations of the key indicators and metrics used throughout this dashboard.")
 
-    # Create expandable sections for each metric category
-    with st.expander("**10-Year/2-Year Treasury Spread (Yield Curve Inversion)**", expanded=False):
-        st.markdown("""
+        # Create expandable sections for each metric category
+        with st.expander("**10-Year/2-Year Treasury Spread (Yield Curve Inversion)**", expanded=False):
+            st.markdown("""
         ### The 10Y-2Y Treasury Spread: The Most Reliable Recession Predictor
 
         **What It Is:**
@@ -4696,8 +5252,8 @@ elif page == "FAQ":
         **Related Metrics:** The 10Y-3M spread (10-year minus 3-month) is also closely watched and some economists consider it even more predictive than the 10Y-2Y spread.
         """)
 
-    with st.expander("**Federal Reserve Balance Sheet & Liquidity Metrics**", expanded=False):
-        st.markdown("""
+        with st.expander("**Federal Reserve Balance Sheet & Liquidity Metrics**", expanded=False):
+            st.markdown("""
         ### Fed Balance Sheet, M2, Reverse Repo, and Treasury General Account: The Liquidity Framework
 
         **What These Metrics Are:**
@@ -4774,8 +5330,8 @@ elif page == "FAQ":
         This formula attempts to capture the actual money available to support asset prices after accounting for funds trapped at the Fed (RRP) and held by Treasury (TGA). Rising net liquidity tends to correlate with rising stock prices; falling net liquidity creates headwinds. While not a perfect predictor, this framework helps explain many major market moves since 2020.
         """)
 
-    with st.expander("**Inflation Metrics: CPI, Core CPI, PCE, and Breakeven Inflation**", expanded=False):
-        st.markdown("""
+        with st.expander("**Inflation Metrics: CPI, Core CPI, PCE, and Breakeven Inflation**", expanded=False):
+            st.markdown("""
         ### Understanding Inflation: The Metrics That Drive Fed Policy
 
         Inflation - the rate at which prices rise across the economy - is arguably the most important economic variable for investors. It directly drives Federal Reserve policy, which in turn moves interest rates, bond prices, stock valuations, and virtually every other financial asset. Understanding the nuances between different inflation measures helps you anticipate Fed actions and position your portfolio accordingly.
@@ -4854,8 +5410,8 @@ elif page == "FAQ":
         - **Breakevens rising sharply:** Markets losing confidence in Fed's inflation control; negative for fixed income
         """)
 
-    with st.expander("**VIX (Volatility Index) - The Fear Gauge**", expanded=False):
-        st.markdown("""
+        with st.expander("**VIX (Volatility Index) - The Fear Gauge**", expanded=False):
+            st.markdown("""
         ### The VIX: Wall Street's Fear Gauge
 
         **What It Is:**
@@ -4915,8 +5471,8 @@ elif page == "FAQ":
         The VIX measures *expected* volatility, not *realized* volatility. Markets can remain calm when VIX is elevated, or surprise investors when VIX is low. VIX is also influenced by options market supply/demand dynamics, not just fear. Systematic selling of volatility by pension funds and structured products can suppress VIX even when underlying risks exist.
         """)
 
-    with st.expander("**Growth vs. Value Investing (IWF/IWD)**", expanded=False):
-        st.markdown("""
+        with st.expander("**Growth vs. Value Investing (IWF/IWD)**", expanded=False):
+            st.markdown("""
         ### Growth vs. Value: The Fundamental Style Rotation
 
         **What These ETFs Represent:**
@@ -5002,8 +5558,8 @@ elif page == "FAQ":
         - Most advisors recommend maintaining exposure to both, rebalancing periodically to capture relative performance
         """)
 
-    with st.expander("**Large Cap vs. Small Cap (SPY/IWM)**", expanded=False):
-        st.markdown("""
+        with st.expander("**Large Cap vs. Small Cap (SPY/IWM)**", expanded=False):
+            st.markdown("""
         ### Large Cap vs. Small Cap: The Size Factor
 
         **What These ETFs Represent:**
@@ -5091,8 +5647,8 @@ elif page == "FAQ":
         When large caps dramatically outperform small caps, it often means returns are concentrated in a handful of mega-cap names. This "narrow" market can be vulnerable - if those few leaders stumble, the index has limited support. Healthy bull markets typically feature broad participation across market caps.
         """)
 
-    with st.expander("**Unemployment Rate & The Sahm Rule**", expanded=False):
-        st.markdown("""
+        with st.expander("**Unemployment Rate & The Sahm Rule**", expanded=False):
+            st.markdown("""
         ### Unemployment Rate: The Lagging Indicator That Matters Most
 
         **What It Is:**
@@ -5173,8 +5729,8 @@ elif page == "FAQ":
         Weekly initial claims (new unemployment filings) provide more timely data than the monthly unemployment rate. Rising claims often precede unemployment rate increases by 1-2 months.
         """)
 
-    with st.expander("**Housing Starts: The Economy's Crystal Ball**", expanded=False):
-        st.markdown("""
+        with st.expander("**Housing Starts: The Economy's Crystal Ball**", expanded=False):
+            st.markdown("""
         ### Housing Starts: Why Home Construction Predicts Recessions
 
         **What It Is:**
@@ -5252,8 +5808,8 @@ elif page == "FAQ":
         The "lock-in effect" - homeowners unwilling to trade their 3% mortgage for a 7% one - has created unusual dynamics where new construction remained relatively resilient while existing home sales plummeted.
         """)
 
-    with st.expander("**Consumer Sentiment: Measuring Economic Mood**", expanded=False):
-        st.markdown("""
+        with st.expander("**Consumer Sentiment: Measuring Economic Mood**", expanded=False):
+            st.markdown("""
         ### Consumer Sentiment: The Psychology of Spending
 
         **What It Is:**
@@ -5356,8 +5912,8 @@ elif page == "FAQ":
         - **Savings Rate:** High savings can reflect precautionary behavior (low confidence)
         """)
 
-    with st.expander("**Industrial Production: Measuring Real Economic Output**", expanded=False):
-        st.markdown("""
+        with st.expander("**Industrial Production: Measuring Real Economic Output**", expanded=False):
+            st.markdown("""
         ### Industrial Production: The Heartbeat of the Physical Economy
 
         **What It Is:**
@@ -5443,8 +5999,8 @@ elif page == "FAQ":
         - **Capacity Utilization:** How much of industrial capacity is being used
         """)
 
-    st.divider()
-    st.markdown("""
+        st.divider()
+        st.markdown("""
     ### Additional Resources
 
     **Data Sources:**
@@ -5460,11 +6016,16 @@ elif page == "FAQ":
     - Quantitative Easing and monetary policy transmission mechanisms
     """)
 
-# Footer
-st.divider()
-st.markdown("""
+    # Footer
+    st.divider()
+    st.markdown("""
 <div class='footer-text'>
     <p>Macro Dashboard v2.0 | Data from FRED & Yahoo Finance</p>
     <p>Built with Streamlit | API Documentation: <a href='http://localhost:8000/docs'>localhost:8000/docs</a></p>
 </div>
 """, unsafe_allow_html=True)
+
+    render_profiler.show(profiler)
+finally:
+    # st.rerun() and errors end the run early; the profiler must not outlive it
+    render_profiler.stop(profiler)
@@ -6,33 +6,68 @@ All charts should consume these standardized frames, not raw API pulls.
 """
 
 import pandas as pd
-import requests
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, Dict, List, Tuple
 import streamlit as st
 
+from api_client import MacroAPIClient, MemoryCache
+from tracing import span
 from categories import (
     CANONICAL_CATEGORIES,
     PCE_SERIES_MAP,
-    CPI_SERIES_MAP,
-    CPI_WEIGHTS,
     BLS_CEX_2023,
     get_category_color,
 )
 
-API_BASE = "http://localhost:8000"
+
+@st.cache_resource
+def get_client() -> MacroAPIClient:
+    """
+    Shared API client for the whole Streamlit process.
+    Pooled connections; responses cached for 5 minutes and cleared on refresh.
+    """
+    return MacroAPIClient(cache=MemoryCache(ttl=300, max_entries=128))
 
 
 def fetch_api(endpoint: str, silent: bool = False) -> Optional[dict]:
     """Fetch data from the API."""
+    with span("fetch_api", attributes={"endpoint": endpoint}) as current:
+        try:
+            return get_client().get_json(endpoint)
+        except Exception as e:
+            current.set_error(str(e))
+            if not silent:
+                st.error(f"API error: {e}")
+        return None
+
+
+@st.cache_data(ttl=3600)
+def get_inflation_decomposition() -> pd.DataFrame:
+    """
+    Full inflation decomposition (CPI components, headline CPI, core CPI, PCE).
+
+    One request per hour; every inflation view filters this frame.
+    Returns DataFrame with columns: [timestamp, series_id, category, headline,
+    weight, level, yoy, mom_annualized, annualized_3m, annualized_6m, contribution]
+    """
     try:
-        response = requests.get(f"{API_BASE}{endpoint}", timeout=30)
-        if response.status_code == 200:
-            return response.json()
-    except Exception as e:
-        if not silent:
-            st.error(f"API error: {e}")
-    return None
+        return get_client().inflation()
+    except Exception:
+        return pd.DataFrame()
+
+
+def _cpi_components(start_date: Optional[datetime], categories: Optional[List[str]]) -> pd.DataFrame:
+    """CPI component rows of the decomposition, optionally filtered by start date and category"""
+    df = get_inflation_decomposition()
+    if df.empty:
+        return df
+
+    mask = ~df["headline"]
+    if start_date is not None:
+        mask &= df["timestamp"] >= pd.Timestamp(start_date)
+    if categories is not None:
+        mask &= df["category"].isin(categories)
+    return df[mask & df["level"].notna()]
 
 
 @st.cache_data(ttl=3600)
@@ -48,13 +83,17 @@ def get_pce_totals() -> Dict[str, float]:
     """
     # Try to get annual PCE (PCECA) - more accurate for annual totals
     # Fall back to monthly SAAR (PCE) if annual not available
-    pce_data = fetch_api("/api/indicators/PCE/latest", silent=True)
+    try:
+        latest = get_client().latest_many(["PCE", "TTLHH", "TTLHHM156N"])
+    except Exception:
+        latest = {}
+    pce_data = latest.get("PCE")
     pce_total = pce_data.get("latest_value", 0) if pce_data else 0
 
     # Get household count
-    hh_data = fetch_api("/api/indicators/TTLHH/latest", silent=True)
+    hh_data = latest.get("TTLHH")
     if not hh_data or not hh_data.get("latest_value"):
-        hh_data = fetch_api("/api/indicators/TTLHHM156N/latest", silent=True)
+        hh_data = latest.get("TTLHHM156N")
     households = hh_data.get("latest_value", 0) if hh_data else 0
 
     # Calculate per-household (PCE is in billions, HH is in thousands)
@@ -97,8 +136,13 @@ def get_pce_spending_by_category() -> pd.DataFrame:
     """
     data = []
 
+    try:
+        latest = get_client().latest_many(PCE_SERIES_MAP)
+    except Exception:
+        latest = {}
+
     for series_id, category in PCE_SERIES_MAP.items():
-        result = fetch_api(f"/api/indicators/{series_id}/latest", silent=True)
+        result = latest.get(series_id)
         if result and result.get("latest_value"):
             cat_info = CANONICAL_CATEGORIES.get(category, {})
             data.append({
@@ -142,7 +186,6 @@ def get_bls_spending_by_category() -> pd.DataFrame:
     return df
 
 
-@st.cache_data(ttl=3600)
 def get_cpi_inflation_timeseries(
     start_date: datetime,
     categories: Optional[List[str]] = None
@@ -150,37 +193,15 @@ def get_cpi_inflation_timeseries(
     """
     Get CPI inflation time series for specified categories.
 
-    Returns DataFrame with columns: [timestamp, category, value, yoy_change]
+    Returns DataFrame with columns: [timestamp, category, value, yoy_change, series_id]
     """
-    if categories is None:
-        categories = list(CPI_SERIES_MAP.values())
-
-    all_data = []
-
-    for series_id, category in CPI_SERIES_MAP.items():
-        if category not in categories:
-            continue
-
-        result = fetch_api(
-            f"/api/indicators/{series_id}/timeseries?start={start_date.isoformat()}&limit=10000",
-            silent=True
-        )
-
-        if result and result.get("data"):
-            df = pd.DataFrame(result["data"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            df = df.sort_values("timestamp")
-            df["category"] = category
-            df["series_id"] = series_id
-
-            # Calculate YoY change
-            df["yoy_change"] = df["value"].pct_change(periods=12) * 100
-
-            all_data.append(df)
+    df = _cpi_components(start_date, categories)
+    if df.empty:
+        return pd.DataFrame()
 
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    return pd.DataFrame()
+    return df.rename(columns={"level": "value", "yoy": "yoy_change"})[
+        ["timestamp", "category", "value", "yoy_change", "series_id"]
+    ].reset_index(drop=True)
 
 
 @st.cache_data(ttl=3600)
@@ -195,56 +216,35 @@ def get_cpi_indexed_series(
         - DataFrame with columns: [timestamp, category, indexed_value]
         - Dict of summary stats per category
     """
-    if categories is None:
-        categories = list(CPI_SERIES_MAP.values())
+    df = _cpi_components(start_date, categories)
+    if df.empty:
+        return pd.DataFrame(), {}
+
+    df = df[["timestamp", "category", "level"]].copy()
+    grouped = df.groupby("category", sort=False)["level"]
+    df["indexed_value"] = df["level"] / grouped.transform("first") * 100
+
+    first = df.groupby("category", sort=False).first()
+    last = df.groupby("category", sort=False).last()
+    years = (last["timestamp"] - first["timestamp"]).dt.days / 365.25
+    growth = last["level"] / first["level"]
 
-    all_data = []
     summary_stats = {}
+    for category in first.index:
+        summary_stats[category] = {
+            "start_date": first.at[category, "timestamp"],
+            "end_date": last.at[category, "timestamp"],
+            "start_value": first.at[category, "level"],
+            "end_value": last.at[category, "level"],
+            "cumulative_change": (growth[category] - 1) * 100,
+            "cagr": (growth[category] ** (1 / years[category]) - 1) * 100 if years[category] > 0 else 0,
+            "years": years[category],
+            "color": get_category_color(category),
+        }
 
-    for series_id, category in CPI_SERIES_MAP.items():
-        if category not in categories:
-            continue
-
-        result = fetch_api(
-            f"/api/indicators/{series_id}/timeseries?start={start_date.isoformat()}&limit=10000",
-            silent=True
-        )
-
-        if result and result.get("data") and len(result["data"]) > 0:
-            df = pd.DataFrame(result["data"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            df = df.sort_values("timestamp")
-
-            # Index to 100 at start
-            base_value = df.iloc[0]["value"]
-            end_value = df.iloc[-1]["value"]
-            df["indexed_value"] = (df["value"] / base_value) * 100
-            df["category"] = category
-
-            # Calculate summary stats
-            cumulative_change = ((end_value / base_value) - 1) * 100
-            years = (df.iloc[-1]["timestamp"] - df.iloc[0]["timestamp"]).days / 365.25
-            cagr = ((end_value / base_value) ** (1 / years) - 1) * 100 if years > 0 else 0
-
-            summary_stats[category] = {
-                "start_date": df.iloc[0]["timestamp"],
-                "end_date": df.iloc[-1]["timestamp"],
-                "start_value": base_value,
-                "end_value": end_value,
-                "cumulative_change": cumulative_change,
-                "cagr": cagr,
-                "years": years,
-                "color": get_category_color(category),
-            }
-
-            all_data.append(df[["timestamp", "category", "indexed_value"]])
-
-    if all_data:
-        return pd.concat(all_data, ignore_index=True), summary_stats
-    return pd.DataFrame(), {}
+    return df[["timestamp", "category", "indexed_value"]].reset_index(drop=True), summary_stats
 
 
-@st.cache_data(ttl=3600)
 def get_inflation_contributions(
     start_date: datetime,
     categories: Optional[List[str]] = None
@@ -256,74 +256,44 @@ def get_inflation_contributions(
 
     Returns DataFrame with columns: [timestamp, category, yoy_change, weight, contribution]
     """
-    inflation_df = get_cpi_inflation_timeseries(start_date, categories)
-
-    if inflation_df.empty:
+    df = _cpi_components(start_date, categories)
+    if df.empty:
         return pd.DataFrame()
 
-    # Add weights and calculate contributions
-    inflation_df["weight"] = inflation_df["category"].map(
-        lambda x: CPI_WEIGHTS.get(x, 0) / 100  # Convert to decimal
-    )
-    inflation_df["contribution"] = inflation_df["yoy_change"] * inflation_df["weight"]
+    df = df.rename(columns={"yoy": "yoy_change"})
+    # Weight as a decimal fraction of the basket
+    df["weight"] = df["weight"].fillna(0) / 100
+    df["contribution"] = df["contribution"].fillna(0)
+    return df[["timestamp", "category", "yoy_change", "weight", "contribution"]].reset_index(drop=True)
 
-    return inflation_df
 
-
-@st.cache_data(ttl=3600)
 def get_current_yoy_inflation() -> pd.DataFrame:
     """
     Get current YoY inflation for all CPI categories.
 
     Returns DataFrame with columns: [category, yoy_change, weight, color]
     """
-    data = []
+    df = _cpi_components(None, None)
+    if df.empty:
+        return pd.DataFrame()
 
-    for series_id, category in CPI_SERIES_MAP.items():
-        # Get 2 years of data to calculate YoY
-        two_years_ago = datetime.now() - timedelta(days=730)
-        result = fetch_api(
-            f"/api/indicators/{series_id}/timeseries?start={two_years_ago.isoformat()}&limit=500",
-            silent=True
-        )
+    latest = df.dropna(subset=["yoy"]).groupby("category", sort=False).last().reset_index()
+    latest = latest.rename(columns={"yoy": "yoy_change"})
+    latest["weight"] = latest["weight"].fillna(0)
+    latest["color"] = latest["category"].map(get_category_color)
+    return latest[["category", "yoy_change", "weight", "color"]].sort_values("yoy_change", ascending=True)
 
-        if result and result.get("data") and len(result["data"]) >= 13:
-            df = pd.DataFrame(result["data"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            df = df.sort_values("timestamp")
 
-            current = df.iloc[-1]["value"]
-            year_ago = df.iloc[-13]["value"]
-            yoy = ((current - year_ago) / year_ago) * 100
+def get_latest_yoy(series_id: str) -> Optional[float]:
+    """Latest YoY inflation (%) of any decomposed price index (components, CPIAUCSL, CPILFESL, PCEPI)."""
+    df = get_inflation_decomposition()
+    if df.empty:
+        return None
 
-            data.append({
-                "category": category,
-                "yoy_change": yoy,
-                "weight": CPI_WEIGHTS.get(category, 0),
-                "color": get_category_color(category),
-            })
-
-    df = pd.DataFrame(data)
-    if not df.empty:
-        df = df.sort_values("yoy_change", ascending=True)
-    return df
+    yoy = df.loc[df["series_id"] == series_id, "yoy"].dropna()
+    return float(yoy.iloc[-1]) if not yoy.empty else None
 
 
 def get_headline_cpi_yoy() -> Optional[float]:
     """Get current headline CPI YoY inflation."""
-    two_years_ago = datetime.now() - timedelta(days=730)
-    result = fetch_api(
-        f"/api/indicators/CPIAUCSL/timeseries?start={two_years_ago.isoformat()}&limit=500",
-        silent=True
-    )
-
-    if result and result.get("data") and len(result["data"]) >= 13:
-        df = pd.DataFrame(result["data"])
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df = df.sort_values("timestamp")
-
-        current = df.iloc[-1]["value"]
-        year_ago = df.iloc[-13]["value"]
-        return ((current - year_ago) / year_ago) * 100
-
-    return None
+    return get_latest_yoy("CPIAUCSL")
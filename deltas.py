@@ -0,0 +1,89 @@
+"""
+Indicator Deltas
+
+Server-side change calculations for metric cards (1D/30D/90D/1Y/YTD).
+
+Delta semantics are CALENDAR based for every horizon and every frequency:
+the base value is the last stored observation on or before
+(latest timestamp - horizon). YTD uses the last observation on or before
+December 31 of the previous year. For a monthly series "1D" therefore
+compares against the previous month's print, and for a daily series it
+compares against the previous trading day.
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+DELTA_BASIS = "calendar"
+
+DELTA_HORIZONS = {
+    "1D": timedelta(days=1),
+    "30D": timedelta(days=30),
+    "90D": timedelta(days=90),
+    "1Y": timedelta(days=365),
+}
+
+# History needed to cover the longest horizon, with slack for sparse
+# (quarterly/annual) series whose previous print is well before the target
+DELTA_LOOKBACK = timedelta(days=800)
+
+
+def _delta(latest_value: float, base_value: float, base_timestamp) -> Dict[str, Optional[float]]:
+    """Absolute and percentage change against one base observation"""
+    change = float(latest_value - base_value)
+    pct_change = (change / abs(base_value)) * 100 if base_value != 0 else None
+    return {
+        "change": round(change, 4),
+        "pct_change": round(pct_change, 2) if pct_change is not None else None,
+        "base_timestamp": base_timestamp,
+    }
+
+
+def compute_deltas(series: pd.Series) -> Dict[str, Optional[Dict]]:
+    """
+    Compute all delta horizons for one series.
+
+    Args:
+        series: values indexed by timestamp (any order)
+
+    Returns dict keyed by horizon ("1D", "30D", "90D", "1Y", "YTD"); a
+    horizon is None when history doesn't reach back far enough.
+    """
+    deltas = {key: None for key in list(DELTA_HORIZONS) + ["YTD"]}
+    series = series.dropna().sort_index()
+    if len(series) < 2:
+        return deltas
+
+    timestamps = series.index.values
+    values = series.to_numpy(dtype=float)
+    latest_ts = series.index[-1]
+    latest_value = values[-1]
+
+    targets = {key: latest_ts - horizon for key, horizon in DELTA_HORIZONS.items()}
+    targets["YTD"] = pd.Timestamp(datetime(latest_ts.year - 1, 12, 31, 23, 59, 59))
+
+    # One vectorized lookup for every horizon: index of last obs <= target
+    target_values = np.array([np.datetime64(t) for t in targets.values()], dtype=timestamps.dtype)
+    positions = np.searchsorted(timestamps, target_values, side="right") - 1
+
+    for key, pos in zip(targets, positions):
+        if 0 <= pos < len(values) - 1:
+            deltas[key] = _delta(latest_value, values[pos], series.index[pos].to_pydatetime())
+
+    return deltas
+
+
+def compute_deltas_frame(long_df: pd.DataFrame) -> Dict[str, Dict]:
+    """
+    Compute deltas for many series from one long frame
+    with columns [indicator_id, timestamp, value].
+    """
+    if long_df.empty:
+        return {}
+
+    return {
+        indicator_id: compute_deltas(group.set_index("timestamp")["value"])
+        for indicator_id, group in long_df.groupby("indicator_id", sort=False)
+    }
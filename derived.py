@@ -0,0 +1,254 @@
+"""
+Derived Indicators
+
+Declarative registry of ratios and spreads computed from stored series and
+materialized into `indicators` with source="DERIVED", so they get the same
+API, caching, deltas and downsampling as any ingested series.
+
+Each definition gives:
+- inputs:     alias -> indicator id (inputs may themselves be derived)
+- expression: arithmetic over the aliases, evaluated with DataFrame.eval
+- alignment:  "inner" - only timestamps where every input has a value
+              "ffill" - union of timestamps, slower inputs carried forward
+- frequency:  "daily" (as aligned) or "weekly"/"monthly"/"quarterly"
+              (last value per period, stamped at period start)
+
+Recomputation is dependency-aware and incremental: a derived series is only
+touched when the data version of its inputs changed, and then only from its
+last stored point onward. Definitions are processed in dependency order so
+changes propagate through derived-of-derived series in one pass.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from main import (
+    get_db_context, load_series_frame, data_version, latest_timestamp, replace_series_tail,
+    IndicatorMetadata, DerivedState
+)
+
+logger = logging.getLogger(__name__)
+
+DERIVED_SOURCE = "DERIVED"
+
+# Input history reloaded before the last stored point on incremental runs:
+# enough to carry a quarterly input forward and to complete a partial period
+INCREMENTAL_LOOKBACK = timedelta(days=400)
+
+FREQUENCIES = {
+    "daily": None,
+    "weekly": "W",
+    "monthly": "M",
+    "quarterly": "Q",
+}
+
+DERIVED_INDICATORS = {
+    "COPPER_GOLD": {
+        "name": "Copper/Gold Ratio",
+        "category": "market",
+        "subcategory": "commodities",
+        "unit": "ratio",
+        "description": "Copper ($/lb) x 1000 / gold ($/oz) - rising = risk-on growth optimism",
+        "inputs": {"copper": "HG=F", "gold": "GC=F"},
+        "expression": "copper * 1000 / gold",
+        "alignment": "inner",
+        "frequency": "daily",
+    },
+    "BAA_AAA": {
+        "name": "BAA-AAA Corporate Spread",
+        "category": "economy",
+        "subcategory": "credit",
+        "unit": "percent",
+        "description": "Moody's BAA minus AAA corporate bond yield - credit quality premium within investment grade",
+        "inputs": {"baa": "BAA", "aaa": "AAA"},
+        "expression": "baa - aaa",
+        "alignment": "inner",
+        "frequency": "monthly",
+    },
+    "VIX_VIX3M": {
+        "name": "VIX / VIX3M Ratio",
+        "category": "sentiment",
+        "subcategory": "volatility",
+        "unit": "ratio",
+        "description": "Spot VIX over 3-month VIX - above 1 means the volatility curve is in backwardation",
+        "inputs": {"vix": "^VIX", "vix3m": "^VIX3M"},
+        "expression": "vix / vix3m",
+        "alignment": "inner",
+        "frequency": "daily",
+    },
+    "VIX_TERM_SPREAD": {
+        "name": "VIX Term Spread (3M - Spot)",
+        "category": "sentiment",
+        "subcategory": "volatility",
+        "unit": "index_points",
+        "description": "3-month VIX minus spot VIX - positive = contango, negative = backwardation",
+        "inputs": {"vix": "^VIX", "vix3m": "^VIX3M"},
+        "expression": "vix3m - vix",
+        "alignment": "inner",
+        "frequency": "daily",
+    },
+    "RSP_SPY": {
+        "name": "Equal-Weight / Cap-Weight S&P 500",
+        "category": "market",
+        "subcategory": "breadth",
+        "unit": "ratio",
+        "description": "RSP / SPY price ratio - rising = broadening market breadth",
+        "inputs": {"rsp": "RSP", "spy": "SPY"},
+        "expression": "rsp / spy",
+        "alignment": "inner",
+        "frequency": "daily",
+    },
+    "REAL_RATE_10Y": {
+        "name": "10Y Real Rate (Breakeven Proxy)",
+        "category": "economy",
+        "subcategory": "rates",
+        "unit": "percent",
+        "description": "10-year Treasury yield minus 10-year breakeven inflation",
+        "inputs": {"nominal": "DGS10", "breakeven": "T10YIE"},
+        "expression": "nominal - breakeven",
+        "alignment": "inner",
+        "frequency": "daily",
+    },
+    "BUFFETT_INDICATOR": {
+        "name": "Buffett Indicator (Market Cap / GDP)",
+        "category": "market",
+        "subcategory": "valuation",
+        "unit": "percent",
+        "description": "Corporate equities market value as a percentage of nominal GDP",
+        "inputs": {"market_cap": "NCBEILQ027S", "gdp": "GDP"},
+        "expression": "market_cap / gdp * 100",
+        "alignment": "ffill",
+        "frequency": "quarterly",
+    },
+}
+
+
+def dependency_order(definitions: Dict[str, dict]) -> List[str]:
+    """Derived ids ordered so every definition comes after the derived inputs it uses"""
+    ordered, visiting = [], set()
+
+    def visit(derived_id: str):
+        if derived_id in ordered:
+            return
+        if derived_id in visiting:
+            raise ValueError(f"Circular derived indicator dependency at '{derived_id}'")
+        visiting.add(derived_id)
+        for input_id in definitions[derived_id]["inputs"].values():
+            if input_id in definitions:
+                visit(input_id)
+        visiting.discard(derived_id)
+        ordered.append(derived_id)
+
+    for derived_id in definitions:
+        visit(derived_id)
+    return ordered
+
+
+def dependents(definitions: Dict[str, dict], changed_ids: List[str]) -> List[str]:
+    """Derived ids (in dependency order) affected by changes to `changed_ids`, transitively"""
+    affected = set(changed_ids)
+    result = []
+    for derived_id in dependency_order(definitions):
+        if affected & set(definitions[derived_id]["inputs"].values()):
+            affected.add(derived_id)
+            result.append(derived_id)
+    return result
+
+
+def compute_derived(spec: dict, inputs: pd.DataFrame) -> pd.Series:
+    """
+    Evaluate one definition over a wide frame of its inputs
+    (index = timestamp, columns = indicator ids).
+    """
+    columns = {alias: inputs[input_id] for alias, input_id in spec["inputs"].items() if input_id in inputs.columns}
+    if len(columns) < len(spec["inputs"]):
+        return pd.Series(dtype=float)
+
+    frame = pd.DataFrame(columns).sort_index()
+    if spec["alignment"] == "ffill":
+        frame = frame.ffill()
+    elif spec["alignment"] != "inner":
+        raise ValueError(f"Unknown alignment '{spec['alignment']}'")
+    frame = frame.dropna()
+
+    values = frame.eval(spec["expression"])
+    values = values.where(~values.isin([float("inf"), float("-inf")])).dropna()
+
+    freq = FREQUENCIES[spec["frequency"]]
+    if freq is not None and not values.empty:
+        values = values.groupby(values.index.to_period(freq)).last()
+        values.index = values.index.to_timestamp()
+    return values
+
+
+def _ensure_metadata(db, derived_id: str, spec: dict):
+    if db.query(IndicatorMetadata).filter(IndicatorMetadata.indicator_id == derived_id).first():
+        return
+    db.add(IndicatorMetadata(
+        indicator_id=derived_id,
+        name=spec["name"],
+        description=spec["description"],
+        category=spec["category"],
+        subcategory=spec.get("subcategory"),
+        unit=spec.get("unit"),
+        source=DERIVED_SOURCE,
+        typical_frequency=spec["frequency"],
+    ))
+
+
+def update_derived(db, derived_id: str, spec: dict, full: bool = False) -> Optional[int]:
+    """
+    Recompute one derived indicator if its inputs changed since the last run.
+    Returns points written, or None when the inputs are unchanged.
+    """
+    input_ids = list(spec["inputs"].values())
+    version = data_version(db, input_ids)
+    state = db.query(DerivedState).filter(DerivedState.indicator_id == derived_id).first()
+    if not full and state is not None and state.input_version == version:
+        return None
+
+    last = None if full else latest_timestamp(db, derived_id)
+    start = last - INCREMENTAL_LOOKBACK if last is not None else None
+
+    output = compute_derived(spec, load_series_frame(db, input_ids, start))
+    if last is not None:
+        output = output[output.index >= pd.Timestamp(last)]
+
+    written = 0
+    if not output.empty:
+        _ensure_metadata(db, derived_id, spec)
+        written = replace_series_tail(db, derived_id, output, DERIVED_SOURCE, spec["frequency"])
+
+    if state is None:
+        state = DerivedState(indicator_id=derived_id)
+        db.add(state)
+    state.input_version = version
+    db.commit()
+    return written
+
+
+def refresh_derived(changed_ids: Optional[List[str]] = None, full: bool = False):
+    """
+    Update derived indicators in their own session (called after ingestion).
+    With `changed_ids`, only definitions that depend on them are checked.
+    """
+    definitions = DERIVED_INDICATORS
+    derived_ids = dependency_order(definitions) if changed_ids is None else dependents(definitions, changed_ids)
+
+    try:
+        with get_db_context() as db:
+            for derived_id in derived_ids:
+                written = update_derived(db, derived_id, definitions[derived_id], full=full)
+                if written is not None:
+                    logger.info(f"Derived {derived_id}: {written} points written")
+    except Exception as e:
+        logger.error(f"Derived indicator update failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    refresh_derived(full="--full" in sys.argv)
@@ -0,0 +1,120 @@
+"""
+Inflation Decomposition Engine
+
+Stacks all monthly price-index series (CPI components plus headline CPI,
+core CPI and PCE) into one aligned month x series matrix and computes, in
+one vectorized pass:
+- YoY change
+- MoM change, annualized
+- 3-month and 6-month changes, annualized
+- weight-based contribution to headline CPI (weight_i * yoy_i, CPI_WEIGHTS)
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from categories import CPI_SERIES_MAP, CPI_WEIGHTS
+
+# Headline price indexes decomposed alongside the CPI components
+HEADLINE_SERIES = {
+    "CPIAUCSL": "All items CPI",
+    "CPILFESL": "Core CPI",
+    "PCEPI": "PCE Price Index",
+}
+
+MEASURES = ["yoy", "mom_annualized", "annualized_3m", "annualized_6m", "contribution"]
+
+
+def inflation_series_ids() -> List[str]:
+    """Every series the engine needs, components first"""
+    return list(CPI_SERIES_MAP) + list(HEADLINE_SERIES)
+
+
+def _annualized(levels: pd.DataFrame, months: int) -> pd.DataFrame:
+    """Compounded annual rate (%) of the change over the last `months` months"""
+    return ((levels / levels.shift(months)) ** (12 / months) - 1) * 100
+
+
+def decompose_inflation(levels: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Compute all inflation measures for a wide frame of index levels
+    (index = timestamp, one column per series).
+
+    Series are aligned on a complete monthly PeriodIndex first, so shifts are
+    true calendar-month lags even when a series has gaps.
+
+    Returns dict of month x series frames: "level" plus every name in MEASURES.
+    Contribution is NaN for series without a CPI weight (e.g. headline CPI).
+    """
+    if levels.empty:
+        return {name: pd.DataFrame() for name in ["level"] + MEASURES}
+
+    monthly = levels.groupby(levels.index.to_period("M")).last()
+    monthly = monthly.reindex(pd.period_range(monthly.index.min(), monthly.index.max(), freq="M"))
+
+    weights = pd.Series(
+        {sid: CPI_WEIGHTS.get(CPI_SERIES_MAP[sid], 0) / 100 for sid in monthly.columns if sid in CPI_SERIES_MAP},
+        dtype=float
+    ).reindex(monthly.columns)
+
+    yoy = (monthly / monthly.shift(12) - 1) * 100
+    return {
+        "level": monthly,
+        "yoy": yoy,
+        "mom_annualized": _annualized(monthly, 1),
+        "annualized_3m": _annualized(monthly, 3),
+        "annualized_6m": _annualized(monthly, 6),
+        "contribution": yoy * weights.where(weights > 0),
+    }
+
+
+def series_label(series_id: str) -> str:
+    """Category (components) or headline name for a series id"""
+    return CPI_SERIES_MAP.get(series_id) or HEADLINE_SERIES.get(series_id, series_id)
+
+
+def decomposition_to_dict(
+    decomposition: Dict[str, pd.DataFrame],
+    start: Optional[pd.Timestamp] = None,
+    decimals: int = 4
+) -> Dict[str, dict]:
+    """
+    Columnar JSON payload per series:
+    {series_id: {category, weight, timestamps, level, yoy, ..., latest: {...}}}
+    """
+    level = decomposition["level"]
+    if level.empty:
+        return {}
+
+    # Month-start timestamps, matching how FRED dates monthly observations
+    timestamps = level.index.to_timestamp()
+    keep = np.ones(len(level), dtype=bool) if start is None else timestamps >= pd.Timestamp(start)
+
+    output = {}
+    for series_id in level.columns:
+        present = level[series_id].notna().to_numpy() & keep
+        if not present.any():
+            continue
+
+        category = series_label(series_id)
+        entry = {
+            "category": category,
+            "headline": series_id in HEADLINE_SERIES,
+            "weight": CPI_WEIGHTS.get(category) if series_id in CPI_SERIES_MAP else None,
+            "timestamps": timestamps[present].strftime("%Y-%m-%dT%H:%M:%S").tolist(),
+        }
+        latest = {}
+        for name in ["level"] + MEASURES:
+            column = decomposition[name][series_id].round(decimals)
+            values = column.to_numpy()[present]
+            entry[name] = [None if np.isnan(v) else float(v) for v in values]
+
+            # Latest available reading over full history (not just the window)
+            valid = column.dropna()
+            latest[name] = float(valid.iloc[-1]) if not valid.empty else None
+        latest["timestamp"] = timestamps[level[series_id].notna().to_numpy()][-1].strftime("%Y-%m-%dT%H:%M:%S")
+        entry["latest"] = latest
+        output[series_id] = entry
+
+    return output
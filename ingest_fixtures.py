@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Ingest Fixtures
+
+Recorded FRED and Yahoo chart API responses and a local HTTP server that
+replays them, so ingest_fred.py / ingest_market.py can run without network
+access (CI, air-gapped boxes, benchmark_ingest.py).
+
+    python ingest_fixtures.py record --dir fixtures            # capture live responses (needs FRED_API_KEY)
+    python ingest_fixtures.py synthesize --dir fixtures --years 30   # or generate them from synthetic_data.py
+    python ingest_fixtures.py serve --dir fixtures --port 8900 --latency-ms 80
+
+Point the ingest scripts at a running server with
+FRED_API_URL=http://127.0.0.1:8900/fred and
+YAHOO_CHART_URL=http://127.0.0.1:8900/v8/finance/chart (any FRED_API_KEY works).
+
+Layout: <dir>/fred/<series_id>.xml holds the raw series/observations
+response, <dir>/yahoo/<symbol>.json the raw chart response.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+from xml.sax.saxutils import quoteattr
+
+import pandas as pd
+import requests
+
+FRED_LIVE_URL = "https://api.stlouisfed.org/fred"
+YAHOO_LIVE_URL = "https://query1.finance.yahoo.com/v8/finance/chart"
+
+FRED_PATH = "/fred/series/observations"
+YAHOO_PATH = "/v8/finance/chart/"
+
+# Time of day Yahoo stamps daily bars with (US market open, UTC)
+YAHOO_SESSION_OPEN = pd.Timedelta(hours=14, minutes=30)
+
+# Same header the ingest uses; Yahoo rejects requests without a browser agent
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+
+def fixture_path(directory: str, source: str, series_id: str) -> str:
+    extension = "xml" if source == "fred" else "json"
+    return os.path.join(directory, source, f"{series_id}.{extension}")
+
+
+def _write(path: str, body: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+def record_fixtures(directory: str, api_key: str) -> Dict[str, int]:
+    """Capture the live response for every tracked series. Returns counts per source."""
+    from ingest_fred import FRED_INDICATORS
+    from ingest_market import CRYPTO_INDICATORS, STOCK_INDICATORS
+
+    counts = {"fred": 0, "yahoo": 0, "failed": 0}
+    for series_id in FRED_INDICATORS:
+        # Same query as Fred.get_series(series_id, observation_start=datetime(1900, 1, 1))
+        params = {"series_id": series_id, "observation_start": "1900-01-01", "api_key": api_key}
+        try:
+            response = requests.get(f"{FRED_LIVE_URL}/series/observations", params=params, timeout=60)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"FRED {series_id}: {e}", file=sys.stderr)
+            counts["failed"] += 1
+            continue
+        _write(fixture_path(directory, "fred", series_id), response.content)
+        counts["fred"] += 1
+
+    for symbol in {**STOCK_INDICATORS, **CRYPTO_INDICATORS}:
+        params = {"period1": 0, "period2": int(datetime.now().timestamp()), "interval": "1d", "events": "history"}
+        try:
+            response = requests.get(f"{YAHOO_LIVE_URL}/{symbol}", params=params,
+                                    headers={"User-Agent": USER_AGENT}, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"Yahoo {symbol}: {e}", file=sys.stderr)
+            counts["failed"] += 1
+            continue
+        _write(fixture_path(directory, "yahoo", symbol), response.content)
+        counts["yahoo"] += 1
+        time.sleep(0.5)
+    return counts
+
+
+def synthesize_fixtures(directory: str, years: float, end: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Write responses in the FRED/Yahoo wire formats from synthetic_data.py for
+    every tracked series - fixtures for boxes that never had network access.
+    """
+    from synthetic_data import synthetic_catalog, synthetic_series
+
+    counts = {"fred": 0, "yahoo": 0}
+    today = datetime.now().strftime("%Y-%m-%d")
+    for entry in synthetic_catalog():
+        series = synthetic_series(entry, years, end)
+        if entry["source"] == "FRED":
+            rows = "".join(
+                f'<observation realtime_start="{today}" realtime_end="{today}" '
+                f'date="{timestamp:%Y-%m-%d}" value="{value:g}"/>'
+                for timestamp, value in series.items()
+            )
+            body = (
+                '<?xml version="1.0" encoding="utf-8" ?>'
+                f'<observations realtime_start="{today}" realtime_end="{today}" '
+                f'observation_start="1900-01-01" observation_end="9999-12-31" units="lin" '
+                f'output_type="1" file_type="xml" order_by="observation_date" sort_order="asc" '
+                f'count="{len(series)}" offset="0" limit="100000">{rows}</observations>'
+            )
+            _write(fixture_path(directory, "fred", entry["indicator_id"]), body.encode())
+            counts["fred"] += 1
+        else:
+            # Yahoo stamps daily bars with the session open in epoch seconds
+            timestamps = (series.index + YAHOO_SESSION_OPEN).astype("int64") // 10 ** 9
+            body = {"chart": {"result": [{
+                "meta": {"symbol": entry["indicator_id"], "currency": "USD", "dataGranularity": "1d"},
+                "timestamp": timestamps.tolist(),
+                "indicators": {"quote": [{"close": series.round(4).tolist()}]},
+            }], "error": None}}
+            _write(fixture_path(directory, "yahoo", entry["indicator_id"]), json.dumps(body).encode())
+            counts["yahoo"] += 1
+    return counts
+
+
+# ============================================================================
+# REPLAY SERVER
+# ============================================================================
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves fixture files on the FRED and Yahoo chart API paths"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        if url.path == FRED_PATH:
+            series_id = parse_qs(url.query).get("series_id", [""])[0]
+            path = fixture_path(server.directory, "fred", series_id)
+            content_type = "text/xml; charset=UTF-8"
+            missing = (400, content_type, '<?xml version="1.0" encoding="utf-8" ?><error code="400" '
+                       f'message={quoteattr("Bad Request.  The series does not exist.")}/>')
+        elif url.path.startswith(YAHOO_PATH):
+            symbol = unquote(url.path[len(YAHOO_PATH):])
+            path = fixture_path(server.directory, "yahoo", symbol)
+            content_type = "application/json;charset=utf-8"
+            missing = (404, content_type, json.dumps({"chart": {"result": None, "error": {
+                "code": "Not Found", "description": "No data found, symbol may be delisted"}}}))
+        else:
+            path, missing = None, (404, "text/plain", "Unknown path")
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        # Ids come straight from the URL - never serve anything outside the fixture tree
+        if path and os.path.dirname(os.path.dirname(path)) != server.directory:
+            path = None
+        if path and os.path.isfile(path):
+            with open(path, "rb") as f:
+                status, body = 200, f.read()
+        else:
+            status, content_type, text = missing
+            body = text.encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.requests_served += 1
+            server.bytes_served += len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Replays fixtures from `directory`, waiting `latency_ms` before each
+    response to model the network round trip to the real APIs.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, directory: str, port: int = 0, latency_ms: float = 0, host: str = "127.0.0.1"):
+        super().__init__((host, port), FixtureHandler)
+        self.directory = os.path.normpath(directory)
+        self.latency = latency_ms / 1000
+        self.lock = threading.Lock()
+        self.requests_served = 0
+        self.bytes_served = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def source_urls(self) -> Dict[str, str]:
+        """Settings overrides that route the ingest scripts here"""
+        return {"FRED_API_URL": f"{self.base_url}/fred", "YAHOO_CHART_URL": f"{self.base_url}{YAHOO_PATH.rstrip('/')}"}
+
+    def start(self) -> "FixtureServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Capture live FRED and Yahoo responses")
+    record.add_argument("--dir", default="fixtures")
+    record.add_argument("--api-key", default=os.environ.get("FRED_API_KEY", ""))
+    synthesize = commands.add_parser("synthesize", help="Generate fixtures from synthetic series")
+    synthesize.add_argument("--dir", default="fixtures")
+    synthesize.add_argument("--years", type=float, default=30)
+    serve = commands.add_parser("serve", help="Replay fixtures over HTTP")
+    serve.add_argument("--dir", default="fixtures")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8900)
+    serve.add_argument("--latency-ms", type=float, default=0, help="Delay before every response")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        if not args.api_key:
+            parser.error("FRED_API_KEY or --api-key is required to record")
+        print(json.dumps(record_fixtures(args.dir, args.api_key)))
+    elif args.command == "synthesize":
+        print(json.dumps(synthesize_fixtures(args.dir, args.years)))
+    else:
+        server = FixtureServer(args.dir, args.port, args.latency_ms, args.host)
+        for name, url in server.source_urls.items():
+            print(f"{name}={url}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
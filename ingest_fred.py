@@ -7,12 +7,21 @@ from datetime import datetime, timedelta
 import pandas as pd
 import logging
 import os
+import time
 
 # Import from main.py
 from main import (
-    settings, get_db_context, 
+    settings, get_db_context, record_ingest_timing, stored_timestamps,
     Indicator, IndicatorMetadata, RefreshLog
 )
+from derived import refresh_derived
+from recession import refresh_recession_models
+from signals import refresh_signals
+from ranking import refresh_rankings
+from series_stats import refresh_series_stats
+from columnar_store import refresh_columnar_store
+from series_cache import refresh_series_cache
+from regimes import refresh_regimes
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -714,11 +723,14 @@ FRED_INDICATORS = {
 def ingest_fred_data(years_back=100):
     """Ingest FRED data - defaults to max available history"""
     fred = Fred(api_key=settings.fred_api_key)
+    fred.root_url = settings.fred_api_url
     # Use 1900 as start to get all available history
     start_date = datetime(1900, 1, 1)
+    changed_ids = []
     
     with get_db_context() as db:
         for series_id, metadata in FRED_INDICATORS.items():
+            started = time.perf_counter()
             try:
                 logger.info(f"Fetching {series_id}: {metadata['name']}")
                 
@@ -743,14 +755,11 @@ def ingest_fred_data(years_back=100):
                 
                 # Save time series
                 records_added = 0
+                stored = stored_timestamps(db, series_id)
                 for timestamp, value in series.items():
                     if pd.notna(value):
-                        existing_data = db.query(Indicator).filter(
-                            Indicator.indicator_id == series_id,
-                            Indicator.timestamp == timestamp
-                        ).first()
-                        
-                        if not existing_data:
+                        if timestamp not in stored:
+                            stored.add(timestamp)
                             indicator = Indicator(
                                 indicator_id=series_id,
                                 timestamp=timestamp,
@@ -772,8 +781,11 @@ def ingest_fred_data(years_back=100):
                 )
                 db.add(log)
                 db.commit()
+                record_ingest_timing(db, "FRED", series_id, time.perf_counter() - started, len(series), records_added)
                 
                 logger.info(f"  ✓ Added {records_added} new records")
+                if records_added:
+                    changed_ids.append(series_id)
                 
             except Exception as e:
                 logger.error(f"  ✗ Error: {str(e)}")
@@ -786,6 +798,18 @@ def ingest_fred_data(years_back=100):
                 )
                 db.add(log)
                 db.commit()
+                record_ingest_timing(db, "FRED", series_id, time.perf_counter() - started, 0, 0, status="error")
+
+    # Update derived series and recession models, then re-evaluate alert
+    # rules and market regimes against the new data
+    refresh_derived(changed_ids)
+    refresh_recession_models()
+    refresh_signals()
+    refresh_regimes()
+    refresh_rankings()
+    refresh_series_stats()
+    refresh_columnar_store()
+    refresh_series_cache()
 
 
 if __name__ == "__main__":
@@ -10,9 +10,17 @@ import logging
 import time
 
 from main import (
-    get_db_context,
+    settings, get_db_context, record_ingest_timing, stored_timestamps,
     Indicator, IndicatorMetadata, RefreshLog
 )
+from derived import refresh_derived
+from signals import refresh_signals
+from ranking import refresh_rankings
+from series_stats import refresh_series_stats
+from columnar_store import refresh_columnar_store
+from series_cache import refresh_series_cache
+from regimes import refresh_regimes
+from rrg import refresh_rrg
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -588,7 +596,7 @@ def fetch_yahoo_data(symbol: str, days_back: int = 365 * 30) -> list:
     start_time = 0
 
     # Yahoo Finance chart API
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+    url = f"{settings.yahoo_chart_url}/{symbol}"
     params = {
         "period1": start_time,
         "period2": end_time,
@@ -677,6 +685,7 @@ def ingest_market_data(years_back: int = 10):
     days_back = years_back * 365
     success_count = 0
     error_count = 0
+    changed_ids = []
 
     logger.info("=" * 60)
     logger.info("MARKET DATA INGESTION")
@@ -690,6 +699,7 @@ def ingest_market_data(years_back: int = 10):
         for symbol, metadata in STOCK_INDICATORS.items():
             logger.info(f"Fetching {symbol}: {metadata['name']}")
 
+            started = time.perf_counter()
             records = fetch_yahoo_data(symbol, days_back)
 
             if not records:
@@ -706,6 +716,7 @@ def ingest_market_data(years_back: int = 10):
                 )
                 db.add(log)
                 db.commit()
+                record_ingest_timing(db, "YAHOO_FINANCE", symbol, time.perf_counter() - started, 0, 0, status="error")
                 continue
 
             logger.info(f"  Fetched {len(records)} records")
@@ -727,13 +738,10 @@ def ingest_market_data(years_back: int = 10):
 
             # Save time series
             records_added = 0
+            stored = stored_timestamps(db, symbol)
             for record in records:
-                existing_data = db.query(Indicator).filter(
-                    Indicator.indicator_id == symbol,
-                    Indicator.timestamp == record["timestamp"]
-                ).first()
-
-                if not existing_data:
+                if record["timestamp"] not in stored:
+                    stored.add(record["timestamp"])
                     indicator = Indicator(
                         indicator_id=symbol,
                         timestamp=record["timestamp"],
@@ -755,12 +763,15 @@ def ingest_market_data(years_back: int = 10):
             )
             db.add(log)
             db.commit()
+            record_ingest_timing(db, "YAHOO_FINANCE", symbol, time.perf_counter() - started, len(records), records_added)
 
             logger.info(f"  Added {records_added} new records")
             success_count += 1
+            if records_added:
+                changed_ids.append(symbol)
 
             # Rate limiting - be nice to Yahoo
-            time.sleep(0.5)
+            time.sleep(settings.yahoo_request_delay)
 
         # === CRYPTO from Yahoo Finance ===
         logger.info("\n--- Cryptocurrency (Yahoo Finance) ---")
@@ -768,6 +779,7 @@ def ingest_market_data(years_back: int = 10):
         for symbol, metadata in CRYPTO_INDICATORS.items():
             logger.info(f"Fetching {symbol}: {metadata['name']}")
 
+            started = time.perf_counter()
             records = fetch_yahoo_data(symbol, days_back)
 
             if not records:
@@ -783,6 +795,7 @@ def ingest_market_data(years_back: int = 10):
                 )
                 db.add(log)
                 db.commit()
+                record_ingest_timing(db, "YAHOO_FINANCE", symbol, time.perf_counter() - started, 0, 0, status="error")
                 continue
 
             logger.info(f"  Fetched {len(records)} records")
@@ -804,13 +817,10 @@ def ingest_market_data(years_back: int = 10):
 
             # Save time series
             records_added = 0
+            stored = stored_timestamps(db, symbol)
             for record in records:
-                existing_data = db.query(Indicator).filter(
-                    Indicator.indicator_id == symbol,
-                    Indicator.timestamp == record["timestamp"]
-                ).first()
-
-                if not existing_data:
+                if record["timestamp"] not in stored:
+                    stored.add(record["timestamp"])
                     indicator = Indicator(
                         indicator_id=symbol,
                         timestamp=record["timestamp"],
@@ -832,11 +842,25 @@ def ingest_market_data(years_back: int = 10):
             )
             db.add(log)
             db.commit()
+            record_ingest_timing(db, "YAHOO_FINANCE", symbol, time.perf_counter() - started, len(records), records_added)
 
             logger.info(f"  Added {records_added} new records")
             success_count += 1
-
-            time.sleep(0.5)
+            if records_added:
+                changed_ids.append(symbol)
+
+            time.sleep(settings.yahoo_request_delay)
+
+    # Recompute derived series that depend on changed inputs and the newest
+    # sector rotation points, then re-evaluate alert rules and market regimes
+    refresh_derived(changed_ids)
+    refresh_rrg()
+    refresh_signals()
+    refresh_regimes()
+    refresh_rankings()
+    refresh_series_stats()
+    refresh_columnar_store()
+    refresh_series_cache()
 
     # Summary
     logger.info("\n" + "=" * 60)
@@ -0,0 +1,144 @@
+"""
+Historical Ranking Index
+
+Where each series' latest value sits in its own history, precomputed at
+ingest time and stored in `indicator_rankings`, one row per series and
+lookback (full history, last 10 years, last 5 years - measured back from
+the series' newest point):
+
+- percentile: mid-rank of the latest value among the lookback's values,
+              found by binary search in the sorted array (ties count half)
+- z_score:    (latest - mean) / std over the lookback
+- quantiles:  101-point sketch (0th..100th percentile) of the lookback's
+              values, so the API can place any other value in the
+              distribution without touching the raw history
+
+A series is only re-ranked when its data version (row count, newest
+timestamp and sum of values) changed since the last run, so refreshes
+after a partial ingest stay cheap and the heatmap endpoint is a single
+small table read.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from main import (
+    get_db_context, load_series_long, series_versions, IndicatorMetadata, IndicatorRanking, RANKING_LOOKBACKS
+)
+
+logger = logging.getLogger(__name__)
+
+# Percentiles stored in each row's quantile sketch
+QUANTILE_POINTS = np.linspace(0, 100, 101)
+
+# Fewer observations than this in a lookback and it is not ranked
+RANKING_MIN_OBSERVATIONS = 10
+
+# Series loaded per query when re-ranking
+LOAD_CHUNK = 20
+
+
+def rank_series(series: pd.Series) -> Dict[str, dict]:
+    """
+    Ranking statistics of a series' latest value for every lookback.
+    series: values indexed by timestamp, in time order.
+    Returns lookback -> dict of IndicatorRanking column values.
+    """
+    series = series.dropna()
+    if series.empty:
+        return {}
+    latest_timestamp = series.index[-1]
+    latest = float(series.iloc[-1])
+
+    rankings = {}
+    for lookback, years in RANKING_LOOKBACKS.items():
+        window = series if years is None else series[series.index > latest_timestamp - pd.DateOffset(years=years)]
+        if len(window) < RANKING_MIN_OBSERVATIONS:
+            continue
+
+        values = np.sort(window.to_numpy())
+        below = np.searchsorted(values, latest, side="left")
+        not_above = np.searchsorted(values, latest, side="right")
+        mean = float(values.mean())
+        std = float(values.std(ddof=1))
+
+        rankings[lookback] = {
+            "latest_timestamp": latest_timestamp.to_pydatetime(),
+            "latest_value": latest,
+            "percentile": round((below + not_above) / 2 / len(values) * 100, 2),
+            "z_score": round((latest - mean) / std, 4) if std > 0 else None,
+            "mean": mean,
+            "std": std,
+            "min_value": float(values[0]),
+            "max_value": float(values[-1]),
+            "observations": int(len(values)),
+            "start_timestamp": window.index[0].to_pydatetime(),
+            "quantiles": json.dumps([round(float(q), 6) for q in np.percentile(values, QUANTILE_POINTS)]),
+        }
+    return rankings
+
+
+def update_rankings(db, indicator_ids: Optional[List[str]] = None, full: bool = False) -> int:
+    """
+    Re-rank series whose data changed since their last ranking (all active
+    series by default). Returns the number of series re-ranked.
+    """
+    all_series = indicator_ids is None
+    if all_series:
+        indicator_ids = [i for (i,) in db.query(IndicatorMetadata.indicator_id).filter(
+            IndicatorMetadata.is_active == True
+        )]
+    versions = series_versions(db, indicator_ids)
+
+    stored = {}
+    if not full:
+        stored = dict(db.query(IndicatorRanking.indicator_id, IndicatorRanking.input_version).filter(
+            IndicatorRanking.indicator_id.in_(list(versions))
+        ).distinct())
+    changed = [i for i, version in versions.items() if stored.get(i) != version]
+
+    for start in range(0, len(changed), LOAD_CHUNK):
+        chunk = changed[start:start + LOAD_CHUNK]
+        long_df = load_series_long(db, chunk)
+        db.query(IndicatorRanking).filter(IndicatorRanking.indicator_id.in_(chunk)).delete(synchronize_session=False)
+
+        rows = []
+        for indicator_id, group in long_df.groupby("indicator_id", sort=False):
+            series = pd.Series(group["value"].to_numpy(), index=pd.DatetimeIndex(group["timestamp"]))
+            for lookback, ranking in rank_series(series).items():
+                rows.append({
+                    "indicator_id": indicator_id,
+                    "lookback": lookback,
+                    "input_version": versions[indicator_id],
+                    **ranking,
+                })
+        db.bulk_insert_mappings(IndicatorRanking, rows)
+        db.commit()
+
+    # Series that lost their data or were deactivated
+    if all_series:
+        db.query(IndicatorRanking).filter(
+            ~IndicatorRanking.indicator_id.in_(list(versions))
+        ).delete(synchronize_session=False)
+        db.commit()
+    return len(changed)
+
+
+def refresh_rankings(full: bool = False):
+    """Update the ranking index in its own session (called after ingestion)"""
+    try:
+        with get_db_context() as db:
+            ranked = update_rankings(db, full=full)
+        logger.info(f"Rankings: {ranked} series re-ranked")
+    except Exception as e:
+        logger.error(f"Ranking update failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    refresh_rankings(full="--full" in sys.argv)
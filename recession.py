@@ -0,0 +1,198 @@
+"""
+Recession Models
+
+Computes recession-risk series from stored FRED data at ingest time and
+persists them as regular indicators (source="MODEL"), so they are served by
+the normal /api/indicators/{id}/timeseries and /latest endpoints:
+
+- RECPROB_TERMSPREAD: NY Fed-style probit on the 10Y-3M term spread
+  (probability of recession 12 months ahead, %)
+- SAHM_INDICATOR:     Sahm rule - 3-month average unemployment minus its
+  12-month low (trigger at 0.5pp)
+- LEADING_INDEX:      composite of standardized leading indicators
+  (z-scores over a rolling 10-year window; below 0 = weaker than usual)
+
+Every output point depends only on a bounded window of past inputs
+(`lookback_months`), so an incremental run reloads just that window and
+rewrites outputs from the last stored month onward instead of recomputing
+decades of history.
+"""
+
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+from main import (
+    get_db_context, load_series_frame, latest_timestamp, replace_series_tail,
+    IndicatorMetadata
+)
+
+logger = logging.getLogger(__name__)
+
+MODEL_SOURCE = "MODEL"
+
+# NY Fed term-spread probit coefficients (Estrella & Trubin, 2006)
+PROBIT_ALPHA = -0.5333
+PROBIT_BETA = -0.6330
+
+SAHM_TRIGGER = 0.5
+
+# Leading index components: (series id, transform, sign)
+# transform "level" uses the monthly average, "change6" the 6-month change,
+# "pct6" the 6-month percent change. sign -1 flips series where a rise is bad.
+LEADING_COMPONENTS = [
+    ("T10Y2Y", "level", 1),
+    ("PERMIT", "pct6", 1),
+    ("HOUST", "pct6", 1),
+    ("ICSA", "pct6", -1),
+    ("UMCSENT", "change6", 1),
+    ("BAMLH0A0HYM2", "change6", -1),
+    ("NFCI", "level", -1),
+]
+LEADING_WINDOW = 120
+LEADING_MIN_COMPONENTS = 3
+
+_normal_cdf = np.vectorize(lambda x: 0.5 * (1 + math.erf(x / math.sqrt(2))), otypes=[float])
+
+
+def to_monthly(frame: pd.DataFrame) -> pd.DataFrame:
+    """Monthly averages indexed by month-start timestamp"""
+    if frame.empty:
+        return frame
+    monthly = frame.groupby(frame.index.to_period("M")).mean()
+    monthly = monthly.reindex(pd.period_range(monthly.index.min(), monthly.index.max(), freq="M"))
+    return monthly.set_axis(monthly.index.to_timestamp())
+
+
+def term_spread_probability(monthly: pd.DataFrame) -> pd.Series:
+    """P(recession in 12 months) in % from the monthly 10Y-3M spread"""
+    spread = monthly["DGS10"] - monthly["DGS3MO"]
+    probability = _normal_cdf(PROBIT_ALPHA + PROBIT_BETA * spread.to_numpy(dtype=float)) * 100
+    return pd.Series(probability, index=monthly.index).where(spread.notna())
+
+
+def sahm_indicator(monthly: pd.DataFrame) -> pd.Series:
+    """3-month average unemployment rate minus its low over the prior 12 months (pp)"""
+    average = monthly["UNRATE"].rolling(3).mean()
+    prior_low = average.shift(1).rolling(12).min()
+    return average - prior_low
+
+
+def leading_index(monthly: pd.DataFrame) -> pd.Series:
+    """Mean of rolling z-scores of the leading components (needs LEADING_MIN_COMPONENTS)"""
+    scores = []
+    for series_id, transform, sign in LEADING_COMPONENTS:
+        if series_id not in monthly.columns:
+            continue
+        values = monthly[series_id]
+        if transform == "pct6":
+            values = (values / values.shift(6) - 1) * 100
+        elif transform == "change6":
+            values = values - values.shift(6)
+        rolling = values.rolling(LEADING_WINDOW, min_periods=36)
+        scores.append(sign * (values - rolling.mean()) / rolling.std())
+
+    if not scores:
+        return pd.Series(dtype=float)
+    stacked = pd.concat(scores, axis=1)
+    return stacked.mean(axis=1).where(stacked.count(axis=1) >= LEADING_MIN_COMPONENTS)
+
+
+# Model id -> definition. `lookback_months` is the input history one output
+# month depends on; incremental runs reload exactly that much.
+# `partial_inputs` lets a model run when only some inputs have data.
+RECESSION_MODELS = {
+    "RECPROB_TERMSPREAD": {
+        "name": "Recession Probability (Term Spread Probit)",
+        "unit": "percent",
+        "description": "Probability of a US recession within 12 months from a probit on the 10Y-3M Treasury spread (NY Fed method)",
+        "inputs": ["DGS10", "DGS3MO"],
+        "lookback_months": 1,
+        "compute": term_spread_probability,
+    },
+    "SAHM_INDICATOR": {
+        "name": "Sahm Rule Recession Indicator",
+        "unit": "percentage_points",
+        "description": f"3-month average unemployment rate minus its prior 12-month low; {SAHM_TRIGGER}pp or more signals recession",
+        "inputs": ["UNRATE"],
+        "lookback_months": 16,
+        "compute": sahm_indicator,
+    },
+    "LEADING_INDEX": {
+        "name": "Composite Leading Index",
+        "unit": "z_score",
+        "description": "Average 10-year z-score of spread, permits, housing starts, claims, sentiment, credit spreads and financial conditions",
+        "inputs": [series_id for series_id, _, _ in LEADING_COMPONENTS],
+        "lookback_months": LEADING_WINDOW + 7,
+        "compute": leading_index,
+        "partial_inputs": True,
+    },
+}
+
+
+def _ensure_metadata(db, model_id: str, spec: dict):
+    if db.query(IndicatorMetadata).filter(IndicatorMetadata.indicator_id == model_id).first():
+        return
+    db.add(IndicatorMetadata(
+        indicator_id=model_id,
+        name=spec["name"],
+        description=spec["description"],
+        category="economy",
+        subcategory="recession",
+        unit=spec["unit"],
+        source=MODEL_SOURCE,
+        typical_frequency="monthly",
+    ))
+
+
+def update_model(db, model_id: str, spec: dict, full: bool = False) -> int:
+    """
+    Compute one model and store its output. Incremental by default: only the
+    last stored month and anything newer is recomputed (the last month is
+    rewritten because daily inputs may have filled it in since).
+    Returns the number of points written.
+    """
+    last = None if full else latest_timestamp(db, model_id)
+
+    start = None
+    if last is not None:
+        start = (pd.Timestamp(last) - pd.DateOffset(months=spec["lookback_months"])).replace(day=1).to_pydatetime()
+
+    monthly = to_monthly(load_series_frame(db, spec["inputs"], start))
+    if monthly.empty:
+        logger.warning(f"  Model {model_id}: no input data for {spec['inputs']}")
+        return 0
+
+    missing = [i for i in spec["inputs"] if i not in monthly.columns]
+    if missing and not spec.get("partial_inputs"):
+        logger.warning(f"  Model {model_id}: missing inputs {missing}")
+        return 0
+
+    output = spec["compute"](monthly).dropna()
+    if last is not None:
+        output = output[output.index >= pd.Timestamp(last)]
+    if output.empty:
+        return 0
+
+    _ensure_metadata(db, model_id, spec)
+    written = replace_series_tail(db, model_id, output, MODEL_SOURCE, "monthly")
+    db.commit()
+    return written
+
+
+def refresh_recession_models(full: bool = False):
+    """Update every recession model in its own session (called after ingestion)"""
+    try:
+        with get_db_context() as db:
+            for model_id, spec in RECESSION_MODELS.items():
+                written = update_model(db, model_id, spec, full=full)
+                logger.info(f"Model {model_id}: {written} points written")
+    except Exception as e:
+        logger.error(f"Recession model update failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    refresh_recession_models(full="--full" in sys.argv)
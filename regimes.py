@@ -0,0 +1,239 @@
+"""
+Market Regime Engine
+
+Classifies every date into a regime state for each definition in
+REGIME_DEFINITIONS (growth/value, large/small, US/international,
+risk-on/risk-off, growth/inflation quadrants) and stores the timeline as
+run-length segments in `regime_periods`. Transitions and durations are read
+straight from the segments, so the API and UI never reclassify anything.
+
+All definitions are evaluated at ingest time from one wide price frame in a
+single vectorized pass per definition.
+"""
+
+from datetime import datetime
+import logging
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from main import get_db_context, load_series_frame, RegimePeriod
+
+logger = logging.getLogger(__name__)
+
+# Regime definitions
+#
+# type "relative_strength": return of `numerator` vs `denominator` over the
+#     last `window` observations; above +band -> states[0], below -band ->
+#     states[1], otherwise "Neutral"
+# type "score":    sum of +1/-1 votes from `components`
+#     (indicator, transform, window, sign); score > 0 -> states[0],
+#     score < 0 -> states[1], 0 -> "Neutral"
+# type "quadrant": direction of `growth` and `inflation` inputs
+#     (indicator, transform, window); four states keyed by
+#     (growth rising, inflation rising)
+#
+# Transforms: "level" (value), "change" (difference over window),
+# "return" (% change over window), "yoy_change" (change in the 12-period %
+# change over window; monthly inputs). Windows count observations of the
+# input series.
+REGIME_DEFINITIONS = {
+    "growth_value": {
+        "title": "Growth vs Value",
+        "type": "relative_strength",
+        "numerator": "IWF",
+        "denominator": "IWD",
+        "window": 63,
+        "band": 1.0,
+        "states": ["Growth", "Value"],
+    },
+    "large_small": {
+        "title": "Large vs Small Cap",
+        "type": "relative_strength",
+        "numerator": "SPY",
+        "denominator": "IWM",
+        "window": 63,
+        "band": 1.0,
+        "states": ["Large Cap", "Small Cap"],
+    },
+    "us_international": {
+        "title": "US vs International",
+        "type": "relative_strength",
+        "numerator": "SPY",
+        "denominator": "EFA",
+        "window": 63,
+        "band": 1.0,
+        "states": ["US", "International"],
+    },
+    "risk_appetite": {
+        "title": "Risk-On vs Risk-Off",
+        "type": "score",
+        "components": [
+            ("BAMLH0A0HYM2", "change", 63, -1),   # credit spreads tightening
+            ("T10Y2Y", "change", 63, 1),          # curve steepening
+            ("SPY", "return", 63, 1),             # equities rising
+            ("TLT", "return", 63, -1),            # no flight to duration
+        ],
+        "states": ["Risk-On", "Risk-Off"],
+    },
+    "macro_quadrant": {
+        "title": "Growth / Inflation Quadrant",
+        "type": "quadrant",
+        "growth": ("INDPRO", "yoy_change", 3),
+        "inflation": ("CPIAUCSL", "yoy_change", 3),
+        "states": {
+            (True, False): "Goldilocks",
+            (True, True): "Reflation",
+            (False, True): "Stagflation",
+            (False, False): "Deflation",
+        },
+    },
+}
+
+
+def regime_inputs(definition: dict) -> List[str]:
+    """Indicator ids a definition reads"""
+    if definition["type"] == "relative_strength":
+        return [definition["numerator"], definition["denominator"]]
+    if definition["type"] == "score":
+        return [component[0] for component in definition["components"]]
+    return [definition["growth"][0], definition["inflation"][0]]
+
+
+def _transform(series: pd.Series, transform: str, window: int) -> pd.Series:
+    series = series.dropna()
+    if transform == "level":
+        return series
+    if transform == "change":
+        return series - series.shift(window)
+    if transform == "return":
+        return (series / series.shift(window) - 1) * 100
+    if transform == "yoy_change":
+        yoy = (series / series.shift(12) - 1) * 100
+        return yoy - yoy.shift(window)
+    raise ValueError(f"Unknown transform '{transform}'")
+
+
+def classify(definition: dict, prices: pd.DataFrame) -> pd.Series:
+    """
+    Regime state for every date a definition can be evaluated on.
+    Returns a Series of state labels indexed by timestamp.
+    """
+    regime_type = definition["type"]
+
+    if regime_type == "relative_strength":
+        pair = prices[[definition["numerator"], definition["denominator"]]].dropna()
+        ratio = pair.iloc[:, 0] / pair.iloc[:, 1]
+        strength = ((ratio / ratio.shift(definition["window"]) - 1) * 100).dropna()
+        up, down = definition["states"]
+        band = definition.get("band", 0)
+        states = np.where(strength > band, up, np.where(strength < -band, down, "Neutral"))
+        return pd.Series(states, index=strength.index)
+
+    if regime_type == "score":
+        votes = pd.concat([
+            sign * np.sign(_transform(prices[indicator_id], transform, window))
+            for indicator_id, transform, window, sign in definition["components"]
+        ], axis=1).sort_index()
+        # Slower inputs carry their last vote forward; start once every component has voted
+        votes = votes.ffill().dropna()
+        score = votes.sum(axis=1)
+        up, down = definition["states"]
+        states = np.where(score > 0, up, np.where(score < 0, down, "Neutral"))
+        return pd.Series(states, index=score.index)
+
+    if regime_type == "quadrant":
+        # Growth and inflation are released on different dates; carry each forward
+        changes = pd.concat([
+            _transform(prices[indicator_id], transform, window)
+            for indicator_id, transform, window in [definition["growth"], definition["inflation"]]
+        ], axis=1).sort_index().ffill().dropna()
+        labels = definition["states"]
+        states = [labels[(bool(g), bool(i))] for g, i in (changes > 0).to_numpy()]
+        return pd.Series(states, index=changes.index, dtype=object)
+
+    raise ValueError(f"Unknown regime type '{regime_type}'")
+
+
+def to_periods(states: pd.Series) -> pd.DataFrame:
+    """
+    Run-length encode a state series.
+    Returns DataFrame [state, start, end, observations, duration_days], one
+    row per run. A run lasts until the next one starts; the current run
+    lasts until its last date.
+    """
+    if states.empty:
+        return pd.DataFrame(columns=["state", "start", "end", "observations", "duration_days"])
+
+    run_id = states.ne(states.shift()).cumsum()
+    timestamps = states.index.to_series()
+    grouped = pd.DataFrame({"state": states, "timestamp": timestamps, "run": run_id}).groupby("run")
+    periods = pd.DataFrame({
+        "state": grouped["state"].first(),
+        "start": grouped["timestamp"].first(),
+        "end": grouped["timestamp"].last(),
+        "observations": grouped["timestamp"].size(),
+    }).reset_index(drop=True)
+
+    next_start = periods["start"].shift(-1).fillna(periods["end"].iloc[-1])
+    periods["duration_days"] = (next_start - periods["start"]).dt.days
+    return periods
+
+
+def evaluate_regimes(db, definitions: dict = None) -> int:
+    """
+    Classify every definition over full history and replace its stored
+    timeline. Returns the number of periods stored.
+    """
+    definitions = definitions or REGIME_DEFINITIONS
+    indicator_ids = sorted({i for definition in definitions.values() for i in regime_inputs(definition)})
+    prices = load_series_frame(db, indicator_ids)
+
+    stored = 0
+    for regime_id, definition in definitions.items():
+        missing = [i for i in regime_inputs(definition) if i not in prices.columns]
+        if missing:
+            logger.warning(f"  Regime {regime_id}: no data for {missing}")
+            continue
+
+        periods = to_periods(classify(definition, prices))
+        if periods.empty:
+            continue
+
+        db.query(RegimePeriod).filter(RegimePeriod.regime_id == regime_id).delete(synchronize_session=False)
+        evaluated_at = datetime.now()
+        db.bulk_insert_mappings(RegimePeriod, [
+            {
+                "regime_id": regime_id,
+                "title": definition["title"],
+                "state": row.state,
+                "start_timestamp": row.start.to_pydatetime(),
+                "end_timestamp": row.end.to_pydatetime(),
+                "duration_days": int(row.duration_days),
+                "observations": int(row.observations),
+                "evaluated_at": evaluated_at,
+            }
+            for row in periods.itertuples()
+        ])
+        stored += len(periods)
+
+    # Drop timelines for definitions that no longer exist
+    db.query(RegimePeriod).filter(~RegimePeriod.regime_id.in_(list(definitions))).delete(synchronize_session=False)
+    db.commit()
+    return stored
+
+
+def refresh_regimes():
+    """Re-classify all regimes in their own session (called after ingestion)"""
+    try:
+        with get_db_context() as db:
+            stored = evaluate_regimes(db)
+        logger.info(f"Regimes evaluated: {stored} periods stored")
+    except Exception as e:
+        logger.error(f"Regime evaluation failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    refresh_regimes()
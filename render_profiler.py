@@ -0,0 +1,247 @@
+"""
+Render Profiler
+
+Debug-mode timing of dashboard_ui.py runs, per page and section. Enable
+with ?profile=1 in the dashboard URL (?profile=cprofile also collects
+cProfile stats) or DASHBOARD_PROFILE=1 in the environment.
+
+Sections start at every header / subheader / "### heading" the page
+writes, so no page code has to be wrapped. Within a section the time is
+split into:
+
+- fetch:   API client calls (network + JSON decode, including cache hits)
+- figure:  Plotly figure construction and updates
+- render:  Streamlit chart/table elements (figure JSON and Arrow
+           serialization and queueing for the browser)
+- other:   everything else - pandas processing, widgets, text
+
+The breakdown is shown in the sidebar at the end of the run and can be
+downloaded as JSON (and .pstats); with DASHBOARD_PROFILE_DIR set every run
+is also appended to <dir>/render_profiles.jsonl for offline analysis.
+Instrumentation is installed on first use and does nothing for runs that
+aren't being profiled.
+"""
+
+import cProfile
+import functools
+import json
+import marshal
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+from api_client import MacroAPIClient
+
+PHASES = ("fetch", "figure", "render")
+
+# Element methods that open a new section (their first argument names it)
+SECTION_METHODS = ("header", "subheader", "markdown")
+# Element methods whose time counts as rendering
+RENDER_METHODS = ("plotly_chart", "dataframe", "table", "line_chart", "bar_chart", "area_chart", "data_editor")
+# Figure methods whose time counts as figure construction
+FIGURE_METHODS = (
+    "__init__", "add_trace", "add_traces", "update_layout", "update_traces", "update_xaxes", "update_yaxes",
+    "add_shape", "add_annotation", "add_hline", "add_vline", "add_hrect", "add_vrect",
+)
+FETCH_METHODS = ("get_json", "post_json")
+
+# Streamlit runs every browser session's script in its own thread
+_active = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+class RenderProfiler:
+    """Timings of one script run, split into sections and phases"""
+
+    def __init__(self, page: str, collect_cprofile: bool = False):
+        self.page = page
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.sections: List[dict] = []
+        self.cprofile = cProfile.Profile() if collect_cprofile else None
+        self._depth = 0  # nesting of instrumented calls; only the outermost one is attributed
+        self.start_section("(page setup)")
+
+    def start_section(self, name: str):
+        now = time.perf_counter()
+        if self.sections:
+            self.sections[-1]["end"] = now
+        self.sections.append({"section": name, "start": now, "end": None,
+                              "fetch": 0.0, "figure": 0.0, "render": 0.0, "api_calls": 0, "charts": 0})
+
+    def record(self, phase: str, seconds: float):
+        current = self.sections[-1]
+        current[phase] += seconds
+        if phase == "fetch":
+            current["api_calls"] += 1
+        elif phase == "render":
+            current["charts"] += 1
+
+    def finish(self):
+        if self.finished is None:
+            self.finished = time.perf_counter()
+            self.sections[-1]["end"] = self.finished
+            if self.cprofile is not None:
+                self.cprofile.disable()
+
+    @property
+    def total(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per section in page order, times in milliseconds"""
+        rows = []
+        for s in self.sections:
+            total = (s["end"] or time.perf_counter()) - s["start"]
+            rows.append({
+                "section": s["section"],
+                "total_ms": total * 1000,
+                **{f"{phase}_ms": s[phase] * 1000 for phase in PHASES},
+                "other_ms": max(total - sum(s[phase] for phase in PHASES), 0) * 1000,
+                "api_calls": s["api_calls"],
+                "charts": s["charts"],
+            })
+        return pd.DataFrame(rows).round(1)
+
+    def to_dict(self) -> dict:
+        return {
+            "page": self.page,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_ms": round(self.total * 1000, 1),
+            "sections": self.to_frame().to_dict(orient="records"),
+        }
+
+    def pstats_bytes(self) -> Optional[bytes]:
+        """cProfile stats in the marshal format pstats / snakeviz read"""
+        if self.cprofile is None:
+            return None
+        # What Profile.dump_stats writes, without the temporary file
+        self.cprofile.create_stats()
+        return marshal.dumps(self.cprofile.stats)
+
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+def _timed(phase: str, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        profiler = getattr(_active, "profiler", None)
+        if profiler is None or profiler._depth:
+            return function(*args, **kwargs)
+        profiler._depth += 1
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler._depth -= 1
+            profiler.record(phase, time.perf_counter() - started)
+    return wrapper
+
+
+def _section_boundary(method_name: str, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        profiler = getattr(_active, "profiler", None)
+        if profiler is not None and not profiler._depth:
+            # DeltaGenerator methods get the container first; st.header etc. are already bound
+            body = args[1:2] if args and isinstance(args[0], DeltaGenerator) else args[:1]
+            body = body[0] if body else kwargs.get("body")
+            if isinstance(body, str):
+                text = body.strip()
+                if method_name != "markdown":
+                    profiler.start_section(text[:80])
+                elif text.startswith("#") and "\n" not in text:
+                    profiler.start_section(text.lstrip("#").strip()[:80])
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def install():
+    """Wrap Streamlit elements, Plotly figures and the API client (once per process)"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        for name in SECTION_METHODS:
+            setattr(DeltaGenerator, name, _section_boundary(name, getattr(DeltaGenerator, name)))
+        for name in RENDER_METHODS:
+            setattr(DeltaGenerator, name, _timed("render", getattr(DeltaGenerator, name)))
+        for name in FIGURE_METHODS:
+            setattr(go.Figure, name, _timed("figure", getattr(go.Figure, name)))
+        for name in FETCH_METHODS:
+            setattr(MacroAPIClient, name, _timed("fetch", getattr(MacroAPIClient, name)))
+        # st.header etc. are methods bound to the main container at import time - wrap them as well
+        for name in SECTION_METHODS:
+            setattr(st, name, _section_boundary(name, getattr(st, name)))
+        for name in RENDER_METHODS:
+            setattr(st, name, _timed("render", getattr(st, name)))
+        _installed = True
+
+
+# ============================================================================
+# PAGE HOOKS
+# ============================================================================
+
+def requested() -> Optional[str]:
+    """Profiling mode from ?profile= or DASHBOARD_PROFILE: "cprofile", "sections" or None"""
+    value = st.query_params.get("profile") or os.environ.get("DASHBOARD_PROFILE", "")
+    if value in ("", "0", "false"):
+        return None
+    return "cprofile" if value == "cprofile" else "sections"
+
+
+def begin(page: str) -> Optional[RenderProfiler]:
+    """Start profiling this run if requested; call right after the page is chosen"""
+    mode = requested()
+    if mode is None:
+        _active.profiler = None
+        return None
+    install()
+    profiler = RenderProfiler(page, collect_cprofile=mode == "cprofile")
+    _active.profiler = profiler
+    if profiler.cprofile is not None:
+        profiler.cprofile.enable()
+    return profiler
+
+
+def stop(profiler: Optional[RenderProfiler]):
+    """Stop timing this run (and cProfile); safe to call more than once"""
+    if profiler is not None:
+        profiler.finish()
+    _active.profiler = None
+
+
+def show(profiler: Optional[RenderProfiler]):
+    """Stop profiling and add the timing breakdown to the sidebar"""
+    if profiler is None:
+        return
+    stop(profiler)
+    frame = profiler.to_frame()
+    report = profiler.to_dict()
+
+    directory = os.environ.get("DASHBOARD_PROFILE_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "render_profiles.jsonl"), "a") as f:
+            f.write(json.dumps(report) + "\n")
+
+    with st.sidebar.expander(f"⏱ Render profile: {profiler.total * 1000:,.0f} ms", expanded=True):
+        totals = frame[[f"{phase}_ms" for phase in PHASES] + ["other_ms"]].sum()
+        st.caption(" · ".join(f"{name[:-3]} {value:,.0f} ms" for name, value in totals.items()))
+        st.dataframe(frame.sort_values("total_ms", ascending=False), hide_index=True, use_container_width=True)
+        st.download_button("Download profile (JSON)", json.dumps(report, indent=2),
+                           file_name=f"render_profile_{profiler.page}.json", mime="application/json")
+        stats = profiler.pstats_bytes()
+        if stats is not None:
+            st.download_button("Download cProfile stats", stats, file_name=f"render_profile_{profiler.page}.pstats")
@@ -0,0 +1,240 @@
+"""
+Risk Statistics
+
+Drawdowns, annualized volatility, Sharpe/Sortino, skew/kurtosis,
+percentile ranks and all-pairs correlations for many series at once, over
+any window.
+
+Every column of the wide frame is packed onto its own observations (see
+technicals.pack_columns), so the expanding/rolling kernels run once over the
+whole matrix regardless of each series' frequency or calendar.
+
+Series are measured on one of two bases:
+- "return": percent changes (prices, index levels, dollar amounts)
+- "change": absolute changes, for rates/spreads/scores and any series that
+  is zero or negative somewhere (percent returns are meaningless there).
+  Drawdowns and volatility are then in the series' own units.
+Annualization uses each series' observed frequency (observations per year
+over the window), so daily, weekly, monthly and quarterly series mix freely.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+from deltas import compute_deltas
+from technicals import pack_columns, unpack_columns
+
+CHANGE_BASIS_UNITS = {"percent", "percentage_points", "z_score", "index_points"}
+
+RISK_CHANGE_HORIZONS = ["30D", "90D", "1Y", "YTD"]
+
+# Rolling statistics need at least this many observations in the window
+ROLLING_MIN_OBSERVATIONS = 6
+
+
+def return_basis(unit: Optional[str], values: pd.Series) -> str:
+    """'change' for rate-like units or series that are not strictly positive, else 'return'"""
+    if unit in CHANGE_BASIS_UNITS or (values.dropna() <= 0).any():
+        return "change"
+    return "return"
+
+
+def _packed_changes(packed: pd.DataFrame, use_returns: np.ndarray) -> pd.DataFrame:
+    """Period-over-period returns (%) or absolute changes, per column basis"""
+    previous = packed.shift(1)
+    returns = (packed / previous - 1) * 100
+    changes = packed - previous
+    return pd.DataFrame(np.where(use_returns, returns, changes), index=packed.index, columns=packed.columns)
+
+
+def _packed_drawdown(packed: pd.DataFrame, use_returns: np.ndarray) -> pd.DataFrame:
+    peak = packed.cummax()
+    return pd.DataFrame(
+        np.where(use_returns, (packed / peak - 1) * 100, packed - peak),
+        index=packed.index, columns=packed.columns
+    )
+
+
+def risk_statistics(
+    prices: pd.DataFrame,
+    basis: Dict[str, str],
+    risk_free: float = 0.0
+) -> pd.DataFrame:
+    """
+    One row of risk statistics per column of a wide frame
+    (index = timestamp, one column per series) over its whole span.
+
+    basis: series id -> "return" or "change" (see return_basis)
+    risk_free: annual risk-free rate (%) subtracted for Sharpe/Sortino on
+               return-basis series
+    """
+    prices = prices.sort_index().dropna(axis=1, how="all")
+    columns = prices.columns
+    use_returns = np.array([basis.get(c, "return") == "return" for c in columns])
+
+    packed_values, source = pack_columns(prices)
+    packed = pd.DataFrame(packed_values, columns=columns)
+    valid = ~np.isnan(packed_values)
+    counts = valid.sum(axis=0)
+    n_rows = len(packed)
+    cols = np.arange(len(columns))
+
+    # Observation timestamps in days, aligned with the packed matrix
+    days = (prices.index.values.astype("datetime64[s]").astype(np.int64) / 86400.0)
+    packed_days = np.where(source >= 0, days[np.clip(source, 0, None)], np.nan)
+    first_row = n_rows - counts
+    first_day = packed_days[np.clip(first_row, 0, n_rows - 1), cols]
+    last_day = packed_days[-1]
+    years = (last_day - first_day) / 365.25
+    with np.errstate(divide="ignore", invalid="ignore"):
+        periods_per_year = np.where(years > 0, (counts - 1) / years, np.nan)
+
+    first_value = packed_values[np.clip(first_row, 0, n_rows - 1), cols]
+    last_value = packed_values[-1]
+
+    changes = _packed_changes(packed, use_returns)
+    mean = changes.mean().to_numpy()
+    std = changes.std().to_numpy()
+    rf_per_period = np.where(use_returns, risk_free / periods_per_year, 0.0)
+    excess = mean - rf_per_period
+    downside = np.sqrt((changes.clip(upper=0) ** 2).mean().to_numpy())
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annual_return = np.where(
+            use_returns,
+            ((last_value / first_value) ** (1 / years) - 1) * 100,
+            (last_value - first_value) / years,
+        )
+        volatility = std * np.sqrt(periods_per_year)
+        sharpe = excess / std * np.sqrt(periods_per_year)
+        sortino = excess / downside * np.sqrt(periods_per_year)
+
+    # Drawdowns: depth, and time under water since the last peak
+    drawdown = _packed_drawdown(packed, use_returns)
+    at_peak = (drawdown.to_numpy() >= 0) & valid
+    last_peak_day = pd.DataFrame(np.where(at_peak, packed_days, np.nan)).ffill().to_numpy()
+    # Episode length up to each row, counting the recovery row itself
+    previous_peak_day = np.vstack([np.full((1, len(columns)), np.nan), last_peak_day[:-1]])
+    episode_days = packed_days - previous_peak_day
+
+    drawdown_values = drawdown.to_numpy()
+    trough_row = np.nanargmin(np.where(valid, drawdown_values, np.inf), axis=0)
+    max_drawdown = drawdown_values[trough_row, cols]
+    peak_day = last_peak_day[trough_row, cols]
+    # Recovery: first new peak after the trough
+    after_trough = at_peak & (np.arange(n_rows)[:, None] > trough_row[None, :])
+    recovered = after_trough.any(axis=0)
+    recovery_day = np.where(recovered, packed_days[np.argmax(after_trough, axis=0), cols], np.nan)
+
+    # Percentile rank of the latest value and latest change within the window
+    with np.errstate(invalid="ignore"):
+        value_percentile = (packed_values <= last_value).sum(axis=0) / counts * 100
+        change_values = changes.to_numpy()
+        change_counts = (~np.isnan(change_values)).sum(axis=0)
+        change_percentile = (change_values <= change_values[-1]).sum(axis=0) / change_counts * 100
+
+    def to_timestamp(day):
+        return pd.NaT if np.isnan(day) else pd.Timestamp(day * 86400, unit="s")
+
+    stats = pd.DataFrame({
+        "basis": np.where(use_returns, "return", "change"),
+        "observations": counts,
+        "periods_per_year": periods_per_year,
+        "start": [to_timestamp(d) for d in first_day],
+        "end": [to_timestamp(d) for d in last_day],
+        "latest": last_value,
+        "total_change": np.where(use_returns, (last_value / first_value - 1) * 100, last_value - first_value),
+        "annual_return": annual_return,
+        "volatility": volatility,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "skew": changes.skew().to_numpy(),
+        "kurtosis": changes.kurt().to_numpy(),
+        "max_drawdown": max_drawdown,
+        "max_drawdown_peak": [to_timestamp(d) for d in peak_day],
+        "max_drawdown_trough": [to_timestamp(d) for d in packed_days[trough_row, cols]],
+        "max_drawdown_recovery": [to_timestamp(d) for d in recovery_day],
+        "max_drawdown_days": np.where(recovered, recovery_day, last_day) - peak_day,
+        "longest_drawdown_days": np.nanmax(np.where(np.isnan(episode_days), -np.inf, episode_days), axis=0),
+        "current_drawdown": drawdown_values[-1],
+        "current_drawdown_days": last_day - last_peak_day[-1],
+        "value_percentile": value_percentile,
+        "change_percentile": change_percentile,
+    }, index=columns)
+    return stats[counts > 1]
+
+
+def calendar_changes(prices: pd.DataFrame, basis: Dict[str, str]) -> Dict[str, Dict[str, Optional[float]]]:
+    """30D/90D/1Y/YTD calendar-day changes per series (% on return basis, units otherwise)"""
+    output = {}
+    for series_id in prices.columns:
+        deltas = compute_deltas(prices[series_id])
+        key = "pct_change" if basis.get(series_id, "return") == "return" else "change"
+        output[series_id] = {
+            horizon: (deltas[horizon][key] if deltas.get(horizon) else None)
+            for horizon in RISK_CHANGE_HORIZONS
+        }
+    return output
+
+
+def rolling_risk(prices: pd.DataFrame, basis: Dict[str, str], window_days: int = 90) -> Dict[str, pd.DataFrame]:
+    """
+    Rolling annualized volatility over a calendar window and drawdown from
+    the running peak, per series, on the timestamp index.
+    Returns {"volatility": wide frame, "drawdown": wide frame}.
+    """
+    prices = prices.sort_index().dropna(axis=1, how="all")
+    use_returns = np.array([basis.get(c, "return") == "return" for c in prices.columns])
+
+    packed_values, source = pack_columns(prices)
+    packed = pd.DataFrame(packed_values, columns=prices.columns)
+    changes = unpack_columns(_packed_changes(packed, use_returns).to_numpy(), source, prices)
+    drawdown = unpack_columns(_packed_drawdown(packed, use_returns).to_numpy(), source, prices)
+
+    # Each series' own frequency for annualization
+    counts = prices.notna().sum()
+    span_years = (prices.apply(pd.Series.last_valid_index) - prices.apply(pd.Series.first_valid_index)).dt.days / 365.25
+    periods_per_year = ((counts - 1) / span_years).replace([np.inf], np.nan)
+
+    rolling = changes.rolling(f"{window_days}D", min_periods=ROLLING_MIN_OBSERVATIONS)
+    volatility = (rolling.std() * np.sqrt(periods_per_year)).where(changes.notna())
+    return {"volatility": volatility, "drawdown": drawdown}
+
+
+# Sampling calendars for correlations (last observation per period)
+CORRELATION_FREQUENCIES = {
+    "day": "D",
+    "week": "W-FRI",
+    "month": "M",
+    "quarter": "Q",
+}
+
+# Pairs with fewer overlapping changes than this get no correlation
+CORRELATION_MIN_OBSERVATIONS = 12
+
+
+def correlation_matrix(
+    prices: pd.DataFrame,
+    basis: Dict[str, str],
+    frequency: str = "week",
+    method: str = "pearson"
+) -> Dict[str, pd.DataFrame]:
+    """
+    All-pairs correlation of period changes. Every series is sampled onto a
+    common calendar first (last value per period), then measured on its own
+    basis between its consecutive observations, so monthly and daily series
+    correlate on the months they share.
+    Returns {"correlation": square frame, "observations": overlapping changes per pair}.
+    """
+    sampled = prices.sort_index().resample(CORRELATION_FREQUENCIES[frequency]).last().dropna(axis=1, how="all")
+    use_returns = np.array([basis.get(c, "return") == "return" for c in sampled.columns])
+
+    packed_values, source = pack_columns(sampled)
+    packed = pd.DataFrame(packed_values, columns=sampled.columns)
+    changes = unpack_columns(_packed_changes(packed, use_returns).to_numpy(), source, sampled)
+
+    present = changes.notna().astype(float)
+    observations = present.T @ present
+    correlation = changes.corr(method=method, min_periods=CORRELATION_MIN_OBSERVATIONS)
+    return {"correlation": correlation, "observations": observations.astype(int)}
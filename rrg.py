@@ -0,0 +1,132 @@
+"""
+Relative Rotation Graphs
+
+JdK-style RS-Ratio and RS-Momentum for every sector against a benchmark,
+computed at ingest time and stored in `rrg_points`:
+
+- RS:          100 * sector / benchmark, smoothed over RRG_SMOOTHING closes
+- RS-Ratio:    100 + rolling z-score of RS over RRG_WINDOW closes
+               (above 100 = outperforming its own recent trend)
+- RS-Momentum: 100 + rolling z-score of the RRG_MOMENTUM-close change in
+               RS-Ratio over RRG_WINDOW closes (above 100 = improving)
+
+The rolling normalization runs over the whole sector matrix at once. Every
+point depends on a bounded window of past closes (RRG_LOOKBACK), so a
+refresh reloads just that window and rewrites only the newest points.
+"""
+
+import logging
+from datetime import timedelta
+from typing import List, Tuple
+
+import pandas as pd
+from sqlalchemy import func
+
+from main import get_db_context, load_series_frame, RRGPoint
+
+logger = logging.getLogger(__name__)
+
+RRG_SMOOTHING = 5
+RRG_WINDOW = 63
+RRG_MOMENTUM = 10
+
+# Closes one output point depends on, and the calendar span reloaded for it
+RRG_LOOKBACK = RRG_SMOOTHING + RRG_WINDOW + RRG_MOMENTUM + RRG_WINDOW
+INCREMENTAL_LOOKBACK = timedelta(days=RRG_LOOKBACK * 7 // 5 + 30)
+
+# Benchmark -> sector series. Sector ETFs rotate against SPY; the longer
+# sector index histories against the S&P 500 index (Energy only has the ETF).
+RRG_UNIVERSES = {
+    "SPY": ["XLK", "XLF", "XLE", "XLV", "XLY", "XLP", "XLI", "XLB", "XLU", "XLRE", "XLC"],
+    "^GSPC": ["^SP500-45", "^SP500-40", "XLE", "^SP500-35", "^SP500-25", "^SP500-30",
+              "^SP500-20", "^SP500-15", "^SP500-55", "^SP500-60", "^SP500-50"],
+}
+
+
+def _zscore(frame: pd.DataFrame, window: int) -> pd.DataFrame:
+    rolling = frame.rolling(window)
+    return (frame - rolling.mean()) / rolling.std()
+
+
+def compute_rrg(sectors: pd.DataFrame, benchmark: pd.Series) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    RS-Ratio and RS-Momentum for a matrix of sector closes
+    (index = timestamp, one column per sector) against benchmark closes.
+    Returns (rs_ratio, rs_momentum), both shaped like `sectors` on the
+    benchmark's dates.
+    """
+    benchmark = benchmark.dropna()
+    # Sectors that miss an odd session carry their last close for a few days
+    sectors = sectors.reindex(benchmark.index.union(sectors.index)).ffill(limit=5).reindex(benchmark.index)
+
+    rs = (100 * sectors.div(benchmark, axis=0)).rolling(RRG_SMOOTHING).mean()
+    rs_ratio = 100 + _zscore(rs, RRG_WINDOW)
+    rs_momentum = 100 + _zscore(rs_ratio - rs_ratio.shift(RRG_MOMENTUM), RRG_WINDOW)
+    return rs_ratio, rs_momentum
+
+
+def update_rrg(db, benchmark: str, symbols: List[str], full: bool = False) -> int:
+    """
+    Compute RRG points for one benchmark universe. Incremental by default:
+    points from the last stored date onward are recomputed from the
+    RRG_LOOKBACK closes before it. Returns the number of points written.
+    """
+    last = None
+    if not full:
+        last = db.query(func.max(RRGPoint.timestamp)).filter(RRGPoint.benchmark == benchmark).scalar()
+    start = last - INCREMENTAL_LOOKBACK if last is not None else None
+
+    prices = load_series_frame(db, [benchmark] + symbols, start)
+    present = [symbol for symbol in symbols if symbol in prices.columns]
+    if benchmark not in prices.columns or not present:
+        logger.warning(f"  RRG {benchmark}: no price data")
+        return 0
+
+    rs_ratio, rs_momentum = compute_rrg(prices[present], prices[benchmark])
+    points = pd.DataFrame({
+        "rs_ratio": rs_ratio.stack(),
+        "rs_momentum": rs_momentum.stack(),
+    }).dropna()
+    points.index.names = ["timestamp", "symbol"]
+    if last is not None:
+        points = points[points.index.get_level_values("timestamp") >= pd.Timestamp(last)]
+    if points.empty:
+        return 0
+
+    first = points.index.get_level_values("timestamp").min().to_pydatetime()
+    query = db.query(RRGPoint).filter(RRGPoint.benchmark == benchmark)
+    if not full:
+        query = query.filter(RRGPoint.timestamp >= first)
+    query.delete(synchronize_session=False)
+
+    db.bulk_insert_mappings(RRGPoint, [
+        {
+            "benchmark": benchmark,
+            "symbol": symbol,
+            "timestamp": timestamp.to_pydatetime(),
+            "rs_ratio": round(float(ratio), 4),
+            "rs_momentum": round(float(momentum), 4),
+        }
+        for (timestamp, symbol), ratio, momentum in zip(
+            points.index, points["rs_ratio"].to_numpy(), points["rs_momentum"].to_numpy()
+        )
+    ])
+    db.commit()
+    return len(points)
+
+
+def refresh_rrg(full: bool = False):
+    """Update every RRG universe in its own session (called after market ingestion)"""
+    try:
+        with get_db_context() as db:
+            for benchmark, symbols in RRG_UNIVERSES.items():
+                written = update_rrg(db, benchmark, symbols, full=full)
+                logger.info(f"RRG {benchmark}: {written} points written")
+    except Exception as e:
+        logger.error(f"RRG update failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    refresh_rrg(full="--full" in sys.argv)
@@ -0,0 +1,112 @@
+"""
+Memory-Mapped Series Cache
+
+Optional read cache for the timeseries endpoints: every indicator is kept
+as one .npy file holding an int64 array of shape (2, n) - row 0 the
+timestamps (microseconds since the epoch), row 1 the float64 values'
+bits - so both columns are contiguous and a file is replaced with a single
+atomic rename. Enable with SERIES_CACHE_DIR; ingestion rewrites the files
+of series it changed (see refresh_series_cache), and
+`python series_cache.py` rebuilds it.
+
+Files are opened with np.load(mmap_mode="r"), so a range request is two
+np.searchsorted calls and slices that are views of the mapping - nothing is
+copied until the response is serialized, and every uvicorn worker reads
+the same pages from the OS page cache instead of holding its own copy.
+Reads trust the manifest written at sync time - no query per request - so
+the cache is exactly as fresh as the last sync, which ingestion runs right
+after committing; series the manifest doesn't list are read from SQL as
+before.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from series_files import SeriesFiles
+
+logger = logging.getLogger(__name__)
+
+
+class SeriesCache(SeriesFiles):
+    """Per-series (timestamps, values) arrays in memory-mapped .npy files"""
+
+    SUFFIX = ".npy"
+    MANIFEST = "series_cache.json"
+
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self._mapped: Dict[str, Tuple[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def write_series(self, indicator_id: str, frame: pd.DataFrame):
+        columns = np.empty((2, len(frame)), dtype=np.int64)
+        columns[0] = frame["timestamp"].to_numpy(dtype="datetime64[us]").view(np.int64)
+        columns[1] = frame["value"].to_numpy(dtype=np.float64).view(np.int64)
+
+        def write(path):
+            with open(path, "wb") as f:
+                np.save(f, columns)
+
+        self._replace(self.path(indicator_id), write)
+
+    def _columns(self, indicator_id: str, version: str) -> np.ndarray:
+        """The mapped (2, n) array of a series, reopened when its version changes"""
+        with self._lock:
+            mapped = self._mapped.get(indicator_id)
+            if mapped is None or mapped[0] != version:
+                mapped = (version, np.load(self.path(indicator_id), mmap_mode="r"))
+                self._mapped[indicator_id] = mapped
+            return mapped[1]
+
+    def read(
+        self,
+        indicator_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        (datetime64[us] timestamps, float64 values) of a series within
+        [start, end], as views of the mapped file. None when the cache
+        doesn't hold the series.
+        """
+        version = self.versions().get(indicator_id)
+        if version is None:
+            return None
+        try:
+            columns = self._columns(indicator_id, version)
+        except FileNotFoundError:
+            # Removed by a sync whose manifest this process hasn't seen yet
+            return None
+        timestamps = columns[0]
+        lo = np.searchsorted(timestamps, np.datetime64(start, "us").view(np.int64)) if start is not None else 0
+        hi = (np.searchsorted(timestamps, np.datetime64(end, "us").view(np.int64), side="right")
+              if end is not None else len(timestamps))
+        return timestamps[lo:hi].view("datetime64[us]"), columns[1, lo:hi].view(np.float64)
+
+
+def refresh_series_cache():
+    """Bring the cache up to date in its own session (called after ingestion); no-op when disabled"""
+    from main import get_db_context, series_cache
+
+    if series_cache is None:
+        return
+    try:
+        with get_db_context() as db:
+            written = series_cache.sync(db)
+        logger.info(f"Series cache: {written} series rewritten")
+    except Exception as e:
+        logger.error(f"Series cache sync failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    import sys
+    from main import settings
+    logging.basicConfig(level=logging.INFO)
+    if not settings.series_cache_dir:
+        sys.exit("Set SERIES_CACHE_DIR to enable the series cache")
+    refresh_series_cache()
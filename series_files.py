@@ -0,0 +1,112 @@
+"""
+Per-Series File Directories
+
+Shared base of the optional on-disk copies of `indicators` (the Parquet
+columnar store and the memory-mapped series cache): one file per series
+plus a JSON manifest of the series version each file holds (the
+version tokens of main.series_versions), written at sync time.
+Kept free of the stores' own dependencies (pyarrow), so importing one
+store never requires another's.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+# Series loaded from the database per query while syncing
+SYNC_BATCH = 50
+
+
+class SeriesFiles:
+    """
+    One file per series in a directory plus a manifest of the series
+    version each file holds. Files are replaced atomically and only
+    rewritten when their series changed. Subclasses set SUFFIX and
+    implement write_series.
+    """
+
+    SUFFIX = ""
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._manifest: Dict[str, str] = {}
+        self._manifest_mtime: Optional[int] = None
+
+    def path(self, indicator_id: str) -> str:
+        return os.path.join(self.directory, quote(indicator_id, safe="") + self.SUFFIX)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, self.MANIFEST)
+
+    def _replace(self, path: str, write):
+        """Write to a temporary file and move it into place, so readers never see a partial file"""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        write(temporary)
+        os.replace(temporary, path)
+
+    def versions(self) -> Dict[str, str]:
+        """Series version held by each file (re-read when another process updates the manifest)"""
+        path = self.manifest_path
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if mtime != self._manifest_mtime:
+            with open(path) as f:
+                self._manifest = json.load(f)["series"]
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    def holds(self, versions: Dict[str, str]) -> bool:
+        """True when the store has exactly these series versions"""
+        stored = self.versions()
+        return all(stored.get(indicator_id) == version for indicator_id, version in versions.items())
+
+    def write_series(self, indicator_id: str, frame: pd.DataFrame):
+        """Store one series from a [timestamp, value] frame (sorted by time)"""
+        raise NotImplementedError
+
+    def write_manifest(self, versions: Dict[str, str]):
+        manifest = {"updated_at": datetime.now().isoformat(timespec="seconds"), "series": versions}
+
+        def write(path):
+            with open(path, "w") as f:
+                json.dump(manifest, f)
+
+        self._replace(self.manifest_path, write)
+
+    def sync(self, db) -> int:
+        """
+        Rewrite the files of series whose database version changed and drop
+        series that no longer exist. Returns the number of series written.
+        """
+        from main import Indicator, load_series_long, series_versions
+
+        indicator_ids = [i for (i,) in db.query(Indicator.indicator_id).distinct()]
+        current = series_versions(db, indicator_ids)
+        stored = dict(self.versions())
+        changed = [i for i, version in current.items() if stored.get(i) != version]
+
+        for offset in range(0, len(changed), SYNC_BATCH):
+            batch = changed[offset:offset + SYNC_BATCH]
+            long_df = load_series_long(db, batch)
+            for indicator_id, frame in long_df.groupby("indicator_id", sort=False):
+                self.write_series(indicator_id, frame)
+                stored[indicator_id] = current[indicator_id]
+
+        removed = [i for i in stored if i not in current]
+        for indicator_id in removed:
+            stored.pop(indicator_id)
+            if os.path.exists(self.path(indicator_id)):
+                os.remove(self.path(indicator_id))
+
+        if changed or removed or not os.path.exists(self.manifest_path):
+            self.write_manifest(stored)
+        return len(changed)
@@ -0,0 +1,65 @@
+"""
+Series Statistics Snapshot
+
+Row count, first/newest timestamp and typical spacing of every series,
+stored in `series_stats` at ingest time so /health and /api/status read a
+table with one row per series instead of aggregating `indicators` on every
+probe. The typical spacing (history span / observations) stands in for the
+publication frequency when judging staleness - see stale_after_days() in
+main.py.
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import func
+
+from main import get_db_context, Indicator, SeriesStats
+
+logger = logging.getLogger(__name__)
+
+
+def update_series_stats(db) -> int:
+    """Rebuild the snapshot with one grouped query. Returns the number of series."""
+    rows = db.query(
+        Indicator.indicator_id,
+        func.max(Indicator.source),
+        func.count(Indicator.timestamp),
+        func.min(Indicator.timestamp),
+        func.max(Indicator.timestamp),
+    ).group_by(Indicator.indicator_id).all()
+
+    now = datetime.now()
+    snapshot = []
+    for indicator_id, source, count, first, latest in rows:
+        span_days = (latest - first).total_seconds() / 86400 if first and latest else 0
+        snapshot.append({
+            "indicator_id": indicator_id,
+            "source": source,
+            "row_count": count,
+            "first_timestamp": first,
+            "latest_timestamp": latest,
+            "typical_gap_days": round(span_days / (count - 1), 3) if count > 1 else None,
+            "updated_at": now,
+        })
+
+    db.query(SeriesStats).delete(synchronize_session=False)
+    if snapshot:
+        db.bulk_insert_mappings(SeriesStats, snapshot)
+    db.commit()
+    return len(snapshot)
+
+
+def refresh_series_stats():
+    """Update the snapshot in its own session (called after ingestion)"""
+    try:
+        with get_db_context() as db:
+            count = update_series_stats(db)
+        logger.info(f"Series stats: {count} series")
+    except Exception as e:
+        logger.error(f"Series stats update failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    refresh_series_stats()
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 """
 Setup Script - Initialize database and load data
+
+    python setup.py                                          # full load from FRED / Yahoo
+    python setup.py --snapshot macro_snapshot.zip            # bulk-load a snapshot, then top up
+    python setup.py --snapshot macro_snapshot.zip --no-top-up
 """
 
+import argparse
 import logging
 from main import Base, engine
 from ingest_fred import ingest_fred_data
@@ -17,6 +22,12 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Run setup"""
+    parser = argparse.ArgumentParser(description="Initialize the database and load data")
+    parser.add_argument("--snapshot", help="Bulk-load this snapshot (snapshot.py export) instead of a full fetch")
+    parser.add_argument("--no-top-up", action="store_true",
+                        help="With --snapshot: skip fetching observations newer than the snapshot")
+    args = parser.parse_args()
+
     print("\n" + "="*60)
     print("MACRO DASHBOARD SETUP")
     print("="*60 + "\n")
@@ -26,16 +37,30 @@ def main():
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
         logger.info("✓ Tables created\n")
-        
-        # Load FRED data
-        logger.info("Loading FRED data (this takes 5-10 minutes)...")
-        ingest_fred_data(years_back=10)
-        logger.info("✓ FRED data loaded\n")
-        
-        # Load market data
-        logger.info("Loading market data...")
-        ingest_market_data(years_back=10)
-        logger.info("✓ Market data loaded\n")
+
+        if args.snapshot:
+            from snapshot import import_snapshot
+            logger.info(f"Loading snapshot {args.snapshot}...")
+            counts = import_snapshot(args.snapshot)
+            logger.info(f"✓ Snapshot loaded: {counts.get('indicators', 0)} observations in {counts['seconds']}s\n")
+            if args.no_top_up:
+                logger.info("Skipping top-up - data ends where the snapshot does\n")
+                # No ingestion run follows to bring the on-disk stores in line with the imported rows
+                from columnar_store import refresh_columnar_store
+                from series_cache import refresh_series_cache
+                refresh_columnar_store()
+                refresh_series_cache()
+
+        if not args.snapshot or not args.no_top_up:
+            # Load FRED data (only observations missing from the database are inserted)
+            logger.info("Loading FRED data..." if args.snapshot else "Loading FRED data (this takes 5-10 minutes)...")
+            ingest_fred_data(years_back=10)
+            logger.info("✓ FRED data loaded\n")
+
+            # Load market data
+            logger.info("Loading market data...")
+            ingest_market_data(years_back=10)
+            logger.info("✓ Market data loaded\n")
         
         print("="*60)
         print("SETUP COMPLETE!")
@@ -0,0 +1,263 @@
+"""
+Alert Signal Engine
+
+Evaluates configurable threshold / crossover / trend rules over stored
+indicators at ingest time, records state transitions and keeps the current
+state of every rule in `signal_state`, which the API serves from /api/signals.
+
+Rules are evaluated over the whole series in one vectorized pass, so adding
+rules costs ingest time only - never UI time.
+"""
+
+from datetime import datetime
+import logging
+
+import numpy as np
+import pandas as pd
+
+from main import (
+    get_db_context, load_series_frame,
+    SignalState, SignalTransition
+)
+
+logger = logging.getLogger(__name__)
+
+# Alert rules
+#
+# type "threshold": value {operator} level
+# type "crossover": value crossed level (or its own ma_window-observation
+#                   moving average) in {direction} within lookback_days
+# type "trend":     percent change over window_days {operator} pct_change
+#
+# `indicators` lists candidate series in priority order - the first one with
+# data is used (e.g. FRED VIX, falling back to the Yahoo ticker).
+# `message` may reference {value} (latest value of the series).
+SIGNAL_RULES = {
+    "yield_curve_inverted": {
+        "title": "Yield Curve Inverted",
+        "indicators": ["T10Y2Y"],
+        "type": "threshold",
+        "operator": "below",
+        "level": 0,
+        "severity": "warning",
+        "message": "The 10Y-2Y spread is negative - historically precedes recessions by 6-18 months"
+    },
+    "high_volatility": {
+        "title": "High Volatility",
+        "indicators": ["VIXCLS", "^VIX"],
+        "type": "threshold",
+        "operator": "above",
+        "level": 30,
+        "severity": "warning",
+        "message": "VIX is {value:.1f} - elevated market fear"
+    },
+    "elevated_unemployment": {
+        "title": "Elevated Unemployment",
+        "indicators": ["UNRATE"],
+        "type": "threshold",
+        "operator": "above",
+        "level": 5,
+        "severity": "warning",
+        "message": "Unemployment at {value:.1f}% - above historical average"
+    },
+    "credit_stress": {
+        "title": "Credit Stress",
+        "indicators": ["BAMLH0A0HYM2"],
+        "type": "threshold",
+        "operator": "above",
+        "level": 5,
+        "severity": "warning",
+        "message": "High yield spread at {value:.2f}% - elevated credit risk"
+    },
+    "yield_curve_uninversion": {
+        "title": "Yield Curve Un-Inverting",
+        "indicators": ["T10Y2Y"],
+        "type": "crossover",
+        "direction": "up",
+        "level": 0,
+        "lookback_days": 180,
+        "severity": "info",
+        "message": "The 10Y-2Y spread turned positive after an inversion - recessions have often started soon after"
+    },
+    "equity_trend_break": {
+        "title": "S&P 500 Below 200-Day Average",
+        "indicators": ["^GSPC", "SPY"],
+        "type": "crossover",
+        "direction": "down",
+        "ma_window": 200,
+        "lookback_days": 30,
+        "severity": "info",
+        "message": "S&P 500 crossed below its 200-day moving average ({value:,.0f})"
+    },
+    "sahm_rule_triggered": {
+        "title": "Sahm Rule Triggered",
+        "indicators": ["SAHM_INDICATOR"],
+        "type": "threshold",
+        "operator": "above",
+        "level": 0.5,
+        "severity": "warning",
+        "message": "Sahm rule indicator at {value:.2f}pp - unemployment is rising at a pace that has marked past recessions"
+    },
+    "jobless_claims_rising": {
+        "title": "Jobless Claims Rising",
+        "indicators": ["ICSA"],
+        "type": "trend",
+        "operator": "above",
+        "window_days": 90,
+        "pct_change": 20,
+        "severity": "warning",
+        "message": "Initial claims up more than 20% over 3 months ({value:,.0f})"
+    },
+}
+
+
+def _lagged(series: pd.Series, days: int) -> pd.Series:
+    """Value of the last observation on or before (t - days) for every t"""
+    timestamps = series.index.values
+    targets = timestamps - np.timedelta64(days, "D")
+    positions = np.searchsorted(timestamps, targets, side="right") - 1
+    lagged = series.to_numpy(dtype=float)[np.clip(positions, 0, None)]
+    lagged[positions < 0] = np.nan
+    return pd.Series(lagged, index=series.index)
+
+
+def _compare(values: pd.Series, operator: str, level: float) -> pd.Series:
+    if operator == "above":
+        return values > level
+    if operator == "below":
+        return values < level
+    raise ValueError(f"Unknown operator '{operator}'")
+
+
+def evaluate_rule(rule: dict, series: pd.Series) -> pd.Series:
+    """
+    Evaluate one rule over a full series.
+    Returns a boolean Series (True = signal active) on the series' index.
+    """
+    series = series.dropna().sort_index()
+    rule_type = rule["type"]
+
+    if rule_type == "threshold":
+        return _compare(series, rule["operator"], rule["level"])
+
+    if rule_type == "crossover":
+        if "ma_window" in rule:
+            reference = series.rolling(rule["ma_window"], min_periods=rule["ma_window"]).mean()
+        else:
+            reference = pd.Series(float(rule["level"]), index=series.index)
+        above = series > reference
+        if rule["direction"] == "up":
+            crossed = above & ~above.shift(1, fill_value=True)
+            still_valid = above
+        else:
+            crossed = ~above & above.shift(1, fill_value=False)
+            still_valid = ~above
+        # Active while the cross happened within lookback_days and hasn't reversed
+        recent = crossed.astype(float).rolling(f"{rule['lookback_days']}D").max() > 0
+        return recent & still_valid
+
+    if rule_type == "trend":
+        base = _lagged(series, rule["window_days"])
+        change = (series / base - 1) * 100
+        return _compare(change, rule["operator"], rule["pct_change"]).fillna(False)
+
+    raise ValueError(f"Unknown rule type '{rule_type}'")
+
+
+def _format_message(rule: dict, value: float) -> str:
+    try:
+        return rule["message"].format(value=value)
+    except (KeyError, ValueError):
+        return rule["message"]
+
+
+def evaluate_signals(db, rules: dict = None) -> int:
+    """
+    Evaluate all rules against stored data, record new transitions and
+    update signal_state. Returns the number of transitions recorded.
+    """
+    rules = rules or SIGNAL_RULES
+    indicator_ids = sorted({i for rule in rules.values() for i in rule["indicators"]})
+    prices = load_series_frame(db, indicator_ids)
+
+    existing = {s.rule_id: s for s in db.query(SignalState).all()}
+    transitions_added = 0
+
+    for rule_id, rule in rules.items():
+        indicator_id = next(
+            (i for i in rule["indicators"] if i in prices.columns and prices[i].notna().any()),
+            None
+        )
+        if indicator_id is None:
+            logger.warning(f"  Signal {rule_id}: no data for {rule['indicators']}")
+            continue
+
+        series = prices[indicator_id].dropna()
+        active = evaluate_rule(rule, series)
+        if active.empty:
+            continue
+
+        # Transitions = points where the state differs from the previous point
+        changed = active.ne(active.shift(1))
+        changed.iloc[0] = bool(active.iloc[0])  # an initially-active state counts as a transition
+
+        state = existing.get(rule_id)
+        if state is not None and state.as_of is not None:
+            changed &= active.index > pd.Timestamp(state.as_of)
+            # First new point only transitions if it differs from the stored state
+            new_points = active.index > pd.Timestamp(state.as_of)
+            if new_points.any():
+                first_new = active.index[new_points][0]
+                changed.loc[first_new] = bool(active.loc[first_new]) != bool(state.active)
+
+        for timestamp in active.index[changed.to_numpy()]:
+            db.add(SignalTransition(
+                rule_id=rule_id,
+                indicator_id=indicator_id,
+                timestamp=timestamp.to_pydatetime(),
+                active=bool(active.loc[timestamp]),
+                value=float(series.loc[timestamp])
+            ))
+            transitions_added += 1
+
+        is_active = bool(active.iloc[-1])
+        latest_value = float(series.iloc[-1])
+        # The current state began at the last change point
+        change_points = active.index[active.ne(active.shift(1)).to_numpy()]
+        since = change_points[-1].to_pydatetime() if len(change_points) else active.index[0].to_pydatetime()
+
+        if state is None:
+            state = SignalState(rule_id=rule_id)
+            db.add(state)
+        state.indicator_id = indicator_id
+        state.title = rule["title"]
+        state.message = _format_message(rule, latest_value)
+        state.severity = rule.get("severity", "warning")
+        state.active = is_active
+        state.value = latest_value
+        state.since = since
+        state.as_of = active.index[-1].to_pydatetime()
+        state.evaluated_at = datetime.now()
+
+    # Drop state for rules that no longer exist
+    for rule_id, state in existing.items():
+        if rule_id not in rules:
+            db.delete(state)
+
+    db.commit()
+    return transitions_added
+
+
+def refresh_signals():
+    """Evaluate all signal rules in their own session (called after ingestion)"""
+    try:
+        with get_db_context() as db:
+            added = evaluate_signals(db)
+        logger.info(f"Signals evaluated: {added} new transitions")
+    except Exception as e:
+        logger.error(f"Signal evaluation failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    refresh_signals()
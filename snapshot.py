@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Database Snapshots
+
+Exports the data tables (indicators, indicator_metadata and every table
+maintained at ingest time: derived state, signals, regimes, RRG, rankings,
+series stats) into one .zip file holding a zstd-compressed Parquet file per
+table plus a manifest, and bulk-loads such a file into another database -
+COPY on Postgres, chunked executemany elsewhere. Operational history
+(refresh_log, ingest_timings) is not included.
+
+    python snapshot.py export macro_snapshot.zip
+    python snapshot.py import macro_snapshot.zip          # replaces those tables' rows
+    python setup.py --snapshot macro_snapshot.zip         # import, then top up from FRED / Yahoo
+
+The target is chosen by DATABASE_URL like every other script.
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Integer, select, text
+
+from main import Base, engine
+
+SNAPSHOT_FORMAT = 1
+EXCLUDED_TABLES = {"refresh_log", "ingest_timings"}
+
+# Rows per INSERT statement when COPY isn't available
+INSERT_CHUNK = 20000
+
+
+def snapshot_tables(names: Optional[Iterable[str]] = None) -> list:
+    """Tables included in snapshots, in metadata order"""
+    tables = [t for t in Base.metadata.sorted_tables if t.name not in EXCLUDED_TABLES]
+    if names is not None:
+        wanted = set(names)
+        unknown = wanted - {t.name for t in tables}
+        if unknown:
+            raise ValueError(f"Unknown or excluded tables: {sorted(unknown)}")
+        tables = [t for t in tables if t.name in wanted]
+    return tables
+
+
+def export_snapshot(path: str, tables: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Write the selected tables to a snapshot file. Returns rows per table."""
+    started = time.perf_counter()
+    counts = {}
+    manifest = {"format": SNAPSHOT_FORMAT, "created_at": datetime.now().isoformat(timespec="seconds"),
+                "dialect": engine.dialect.name, "tables": {}}
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for table in snapshot_tables(tables):
+            with engine.connect() as conn:
+                frame = pd.read_sql(select(table), conn, coerce_float=True)
+            buffer = io.BytesIO()
+            pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), buffer, compression="zstd")
+            archive.writestr(f"{table.name}.parquet", buffer.getvalue())
+            manifest["tables"][table.name] = {"rows": len(frame), "columns": list(frame.columns)}
+            counts[table.name] = len(frame)
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+
+    counts["seconds"] = round(time.perf_counter() - started, 2)
+    return counts
+
+
+def read_manifest(path: str) -> dict:
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format')} (expected {SNAPSHOT_FORMAT})")
+    return manifest
+
+
+def _copy_frame(conn, table, frame: pd.DataFrame):
+    """Postgres COPY FROM STDIN of a frame (CSV, \\N for NULL)"""
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False, na_rep="\\N", date_format="%Y-%m-%d %H:%M:%S.%f")
+    buffer.seek(0)
+    columns = ", ".join(f'"{c}"' for c in frame.columns)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f'COPY "{table.name}" ({columns}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')', buffer)
+    finally:
+        cursor.close()
+
+
+def _insert_frame(conn, table, frame: pd.DataFrame):
+    records = frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+    for start in range(0, len(records), INSERT_CHUNK):
+        conn.execute(table.insert(), records[start:start + INSERT_CHUNK])
+
+
+def _reset_sequences(conn, table):
+    """Move Postgres serial sequences past the imported ids"""
+    for column in table.primary_key.columns:
+        if isinstance(column.type, Integer) and column.autoincrement in (True, "auto"):
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{column.name}'), "
+                f"COALESCE((SELECT MAX(\"{column.name}\") FROM \"{table.name}\"), 0) + 1, false)"
+            ))
+
+
+def import_snapshot(path: str, tables: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Replace the rows of every table in the snapshot (or the selected ones)
+    with the snapshot's, in one transaction. Columns the current schema no
+    longer has are dropped; new columns get their defaults.
+    Returns rows per table.
+    """
+    started = time.perf_counter()
+    manifest = read_manifest(path)
+    Base.metadata.create_all(bind=engine)
+    postgres = engine.dialect.name == "postgresql"
+    counts = {}
+
+    with zipfile.ZipFile(path) as archive, engine.begin() as conn:
+        for table in snapshot_tables(tables):
+            if table.name not in manifest["tables"]:
+                continue
+            frame = pq.read_table(io.BytesIO(archive.read(f"{table.name}.parquet"))).to_pandas()
+            frame = frame[[c for c in frame.columns if c in table.columns]]
+
+            conn.execute(table.delete())
+            if len(frame):
+                if postgres:
+                    _copy_frame(conn, table, frame)
+                    _reset_sequences(conn, table)
+                else:
+                    _insert_frame(conn, table, frame)
+            counts[table.name] = len(frame)
+
+    counts["seconds"] = round(time.perf_counter() - started, 2)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in [("export", "Write a snapshot of DATABASE_URL"), ("import", "Load a snapshot into DATABASE_URL")]:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("path")
+        command.add_argument("--tables", nargs="+", help="Subset of tables (default: all snapshot tables)")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        result = export_snapshot(args.path, args.tables)
+    else:
+        from columnar_store import refresh_columnar_store
+        from series_cache import refresh_series_cache
+        result = import_snapshot(args.path, args.tables)
+        # The on-disk stores (when enabled) serve what their last sync wrote
+        refresh_columnar_store()
+        refresh_series_cache()
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Synthetic Data
+
+Deterministic stand-in series shaped like the tracked catalog
+(FRED_INDICATORS, STOCK_INDICATORS, CRYPTO_INDICATORS): the same ids and
+metadata, each series at its real publication frequency, random-walk values
+and any history length. Used by the benchmarks to seed a throwaway database
+without touching FRED or Yahoo.
+"""
+
+import re
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ingest_fred import FRED_INDICATORS
+from ingest_market import CRYPTO_INDICATORS, STOCK_INDICATORS
+from main import Base, Indicator, IndicatorMetadata
+
+# Publication frequency of FRED series (everything else is monthly)
+DAILY_FRED_PREFIXES = (
+    "DGS", "DFII", "DFF", "T10Y", "BAML", "DCOIL", "VIXCLS", "VXVCLS", "DTWEX",
+    "RRPONTSYD", "SOFR", "SP500", "THREEFYTP",
+)
+WEEKLY_FRED = {"MORTGAGE30US", "ICSA", "CCSA", "WALCL", "WTREGEN", "NFCI", "ANFCI"}
+QUARTERLY_FRED = {"GDP", "GDPC1", "GFDEBTN"}
+
+# Observation calendars per frequency (market tickers trade on business days, crypto daily)
+FREQUENCY_DATES = {"daily": "B", "crypto": "D", "weekly": "W-SAT", "monthly": "MS", "quarterly": "QS"}
+PERIODS_PER_YEAR = {"daily": 252, "crypto": 365, "weekly": 52, "monthly": 12, "quarterly": 4}
+
+# Rows inserted per statement while seeding
+INSERT_CHUNK = 20000
+
+
+def fred_frequency(series_id: str) -> str:
+    """Publication frequency of a FRED series id"""
+    if series_id.startswith(DAILY_FRED_PREFIXES):
+        return "daily"
+    if series_id in WEEKLY_FRED:
+        return "weekly"
+    if series_id in QUARTERLY_FRED or re.search(r"Q\d{3}S|Q$", series_id):
+        return "quarterly"
+    return "monthly"
+
+
+def synthetic_catalog(scale: int = 1) -> List[dict]:
+    """
+    Every tracked series as {indicator_id, source, frequency, calendar, metadata}.
+    scale > 1 adds copies of each series ("<id>__2", ...) to grow the series count.
+    """
+    base = []
+    for series_id, metadata in FRED_INDICATORS.items():
+        frequency = fred_frequency(series_id)
+        base.append({"indicator_id": series_id, "source": "FRED", "frequency": frequency,
+                     "calendar": frequency, "metadata": metadata})
+    for group, calendar in [(STOCK_INDICATORS, "daily"), (CRYPTO_INDICATORS, "crypto")]:
+        for symbol, metadata in group.items():
+            base.append({"indicator_id": symbol, "source": "YAHOO_FINANCE", "frequency": "daily",
+                         "calendar": calendar, "metadata": metadata})
+
+    catalog = list(base)
+    for copy in range(2, scale + 1):
+        for entry in base:
+            catalog.append({
+                **entry,
+                "indicator_id": f"{entry['indicator_id']}__{copy}",
+                "metadata": {**entry["metadata"], "name": f"{entry['metadata']['name']} #{copy}"},
+            })
+    return catalog
+
+
+def synthetic_series(entry: dict, years: float, end: Optional[datetime] = None) -> pd.Series:
+    """
+    Random-walk values for one catalog entry over the last `years`, seeded by
+    its id so every run produces the same data. Rates (unit "percent")
+    wander around 4; everything else follows a geometric random walk from 100.
+    """
+    end = pd.Timestamp(end or datetime.now()).normalize()
+    dates = pd.date_range(end - pd.DateOffset(years=years), end, freq=FREQUENCY_DATES[entry["calendar"]])
+    rng = np.random.default_rng(zlib.crc32(entry["indicator_id"].encode()))
+    step = 1 / np.sqrt(PERIODS_PER_YEAR[entry["calendar"]])
+
+    if entry["metadata"].get("unit") == "percent":
+        values = 4 + np.cumsum(rng.normal(0, 0.8 * step, len(dates)))
+    else:
+        values = 100 * np.exp(np.cumsum(rng.normal(0.05 * step ** 2, 0.2 * step, len(dates))))
+    return pd.Series(np.round(values, 6), index=dates)
+
+
+def seed_database(engine, years: float, scale: int = 1, reset: bool = True) -> Dict[str, float]:
+    """
+    Fill a database with the synthetic catalog (dropping every table first
+    when `reset`). Returns {"series", "rows", "seconds"}.
+    """
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    started = time.perf_counter()
+    catalog = synthetic_catalog(scale)
+    rows = 0
+    with engine.begin() as conn:
+        conn.execute(IndicatorMetadata.__table__.insert(), [
+            {
+                "indicator_id": entry["indicator_id"],
+                "source": entry["source"],
+                "typical_frequency": entry["frequency"],
+                "fred_series_id": entry["indicator_id"] if entry["source"] == "FRED" else None,
+                **entry["metadata"],
+            }
+            for entry in catalog
+        ])
+
+    for entry in catalog:
+        series = synthetic_series(entry, years)
+        records = [
+            {"indicator_id": entry["indicator_id"], "timestamp": timestamp.to_pydatetime(), "value": float(value),
+             "source": entry["source"], "frequency": entry["frequency"]}
+            for timestamp, value in series.items()
+        ]
+        with engine.begin() as conn:
+            for start in range(0, len(records), INSERT_CHUNK):
+                conn.execute(Indicator.__table__.insert(), records[start:start + INSERT_CHUNK])
+        rows += len(records)
+
+    return {"series": len(catalog), "rows": rows, "seconds": round(time.perf_counter() - started, 2)}
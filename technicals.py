@@ -0,0 +1,167 @@
+"""
+Technical Indicators
+
+Moving averages, RSI, MACD, Bollinger bands, ATR-style volatility, 52-week
+range distance and drawdown for a whole wide price matrix in one pass, plus
+market breadth across tickers.
+
+Tickers trade on different calendars (crypto every day, exchanges with
+different holidays), so the matrix is first packed per column: each ticker's
+observations are right-aligned on a shared row axis, rolling windows run
+down that axis for all tickers at once, and results are scattered back onto
+the timestamp index. Windows therefore always count a ticker's own trading
+days, and the last packed row is every ticker's latest snapshot.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+MA_WINDOWS = [20, 50, 200]
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_WINDOW, BOLLINGER_WIDTH = 20, 2
+ATR_PERIOD = 14
+RANGE_WINDOW = 252
+
+TECHNICAL_FIELDS = [
+    "close", "ma_20", "ma_50", "ma_200", "pct_vs_ma_50", "pct_vs_ma_200",
+    "rsi_14", "macd", "macd_signal", "macd_hist",
+    "bb_upper", "bb_lower", "bb_percent_b", "bb_width",
+    "atr_pct", "pct_from_52w_high", "pct_from_52w_low", "drawdown",
+]
+
+# Breadth measures: share (%) of tickers meeting each condition
+BREADTH_FIELDS = ["pct_above_ma_50", "pct_above_ma_200", "pct_golden_cross", "pct_52w_high", "pct_52w_low"]
+
+# Breadth is skipped on dates where fewer tickers than this have data
+BREADTH_MIN_TICKERS = 5
+
+
+def pack_columns(prices: pd.DataFrame):
+    """
+    Right-align every column's observations.
+    Returns (packed values, source row of each packed cell or -1).
+    """
+    values = prices.to_numpy(dtype=float)
+    n_rows = len(values)
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+
+    # Valid rows first (time order kept), then shift each column to the bottom
+    order = np.argsort(~valid, axis=0, kind="stable")
+    offset = np.arange(n_rows)[:, None] - (n_rows - counts)[None, :]
+    source = np.take_along_axis(order, np.clip(offset, 0, None), axis=0)
+    source[offset < 0] = -1
+
+    packed = np.take_along_axis(values, np.clip(source, 0, None), axis=0)
+    packed[source < 0] = np.nan
+    return packed, source
+
+
+def unpack_columns(packed: np.ndarray, source: np.ndarray, like: pd.DataFrame) -> pd.DataFrame:
+    """Scatter a packed matrix back onto the index and columns of `like`"""
+    output = np.full(like.shape, np.nan)
+    rows, cols = np.nonzero(source >= 0)
+    output[source[rows, cols], cols] = packed[rows, cols]
+    return pd.DataFrame(output, index=like.index, columns=like.columns)
+
+
+def _rsi(close: pd.DataFrame) -> pd.DataFrame:
+    """Wilder RSI"""
+    change = close.diff()
+    gain = change.clip(lower=0).ewm(alpha=1 / RSI_PERIOD, adjust=False, min_periods=RSI_PERIOD).mean()
+    loss = (-change.clip(upper=0)).ewm(alpha=1 / RSI_PERIOD, adjust=False, min_periods=RSI_PERIOD).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+def _packed_technicals(close: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """All fields over a packed close matrix (rows = observations)"""
+    fields = {"close": close}
+    for window in MA_WINDOWS:
+        fields[f"ma_{window}"] = close.rolling(window).mean()
+    fields["pct_vs_ma_50"] = (close / fields["ma_50"] - 1) * 100
+    fields["pct_vs_ma_200"] = (close / fields["ma_200"] - 1) * 100
+
+    fields["rsi_14"] = _rsi(close)
+
+    fast = close.ewm(span=MACD_FAST, adjust=False, min_periods=MACD_FAST).mean()
+    slow = close.ewm(span=MACD_SLOW, adjust=False, min_periods=MACD_SLOW).mean()
+    fields["macd"] = fast - slow
+    fields["macd_signal"] = fields["macd"].ewm(span=MACD_SIGNAL, adjust=False, min_periods=MACD_SIGNAL).mean()
+    fields["macd_hist"] = fields["macd"] - fields["macd_signal"]
+
+    middle = fields[f"ma_{BOLLINGER_WINDOW}"]
+    std = close.rolling(BOLLINGER_WINDOW).std()
+    fields["bb_upper"] = middle + BOLLINGER_WIDTH * std
+    fields["bb_lower"] = middle - BOLLINGER_WIDTH * std
+    fields["bb_percent_b"] = (close - fields["bb_lower"]) / (fields["bb_upper"] - fields["bb_lower"])
+    fields["bb_width"] = (fields["bb_upper"] - fields["bb_lower"]) / middle * 100
+
+    # Close-only data: average absolute close-to-close move as % of price
+    fields["atr_pct"] = (close.diff().abs().rolling(ATR_PERIOD).mean() / close) * 100
+
+    high = close.rolling(RANGE_WINDOW, min_periods=RANGE_WINDOW // 2).max()
+    low = close.rolling(RANGE_WINDOW, min_periods=RANGE_WINDOW // 2).min()
+    fields["pct_from_52w_high"] = (close / high - 1) * 100
+    fields["pct_from_52w_low"] = (close / low - 1) * 100
+    fields["drawdown"] = (close / close.cummax() - 1) * 100
+    return fields
+
+
+def compute_technicals(prices: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Every TECHNICAL_FIELDS entry for every ticker.
+    prices: wide close matrix (index = timestamp, one column per ticker).
+    Returns field -> wide frame on the same index (NaN where a ticker has no close).
+    """
+    prices = prices.sort_index()
+    packed, source = pack_columns(prices)
+    fields = _packed_technicals(pd.DataFrame(packed, columns=prices.columns))
+    return {name: unpack_columns(frame.to_numpy(), source, prices) for name, frame in fields.items()}
+
+
+def technical_snapshot(fields: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Latest value of every field per ticker from compute_technicals output
+    (index = ticker, columns = "timestamp" + TECHNICAL_FIELDS), as float32.
+    """
+    close = fields["close"]
+    valid = close.notna().to_numpy()
+    has_data = valid.any(axis=0)
+    last_row = len(close) - 1 - np.argmax(valid[::-1], axis=0)
+    columns = np.arange(close.shape[1])
+
+    snapshot = pd.DataFrame(
+        {name: fields[name].to_numpy()[last_row, columns] for name in TECHNICAL_FIELDS},
+        index=close.columns
+    ).astype("float32")
+    snapshot.insert(0, "timestamp", close.index[last_row])
+    return snapshot[has_data]
+
+
+def breadth(fields: Dict[str, pd.DataFrame], tickers: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Share (%) of tickers above their 50/200-day MA, with the 50-day above the
+    200-day, and at a 52-week high/low, per date. A ticker counts on dates it
+    has a close; the others are carried for up to 5 days to bridge holidays.
+    """
+    if tickers is not None:
+        fields = {name: frame[[t for t in tickers if t in frame.columns]] for name, frame in fields.items()}
+
+    close, ma_50, ma_200 = fields["close"], fields["ma_50"], fields["ma_200"]
+    conditions = {
+        "pct_above_ma_50": (close > ma_50).where(ma_50.notna()),
+        "pct_above_ma_200": (close > ma_200).where(ma_200.notna()),
+        "pct_golden_cross": (ma_50 > ma_200).where(ma_200.notna()),
+        "pct_52w_high": (fields["pct_from_52w_high"] >= 0).where(fields["pct_from_52w_high"].notna()),
+        "pct_52w_low": (fields["pct_from_52w_low"] <= 0).where(fields["pct_from_52w_low"].notna()),
+    }
+
+    output = {}
+    for name, flags in conditions.items():
+        output[name] = flags.astype(float).ffill(limit=5).mean(axis=1) * 100
+    output["tickers"] = conditions["pct_above_ma_200"].astype(float).ffill(limit=5).count(axis=1)
+
+    result = pd.DataFrame(output)
+    return result[result["tickers"] >= BREADTH_MIN_TICKERS]
@@ -0,0 +1,48 @@
+"""
+Shared fixtures: main reads DATABASE_URL (and creates its tables) at import
+time, so every test module runs against one throwaway SQLite file, emptied
+after each test.
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+import pytest
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="macro-tests-"), "test.db")
+for name in ("COLUMNAR_STORE_DIR", "SERIES_CACHE_DIR", "TRACE_EXPORT"):
+    os.environ.pop(name, None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    session = main.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(main.Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        session.close()
+
+
+def store_series(db, indicator_id: str, values, start: str = "2020-01-01", freq: str = "D",
+                 category: str = "test") -> pd.Series:
+    """Write metadata plus one point per period starting at `start`; returns the stored series"""
+    series = pd.Series(values, index=pd.date_range(start, periods=len(values), freq=freq), dtype=float)
+    db.merge(main.IndicatorMetadata(indicator_id=indicator_id, name=indicator_id, category=category, source="TEST"))
+    main.replace_series_tail(db, indicator_id, series, "TEST", "daily")
+    db.commit()
+    return series
+
+
+def rewrite_last_point(db, indicator_id: str, series: pd.Series, value: float):
+    """Same-length tail rewrite, as recession.update_model and derived.update_derived do"""
+    main.replace_series_tail(db, indicator_id, pd.Series([value], index=series.index[-1:]), "TEST", "daily")
+    db.commit()
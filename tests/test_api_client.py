@@ -0,0 +1,56 @@
+"""MacroAPIClient request building and response caching (no server: the session is stubbed)"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from api_client import MacroAPIClient, MemoryCache, _day_param
+
+
+class FakeResponse:
+    content = b"{}"
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = MacroAPIClient(base_url="http://api.test", cache=MemoryCache())
+    client.requested = []
+
+    def get(url, **kwargs):
+        client.requested.append(url)
+        return FakeResponse({"data": [{"timestamp": "2024-01-02T00:00:00", "value": 1.0}]})
+
+    monkeypatch.setattr(client.session, "get", get)
+    return client
+
+
+def test_rolling_window_reruns_hit_the_cache(client):
+    for _ in range(2):
+        client.timeseries("SPY", start=datetime.now() - timedelta(days=365), end=datetime.now())
+    assert len(client.requested) == 1
+
+
+def test_query_string_start_is_snapped(client):
+    # Dashboard pages build timeseries URLs by hand (data_loaders.fetch_api)
+    for offset in (0, 1):
+        start = datetime(2024, 5, 1, 9, 30, 15, 123456) + timedelta(seconds=offset)
+        client.get_json(f"/api/indicators/SPY/timeseries?start={start.isoformat()}&limit=20000")
+    assert client.requested == ["http://api.test/api/indicators/SPY/timeseries?start=2024-05-01T00%3A00%3A00&limit=20000"]
+
+
+def test_day_param():
+    assert _day_param(datetime(2024, 5, 1, 9, 30)) == "2024-05-01T00:00:00"
+    assert _day_param(datetime(2024, 5, 1, 9, 30), round_up=True) == "2024-05-02T00:00:00"
+    assert _day_param(datetime(2024, 5, 1), round_up=True) == "2024-05-01T00:00:00"
+    assert _day_param(date(2024, 5, 1)) == "2024-05-01T00:00:00"
+    assert _day_param("2024-05-01T09:30:00") == "2024-05-01T00:00:00"
+    assert _day_param("last-week") == "last-week"
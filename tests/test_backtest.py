@@ -0,0 +1,79 @@
+"""Backtest spec validation, the /api/backtest error contract and a known-answer run"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from backtest import BACKTEST_PRESETS, expand_grid, run_backtest, validate_spec
+from conftest import store_series
+
+
+@pytest.mark.parametrize("name", list(BACKTEST_PRESETS))
+def test_presets_are_valid(name):
+    validate_spec(BACKTEST_PRESETS[name])
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"type": "lever"}, "Unknown strategy type"),
+    ({"type": "static"}, "needs ['weights']"),
+    ({"type": "static", "weights": 1}, "'weights' must be a non-empty mapping"),
+    ({"type": "static", "weights": {"SPY": "half"}}, "weight of SPY must be a number"),
+    ({"type": "static", "weights": {"SPY": 1}, "rebalance": "W"}, "rebalance must be one of"),
+    ({"type": "signal", "signal": "T10Y2Y", "threshold": "0", "weights_on": {"SPY": 1}, "weights_off": {"TLT": 1}},
+     "'threshold' must be a number"),
+    ({"type": "regime", "regime": "risk_appetite", "weights": {"Risk-On": [0.5]}, "default": {"SPY": 1}},
+     "'weights.Risk-On' must be a non-empty mapping"),
+    ({"type": "momentum", "universe": ["XLK", "XLF"], "lookback": 126, "top_n": 0}, "'top_n' must be a positive integer"),
+    ({"type": "momentum", "universe": "XLK", "lookback": 126, "top_n": 1}, "'universe' must be a non-empty list"),
+])
+def test_validate_spec_rejects(spec, message):
+    with pytest.raises(ValueError, match=message.replace("[", r"\[").replace("]", r"\]")):
+        validate_spec(spec)
+
+
+def test_sweep_combinations_are_validated():
+    specs = expand_grid({"type": "static", "weights": {"SPY": 1}}, {"weights": [{"SPY": 1}, 2]})
+    validate_spec(specs[0])
+    with pytest.raises(ValueError, match="'weights' must be a non-empty mapping"):
+        validate_spec(specs[1])
+
+
+def test_static_buy_and_hold_tracks_weighted_growth():
+    index = pd.date_range("2024-01-01", periods=5, freq="B")
+    prices = pd.DataFrame({"A": [100, 110, 121, 133.1, 146.41], "B": [50, 50, 50, 50, 50]}, index=index, dtype=float)
+    result = run_backtest({"type": "static", "weights": {"A": 1, "B": 1}, "rebalance": "none"}, prices)
+
+    equity = result["equity"]
+    assert equity.iloc[0] == pytest.approx(1.0)
+    # Half grows 46.41%, half stays flat
+    assert equity.iloc[-1] == pytest.approx(1 + 0.5 * 0.4641)
+    np.testing.assert_allclose(result["targets"].iloc[0].to_numpy(), [0.5, 0.5])
+
+
+def test_endpoint_rejects_malformed_sweep_with_400(db):
+    response = TestClient(main.app).post("/api/backtest", json={
+        "strategy": {"type": "static", "weights": {"SPY": 1.0}},
+        "sweep": {"weights": [1, 2]},
+    })
+    assert response.status_code == 400
+    assert "'weights' must be a non-empty mapping" in response.json()["detail"]
+
+
+def test_endpoint_reports_engine_value_errors_as_400(db):
+    response = TestClient(main.app).post("/api/backtest", json={"strategy": {"type": "static", "weights": {"NOPE": 1}}})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid strategy: ")
+
+
+def test_endpoint_runs_stored_prices(db):
+    store_series(db, "AAA", [100.0 + i for i in range(40)], start="2024-01-01", freq="B")
+    response = TestClient(main.app).post("/api/backtest", json={
+        "strategy": {"type": "static", "weights": {"AAA": 1.0}, "rebalance": "M"}, "benchmark": "AAA",
+    })
+    assert response.status_code == 200
+    statistics = response.json()["statistics"]
+    assert statistics["strategy"]["total_return"] == pytest.approx(statistics["benchmark"]["total_return"], abs=1e-6)
+    # Never drew down: Calmar is infinite, which JSON can't carry
+    assert statistics["strategy"]["max_drawdown"] == 0 and statistics["strategy"]["calmar"] is None
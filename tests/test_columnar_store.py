@@ -0,0 +1,40 @@
+"""Parquet columnar store: sync against series versions and analytics reads"""
+
+import pandas as pd
+import pytest
+
+import main
+from columnar_store import ColumnarStore
+from conftest import rewrite_last_point, store_series
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ColumnarStore(str(tmp_path / "store"))
+    monkeypatch.setattr(main, "columnar_store", store)
+    return store
+
+
+def test_read_frame_matches_sql(db, store):
+    store_series(db, "A", [1.0, 2.0, 3.0], start="2024-01-01")
+    store_series(db, "B", [5.0, 6.0], start="2024-01-02")
+    store.sync(db)
+
+    start, end = pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")
+    expected = main.load_series_frame(db, ["A", "B"], start, end)
+    pd.testing.assert_frame_equal(store.read_frame(["A", "B"], start, end), expected, check_names=False)
+
+
+def test_rewritten_tail_is_reexported(db, store):
+    series = store_series(db, "RECPROB", [10.0, 20.0, 55.98])
+    assert store.sync(db) == 1
+    assert store.sync(db) == 0
+
+    rewrite_last_point(db, "RECPROB", series, 99.0)
+    # Stale until synced: analytics fall back to SQL rather than serving the old file
+    assert not store.holds(main.series_versions(db, ["RECPROB"]))
+    assert main.load_analytics_frame(db, ["RECPROB"])["RECPROB"].iloc[-1] == 99.0
+
+    assert store.sync(db) == 1
+    assert store.holds(main.series_versions(db, ["RECPROB"]))
+    assert store.read_frame(["RECPROB"])["RECPROB"].iloc[-1] == 99.0
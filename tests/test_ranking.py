@@ -0,0 +1,63 @@
+"""Ranking index refreshes and versioned analytics caching (LRU, same-length tail rewrites)"""
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import main
+from conftest import rewrite_last_point, store_series
+from ranking import rank_series, update_rankings
+
+
+def test_rank_series_percentile_and_z_score():
+    series = pd.Series(range(1, 21), index=pd.date_range("2024-01-01", periods=20), dtype=float)
+    full = rank_series(series)["full"]
+    assert full["latest_value"] == 20.0
+    assert full["percentile"] == 97.5  # mid-rank of the maximum among 20 distinct values
+    assert full["observations"] == 20
+    assert full["z_score"] > 1.5
+
+
+def test_rank_series_skips_short_history():
+    assert rank_series(pd.Series([1.0, 2.0], index=pd.date_range("2024-01-01", periods=2))) == {}
+
+
+def test_update_rankings_picks_up_same_length_rewrite(db):
+    series = store_series(db, "RECPROB", [float(v) for v in range(30)] + [55.98])
+    assert update_rankings(db) == 1
+    assert update_rankings(db) == 0
+
+    rewrite_last_point(db, "RECPROB", series, 1.0)
+    assert update_rankings(db) == 1
+
+    response = TestClient(main.app).get("/api/rankings/heatmap").json()
+    assert response["indicators"]["RECPROB"]["value"] == 1.0
+    assert TestClient(main.app).get("/api/rankings/RECPROB").json()["value"] == 1.0
+
+
+def test_versioned_cache_recomputes_after_same_length_rewrite(db):
+    series = store_series(db, "RECPROB", [10.0, 20.0, 55.98])
+    cache = main.VersionedCache()
+    calls = []
+
+    def latest():
+        calls.append(1)
+        return float(main.load_series_frame(db, ["RECPROB"])["RECPROB"].iloc[-1])
+
+    assert cache.get_or_compute(("latest",), main.data_version(db, ["RECPROB"]), latest) == 55.98
+    assert cache.get_or_compute(("latest",), main.data_version(db, ["RECPROB"]), latest) == 55.98
+    assert len(calls) == 1
+
+    rewrite_last_point(db, "RECPROB", series, 99.0)
+    assert cache.get_or_compute(("latest",), main.data_version(db, ["RECPROB"]), latest) == 99.0
+    assert len(calls) == 2
+
+
+def test_versioned_cache_evicts_least_recently_used():
+    cache = main.VersionedCache(max_entries=2)
+    for key in ("a", "b", "a", "c"):
+        cache.get_or_compute((key,), "v1", lambda: key)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # "b" was evicted; "a" survived because it was read again
+    assert cache.get_or_compute(("a",), "v1", lambda: "recomputed") == "a"
+    assert cache.get_or_compute(("b",), "v1", lambda: "recomputed") == "recomputed"
@@ -0,0 +1,90 @@
+"""Regime classification and run-length encoding into stored periods"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from conftest import store_series
+from regimes import classify, evaluate_regimes, to_periods
+
+RELATIVE_STRENGTH = {
+    "title": "A vs B", "type": "relative_strength", "numerator": "A", "denominator": "B",
+    "window": 1, "band": 1.0, "states": ["A", "B"],
+}
+
+
+def test_to_periods_run_lengths_and_durations():
+    index = pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-05", "2024-01-10", "2024-01-12"])
+    periods = to_periods(pd.Series(["Up", "Up", "Down", "Up", "Up"], index=index))
+
+    assert periods["state"].tolist() == ["Up", "Down", "Up"]
+    assert periods["start"].tolist() == list(index[[0, 2, 3]])
+    assert periods["end"].tolist() == list(index[[1, 2, 4]])
+    assert periods["observations"].tolist() == [2, 1, 2]
+    # Until the next run starts; the current run until its last date
+    assert periods["duration_days"].tolist() == [4, 5, 2]
+
+
+def test_to_periods_empty():
+    periods = to_periods(pd.Series([], index=pd.DatetimeIndex([]), dtype=object))
+    assert periods.empty
+    assert list(periods.columns) == ["state", "start", "end", "observations", "duration_days"]
+
+
+def test_classify_relative_strength_band():
+    index = pd.date_range("2024-01-01", periods=4)
+    prices = pd.DataFrame({"A": [100.0, 105.0, 105.5, 100.0], "B": [100.0] * 4}, index=index)
+
+    states = classify(RELATIVE_STRENGTH, prices)
+    # The first date has no window to compare against; +0.48% is inside the band
+    assert states.index.equals(index[1:])
+    assert states.tolist() == ["A", "Neutral", "B"]
+
+
+def test_classify_score_carries_slower_votes_forward():
+    daily = pd.date_range("2024-01-01", periods=6)
+    prices = pd.DataFrame({"FAST": [1.0, 2.0, 3.0, 2.0, 1.0, 0.0], "SLOW": np.nan}, index=daily)
+    prices.loc[daily[[0, 2]], "SLOW"] = [5.0, 6.0]
+    definition = {
+        "type": "score", "states": ["On", "Off"],
+        "components": [("FAST", "change", 1, 1), ("SLOW", "change", 1, 1)],
+    }
+
+    states = classify(definition, prices)
+    # Starts once SLOW has voted (+1) and keeps that vote while FAST turns down
+    assert states.index.equals(daily[2:])
+    assert states.tolist() == ["On", "Neutral", "Neutral", "Neutral"]
+
+
+def test_classify_quadrant_labels():
+    months = pd.date_range("2020-01-01", periods=15, freq="MS")
+    curve = 0.001 * np.arange(15) ** 2
+    definition = {
+        "type": "quadrant",
+        "growth": ("G", "yoy_change", 1), "inflation": ("I", "yoy_change", 1),
+        "states": {(True, False): "Goldilocks", (True, True): "Reflation",
+                   (False, True): "Stagflation", (False, False): "Deflation"},
+    }
+    # Accelerating growth, decelerating inflation
+    prices = pd.DataFrame({"G": 100 * np.exp(curve), "I": 100 * np.exp(-curve)}, index=months)
+
+    states = classify(definition, prices)
+    assert len(states) == 2
+    assert set(states) == {"Goldilocks"}
+
+
+def test_classify_unknown_type():
+    with pytest.raises(ValueError, match="Unknown regime type 'nope'"):
+        classify({"type": "nope"}, pd.DataFrame())
+
+
+def test_evaluate_regimes_replaces_stored_timeline(db):
+    store_series(db, "A", [100.0, 103.0, 106.0, 100.0, 95.0])
+    store_series(db, "B", [100.0] * 5)
+
+    assert evaluate_regimes(db, {"ab": RELATIVE_STRENGTH}) == 2
+    assert evaluate_regimes(db, {"ab": RELATIVE_STRENGTH}) == 2
+    stored = db.query(main.RegimePeriod).order_by(main.RegimePeriod.start_timestamp).all()
+    assert [(p.state, p.observations, p.duration_days) for p in stored] == [("A", 2, 2), ("B", 2, 1)]
+    assert {p.title for p in stored} == {"A vs B"}
@@ -0,0 +1,73 @@
+"""Series version tokens and the memory-mapped series cache"""
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from conftest import rewrite_last_point, store_series
+from series_cache import SeriesCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = SeriesCache(str(tmp_path / "series_cache"))
+    monkeypatch.setattr(main, "series_cache", cache)
+    return cache
+
+
+def test_version_changes_on_same_length_rewrite(db):
+    series = store_series(db, "RECPROB", [10.0, 20.0, 55.98258])
+    before = main.series_versions(db, ["RECPROB"])["RECPROB"]
+
+    rewrite_last_point(db, "RECPROB", series, 99.0)
+
+    after = main.series_versions(db, ["RECPROB"])["RECPROB"]
+    assert after != before
+    assert after.split(":")[0] == before.split(":")[0] == "3"
+
+
+def test_version_unchanged_without_writes(db):
+    store_series(db, "A", [1.0, 2.0])
+    assert main.series_versions(db, ["A"]) == main.series_versions(db, ["A"])
+    assert main.series_versions(db, ["A", "MISSING"]).keys() == {"A"}
+
+
+def test_cache_serves_rewritten_tail_after_sync(db, cache):
+    series = store_series(db, "RECPROB", [10.0, 20.0, 55.98258], start="2026-01-01")
+    assert cache.sync(db) == 1
+    client = TestClient(main.app)
+    params = {"start": "2025-01-01T00:00:00"}
+
+    timestamps, values = cache.read("RECPROB")
+    assert values[-1] == 55.98258
+    assert client.get("/api/indicators/RECPROB/timeseries", params=params).json()["data"][-1]["value"] == 55.98258
+
+    rewrite_last_point(db, "RECPROB", series, 99.0)
+    assert cache.sync(db) == 1
+
+    timestamps, values = cache.read("RECPROB")
+    assert len(values) == 3 and values[-1] == 99.0
+    assert client.get("/api/indicators/RECPROB/timeseries", params=params).json()["data"][-1]["value"] == 99.0
+    batch = client.get("/api/batch/timeseries", params={"ids": "RECPROB", **params}).json()
+    assert batch["series"]["RECPROB"]["values"] == [10.0, 20.0, 99.0]
+
+
+def test_cache_read_slices_range(db, cache):
+    store_series(db, "A", [1.0, 2.0, 3.0, 4.0], start="2024-01-01")
+    cache.sync(db)
+
+    timestamps, values = cache.read("A", pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03"))
+    assert values.tolist() == [2.0, 3.0]
+    assert str(timestamps[0]) == "2024-01-02T00:00:00.000000"
+    assert cache.read("MISSING") is None
+
+
+def test_cache_drops_deleted_series(db, cache):
+    store_series(db, "A", [1.0, 2.0])
+    cache.sync(db)
+    db.query(main.Indicator).filter(main.Indicator.indicator_id == "A").delete()
+    db.commit()
+
+    cache.sync(db)
+    assert cache.read("A") is None
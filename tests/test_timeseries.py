@@ -0,0 +1,41 @@
+"""/timeseries and /batch/timeseries serialize the same points the same way, from SQL or the series cache"""
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from series_cache import SeriesCache
+
+TIMESTAMPS = pd.DatetimeIndex(["2024-01-02", "2024-01-03 15:30:00", "2024-01-04 09:00:00.250000"])
+PARAMS = {"start": "2024-01-01T00:00:00", "end": "2024-02-01T00:00:00"}
+
+
+@pytest.fixture(params=["sql", "cache"])
+def client(request, db, tmp_path, monkeypatch):
+    db.add(main.IndicatorMetadata(indicator_id="A", name="Series A", category="test", source="TEST"))
+    main.replace_series_tail(db, "A", pd.Series([1.5, 2.0, 3.25], index=TIMESTAMPS), "TEST", "daily")
+    db.commit()
+    if request.param == "cache":
+        cache = SeriesCache(str(tmp_path / "series_cache"))
+        cache.sync(db)
+        monkeypatch.setattr(main, "series_cache", cache)
+    return TestClient(main.app)
+
+
+def test_single_and_batch_timestamps_match(client):
+    single = client.get("/api/indicators/A/timeseries", params=PARAMS).json()
+    batch = client.get("/api/batch/timeseries", params={"ids": "A", **PARAMS}).json()["series"]["A"]
+
+    expected = ["2024-01-02T00:00:00", "2024-01-03T15:30:00", "2024-01-04T09:00:00.250000"]
+    assert [point["timestamp"] for point in single["data"]] == expected
+    assert batch["timestamps"] == expected
+    assert [point["value"] for point in single["data"]] == batch["values"] == [1.5, 2.0, 3.25]
+    assert single["frequency"] == "daily"
+
+
+def test_limit_and_empty_range(client):
+    assert len(client.get("/api/indicators/A/timeseries", params={**PARAMS, "limit": 2}).json()["data"]) == 2
+    empty = client.get("/api/indicators/A/timeseries", params={"start": "2030-01-01T00:00:00"}).json()
+    assert empty["data"] == [] and empty["frequency"] == "unknown"
+    assert client.get("/api/indicators/NOPE/timeseries").status_code == 404
@@ -0,0 +1,176 @@
+"""
+Tracing
+
+Opt-in request tracing shared by the API and the dashboard. Spans carry
+OpenTelemetry ids and fields (trace_id, span_id, parent_span_id, kind,
+start/end in unix nanoseconds, attributes, status) and are written as one
+JSON object per line to a file or the console, so they can be inspected
+with jq or converted to OTLP for Jaeger / Tempo.
+
+Enable with TRACE_EXPORT=console or TRACE_EXPORT=/path/to/spans.jsonl
+(API and dashboard processes alike). When disabled, span() returns a
+shared no-op object and costs one attribute lookup.
+
+Trace context crosses process boundaries in the W3C `traceparent` header:
+the API client injects it, the API middleware continues it, so a
+dashboard fetch and the API work it caused share one trace id.
+"""
+
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+TRACEPARENT_HEADER = "traceparent"
+
+# Span kinds (OpenTelemetry SpanKind names)
+INTERNAL, SERVER, CLIENT = "INTERNAL", "SERVER", "CLIENT"
+
+
+class Span:
+    """One timed operation. Use as a context manager (see span())."""
+
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_span_id", "attributes",
+                 "start_ns", "end_ns", "status", "_token")
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_span_id: Optional[str],
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.attributes = dict(attributes or {})
+        self.start_ns = 0
+        self.end_ns = 0
+        self.status = "OK"
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        self.status = "ERROR"
+        self.attributes["error.message"] = message
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc is not None:
+            self.set_error(f"{exc_type.__name__}: {exc}")
+        tracer.export(self)
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": {"code": self.status},
+            "resource": {"service.name": tracer.service_name},
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled"""
+
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_error(self, message: str):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Creates spans and writes finished ones to the configured destination"""
+
+    def __init__(self):
+        self.enabled = False
+        self.service_name = "macro-dashboard"
+        self._stream = None
+        self._lock = threading.Lock()
+
+    def configure(self, export: Optional[str], service_name: Optional[str] = None):
+        """export: "" / None disables, "console" writes to stderr, anything else is a file path"""
+        with self._lock:
+            if self._stream not in (None, sys.stderr):
+                self._stream.close()
+            self._stream = None
+            if export == "console":
+                self._stream = sys.stderr
+            elif export:
+                self._stream = open(export, "a", buffering=1)
+            self.enabled = self._stream is not None
+            if service_name:
+                self.service_name = service_name
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            if self._stream is not None:
+                self._stream.write(line + "\n")
+
+
+tracer = Tracer()
+tracer.configure(os.environ.get("TRACE_EXPORT", ""), os.environ.get("TRACE_SERVICE_NAME"))
+
+
+def parse_traceparent(header: Optional[str]):
+    """(trace_id, parent_span_id) from a W3C traceparent header, or None"""
+    parts = (header or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+def span(name: str, kind: str = INTERNAL, attributes: Optional[Dict[str, Any]] = None,
+         traceparent: Optional[str] = None):
+    """
+    Child of the current span (or of `traceparent`, or a new trace).
+    Returns NOOP_SPAN when tracing is disabled.
+    """
+    if not tracer.enabled:
+        return NOOP_SPAN
+    remote = parse_traceparent(traceparent) if traceparent else None
+    if remote is not None:
+        trace_id, parent = remote
+    else:
+        current = _current.get()
+        trace_id, parent = (current.trace_id, current.span_id) if current else (secrets.token_hex(16), None)
+    return Span(name, kind, trace_id, parent, attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
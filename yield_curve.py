@@ -0,0 +1,276 @@
+"""
+Yield Curve Cube
+
+Aligns the Treasury constant-maturity series (DGS1MO..DGS30) into one
+date x tenor matrix and fits a Nelson-Siegel or Nelson-Siegel-Svensson curve
+to every date in batch:
+
+- decay parameters are chosen per date from a fixed grid; for a fixed decay
+  the model is linear, so each grid point is one least-squares solve over all
+  dates that share the same set of available tenors
+- snapshots, any-tenor spreads (observed where the tenor is published,
+  fitted otherwise) and level/slope/curvature histories are slices of the
+  cube - no per-request refitting
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# Series id -> (label, maturity in years), shortest first
+TENORS = {
+    "DGS1MO": ("1M", 1 / 12),
+    "DGS3MO": ("3M", 0.25),
+    "DGS6MO": ("6M", 0.5),
+    "DGS1": ("1Y", 1),
+    "DGS2": ("2Y", 2),
+    "DGS5": ("5Y", 5),
+    "DGS7": ("7Y", 7),
+    "DGS10": ("10Y", 10),
+    "DGS20": ("20Y", 20),
+    "DGS30": ("30Y", 30),
+}
+
+# Decay grids (years); the Svensson second hump is restricted to long maturities
+NS_TAU_GRID = np.round(np.geomspace(0.25, 8, 24), 4)
+NSS_TAU2_GRID = np.array([5.0, 7.5, 10.0, 15.0, 20.0, 30.0])
+
+MODELS = {
+    "ns": ["beta0", "beta1", "beta2"],
+    "nss": ["beta0", "beta1", "beta2", "beta3"],
+}
+
+# Maturities (years) of the fitted curve returned with snapshots
+FITTED_GRID = np.round(np.concatenate([np.arange(1, 12) / 12, np.arange(1, 30.5, 0.5)]), 4)
+
+
+def yield_series_ids() -> List[str]:
+    return list(TENORS)
+
+
+def parse_tenor(tenor: str) -> float:
+    """'3M' -> 0.25, '10Y' -> 10.0, '6' -> 6.0 (years)"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([MmYy]?)\s*", tenor)
+    if not match:
+        raise ValueError(f"Invalid tenor '{tenor}', expected e.g. 3M or 10Y")
+    value = float(match.group(1))
+    years = value / 12 if match.group(2).upper() == "M" else value
+    if not 0 < years <= 50:
+        raise ValueError(f"Tenor '{tenor}' out of range")
+    return years
+
+
+def parse_spread(pair: str) -> Tuple[str, str]:
+    """'10Y-3M' -> ('10Y', '3M')"""
+    parts = pair.split("-")
+    if len(parts) != 2:
+        raise ValueError(f"Invalid spread '{pair}', expected e.g. 10Y-3M")
+    parse_tenor(parts[0])
+    parse_tenor(parts[1])
+    return parts[0].strip().upper(), parts[1].strip().upper()
+
+
+def loadings(maturities: np.ndarray, tau1: float, tau2: Optional[float] = None) -> np.ndarray:
+    """Nelson-Siegel(-Svensson) factor loadings, shape (len(maturities), 3 or 4)"""
+    m = np.maximum(np.asarray(maturities, dtype=float), 1e-6)
+    x1 = m / tau1
+    slope = (1 - np.exp(-x1)) / x1
+    columns = [np.ones_like(m), slope, slope - np.exp(-x1)]
+    if tau2 is not None:
+        x2 = m / tau2
+        columns.append((1 - np.exp(-x2)) / x2 - np.exp(-x2))
+    return np.column_stack(columns)
+
+
+def fit_curves(matrix: pd.DataFrame, maturities: np.ndarray, model: str = "ns") -> pd.DataFrame:
+    """
+    Fit one curve per row of a date x tenor yield matrix.
+
+    Rows are grouped by their pattern of available tenors; for every decay
+    grid point each group is solved with a single least-squares call, and the
+    best decay (lowest RMSE) is kept per row. Rows with fewer than
+    n_params + 1 yields are left as NaN.
+
+    Returns DataFrame indexed by date with columns
+    beta0..beta2 (beta3 for nss), tau1 (tau2), rmse.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model '{model}', expected one of {list(MODELS)}")
+
+    betas = MODELS[model]
+    n_params = len(betas)
+    values = matrix.to_numpy(dtype=float)
+    n_rows = len(values)
+
+    best_sse = np.full(n_rows, np.inf)
+    best_betas = np.full((n_rows, n_params), np.nan)
+    best_taus = np.full((n_rows, 2), np.nan)
+    n_obs = np.zeros(n_rows)
+
+    if model == "ns":
+        grid = [(tau1, None) for tau1 in NS_TAU_GRID]
+    else:
+        grid = [(tau1, tau2) for tau1 in NS_TAU_GRID for tau2 in NSS_TAU2_GRID if tau2 > 2 * tau1]
+
+    observed = ~np.isnan(values)
+    patterns, pattern_of_row = np.unique(observed, axis=0, return_inverse=True)
+    pattern_of_row = pattern_of_row.reshape(-1)
+    groups = [
+        (pattern, np.flatnonzero(pattern_of_row == i))
+        for i, pattern in enumerate(patterns)
+        if pattern.sum() > n_params
+    ]
+
+    for tau1, tau2 in grid:
+        X = loadings(maturities, tau1, tau2)
+        for pattern, rows in groups:
+            Y = values[np.ix_(rows, pattern)].T           # tenors x dates
+            coef, *_ = np.linalg.lstsq(X[pattern], Y, rcond=None)
+            sse = ((X[pattern] @ coef - Y) ** 2).sum(axis=0)
+
+            better = sse < best_sse[rows]
+            improved = rows[better]
+            best_sse[improved] = sse[better]
+            best_betas[improved] = coef[:, better].T
+            best_taus[improved] = (tau1, tau2 if tau2 is not None else np.nan)
+            n_obs[improved] = pattern.sum()
+
+    params = pd.DataFrame(best_betas, index=matrix.index, columns=betas)
+    params["tau1"] = best_taus[:, 0]
+    if model == "nss":
+        params["tau2"] = best_taus[:, 1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        params["rmse"] = np.sqrt(best_sse / n_obs)
+    return params
+
+
+def evaluate_curves(params: pd.DataFrame, maturities: np.ndarray) -> np.ndarray:
+    """Fitted yields for every row of a parameter frame, shape (rows, len(maturities))"""
+    m = np.maximum(np.asarray(maturities, dtype=float), 1e-6)[None, :]
+    tau1 = params["tau1"].to_numpy()[:, None]
+    x1 = m / tau1
+    slope = (1 - np.exp(-x1)) / x1
+    fitted = (
+        params["beta0"].to_numpy()[:, None]
+        + params["beta1"].to_numpy()[:, None] * slope
+        + params["beta2"].to_numpy()[:, None] * (slope - np.exp(-x1))
+    )
+    if "beta3" in params.columns:
+        x2 = m / params["tau2"].to_numpy()[:, None]
+        fitted = fitted + params["beta3"].to_numpy()[:, None] * ((1 - np.exp(-x2)) / x2 - np.exp(-x2))
+    return fitted
+
+
+class YieldCurveCube:
+    """
+    Date x tenor yield matrix plus fitted curve parameters for every date.
+
+    Build once per data version from a wide frame of DGS* series
+    (index = timestamp, one column per series id).
+    """
+
+    def __init__(self, yields: pd.DataFrame, model: str = "ns", min_tenors: int = 4):
+        series_ids = [sid for sid in TENORS if sid in yields.columns]
+        matrix = yields[series_ids].sort_index()
+        matrix = matrix[matrix.notna().sum(axis=1) >= min_tenors]
+
+        self.model = model
+        self.series_ids = series_ids
+        self.labels = [TENORS[sid][0] for sid in series_ids]
+        self.maturities = np.array([TENORS[sid][1] for sid in series_ids], dtype=float)
+        self.matrix = matrix.set_axis(self.labels, axis=1)
+        self.params = fit_curves(self.matrix, self.maturities, model)
+
+    @property
+    def empty(self) -> bool:
+        return self.matrix.empty
+
+    def _window(self, frame: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        if end is not None:
+            frame = frame[frame.index <= pd.Timestamp(end)]
+        return frame
+
+    def tenor_series(self, tenor: str) -> pd.Series:
+        """Observed yield where the tenor is published, fitted yield otherwise"""
+        years = parse_tenor(tenor)
+        fitted = pd.Series(evaluate_curves(self.params, [years])[:, 0], index=self.params.index)
+        matches = np.flatnonzero(np.isclose(self.maturities, years))
+        if len(matches):
+            return self.matrix.iloc[:, matches[0]].fillna(fitted)
+        return fitted
+
+    def spreads(self, pairs: List[str], start=None, end=None) -> pd.DataFrame:
+        """Spread histories (percentage points) for pairs like '10Y-3M'"""
+        columns = {}
+        for pair in pairs:
+            long_tenor, short_tenor = parse_spread(pair)
+            columns[f"{long_tenor}-{short_tenor}"] = self.tenor_series(long_tenor) - self.tenor_series(short_tenor)
+        return self._window(pd.DataFrame(columns, index=self.matrix.index), start, end)
+
+    def factors(self, start=None, end=None) -> pd.DataFrame:
+        """
+        Level / slope / curvature history from the fitted parameters:
+        level = beta0 (long-run yield), slope = -beta1 (long minus short end),
+        curvature = beta2 (medium-term hump).
+        """
+        factors = pd.DataFrame({
+            "level": self.params["beta0"],
+            "slope": -self.params["beta1"],
+            "curvature": self.params["beta2"],
+            "rmse": self.params["rmse"],
+        })
+        return self._window(factors, start, end)
+
+    def snapshot_dates(self, dates: List[pd.Timestamp]) -> List[pd.Timestamp]:
+        """Map requested dates to the last curve date on or before each (deduplicated, in order)"""
+        index = self.matrix.index
+        positions = np.searchsorted(index.values, pd.DatetimeIndex(dates).values, side="right") - 1
+        return list(dict.fromkeys(index[p] for p in positions if p >= 0))
+
+    def sampled_dates(self, freq: str, start=None, end=None) -> List[pd.Timestamp]:
+        """Last curve date of every period (e.g. 'M', 'Q', 'Y') - frames for animated views"""
+        index = self._window(self.matrix, start, end).index
+        if len(index) == 0:
+            return []
+        last = pd.Series(index, index=index).groupby(index.to_period(freq)).last()
+        return list(last)
+
+    def snapshots(self, dates: List[pd.Timestamp], decimals: int = 4) -> List[dict]:
+        """Observed and fitted curves for the given curve dates"""
+        if not dates:
+            return []
+        params = self.params.loc[dates]
+        fitted = np.round(evaluate_curves(params, FITTED_GRID), decimals)
+        observed = self.matrix.loc[dates].round(decimals)
+
+        output = []
+        for i, date in enumerate(dates):
+            row = observed.loc[date]
+            output.append({
+                "date": date.to_pydatetime(),
+                "observed": {label: float(v) for label, v in row.items() if not np.isnan(v)},
+                "fitted": [float(v) if not np.isnan(v) else None for v in fitted[i]],
+                "params": {
+                    k: (None if pd.isna(v) else round(float(v), decimals))
+                    for k, v in params.loc[date].items()
+                },
+            })
+        return output
+
+    def tenors(self) -> List[dict]:
+        return [
+            {"series_id": sid, "label": label, "years": float(years)}
+            for sid, label, years in zip(self.series_ids, self.labels, self.maturities)
+        ]
+
+
+def frame_to_columns(frame: pd.DataFrame, decimals: int = 4) -> Dict[str, list]:
+    """Columnar JSON: {timestamps: [...], column: [...], ...}"""
+    rounded = frame.round(decimals)
+    output = {"timestamps": rounded.index.strftime("%Y-%m-%dT%H:%M:%S").tolist()}
+    for column in rounded.columns:
+        output[column] = [None if np.isnan(v) else float(v) for v in rounded[column].to_numpy(dtype=float)]
+    return output